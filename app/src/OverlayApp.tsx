@@ -48,11 +48,33 @@ const PIPECAT_LOCAL_PARTICIPANT = {
 const KnownRTVICustomServerMessageSchema = z.discriminatedUnion("type", [
 	z.object({
 		type: z.literal("recording-complete-with-zero-words"),
+		recording_id: z.number().nullish(),
 	}),
 	// Raw transcription (LLM bypassed) - sent when LLM formatting is disabled
 	z.object({
 		type: z.literal("raw-transcription"),
 		text: z.string(),
+		recording_id: z.number().nullish(),
+	}),
+	// Progressive raw delivery (LLM bypassed): final STT segments while recording,
+	// then the end message with the combined text at stop
+	z.object({
+		type: z.literal("raw-transcription-segment"),
+		recording_id: z.number().nullish(),
+		sequence: z.number(),
+		text: z.string(),
+	}),
+	z.object({
+		type: z.literal("raw-transcription-end"),
+		recording_id: z.number().nullish(),
+		segment_count: z.number(),
+		text: z.string(),
+	}),
+	// Sent after BotLlmStopped with the recording ID of the formatted response
+	z.object({
+		type: z.literal("formatted-transcription"),
+		recording_id: z.number(),
+		text: z.string(),
 	}),
 	// Provider switching uses RTVI (requires frame injection into pipeline)
 	// z.enum() validates known settings; unknown settings become UnknownRTVICustomServerMessage
@@ -969,6 +991,46 @@ function RecordingControl() {
 						activeAppContextSentForCurrentRecordingRef.current = null;
 						send({ type: "RESPONSE_RECEIVED" });
 					})
+					.with(
+						{ type: "raw-transcription-segment" },
+						async ({ sequence, text }) => {
+							// Typed as it arrives; segments after the first follow a space
+							const trimmedText = text.trim();
+							if (!trimmedText) {
+								return;
+							}
+							try {
+								await typeTextMutation.mutateAsync(
+									sequence > 0 ? ` ${trimmedText}` : trimmedText,
+								);
+							} catch (error) {
+								console.error("[Pipecat] Failed to type text:", error);
+							}
+						},
+					)
+					.with({ type: "raw-transcription-end" }, ({ segment_count, text }) => {
+						// All segments were already typed; record the whole transcription
+						clearResponseTimeout();
+						const trimmedText = text.trim();
+						console.debug(
+							`[Pipecat] Raw transcription (${segment_count} segments):`,
+							trimmedText,
+						);
+						if (trimmedText) {
+							addHistoryEntry.mutate({
+								text: trimmedText,
+								rawText: trimmedText,
+								activeAppContext:
+									activeAppContextSentForCurrentRecordingRef.current,
+							});
+						}
+						activeAppContextSentForCurrentRecordingRef.current = null;
+						send({ type: "RESPONSE_RECEIVED" });
+					})
+					.with({ type: "formatted-transcription" }, ({ recording_id }) => {
+						// The text was already typed from the BotLlm events
+						console.debug("[Pipecat] Formatted recording:", recording_id);
+					})
 					.with({ type: "config-updated" }, ({ setting, value }) => {
 						tauriAPI.emitConfigResponse({
 							type: "config-updated",
@@ -0,0 +1,345 @@
+"""HTTP API for headless batch transcription and formatting.
+
+This module provides REST endpoints for:
+- POST /api/transcribe - Transcribe and format an uploaded WAV file (no WebRTC session)
+- POST /api/format - Format text transcripts from other STT systems (no STT)
+
+Both endpoints require a registered client (X-Client-UUID header). Formatting
+uses the connected client's prompt sections unless others are given, and the
+default sections otherwise.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import time
+from typing import TYPE_CHECKING, Annotated
+
+from fastapi import APIRouter, Header, HTTPException, Request
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from api.config_api import CleanupPromptSections, ConfigErrorResponse, apply_prompt_sections
+from processors.context_manager import DictationContextManager
+from processors.llm import PromptProfile
+from protocol.providers import LLMProviderId, STTProviderId
+from services.providers import create_llm_service, get_llm_prompt_profile
+from utils.rate_limiter import RATE_LIMIT_FORMAT, RATE_LIMIT_TRANSCRIBE, get_ip_only, limiter
+
+if TYPE_CHECKING:
+    from pipecat.services.llm_service import LLMService
+
+    from main import AppServices
+
+batch_router = APIRouter(prefix="/api", tags=["batch"])
+
+
+# =============================================================================
+# Pydantic models
+# =============================================================================
+
+
+class BatchTranscriptionResponse(BaseModel):
+    """Response with the transcript of an uploaded file."""
+
+    text: str
+    raw_text: str
+    formatted: bool
+    stt_provider: STTProviderId
+    llm_provider: LLMProviderId | None
+    audio_secs: float
+    processing_secs: float
+
+
+class BatchFormatRequest(BaseModel):
+    """Request body for formatting text transcripts.
+
+    - transcripts: One or more transcripts, formatted independently
+    - sections: Prompt sections to format with (default: the client's current sections)
+    - llm_provider: LLM provider to format with (default: the first available)
+    """
+
+    transcripts: list[str] = Field(min_length=1)
+    sections: CleanupPromptSections | None = None
+    llm_provider: LLMProviderId | None = None
+
+
+class FormattedTranscriptResult(BaseModel):
+    """Formatting result of one transcript."""
+
+    text: str
+    formatted: bool
+    latency_ms: float
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    usage_estimated: bool = False
+
+
+class BatchFormatResponse(BaseModel):
+    """Response with one result per transcript, in request order."""
+
+    results: list[FormattedTranscriptResult]
+    llm_provider: LLMProviderId
+    processing_ms: float
+
+
+# =============================================================================
+# Helper functions
+# =============================================================================
+
+
+def get_app_services(request: Request) -> AppServices:
+    """Get the application services from app state."""
+    return request.app.state.services
+
+
+async def require_registered_client(services: AppServices, client_uuid: str) -> None:
+    """Reject requests from unregistered clients.
+
+    Raises:
+        HTTPException: 401 if the client UUID is not registered
+    """
+    if not await services.client_manager.is_registered(client_uuid):
+        raise HTTPException(
+            status_code=401,
+            detail={"error": "Client not registered", "code": "CLIENT_NOT_REGISTERED"},
+        )
+
+
+def select_llm_provider(services: AppServices, llm_provider: LLMProviderId | None) -> LLMProviderId:
+    """Get the requested LLM provider, or the first available one.
+
+    Raises:
+        HTTPException: 400 if the provider is not available
+    """
+    selected_provider = llm_provider or services.available_llm_providers[0]
+    if selected_provider not in services.available_llm_providers:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": f"LLM provider not available: {selected_provider}",
+                "code": "LLM_UNAVAILABLE",
+            },
+        )
+    return selected_provider
+
+
+def get_batch_llm_service(services: AppServices, llm_provider: LLMProviderId) -> LLMService:
+    """Get the LLM service batch requests format with, creating it on first use.
+
+    All batch requests share one service (and HTTP client) per provider; its
+    one-shot inferences keep no per-request state.
+    """
+    llm_service = services.batch_llm_services.get(llm_provider)
+    if llm_service is None:
+        llm_service = create_llm_service(llm_provider, services.settings)
+        services.batch_llm_services[llm_provider] = llm_service
+    return llm_service
+
+
+async def close_batch_llm_services(services: AppServices) -> None:
+    """Close the HTTP clients of the cached batch LLM services (on shutdown)."""
+    for llm_service in services.batch_llm_services.values():
+        client = getattr(llm_service, "_client", None)
+        close = getattr(client, "close", None)
+        if close is None:
+            continue
+        with contextlib.suppress(Exception):
+            await close()
+    services.batch_llm_services.clear()
+
+
+def build_batch_context_manager(
+    services: AppServices,
+    client_uuid: str,
+    llm_provider: LLMProviderId | None,
+    sections: CleanupPromptSections | None = None,
+) -> DictationContextManager:
+    """Get the context manager whose prompt formats a batch request.
+
+    A connected client's own context manager is reused unless sections are
+    given. Otherwise a new one is created with the given (or default) sections
+    and the prompt profile of the server setting or LLM provider.
+    """
+    connection = services.client_manager.get_connection(client_uuid)
+    if sections is None and connection is not None and connection.context_manager is not None:
+        return connection.context_manager
+
+    settings = services.settings
+    prompt_profile = (
+        PromptProfile(settings.llm_prompt_profile)
+        if settings.llm_prompt_profile is not None
+        else get_llm_prompt_profile(llm_provider)
+        if llm_provider is not None
+        else None
+    )
+    context_manager = DictationContextManager(
+        dictionary_prompt_token_budget=(
+            settings.dictionary_prompt_token_budget
+            if settings.dictionary_retrieval_enabled
+            else None
+        ),
+        prompt_profile=prompt_profile,
+    )
+    if sections is not None:
+        apply_prompt_sections(context_manager, sections)
+    return context_manager
+
+
+# =============================================================================
+# Endpoints
+# =============================================================================
+
+
+@batch_router.post(
+    "/transcribe",
+    response_model=BatchTranscriptionResponse,
+    responses={
+        400: {"model": ConfigErrorResponse, "description": "Provider not available"},
+        401: {"model": ConfigErrorResponse, "description": "Client not registered"},
+        422: {"model": ConfigErrorResponse, "description": "Unsupported or invalid audio"},
+    },
+)
+@limiter.limit(RATE_LIMIT_TRANSCRIBE, key_func=get_ip_only)
+async def transcribe_file(
+    request: Request,
+    x_client_uuid: Annotated[str, Header()],
+    stt_provider: STTProviderId | None = None,
+    llm_provider: LLMProviderId | None = None,
+    llm_formatting: bool = True,
+) -> BatchTranscriptionResponse:
+    """Transcribe a 16-bit PCM WAV file streamed in the request body.
+
+    Runs the same STT providers and prompt formatting as live dictation,
+    faster than real time. Jobs share a bounded worker budget, so a request
+    may wait for a free slot before its upload is read.
+
+    Args:
+        request: FastAPI request object (its body is the WAV file)
+        x_client_uuid: Client UUID from X-Client-UUID header
+        stt_provider: STT provider to use (default: the first available)
+        llm_provider: LLM provider to format with (default: the first available)
+        llm_formatting: False to return the raw transcript without formatting
+
+    Returns:
+        The formatted and raw transcript with job timings
+
+    Raises:
+        HTTPException: 400 if a provider is not available, 401 if the client
+            is not registered, 422 if the audio is invalid or too long
+    """
+    services = get_app_services(request)
+    await require_registered_client(services, x_client_uuid)
+
+    stt_provider = stt_provider or services.available_stt_providers[0]
+    if stt_provider not in services.available_stt_providers:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": f"STT provider not available: {stt_provider}",
+                "code": "STT_UNAVAILABLE",
+            },
+        )
+    llm_provider = select_llm_provider(services, llm_provider) if llm_formatting else None
+
+    try:
+        result = await services.batch_transcriber.transcribe(
+            request.stream(),
+            stt_provider,
+            get_batch_llm_service(services, llm_provider) if llm_provider else None,
+            build_batch_context_manager(services, x_client_uuid, llm_provider),
+        )
+    except ValueError as error:
+        raise HTTPException(
+            status_code=422,
+            detail={"error": str(error), "code": "INVALID_AUDIO"},
+        ) from error
+
+    logger.info(f"Batch transcription of {result.audio_secs:.1f}s for client: {x_client_uuid}")
+    formatted = result.formatting is not None and result.formatting.formatted
+    return BatchTranscriptionResponse(
+        text=result.formatting.text if result.formatting is not None else result.raw_text,
+        raw_text=result.raw_text,
+        formatted=formatted,
+        stt_provider=stt_provider,
+        llm_provider=llm_provider if formatted else None,
+        audio_secs=result.audio_secs,
+        processing_secs=result.processing_secs,
+    )
+
+
+@batch_router.post(
+    "/format",
+    response_model=BatchFormatResponse,
+    responses={
+        400: {"model": ConfigErrorResponse, "description": "Provider not available"},
+        401: {"model": ConfigErrorResponse, "description": "Client not registered"},
+        422: {"model": ConfigErrorResponse, "description": "Too many transcripts"},
+    },
+)
+@limiter.limit(RATE_LIMIT_FORMAT, key_func=get_ip_only)
+async def format_transcripts(
+    body: BatchFormatRequest,
+    request: Request,
+    x_client_uuid: Annotated[str, Header()],
+) -> BatchFormatResponse:
+    """Format text transcripts with Tambourine's prompts, without STT.
+
+    Transcripts are formatted concurrently (bounded across all batch
+    requests) and returned in request order. A transcript whose formatting
+    fails is returned unformatted.
+
+    Args:
+        body: The transcripts, and optionally prompt sections and LLM provider
+        request: FastAPI request object
+        x_client_uuid: Client UUID from X-Client-UUID header
+
+    Returns:
+        One result per transcript with its latency and token usage
+
+    Raises:
+        HTTPException: 400 if the provider is not available, 401 if the client
+            is not registered, 422 if there are too many transcripts
+    """
+    services = get_app_services(request)
+    await require_registered_client(services, x_client_uuid)
+
+    max_transcripts = services.settings.batch_formatting_max_transcripts
+    if len(body.transcripts) > max_transcripts:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "error": f"At most {max_transcripts} transcripts per request",
+                "code": "TOO_MANY_TRANSCRIPTS",
+            },
+        )
+    llm_provider = select_llm_provider(services, body.llm_provider)
+    context_manager = build_batch_context_manager(
+        services, x_client_uuid, llm_provider, body.sections
+    )
+
+    started_at = time.perf_counter()
+    results = await services.transcript_formatter.format_many(
+        body.transcripts, get_batch_llm_service(services, llm_provider), context_manager
+    )
+    processing_ms = (time.perf_counter() - started_at) * 1000
+
+    logger.info(
+        f"Formatted {len(results)} transcripts in {processing_ms:.0f}ms "
+        f"({llm_provider.value}) for client: {x_client_uuid}"
+    )
+    return BatchFormatResponse(
+        results=[
+            FormattedTranscriptResult(
+                text=result.text,
+                formatted=result.formatted,
+                latency_ms=result.latency_secs * 1000,
+                prompt_tokens=result.usage.prompt_tokens if result.usage else None,
+                completion_tokens=result.usage.completion_tokens if result.usage else None,
+                usage_estimated=result.usage.estimated if result.usage else False,
+            )
+            for result in results
+        ],
+        llm_provider=llm_provider,
+        processing_ms=processing_ms,
+    )
@@ -3,7 +3,10 @@
 This module provides REST endpoints for:
 - GET /api/prompt/sections/default - Get default prompt sections (static)
 - PUT /api/config/prompts - Update prompt sections (per-client)
+- PUT /api/config/prompt-profile - Select full or lite default sections (per-client)
 - PUT /api/config/stt-timeout - Update STT timeout (per-client)
+- PUT /api/config/formatting-cache - Opt in/out of formatting result caching (per-client)
+- POST /api/transcripts/reformat - Format a recent transcript again without new STT (per-client)
 - GET /api/providers - Get available providers (global)
 
 Per-client endpoints use X-Client-UUID header to identify the client's pipeline.
@@ -19,9 +22,9 @@ from loguru import logger
 from pydantic import BaseModel, Field
 
 from processors.llm import (
-    ADVANCED_PROMPT_DEFAULT,
-    DICTIONARY_PROMPT_DEFAULT,
-    MAIN_PROMPT_DEFAULT,
+    PROMPT_SECTION_DEFAULTS,
+    PromptProfile,
+    prompt_profile_token_counts,
 )
 from services.provider_registry import (
     LLMProviderId,
@@ -32,6 +35,7 @@ from services.provider_registry import (
 from utils.rate_limiter import (
     RATE_LIMIT_CONFIG,
     RATE_LIMIT_PROVIDERS,
+    RATE_LIMIT_REFORMAT,
     RATE_LIMIT_RUNTIME_CONFIG,
     get_ip_only,
     limiter,
@@ -39,6 +43,7 @@ from utils.rate_limiter import (
 
 if TYPE_CHECKING:
     from processors.client_manager import ClientConnectionManager
+    from processors.context_manager import DictationContextManager
 
 config_router = APIRouter(prefix="/api", tags=["config"])
 
@@ -104,6 +109,44 @@ class LLMFormattingRequest(BaseModel):
     enabled: bool
 
 
+class FormattingCacheRequest(BaseModel):
+    """Request body for formatting cache configuration update.
+
+    - {"enabled": true}: Reuse and store formatting results for identical requests
+    - {"enabled": false}: Never read or store this client's transcripts
+    """
+
+    enabled: bool
+
+
+class PromptProfileRequest(BaseModel):
+    """Request body for prompt profile update.
+
+    - {"profile": "full"} or {"profile": "lite"}: Use that profile's default sections
+    - {"profile": null}: Select the profile from the server setting or active LLM provider
+    """
+
+    profile: PromptProfile | None
+
+
+class ReformatTranscriptRequest(BaseModel):
+    """Request body for reformatting a stored transcript.
+
+    - {"recording_id": 3}: Reformat that recording, if still in the history
+    - {"recording_id": null} or {}: Reformat the most recent recording
+    """
+
+    recording_id: int | None = None
+
+
+class ReformatTranscriptResponse(BaseModel):
+    """Response with a stored transcript formatted again."""
+
+    recording_id: int | None
+    transcript: str
+    text: str
+
+
 class ConfigSuccessResponse(BaseModel):
     """Response for successful configuration update."""
 
@@ -142,6 +185,9 @@ class DefaultSectionsResponse(BaseModel):
     main: str
     advanced: str
     dictionary: str
+    token_counts: dict[str, int] = Field(
+        default_factory=dict, description="Estimated tokens of each section"
+    )
 
 
 # =============================================================================
@@ -157,6 +203,27 @@ def get_client_manager(request: Request) -> ClientConnectionManager:
     return services.client_manager
 
 
+def apply_prompt_sections(
+    context_manager: DictationContextManager, sections: CleanupPromptSections
+) -> None:
+    """Set a context manager's prompt sections from their API configuration."""
+
+    def get_content(section: PromptSection) -> str | None:
+        match section.mode:
+            case PromptModeAuto():
+                return None
+            case PromptModeManual(content=content):
+                return content
+
+    context_manager.set_prompt_sections(
+        main_custom=get_content(sections.main),
+        advanced_enabled=sections.advanced.enabled,
+        advanced_custom=get_content(sections.advanced),
+        dictionary_enabled=sections.dictionary.enabled,
+        dictionary_custom=get_content(sections.dictionary),
+    )
+
+
 def build_provider_list(
     services: dict[Any, Any],
     labels: dict[Any, str],
@@ -190,16 +257,20 @@ def build_provider_list(
 
 @config_router.get("/prompt/sections/default", response_model=DefaultSectionsResponse)
 @limiter.limit(RATE_LIMIT_CONFIG, key_func=get_ip_only)
-async def get_default_sections(request: Request) -> DefaultSectionsResponse:
-    """Get default prompts for each section.
+async def get_default_sections(
+    request: Request, profile: PromptProfile = PromptProfile.FULL
+) -> DefaultSectionsResponse:
+    """Get default prompts for each section of a prompt profile.
 
     Rate limited to prevent abuse, though this endpoint serves static data.
     """
     _ = request  # Required for rate limiter but unused in handler
+    defaults = PROMPT_SECTION_DEFAULTS[profile]
     return DefaultSectionsResponse(
-        main=MAIN_PROMPT_DEFAULT,
-        advanced=ADVANCED_PROMPT_DEFAULT,
-        dictionary=DICTIONARY_PROMPT_DEFAULT,
+        main=defaults.main,
+        advanced=defaults.advanced,
+        dictionary=defaults.dictionary,
+        token_counts=prompt_profile_token_counts(profile),
     )
 
 
@@ -245,25 +316,66 @@ async def update_prompt_sections(
             detail={"error": "Pipeline not ready", "code": "PIPELINE_NOT_READY"},
         )
 
-    def get_content(section: PromptSection) -> str | None:
-        match section.mode:
-            case PromptModeAuto():
-                return None
-            case PromptModeManual(content=content):
-                return content
-
-    connection.context_manager.set_prompt_sections(
-        main_custom=get_content(sections.main),
-        advanced_enabled=sections.advanced.enabled,
-        advanced_custom=get_content(sections.advanced),
-        dictionary_enabled=sections.dictionary.enabled,
-        dictionary_custom=get_content(sections.dictionary),
-    )
+    apply_prompt_sections(connection.context_manager, sections)
+    if connection.stt_vocabulary_booster is not None:
+        await connection.stt_vocabulary_booster.boost(
+            connection.context_manager.compiled_dictionary
+        )
 
     logger.info(f"Updated prompt sections for client: {x_client_uuid}")
     return ConfigSuccessResponse(setting="prompt-sections", value="custom")
 
 
+@config_router.put(
+    "/config/prompt-profile",
+    response_model=ConfigSuccessResponse,
+    responses={
+        404: {"model": ConfigErrorResponse, "description": "Client not connected"},
+    },
+)
+@limiter.limit(RATE_LIMIT_RUNTIME_CONFIG, key_func=get_ip_only)
+async def update_prompt_profile(
+    body: PromptProfileRequest,
+    request: Request,
+    x_client_uuid: Annotated[str, Header()],
+) -> ConfigSuccessResponse:
+    """Select the full or lite default prompt sections for a connected client.
+
+    Custom (manual) sections are unaffected. A null profile restores automatic
+    selection from the server setting or the active LLM provider.
+
+    Args:
+        body: Request body containing the profile
+        request: FastAPI request object
+        x_client_uuid: Client UUID from X-Client-UUID header
+
+    Returns:
+        Success response with the updated setting
+
+    Raises:
+        HTTPException: 404 if client not connected
+    """
+    client_manager = get_client_manager(request)
+    connection = client_manager.get_connection(x_client_uuid)
+
+    if connection is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": "Client not connected", "code": "CLIENT_NOT_FOUND"},
+        )
+
+    if connection.context_manager is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": "Pipeline not ready", "code": "PIPELINE_NOT_READY"},
+        )
+
+    connection.context_manager.set_prompt_profile(body.profile)
+
+    logger.info(f"Set prompt profile={body.profile or 'auto'} for client: {x_client_uuid}")
+    return ConfigSuccessResponse(setting="prompt-profile", value=body.profile)
+
+
 @config_router.put(
     "/config/llm-formatting",
     response_model=ConfigSuccessResponse,
@@ -315,6 +427,53 @@ async def update_llm_formatting(
     return ConfigSuccessResponse(setting="llm-formatting", value=body.enabled)
 
 
+@config_router.put(
+    "/config/formatting-cache",
+    response_model=ConfigSuccessResponse,
+    responses={
+        404: {"model": ConfigErrorResponse, "description": "Client not connected"},
+    },
+)
+@limiter.limit(RATE_LIMIT_RUNTIME_CONFIG, key_func=get_ip_only)
+async def update_formatting_cache(
+    body: FormattingCacheRequest,
+    request: Request,
+    x_client_uuid: Annotated[str, Header()],
+) -> ConfigSuccessResponse:
+    """Enable or disable formatting result caching for a connected client.
+
+    The choice is kept by client UUID and applied again on reconnect. Opting
+    out purges the results this client stored. When the server-wide cache is
+    disabled this is accepted but has no effect.
+
+    Args:
+        body: Request body containing the enabled flag
+        request: FastAPI request object
+        x_client_uuid: Client UUID from X-Client-UUID header
+
+    Returns:
+        Success response with the updated setting
+
+    Raises:
+        HTTPException: 404 if client not connected
+    """
+    client_manager = get_client_manager(request)
+    connection = client_manager.get_connection(x_client_uuid)
+
+    if connection is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": "Client not connected", "code": "CLIENT_NOT_FOUND"},
+        )
+
+    await client_manager.set_formatting_cache_opt_out(x_client_uuid, not body.enabled)
+    if connection.formatting_cache is not None:
+        connection.formatting_cache.set_enabled(body.enabled)
+
+    logger.info(f"Set formatting cache enabled={body.enabled} for client: {x_client_uuid}")
+    return ConfigSuccessResponse(setting="formatting-cache", value=body.enabled)
+
+
 @config_router.put(
     "/config/stt-timeout",
     response_model=ConfigSuccessResponse,
@@ -372,6 +531,73 @@ async def update_stt_timeout(
     return ConfigSuccessResponse(setting="stt-timeout", value=body.timeout_seconds)
 
 
+@config_router.post(
+    "/transcripts/reformat",
+    response_model=ReformatTranscriptResponse,
+    responses={
+        404: {"model": ConfigErrorResponse, "description": "Client or transcript not found"},
+        502: {"model": ConfigErrorResponse, "description": "LLM formatting failed"},
+    },
+)
+@limiter.limit(RATE_LIMIT_REFORMAT, key_func=get_ip_only)
+async def reformat_transcript(
+    body: ReformatTranscriptRequest,
+    request: Request,
+    x_client_uuid: Annotated[str, Header()],
+) -> ReformatTranscriptResponse:
+    """Format a recent transcript again with the client's current prompt and LLM.
+
+    Only the LLM stage runs (no new STT work), so the effect of prompt section
+    or provider changes can be checked without dictating again. The result is
+    returned in the response and is not sent through the pipeline.
+
+    Args:
+        body: Request body with the recording to reformat (default: most recent)
+        request: FastAPI request object
+        x_client_uuid: Client UUID from X-Client-UUID header
+
+    Returns:
+        The stored transcript and its newly formatted text
+
+    Raises:
+        HTTPException: 404 if client not connected or transcript not stored,
+            502 if formatting fails
+    """
+    client_manager = get_client_manager(request)
+    connection = client_manager.get_connection(x_client_uuid)
+
+    if connection is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": "Client not connected", "code": "CLIENT_NOT_FOUND"},
+        )
+
+    if connection.transcript_history is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": "Transcript history is disabled", "code": "HISTORY_DISABLED"},
+        )
+
+    stored = connection.transcript_history.get(body.recording_id)
+    if stored is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": "Transcript not in history", "code": "TRANSCRIPT_NOT_FOUND"},
+        )
+
+    formatted_text = await connection.transcript_history.reformat(stored)
+    if formatted_text is None:
+        raise HTTPException(
+            status_code=502,
+            detail={"error": "LLM formatting failed", "code": "REFORMAT_FAILED"},
+        )
+
+    logger.info(f"Reformatted recording {stored.recording_id} for client: {x_client_uuid}")
+    return ReformatTranscriptResponse(
+        recording_id=stored.recording_id, transcript=stored.transcript, text=formatted_text
+    )
+
+
 @config_router.get(
     "/providers",
     response_model=AvailableProvidersResponse,
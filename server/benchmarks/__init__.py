@@ -0,0 +1 @@
+"""Offline benchmarks for latency-sensitive server components."""
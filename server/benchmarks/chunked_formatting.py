@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Benchmark wall-clock formatting latency of whole vs chunked transcripts.
+
+A long transcript formatted in one request takes time proportional to its
+output length. Chunked formatting (processors/chunked_formatting.py) splits it
+into overlapping chunks formatted concurrently, so its latency is bounded by
+the slowest wave of chunks instead.
+
+By default a local stub model is used. Each request takes a fixed TTFB plus a
+per-output-token decode time, and requests beyond the concurrency limit wait
+for a free slot. The stub formats by echoing the transcript, so stitching is
+checked exactly: the stitched chunks must reproduce the transcript's words.
+
+Pass --base-url (and --model) to run the same transcripts against any
+OpenAI-compatible endpoint, such as a local Ollama server, and measure real
+latencies and the similarity of stitched to whole output.
+
+Usage:
+    python -m benchmarks.chunked_formatting
+    python -m benchmarks.chunked_formatting --concurrency 8 --decode-ms-per-token 25
+    python -m benchmarks.chunked_formatting --base-url http://localhost:11434/v1 --model llama3.2
+"""
+
+import asyncio
+import difflib
+import heapq
+import time
+from typing import Annotated
+
+import typer
+from openai import AsyncOpenAI
+
+from processors.chunked_formatting import (
+    TranscriptChunk,
+    remove_formatted_overlap,
+    split_transcript,
+)
+from processors.incremental_formatting import join_formatted_segments
+from processors.llm import PromptProfile, combine_prompt_sections, estimate_token_count
+
+DICTATED_SENTENCES: tuple[str, ...] = (
+    "so the first thing I wanted to mention is that the quarterly report is almost done.",
+    "we still need the numbers from the sales team before we can send it out.",
+    "um I think Sarah said she would have them by Thursday but I am not completely sure.",
+    "the second thing is the offsite which is now planned for the last week of the month.",
+    "please let me know if you have any dietary restrictions so we can sort out the catering.",
+    "and finally I would like everyone to review the onboarding document before Friday.",
+)
+
+TRANSCRIPT_WORD_COUNTS: tuple[int, ...] = (50, 100, 200, 400, 800)
+
+
+def build_transcript(word_count: int) -> str:
+    """Build a dictation-like transcript of roughly word_count words."""
+    sentences: list[str] = []
+    words = 0
+    while words < word_count:
+        sentence = DICTATED_SENTENCES[len(sentences) % len(DICTATED_SENTENCES)]
+        sentences.append(sentence)
+        words += len(sentence.split())
+    return " ".join(sentences)
+
+
+def stitch_chunks(chunks: list[TranscriptChunk], formatted_chunks: list[str]) -> str:
+    """Remove each chunk's formatted overlap and join the chunks."""
+    stitched_chunks = [formatted_chunks[0]]
+    for chunk, formatted_chunk, previous_chunk in zip(
+        chunks[1:], formatted_chunks[1:], formatted_chunks, strict=False
+    ):
+        stitched_chunks.append(
+            remove_formatted_overlap(previous_chunk, formatted_chunk, chunk.overlap_words)
+        )
+    return join_formatted_segments(stitched_chunks)
+
+
+def simulate_wall_clock_ms(request_ms: list[float], concurrency: int) -> float:
+    """Wall-clock time of requests started in order on at most `concurrency` slots."""
+    slot_free_at = [0.0] * concurrency
+    finished_at = 0.0
+    for duration in request_ms:
+        started_at = heapq.heappop(slot_free_at)
+        finished_at = max(finished_at, started_at + duration)
+        heapq.heappush(slot_free_at, started_at + duration)
+    return finished_at
+
+
+def run_stub(
+    chunk_words: int,
+    overlap_words: int,
+    concurrency: int,
+    base_ttfb_ms: float,
+    decode_ms_per_token: float,
+) -> None:
+    """Report simulated whole and chunked latency for each transcript length."""
+
+    def request_ms(text: str) -> float:
+        return base_ttfb_ms + estimate_token_count(text) * decode_ms_per_token
+
+    for word_count in TRANSCRIPT_WORD_COUNTS:
+        transcript = build_transcript(word_count)
+        chunks = split_transcript([transcript], chunk_words, overlap_words)
+        whole_ms = request_ms(transcript)
+        chunked_ms = simulate_wall_clock_ms(
+            [request_ms(chunk.text) for chunk in chunks], concurrency
+        )
+        stitched = stitch_chunks(chunks, [chunk.text for chunk in chunks])
+        stitched_exactly = stitched.split() == transcript.split()
+        print(
+            f"words={len(transcript.split()):>4} chunks={len(chunks):>2} "
+            f"whole={whole_ms:>8.0f}ms chunked={chunked_ms:>8.0f}ms (simulated) "
+            f"speedup={whole_ms / chunked_ms:>5.2f}x stitched={'ok' if stitched_exactly else 'MISMATCH'}"
+        )
+
+
+async def format_with_endpoint(
+    client: AsyncOpenAI, model: str, system_prompt: str, transcript: str
+) -> str:
+    """Format one transcript with the endpoint."""
+    response = await client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": transcript},
+        ],
+        temperature=0,
+    )
+    return (response.choices[0].message.content or "").strip()
+
+
+async def run_endpoint(
+    client: AsyncOpenAI, model: str, chunk_words: int, overlap_words: int, concurrency: int
+) -> None:
+    """Report measured whole and chunked latency for each transcript length."""
+    system_prompt = combine_prompt_sections(
+        main_custom=None,
+        advanced_enabled=True,
+        advanced_custom=None,
+        dictionary_enabled=False,
+        dictionary_custom=None,
+        profile=PromptProfile.FULL,
+    )
+    concurrency_limit = asyncio.Semaphore(concurrency)
+
+    async def format_chunk(chunk: TranscriptChunk) -> str:
+        async with concurrency_limit:
+            return await format_with_endpoint(client, model, system_prompt, chunk.text)
+
+    for word_count in TRANSCRIPT_WORD_COUNTS:
+        transcript = build_transcript(word_count)
+        chunks = split_transcript([transcript], chunk_words, overlap_words)
+
+        started_at = time.perf_counter()
+        whole_output = await format_with_endpoint(client, model, system_prompt, transcript)
+        whole_ms = (time.perf_counter() - started_at) * 1000
+
+        started_at = time.perf_counter()
+        formatted_chunks = await asyncio.gather(*(format_chunk(chunk) for chunk in chunks))
+        chunked_output = stitch_chunks(chunks, list(formatted_chunks))
+        chunked_ms = (time.perf_counter() - started_at) * 1000
+
+        similarity = difflib.SequenceMatcher(None, chunked_output, whole_output).ratio()
+        print(
+            f"words={len(transcript.split()):>4} chunks={len(chunks):>2} "
+            f"whole={whole_ms:>8.0f}ms chunked={chunked_ms:>8.0f}ms "
+            f"speedup={whole_ms / chunked_ms:>5.2f}x similarity to whole={similarity:>6.1%}"
+        )
+
+
+def main(
+    chunk_words: Annotated[int, typer.Option(help="Target words per chunk")] = 80,
+    overlap_words: Annotated[int, typer.Option(help="Words repeated between chunks")] = 8,
+    concurrency: Annotated[int, typer.Option(help="Maximum chunks formatted at once")] = 4,
+    base_ttfb_ms: Annotated[
+        float, typer.Option(help="Stub model TTFB (network, queueing, prefill)")
+    ] = 300.0,
+    decode_ms_per_token: Annotated[
+        float, typer.Option(help="Stub model decode time per output token")
+    ] = 20.0,
+    base_url: Annotated[
+        str | None, typer.Option(help="OpenAI-compatible endpoint to benchmark instead")
+    ] = None,
+    model: Annotated[str, typer.Option(help="Model name for --base-url")] = "llama3.2",
+    api_key: Annotated[str, typer.Option(help="API key for --base-url")] = "unused",
+) -> None:
+    """Benchmark whole vs chunked formatting latency."""
+    if base_url is None:
+        run_stub(chunk_words, overlap_words, concurrency, base_ttfb_ms, decode_ms_per_token)
+    else:
+        client = AsyncOpenAI(base_url=base_url, api_key=api_key)
+        asyncio.run(run_endpoint(client, model, chunk_words, overlap_words, concurrency))
+
+
+if __name__ == "__main__":
+    typer.run(main)
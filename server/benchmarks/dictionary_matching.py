@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Benchmark dictionary matching over the example prompt dictionaries.
+
+Measures compile time, per-transcript latency of exact + phonetic matching,
+how many simulated STT near-misses are corrected, and the false-positive
+rate: the share of everyday transcripts without dictionary terms that
+phonetic matching changes. A synthetic 10k-entry dictionary is included to
+check that lookups stay sub-millisecond at scale.
+
+Usage:
+    python -m benchmarks.dictionary_matching
+    python -m benchmarks.dictionary_matching --synthetic-entries 20000
+"""
+
+import random
+import statistics
+import string
+import time
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from processors.dictionary import (
+    CompiledDictionary,
+    DictionaryMapping,
+    DictionaryTerm,
+    compile_dictionary_section,
+)
+from processors.phonetic import DEFAULT_MAX_EDIT_RATIO
+
+EXAMPLES_DIRECTORY = Path(__file__).resolve().parents[2] / "examples"
+FILLER_SENTENCE = "so we talked about the results and then we moved on to the next item"
+
+# Everyday dictation without dictionary terms, which phonetic matching must not change
+CLEAN_TRANSCRIPTS = [
+    "upload it to the cloud",
+    "the cloud bill went up again this month",
+    "send the contract to the other party",
+    "let's grab tacos after the standup tomorrow",
+    "the quarterly forecast looks promising but shipping costs doubled",
+    "remind me to water the tomatoes before the heatwave",
+    "can you proofread the paragraph about the migration timeline",
+    "my flight to Denver got rescheduled to Thursday evening",
+    "the spreadsheet formulas broke after someone renamed the tab",
+    "we should refactor the parser before adding more grammar rules",
+    "the landlord agreed to fix the radiator next week",
+    "please archive the old invoices and forward the receipts",
+    "the toddler finally fell asleep after two bedtime stories",
+    "our vendor missed the deadline for the hardware order",
+    "the recipe calls for cumin paprika and a pinch of cinnamon",
+    "the clinic moved my appointment to the afternoon",
+    "the lawyer reviewed the clause about termination fees",
+    "I think the router firmware needs an update",
+    "the tour guide pointed out the cathedral and the old harbor",
+    "the pipeline stalled because the queue filled up",
+    "we celebrated the launch with pizza and cake",
+    "the patient reported mild chest pain after jogging",
+    "the campaign budget was reallocated to video ads",
+    "ask the plumber whether the valve is still under warranty",
+    "the cat knocked the pipe off the shelf",
+    "the tory party lost seats in the election",
+    "she played the tambourine in the marching band",
+    "the claws of the crab were surprisingly strong",
+    "the conference keynote ran twenty minutes over",
+    "the draft mentions indemnity caps and liability limits",
+]
+
+
+def load_example_dictionary(path: Path) -> str:
+    """Read an example dictionary file, dropping its front matter block."""
+    content = path.read_text(encoding="utf-8")
+    _, separator, body = content.partition("\n---\n")
+    return body if separator else content
+
+
+def build_synthetic_dictionary(entry_count: int, seed: int) -> str:
+    """Build a dictionary section of pronounceable pseudo-words."""
+    random_generator = random.Random(seed)
+    consonants = "bcdfgklmnprstvz"
+    vowels = "aeiou"
+
+    def pseudo_word() -> str:
+        syllable_count = random_generator.randint(2, 4)
+        return "".join(
+            random_generator.choice(consonants) + random_generator.choice(vowels)
+            for _ in range(syllable_count)
+        )
+
+    entry_lines = []
+    for entry_index in range(entry_count):
+        if entry_index % 3 == 0:
+            entry_lines.append(f"- {pseudo_word()} {pseudo_word()} = {pseudo_word().upper()}")
+        else:
+            entry_lines.append(f"- {pseudo_word().capitalize()}")
+    return "## Personal Dictionary\n\n### Entries\n" + "\n".join(entry_lines)
+
+
+def simulate_near_miss(phrase: str, random_generator: random.Random) -> str:
+    """Simulate an STT near-miss by splitting a word or doubling a letter."""
+    letters_only = phrase.replace(" ", "")
+    if len(letters_only) >= 6 and " " not in phrase and random_generator.random() < 0.5:
+        split_index = len(phrase) // 2
+        return f"{phrase[:split_index]} {phrase[split_index:]}".lower()
+    position = random_generator.randrange(1, len(phrase))
+    if phrase[position] in string.ascii_letters:
+        return (phrase[:position] + phrase[position] + phrase[position:]).lower()
+    return phrase.lower()
+
+
+def build_probe_transcripts(
+    compiled_dictionary: CompiledDictionary, probe_count: int, seed: int
+) -> list[tuple[str, str]]:
+    """Build (transcript, expected replacement) pairs from dictionary entries."""
+    random_generator = random.Random(seed)
+    probe_targets: list[tuple[str, str]] = []
+    for entry in compiled_dictionary.section.entries:
+        match entry:
+            case DictionaryMapping(spoken_form=spoken_form, written_form=written_form):
+                probe_targets.append((spoken_form, written_form))
+            case DictionaryTerm(term=term) if len(term) >= 5 and term.isascii():
+                probe_targets.append((term, term))
+            case _:
+                pass
+
+    if not probe_targets:
+        return []
+
+    return [
+        (
+            f"{FILLER_SENTENCE} {simulate_near_miss(source, random_generator)} and that was it",
+            expected,
+        )
+        for source, expected in (random_generator.choice(probe_targets) for _ in range(probe_count))
+    ]
+
+
+def false_positive_rate(compiled_dictionary: CompiledDictionary, max_edit_ratio: float) -> float:
+    """Share of the clean transcripts that phonetic matching changes."""
+    changed_count = sum(
+        compiled_dictionary.apply_phonetic_matches(transcript, max_edit_ratio).replacement_count > 0
+        for transcript in CLEAN_TRANSCRIPTS
+    )
+    return changed_count / len(CLEAN_TRANSCRIPTS)
+
+
+def run_benchmark(
+    name: str, section_text: str, probe_count: int, max_edit_ratio: float, seed: int
+) -> None:
+    """Compile one dictionary and report matching latency and corrections."""
+    compile_started_at = time.perf_counter()
+    compiled_dictionary = compile_dictionary_section(section_text)
+    compile_milliseconds = (time.perf_counter() - compile_started_at) * 1000
+
+    probes = build_probe_transcripts(compiled_dictionary, probe_count, seed)
+    latencies_microseconds: list[float] = []
+    corrected_probe_count = 0
+    for transcript, expected in probes:
+        started_at = time.perf_counter()
+        exact_result = compiled_dictionary.apply_exact_mappings(transcript)
+        phonetic_result = compiled_dictionary.apply_phonetic_matches(
+            exact_result.text, max_edit_ratio
+        )
+        latencies_microseconds.append((time.perf_counter() - started_at) * 1_000_000)
+        if expected in phonetic_result.text:
+            corrected_probe_count += 1
+
+    if not latencies_microseconds:
+        print(f"{name:<18} no probe entries")
+        return
+
+    latencies_microseconds.sort()
+    p95_microseconds = latencies_microseconds[int(len(latencies_microseconds) * 0.95) - 1]
+    print(
+        f"{name:<18} entries={len(compiled_dictionary.section.entries):>6} "
+        f"phonetic={len(compiled_dictionary.phonetic_index):>6} "
+        f"compile={compile_milliseconds:>8.1f}ms "
+        f"mean={statistics.mean(latencies_microseconds):>7.1f}us "
+        f"p95={p95_microseconds:>7.1f}us "
+        f"corrected={corrected_probe_count / len(probes):>6.1%} "
+        f"false_positives={false_positive_rate(compiled_dictionary, max_edit_ratio):>6.1%}"
+    )
+
+
+def main(
+    probes: Annotated[int, typer.Option(help="Probe transcripts per dictionary")] = 500,
+    synthetic_entries: Annotated[
+        int, typer.Option(help="Entries in the synthetic large dictionary")
+    ] = 10_000,
+    max_edit_ratio: Annotated[
+        float, typer.Option(help="Phonetic edit-distance threshold")
+    ] = DEFAULT_MAX_EDIT_RATIO,
+    seed: Annotated[int, typer.Option(help="Random seed")] = 7,
+) -> None:
+    """Benchmark exact and phonetic dictionary matching."""
+    for dictionary_path in sorted(EXAMPLES_DIRECTORY.glob("*/tambourine-prompt-dictionary.md")):
+        run_benchmark(
+            dictionary_path.parent.name,
+            load_example_dictionary(dictionary_path),
+            probes,
+            max_edit_ratio,
+            seed,
+        )
+
+    if synthetic_entries:
+        run_benchmark(
+            f"synthetic-{synthetic_entries}",
+            build_synthetic_dictionary(synthetic_entries, seed),
+            probes,
+            max_edit_ratio,
+            seed,
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Benchmark time-to-first-byte and formatting fidelity across prompt profiles.
+
+By default a local stub model is used. Its TTFB grows with the prompt's
+estimated token count at a configurable prefill rate. Its fidelity is rule
+coverage: a fixture counts as formatted when every rule it depends on is still
+stated in the profile's prompt.
+
+Pass --base-url (and --model) to run the same fixtures against any
+OpenAI-compatible endpoint, such as a local Ollama server, and measure real
+streamed TTFB and output similarity.
+
+Usage:
+    python -m benchmarks.prompt_profiles
+    python -m benchmarks.prompt_profiles --prefill-ms-per-1k-tokens 120
+    python -m benchmarks.prompt_profiles --base-url http://localhost:11434/v1 --model llama3.2
+"""
+
+import difflib
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Annotated
+
+import typer
+from openai import OpenAI
+
+from processors.llm import PromptProfile, combine_prompt_sections, estimate_token_count
+
+
+@dataclass(frozen=True)
+class FormattingFixture:
+    """A dictated input, its expected formatting and the prompt rules it depends on."""
+
+    transcript: str
+    expected: str
+    required_rules: tuple[str, ...]
+
+
+FIXTURES: tuple[FormattingFixture, ...] = (
+    FormattingFixture(
+        "um so basically I was like thinking we should uh you know update the readme file",
+        "So basically, I was thinking we should update the readme file.",
+        ("filler",),
+    ),
+    FormattingFixture(
+        "what is the capital of France",
+        "What is the capital of France?",
+        ("question",),
+    ),
+    FormattingFixture(
+        "I can't wait exclamation point let's meet at seven period",
+        "I can't wait! Let's meet at seven.",
+        ("exclamation point", "period"),
+    ),
+    FormattingFixture(
+        "Hello new line world new paragraph bye",
+        "Hello\nworld\n\nbye",
+        ("new line", "new paragraph"),
+    ),
+    FormattingFixture(
+        "I'll bring cookies scratch that brownies",
+        "I'll bring brownies.",
+        ("scratch that",),
+    ),
+    FormattingFixture(
+        "let's do coffee at 2 actually 3",
+        "Let's do coffee at 3.",
+        ("actually",),
+    ),
+    FormattingFixture(
+        "my goals are one finish the report two send the presentation three review feedback",
+        "My goals are:\n1. Finish the report\n2. Send the presentation\n3. Review feedback",
+        ("numbered",),
+    ),
+    FormattingFixture(
+        "I'm not sure dot dot dot maybe we could try something else",
+        "I'm not sure... maybe we could try something else.",
+        ("dot dot dot",),
+    ),
+)
+
+
+def normalize_output(text: str) -> str:
+    """Normalize whitespace and surrounding quotes before comparing outputs."""
+    lines = [" ".join(line.split()) for line in text.strip().strip('"').splitlines()]
+    return "\n".join(lines)
+
+
+def build_system_prompt(profile: PromptProfile) -> str:
+    """Build the default system prompt (all sections enabled) for a profile."""
+    return combine_prompt_sections(
+        main_custom=None,
+        advanced_enabled=True,
+        advanced_custom=None,
+        dictionary_enabled=True,
+        dictionary_custom=None,
+        profile=profile,
+    )
+
+
+def run_stub_profile(
+    profile: PromptProfile, prefill_ms_per_1k_tokens: float, base_ttfb_ms: float
+) -> None:
+    """Report simulated TTFB and rule coverage for one profile."""
+    system_prompt = build_system_prompt(profile)
+    lowercase_prompt = system_prompt.lower()
+    ttfb_milliseconds: list[float] = []
+    covered_fixture_count = 0
+    for fixture in FIXTURES:
+        prompt_tokens = estimate_token_count(system_prompt) + estimate_token_count(
+            fixture.transcript
+        )
+        ttfb_milliseconds.append(base_ttfb_ms + prompt_tokens / 1000 * prefill_ms_per_1k_tokens)
+        if all(rule in lowercase_prompt for rule in fixture.required_rules):
+            covered_fixture_count += 1
+
+    print(
+        f"{profile.value:<6} prompt=~{estimate_token_count(system_prompt):>5} tokens "
+        f"ttfb={statistics.mean(ttfb_milliseconds):>7.1f}ms (simulated) "
+        f"rule coverage={covered_fixture_count / len(FIXTURES):>6.1%}"
+    )
+
+
+def run_endpoint_profile(profile: PromptProfile, client: OpenAI, model: str) -> None:
+    """Report streamed TTFB and output similarity for one profile against a real endpoint."""
+    system_prompt = build_system_prompt(profile)
+    ttfb_milliseconds: list[float] = []
+    similarities: list[float] = []
+    exact_match_count = 0
+    for fixture in FIXTURES:
+        started_at = time.perf_counter()
+        first_token_at: float | None = None
+        output_parts: list[str] = []
+        stream = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": fixture.transcript},
+            ],
+            temperature=0,
+            stream=True,
+        )
+        for chunk in stream:
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            output_parts.append(chunk.choices[0].delta.content)
+        ttfb_milliseconds.append(((first_token_at or time.perf_counter()) - started_at) * 1000)
+
+        output = normalize_output("".join(output_parts))
+        expected = normalize_output(fixture.expected)
+        similarities.append(difflib.SequenceMatcher(None, output, expected).ratio())
+        if output == expected:
+            exact_match_count += 1
+
+    print(
+        f"{profile.value:<6} prompt=~{estimate_token_count(system_prompt):>5} tokens "
+        f"ttfb={statistics.mean(ttfb_milliseconds):>7.1f}ms "
+        f"p50={statistics.median(ttfb_milliseconds):>7.1f}ms "
+        f"similarity={statistics.mean(similarities):>6.1%} "
+        f"exact={exact_match_count}/{len(FIXTURES)}"
+    )
+
+
+def main(
+    prefill_ms_per_1k_tokens: Annotated[
+        float, typer.Option(help="Stub model prefill cost per 1k prompt tokens")
+    ] = 60.0,
+    base_ttfb_ms: Annotated[
+        float, typer.Option(help="Stub model TTFB excluding prefill (network, queueing)")
+    ] = 150.0,
+    base_url: Annotated[
+        str | None, typer.Option(help="OpenAI-compatible endpoint to benchmark instead")
+    ] = None,
+    model: Annotated[str, typer.Option(help="Model name for --base-url")] = "llama3.2",
+    api_key: Annotated[str, typer.Option(help="API key for --base-url")] = "unused",
+) -> None:
+    """Benchmark prompt profiles."""
+    client = OpenAI(base_url=base_url, api_key=api_key) if base_url else None
+    for profile in PromptProfile:
+        if client is None:
+            run_stub_profile(profile, prefill_ms_per_1k_tokens, base_ttfb_ms)
+        else:
+            run_endpoint_profile(profile, client, model)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Benchmark per-request rate-limiter overhead and cross-worker accuracy.
+
+Times one limiter check and increment (what the limiter adds to each
+/api/offer or ICE PATCH request) for:
+- The previous implementation: fixed-window counters in the SQLite state store
+- Sliding windows in the SQLite state store (RATE_LIMIT_BACKEND=state)
+- Sliding windows in shared memory (RATE_LIMIT_BACKEND=shared-memory)
+- The limits library's per-process memory storage, as a lower bound
+
+Then several processes hit one key of the shared-memory counters at once,
+checking that together they accept exactly the limit.
+
+Usage:
+    python -m benchmarks.rate_limiter
+    python -m benchmarks.rate_limiter --requests 50000 --clients 1000 --workers 8
+"""
+
+import multiprocessing
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from limits import parse
+from limits.storage import MemoryStorage
+from limits.strategies import SlidingWindowCounterRateLimiter
+
+from utils.rate_limit_counters import SharedMemoryWindowCounters, StateStoreWindowCounters
+from utils.rate_limiter import RATE_LIMIT_ICE, SharedRateLimitStorage, use_window_counters
+from utils.state_store import SqliteStateStore
+
+RATE_LIMIT_ITEM = parse(RATE_LIMIT_ICE)
+
+
+def run_benchmark(name: str, hit: Callable[[str], bool], requests: int, clients: int) -> None:
+    """Time hits spread over client IPs and print per-request latency."""
+    client_ips = [f"10.0.{index // 256}.{index % 256}" for index in range(clients)]
+    latencies_microseconds: list[float] = []
+    accepted_count = 0
+    for index in range(requests):
+        started_at = time.perf_counter()
+        accepted_count += hit(client_ips[index % clients])
+        latencies_microseconds.append((time.perf_counter() - started_at) * 1_000_000)
+
+    latencies_microseconds.sort()
+    p99_microseconds = latencies_microseconds[int(len(latencies_microseconds) * 0.99) - 1]
+    print(
+        f"{name:<34} mean={statistics.mean(latencies_microseconds):>7.1f}us "
+        f"p99={p99_microseconds:>7.1f}us "
+        f"accepted={accepted_count / requests:>6.1%}"
+    )
+
+
+def hit_shared_key(path: str, attempts: int) -> int:
+    """Hit one key of the shared-memory counters from a worker process."""
+    counters = SharedMemoryWindowCounters(path)
+    accepted_count = sum(
+        counters.acquire("shared-client", RATE_LIMIT_ITEM.amount, RATE_LIMIT_ITEM.get_expiry())
+        for _ in range(attempts)
+    )
+    counters.close()
+    return accepted_count
+
+
+def main(
+    requests: Annotated[int, typer.Option(help="Limiter hits per implementation")] = 20_000,
+    clients: Annotated[
+        int, typer.Option(help="Distinct client IPs the hits are spread over")
+    ] = 200,
+    workers: Annotated[int, typer.Option(help="Processes sharing one client's limit")] = 4,
+) -> None:
+    """Benchmark rate-limiter overhead per request."""
+    with tempfile.TemporaryDirectory() as directory:
+        expiry = RATE_LIMIT_ITEM.get_expiry()
+
+        previous_store = SqliteStateStore(str(Path(directory) / "previous.db"))
+        run_benchmark(
+            "fixed window, sqlite (previous)",
+            lambda ip: (
+                previous_store.increment_counter(f"{RATE_LIMIT_ITEM}/{ip}", expiry)
+                <= RATE_LIMIT_ITEM.amount
+            ),
+            requests,
+            clients,
+        )
+        previous_store.close()
+
+        strategy = SlidingWindowCounterRateLimiter(SharedRateLimitStorage("shared://"))
+        state_store = SqliteStateStore(str(Path(directory) / "state.db"))
+        state_counters = StateStoreWindowCounters(state_store)
+        use_window_counters(state_counters)
+        run_benchmark(
+            "sliding window, sqlite",
+            lambda ip: strategy.hit(RATE_LIMIT_ITEM, ip),
+            requests,
+            clients,
+        )
+        state_counters.close()
+        state_store.close()
+
+        shared_path = str(Path(directory) / "rate_limits")
+        shared_counters = SharedMemoryWindowCounters(shared_path)
+        use_window_counters(shared_counters)
+        run_benchmark(
+            "sliding window, shared memory",
+            lambda ip: strategy.hit(RATE_LIMIT_ITEM, ip),
+            requests,
+            clients,
+        )
+        shared_counters.close()
+
+        memory_strategy = SlidingWindowCounterRateLimiter(MemoryStorage())
+        run_benchmark(
+            "sliding window, per-process memory",
+            lambda ip: memory_strategy.hit(RATE_LIMIT_ITEM, ip),
+            requests,
+            clients,
+        )
+
+        attempts = RATE_LIMIT_ITEM.amount
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            accepted_counts = pool.starmap(hit_shared_key, [(shared_path, attempts)] * workers)
+        print(
+            f"{workers} workers x {attempts} hits on one client: accepted {sum(accepted_counts)} "
+            f"(limit {RATE_LIMIT_ITEM.amount}/{RATE_LIMIT_ITEM.get_expiry()}s)"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Compare per-worker memory of subprocess workers and fork-server workers.
+
+Starts idle workers that have imported the server's modules, once as fresh
+interpreters (python main.py --workers N) and once forked from a preloaded
+fork server (python main.py --workers N --fork-server), then reads each
+worker's memory from /proc/<pid>/smaps_rollup (Linux only):
+- RSS: resident memory, counting pages shared with other processes in full
+- PSS: resident memory with each shared page split between its sharers
+- USS: memory only this worker uses (what each extra worker costs)
+
+The fork server's own memory is reported separately, as it is paid once.
+
+Usage:
+    python -m benchmarks.worker_memory
+    python -m benchmarks.worker_memory --workers 8 --module main
+"""
+
+import gc
+import importlib
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from utils.fork_server import ForkServer
+
+# Imports and idles like a worker that is waiting for clients
+SUBPROCESS_WORKER = (
+    "import gc, importlib, sys, time\n"
+    "for module in sys.argv[1:]:\n"
+    "    importlib.import_module(module)\n"
+    "gc.collect()\n"
+    "time.sleep(3600)\n"
+)
+
+
+def idle_worker(port: int) -> None:
+    """Idle like a forked worker that is waiting for clients."""
+    _ = port
+    gc.collect()
+    time.sleep(3600)
+
+
+def read_memory_mb(pid: int) -> dict[str, float]:
+    """Read a process's RSS, PSS and USS in MB."""
+    fields: dict[str, int] = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, value = line.split(":", 1)
+        fields[name] = int(value.split()[0])
+    return {
+        "rss": fields["Rss"] / 1024,
+        "pss": fields["Pss"] / 1024,
+        "uss": (fields["Private_Clean"] + fields["Private_Dirty"]) / 1024,
+    }
+
+
+def print_report(name: str, pids: list[int]) -> None:
+    """Print the mean per-worker memory of processes and their total PSS."""
+    memories = [read_memory_mb(pid) for pid in pids]
+    means = {key: sum(memory[key] for memory in memories) / len(memories) for key in memories[0]}
+    print(
+        f"{name:<22} per process: rss={means['rss']:>7.1f}MB pss={means['pss']:>7.1f}MB "
+        f"uss={means['uss']:>7.1f}MB | total pss={sum(m['pss'] for m in memories):>8.1f}MB"
+    )
+
+
+def main(
+    workers: Annotated[int, typer.Option(help="Worker processes per mode")] = 4,
+    module: Annotated[
+        list[str] | None,
+        typer.Option(help="Module workers import (repeatable; defaults to main)"),
+    ] = None,
+    settle_secs: Annotated[
+        float, typer.Option(help="Seconds to let workers finish importing")
+    ] = 5.0,
+) -> None:
+    """Report per-worker memory with and without the fork server."""
+    if not Path("/proc/self/smaps_rollup").exists():
+        print("This benchmark reads /proc/<pid>/smaps_rollup, which needs Linux.")
+        raise SystemExit(1)
+    modules = module or ["main"]
+    print(f"{workers} idle workers importing: {', '.join(modules)}")
+
+    processes = [
+        subprocess.Popen([sys.executable, "-c", SUBPROCESS_WORKER, *modules])
+        for _ in range(workers)
+    ]
+    time.sleep(settle_secs)
+    print_report("subprocess workers", [process.pid for process in processes])
+    for process in processes:
+        process.terminate()
+        process.wait()
+
+    for name in modules:
+        importlib.import_module(name)
+    fork_server = ForkServer(idle_worker)
+    fork_server.start()
+    forked_workers = [fork_server.launch(index) for index in range(workers)]
+    time.sleep(settle_secs)
+    print_report("fork-server workers", [worker.pid for worker in forked_workers])
+    if fork_server.pid is not None:
+        print_report("fork server (once)", [fork_server.pid])
+    for worker in forked_workers:
+        worker.terminate()
+        worker.wait()
+    fork_server.close()
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -1,6 +1,6 @@
 """Configuration management for Tambourine server using Pydantic Settings."""
 
-from typing import Self
+from typing import Literal, Self
 
 from loguru import logger
 from pydantic import Field, model_validator
@@ -69,6 +69,16 @@ class Settings(BaseSettings):
     ollama_model: str | None = Field(
         None, description="Ollama model name (e.g., llama3.2, mistral, qwen2.5)"
     )
+    ollama_preload_enabled: bool = Field(
+        True, description="Load the Ollama model and warm its prompt prefix at startup"
+    )
+    ollama_keep_alive: str = Field(
+        "-1",
+        description="How long Ollama keeps the model loaded (e.g., 30m; -1 pins it indefinitely)",
+    )
+    ollama_keep_alive_refresh_secs: float = Field(
+        60.0, ge=0, description="Interval of Ollama keep-alive refreshes (0 to only pin at startup)"
+    )
     openrouter_api_key: str | None = Field(None, description="OpenRouter API key for LLM")
     aws_bedrock_model_id: str | None = Field(
         None, description="AWS Bedrock model ID (required to enable Bedrock)"
@@ -105,6 +115,228 @@ class Settings(BaseSettings):
         None, description="Silero VAD min_volume threshold (0.0 - 1.0)"
     )
 
+    # Personal dictionary matching (applied to transcriptions before the LLM)
+    dictionary_phonetic_matching_enabled: bool = Field(
+        False, description="Rewrite phonetic near-misses of dictionary terms before the LLM"
+    )
+    dictionary_phonetic_max_edit_ratio: float = Field(
+        0.34,
+        ge=0.0,
+        le=1.0,
+        description="Maximum edit distance (relative to term length) for phonetic matches",
+    )
+    dictionary_retrieval_enabled: bool = Field(
+        True,
+        description="Only send dictionary entries relevant to each recording's transcript",
+    )
+    dictionary_prompt_token_budget: int = Field(
+        400,
+        ge=0,
+        description="Maximum estimated tokens of the dictionary section sent per recording",
+    )
+    stt_vocabulary_boost_enabled: bool = Field(
+        True,
+        description=(
+            "Send dictionary terms to STT keyword boosting (Deepgram, AssemblyAI, "
+            "Speechmatics, Azure) and leave them out of the LLM prompt while boosted"
+        ),
+    )
+
+    # Formatting result cache (shared by all clients, so off unless enabled)
+    formatting_cache_enabled: bool = Field(
+        False, description="Reuse LLM formatting results for identical requests across clients"
+    )
+    formatting_cache_max_bytes: int = Field(
+        16 * 1024 * 1024, ge=0, description="Memory cap for cached formatting results"
+    )
+    formatting_cache_ttl_secs: float = Field(
+        3600.0, gt=0.0, description="Seconds a cached formatting result stays valid"
+    )
+    formatting_cache_in_flight_wait_secs: float = Field(
+        15.0,
+        gt=0.0,
+        description="Maximum seconds to wait for an identical in-flight formatting request",
+    )
+
+    # Formatting output guard (bounds runaway LLM responses)
+    formatting_output_guard_enabled: bool = Field(
+        True,
+        description="Size max_tokens from the transcript and fall back to it on runaway output",
+    )
+    formatting_max_output_ratio: float = Field(
+        3.0,
+        gt=1.0,
+        description="Maximum formatted output length as a multiple of the transcript length",
+    )
+    formatting_min_output_tokens: int = Field(
+        64, ge=1, description="Output limit floor for very short transcripts"
+    )
+
+    # Prompt profile (full or lite default prompt sections)
+    llm_prompt_profile: Literal["full", "lite"] | None = Field(
+        None,
+        description="Prompt profile for every provider; unset selects it per provider",
+    )
+
+    # Formatting router (lets already-clean transcripts skip the LLM)
+    formatting_router_enabled: bool = Field(
+        False,
+        description="Send punctuated, confident, filler-free transcripts straight to the client",
+    )
+    formatting_router_min_stt_confidence: float = Field(
+        0.9,
+        ge=0.0,
+        le=1.0,
+        description="Minimum STT confidence for a transcript to skip the LLM",
+    )
+    formatting_router_max_raw_words: int = Field(
+        30, ge=1, description="Transcripts with more words than this always use the LLM"
+    )
+
+    # Incremental formatting of long recordings
+    incremental_formatting_enabled: bool = Field(
+        False,
+        description="Format long recordings segment by segment at natural pauses while recording",
+    )
+    incremental_formatting_min_segment_words: int = Field(
+        25, ge=1, description="Words a segment needs before a pause closes it"
+    )
+
+    # Parallel chunked formatting of long transcripts
+    chunked_formatting_enabled: bool = Field(
+        False,
+        description="Split long unsegmented transcripts into overlapping chunks formatted in parallel",
+    )
+    chunked_formatting_min_words: int = Field(
+        150, ge=1, description="Transcripts with fewer words are formatted in one request"
+    )
+    chunked_formatting_chunk_words: int = Field(
+        80, ge=10, description="Target words per chunk (excluding the overlap)"
+    )
+    chunked_formatting_overlap_words: int = Field(
+        8, ge=0, description="Words of the previous chunk repeated at the start of each chunk"
+    )
+    chunked_formatting_concurrency: int = Field(
+        4, ge=1, description="Maximum chunks of one transcript formatted at once"
+    )
+
+    # Progressive raw delivery (LLM formatting disabled)
+    raw_transcription_progressive_enabled: bool = Field(
+        False,
+        description=(
+            "With LLM formatting disabled, send each final STT segment as it arrives "
+            "instead of the whole transcript after the recording ends"
+        ),
+    )
+
+    # Transcript history for reformatting without re-dictating
+    transcript_history_size: int = Field(
+        5,
+        ge=0,
+        description="Final transcripts kept per client for reformatting (0 disables the history)",
+    )
+
+    # Headless batch transcription of uploaded audio files
+    batch_transcription_max_concurrent_jobs: int = Field(
+        2, ge=1, description="Batch transcription jobs run at once (further uploads wait)"
+    )
+    batch_transcription_max_audio_secs: float = Field(
+        3600.0, gt=0, description="Longest audio file accepted for batch transcription"
+    )
+
+    # Text-only batch formatting (also formats batch transcriptions)
+    batch_formatting_max_concurrency: int = Field(
+        4, ge=1, description="Batch formatting requests in flight to LLM providers at once"
+    )
+    batch_formatting_max_transcripts: int = Field(
+        100, ge=1, description="Most transcripts accepted in one batch formatting request"
+    )
+
+    # Shared state (client registrations, connection owners, rate-limit counters).
+    # A single node keeps it in memory; with WORKER_URL or --workers the defaults
+    # become sqlite and shared-memory (see with_worker_defaults())
+    state_backend: Literal["memory", "sqlite", "redis"] = Field(
+        "memory",
+        description="State backend: memory (single worker, lost on restart), sqlite "
+        "(workers on one host), or redis (any Redis-protocol server)",
+    )
+    state_sqlite_path: str = Field(
+        "tambourine_state.db", description="SQLite database path of the sqlite state backend"
+    )
+    state_redis_url: str = Field(
+        "redis://localhost:6379/0", description="Server URL of the redis state backend"
+    )
+    client_registration_ttl_days: float = Field(
+        90.0, ge=0, description="Unregister client UUIDs not seen for this many days (0: never)"
+    )
+    client_registry_cache_size: int = Field(
+        10000, ge=1, description="Most registered client UUIDs cached in memory"
+    )
+    rate_limit_backend: Literal["memory", "shared-memory", "state"] = Field(
+        "memory",
+        description="Rate-limit counters: memory (this process only), shared-memory (shared "
+        "by the workers on this host) or state (the state backend, for workers on several hosts)",
+    )
+    rate_limit_shared_memory_path: str | None = Field(
+        None,
+        description="File holding shared-memory rate-limit counters (default: "
+        "tambourine_rate_limits in /dev/shm, or the temp directory)",
+    )
+    worker_url: str | None = Field(
+        None,
+        description="URL other workers reach this worker at, to forward requests for the "
+        "clients it hosts (required to run several workers)",
+    )
+    proxy_token: str | None = Field(
+        None,
+        description="Token of the router in front of this node; requests carrying it are "
+        "rate-limited by the client IP the router forwards",
+    )
+
+    # Admission control: WebRTC offers over capacity get 503 with Retry-After
+    admission_max_pipelines: int | None = Field(
+        None, ge=1, description="Most concurrent pipelines per worker (unlimited if unset)"
+    )
+    admission_reserved_pipelines: int = Field(
+        0,
+        ge=0,
+        description="Pipelines of ADMISSION_MAX_PIPELINES kept for reconnecting clients",
+    )
+    admission_max_loop_lag_secs: float | None = Field(
+        None,
+        gt=0,
+        description="Event-loop lag over which new clients are turned away (off if unset)",
+    )
+    admission_max_cpu_percent: float | None = Field(
+        None,
+        gt=0,
+        description="Process CPU (percent of one core) over which new clients are turned away",
+    )
+    admission_retry_after_secs: int = Field(
+        5, ge=1, description="Retry-After of offers turned away for load"
+    )
+    drain_secs: float = Field(
+        0.0,
+        ge=0,
+        description="Seconds to turn new offers away after SIGTERM before shutting down",
+    )
+
+    def with_worker_defaults(self) -> Self:
+        """Get these settings with the shared state defaults of several workers.
+
+        Backends set explicitly are kept; the others default to a SQLite state
+        store and shared-memory rate-limit counters, shared by the workers on
+        this host.
+        """
+        worker_defaults = {"state_backend": "sqlite", "rate_limit_backend": "shared-memory"}
+        return self.model_copy(
+            update={
+                name: value
+                for name, value in worker_defaults.items()
+                if name not in self.model_fields_set
+            }
+        )
+
     @model_validator(mode="after")
     def validate_at_least_one_provider(self) -> Self:
         """Validate that at least one STT and one LLM provider is configured.
@@ -187,3 +419,33 @@ class Settings(BaseSettings):
             )
 
         return self
+
+
+class RouterSettings(BaseSettings):
+    """Settings of the router role, which needs no provider credentials."""
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+        case_sensitive=False,
+    )
+
+    host: str = Field("127.0.0.1", description="Host to bind the router to")
+    port: int = Field(8765, description="Port to listen on")
+    router_backends: str = Field(
+        "", description="Comma-separated base URLs of the backend server nodes"
+    )
+    router_health_interval_secs: float = Field(
+        2.0, gt=0, description="How often the router polls backend node health and load"
+    )
+    proxy_token: str | None = Field(
+        None,
+        description="Token sent with proxied requests so the nodes (configured with the "
+        "same PROXY_TOKEN) rate-limit by the client's IP rather than the router's",
+    )
+
+    @property
+    def backend_urls(self) -> list[str]:
+        """Get the backend node URLs."""
+        return [url.strip() for url in self.router_backends.split(",") if url.strip()]
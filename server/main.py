@@ -7,23 +7,34 @@ processes it through STT and LLM formatting, and returns formatted text.
 Usage:
     python main.py
     python main.py --port 8765
+    python main.py --workers 4
+    python main.py --workers 4 --fork-server
+    python main.py --profile-startup
+    python main.py --role router --backend http://10.0.0.5:8765 --backend http://10.0.0.6:8765
 """
 
 import asyncio
+import contextlib
+import os
 import re
-from collections.abc import Coroutine
+import sys
+import time
+from collections.abc import Awaitable, Callable, Coroutine
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
 from typing import Annotated, Final, cast
 
 import typer
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from loguru import logger
 from pipecat.audio.vad.silero import SileroVADAnalyzer, VADParams
 from pipecat.frames.frames import HeartbeatFrame
+from pipecat.observers.base_observer import BaseObserver
 from pipecat.observers.loggers.user_bot_latency_log_observer import UserBotLatencyLogObserver
 from pipecat.pipeline.llm_switcher import LLMSwitcher
 from pipecat.pipeline.pipeline import Pipeline
@@ -44,12 +55,22 @@ from pipecat.transports.smallwebrtc.transport import SmallWebRTCTransport
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
+from api.batch_api import batch_router, close_batch_llm_services
 from api.config_api import config_router
-from config.settings import Settings
+from config.settings import RouterSettings, Settings
+from processors.chunked_formatting import ChunkingConfig
 from processors.client_manager import ClientConnectionManager
 from processors.configuration import ConfigurationHandler
 from processors.context_manager import DictationContextManager
+from processors.dictionary import DictionaryReplacementProcessor
+from processors.formatting_cache import FormattingCacheProcessorPair, FormattingResultCache
+from processors.formatting_router import FormattingRouter, FormattingRouteThresholds
+from processors.incremental_formatting import IncrementalFormattingPair
+from processors.llm import PromptProfile, prompt_profile_token_counts
 from processors.llm_gate import LLMGateFilter
+from processors.output_guard import FormattingOutputGuardPair
+from processors.recording_jobs import RecordingOutputSequencer
+from processors.transcript_history import TranscriptHistory
 from processors.turn_controller import TurnController
 from protocol.messages import (
     SetLLMProviderMessage,
@@ -60,16 +81,33 @@ from protocol.messages import (
     parse_client_message,
     parse_rtvi_client_message_payload,
 )
+from services.batch_formatting import TranscriptFormatter
+from services.batch_transcription import BatchTranscriber
+from services.ollama_models import OllamaModelManager
 from services.providers import (
     LLMProviderId,
     STTProviderId,
     create_all_available_llm_services,
     create_all_available_stt_services,
+    create_stt_service,
     get_available_llm_providers,
     get_available_stt_providers,
+    get_llm_prompt_profile,
+    get_stt_vocabulary_boost,
+    load_llm_service_classes,
+    load_stt_service_classes,
 )
+from services.stt_vocabulary import STTVocabularyBooster
+from utils.admission_control import AdmissionController, LoadMonitor, format_metrics
+from utils.fork_server import ForkServer
 from utils.logger import configure_logging
-from utils.observers import PipelineLogObserver
+from utils.observers import (
+    FormattingRouteLatencyObserver,
+    InFlightLLMObserver,
+    PipelineLogObserver,
+    RecordingOutputRTVIProcessor,
+)
+from utils.rate_limit_counters import WindowCounters, create_window_counters
 from utils.rate_limiter import (
     RATE_LIMIT_HEALTH,
     RATE_LIMIT_ICE,
@@ -78,6 +116,23 @@ from utils.rate_limiter import (
     RATE_LIMIT_VERIFY,
     get_ip_only,
     limiter,
+    use_window_counters,
+)
+from utils.readiness import DrainingServer, ReadinessReport, ReadinessState, WarmUp, readiness_state
+from utils.signaling_router import create_router_app
+from utils.startup_profile import StartupProfile, time_imports
+from utils.state_store import StateStore, create_state_store
+from utils.worker_routing import (
+    TrustedProxy,
+    WorkerForwarder,
+    find_remote_owner,
+    resolve_proxy_token,
+)
+from utils.worker_supervisor import (
+    WORKER_HEALTH_INTERVAL_SECS,
+    WorkerProcess,
+    WorkerSupervisor,
+    subprocess_launcher,
 )
 
 # ICE servers for WebRTC NAT traversal
@@ -93,6 +148,8 @@ MDNS_CANDIDATE_PATTERN: Final[re.Pattern[str]] = re.compile(
     re.MULTILINE | re.IGNORECASE,
 )
 
+SECONDS_PER_DAY: Final[int] = 86400
+
 # Set to hold background tasks to prevent garbage collection before completion
 _background_tasks: set[asyncio.Task[None]] = set()
 
@@ -156,14 +213,59 @@ class AppServices:
 
     The available_stt_providers and available_llm_providers lists are
     pre-computed at startup since Settings is immutable after initialization.
+
+    The formatting cache is shared by all connections (None when disabled), and
+    batch transcription and formatting requests of all clients share one worker
+    budget each, and one LLM service per provider (created on first use).
+
+    The Ollama model manager (None unless Ollama is available and preloading
+    is enabled) keeps the Ollama model loaded from startup to shutdown.
+
+    Client registrations and connection owners live in the state store, and
+    rate-limit counters in shared window counters, both shared with other
+    workers. The worker forwarder (None for a single worker) forwards requests
+    for clients hosted by other workers.
+
+    The load monitor samples event-loop lag and CPU, which admission control
+    uses to turn away new pipelines over capacity.
+
+    The warm-up tracks the models loaded in the background after startup, and
+    each running pipeline's LLM observer counts its responses in flight, both
+    for /ready.
     """
 
     settings: Settings
     webrtc_handler: SmallWebRTCRequestHandler
     active_pipeline_tasks: set[asyncio.Task[None]]
     client_manager: ClientConnectionManager
+    state_store: StateStore
+    rate_limit_counters: WindowCounters
+    worker_forwarder: WorkerForwarder | None
     available_stt_providers: list[STTProviderId]
     available_llm_providers: list[LLMProviderId]
+    formatting_cache: FormattingResultCache | None
+    transcript_formatter: TranscriptFormatter
+    batch_transcriber: BatchTranscriber
+    batch_llm_services: dict[LLMProviderId, LLMService]
+    ollama_model_manager: OllamaModelManager | None
+    load_monitor: LoadMonitor
+    admission: AdmissionController
+    warm_up: WarmUp
+    llm_observers: set[InFlightLLMObserver]
+
+
+def build_vad_params(settings: Settings) -> VADParams:
+    """Construct VAD params from settings (library defaults for unset values)."""
+    vad_params_kwargs: dict = {}
+    if settings.vad_confidence is not None:
+        vad_params_kwargs["confidence"] = settings.vad_confidence
+    if settings.vad_start_secs is not None:
+        vad_params_kwargs["start_secs"] = settings.vad_start_secs
+    if settings.vad_stop_secs is not None:
+        vad_params_kwargs["stop_secs"] = settings.vad_stop_secs
+    if settings.vad_min_volume is not None:
+        vad_params_kwargs["min_volume"] = settings.vad_min_volume
+    return VADParams(**vad_params_kwargs)
 
 
 async def run_pipeline(
@@ -174,7 +276,14 @@ async def run_pipeline(
     llm_services: dict[LLMProviderId, LLMService],
     context_manager: DictationContextManager,
     turn_controller: TurnController,
+    dictionary_processor: DictionaryReplacementProcessor,
     llm_gate: LLMGateFilter,
+    formatting_cache: FormattingCacheProcessorPair | None,
+    output_guard: FormattingOutputGuardPair | None,
+    formatting_router: FormattingRouter | None,
+    stt_vocabulary_booster: STTVocabularyBooster | None,
+    incremental_formatting: IncrementalFormattingPair | None,
+    transcript_history: TranscriptHistory | None,
 ) -> None:
     """Run the Pipecat pipeline for a single WebRTC connection.
 
@@ -185,6 +294,20 @@ async def run_pipeline(
         llm_services: Pre-created LLM services for this connection
         context_manager: Pre-created context manager for this connection
         turn_controller: Pre-created turn controller for this connection
+        dictionary_processor: Pre-created dictionary replacement processor for this connection
+        llm_gate: Pre-created LLM gate filter for this connection
+        formatting_cache: Pre-created formatting cache processors for this connection,
+            or None when the formatting cache is disabled
+        output_guard: Pre-created output-length guard for this connection,
+            or None when the guard is disabled
+        formatting_router: The LLM gate's formatting router for this connection,
+            or None when routing is disabled
+        stt_vocabulary_booster: Pre-created dictionary keyword booster for this
+            connection, or None when STT vocabulary boosting is disabled
+        incremental_formatting: Pre-created incremental and chunked formatting
+            processors for this connection, or None when both are disabled
+        transcript_history: Pre-created final transcript history for this connection,
+            or None when the history is disabled
     """
     logger.info("Starting pipeline for new WebRTC connection")
 
@@ -194,21 +317,10 @@ async def run_pipeline(
     # Uses defaults from the library when settings are not provided.
     settings = services.settings
 
-    # Construct VAD params from settings and always pass a VADParams object
-    vad_params_kwargs: dict = {}
-    if settings.vad_confidence is not None:
-        vad_params_kwargs["confidence"] = settings.vad_confidence
-    if settings.vad_start_secs is not None:
-        vad_params_kwargs["start_secs"] = settings.vad_start_secs
-    if settings.vad_stop_secs is not None:
-        vad_params_kwargs["stop_secs"] = settings.vad_stop_secs
-    if settings.vad_min_volume is not None:
-        vad_params_kwargs["min_volume"] = settings.vad_min_volume
-
-    vad_params = VADParams(**vad_params_kwargs)
+    vad_params = build_vad_params(settings)
     vad_analyzer = SileroVADAnalyzer(params=vad_params)
 
-    logger.info(f"SileroVADAnalyzer configuration: params={vad_params_kwargs}")
+    logger.info(f"SileroVADAnalyzer configuration: params={vad_params}")
 
     transport = SmallWebRTCTransport(
         webrtc_connection=webrtc_connection,
@@ -230,28 +342,76 @@ async def run_pipeline(
         strategy_type=ServiceSwitcherStrategyManual,
     )
 
+    if stt_vocabulary_booster is not None:
+        # Services connect with the boosted vocabulary when the pipeline starts
+        stt_vocabulary_booster.set_stt_switcher(stt_switcher)
+        await stt_vocabulary_booster.boost(context_manager.compiled_dictionary)
+
     llm_switcher = LLMSwitcher(
         llms=llm_service_list,
         strategy_type=ServiceSwitcherStrategyManual,
     )
+    context_manager.set_llm_switcher(
+        llm_switcher,
+        {
+            service: get_llm_prompt_profile(provider_id)
+            for provider_id, service in llm_services.items()
+        },
+    )
+
+    # Formatting results are cached per active provider/model, and the output guard
+    # sizes each request and holds its response (inside the cache, so aborted
+    # responses are never stored)
+    llm_stage: list[PipecatFrameProcessor] = [llm_switcher]
+    if output_guard is not None:
+        llm_stage = [output_guard.request_sizer(), *llm_stage, output_guard.response_guard()]
+    if formatting_cache is not None:
+        formatting_cache.set_llm_switcher(llm_switcher)
+        llm_stage = [formatting_cache.lookup(), *llm_stage, formatting_cache.store()]
+
+    # Long recordings are formatted per segment while recording and bypass the LLM stage
+    segmenter_stage: list[PipecatFrameProcessor] = []
+    delivery_stage: list[PipecatFrameProcessor] = []
+    if incremental_formatting is not None:
+        incremental_formatting.set_llm_switcher(llm_switcher)
+        segmenter_stage = [incremental_formatting.segmenter()]
+        delivery_stage = [incremental_formatting.delivery()]
+    if transcript_history is not None:
+        transcript_history.set_llm_switcher(llm_switcher)
 
     # Build pipeline - Pipecat 0.0.101+ handles RTVI automatically via task.rtvi
     # The aggregator pair from context_manager collects transcriptions and LLM responses
+    output_sequencer = RecordingOutputSequencer()
     pipeline = Pipeline(
         [
             transport.input(),
             stt_switcher,
             turn_controller,  # Controls turn boundaries, passes transcriptions through
+            dictionary_processor,  # Applies dictionary corrections before the LLM
             llm_gate,  # Gates frames to aggregator based on LLM formatting setting
+            *segmenter_stage,  # Formats long recordings per segment (when enabled)
             context_manager.user_aggregator(),  # Collects transcriptions, emits LLMContextFrame
-            llm_switcher,
+            *llm_stage,  # LLM (wrapped by the output guard and formatting cache when enabled)
+            *delivery_stage,  # Delivers per-segment results (when enabled)
+            output_sequencer,  # Sends results in recording order with their IDs
             context_manager.assistant_aggregator(),  # Collects LLM responses
             transport.output(),
         ]
     )
 
+    llm_observer = InFlightLLMObserver()
+    observers: list[BaseObserver] = [
+        UserBotLatencyLogObserver(),
+        PipelineLogObserver(),
+        llm_observer,
+    ]
+    if formatting_router is not None:
+        observers.append(FormattingRouteLatencyObserver(formatting_router))
+
     # Create pipeline task - RTVI is automatically enabled and accessible via task.rtvi
     # This avoids duplicate RTVIObservers that caused text duplication in 0.0.101
+    # LLM responses are reported to the client only once they leave the LLM stage,
+    # so responses held back by the output guard never reach it
     task = PipelineTask(
         pipeline,
         params=PipelineParams(
@@ -261,10 +421,8 @@ async def run_pipeline(
             enable_heartbeats=True,
         ),
         idle_timeout_frames=(HeartbeatFrame,),
-        observers=[
-            UserBotLatencyLogObserver(),
-            PipelineLogObserver(),
-        ],
+        observers=observers,
+        rtvi_processor=RecordingOutputRTVIProcessor(output_sequencer),
     )
 
     # ConfigurationHandler processes provider switching messages from RTVI client
@@ -299,8 +457,8 @@ async def run_pipeline(
                     f"Start-recording received active app context: {active_app_context_for_recording}"
                 )
                 context_manager.set_active_app_context(active_app_context_for_recording)
-                llm_gate.reset_for_recording()
-                await context_manager.reset_aggregator()
+                # The recording's job (own context, recording ID) travels with its frames;
+                # a previous recording still being formatted is not touched
                 await turn_controller.start_recording()
             case StopRecordingMessage():
                 await turn_controller.stop_recording()
@@ -309,6 +467,12 @@ async def run_pipeline(
             case UnknownClientMessage():
                 pass  # Already logged at debug level in parse_client_message
 
+    if stt_vocabulary_booster is not None:
+
+        @task.event_handler("on_pipeline_started")
+        async def on_pipeline_started(_task: PipelineTask, _frame: object) -> None:
+            stt_vocabulary_booster.set_pipeline_started()
+
     # Set up event handlers
     @transport.event_handler("on_client_connected")
     async def on_client_connected(_transport: object, client: object) -> None:
@@ -321,7 +485,11 @@ async def run_pipeline(
 
     # Run the pipeline
     runner = PipelineRunner(handle_sigint=False)
-    await runner.run(task)
+    services.llm_observers.add(llm_observer)
+    try:
+        await runner.run(task)
+    finally:
+        services.llm_observers.discard(llm_observer)
 
 
 def initialize_services(settings: Settings) -> AppServices | None:
@@ -337,8 +505,9 @@ def initialize_services(settings: Settings) -> AppServices | None:
     Returns:
         AppServices instance if successful, None otherwise
     """
-    available_stt = get_available_stt_providers(settings)
-    available_llm = get_available_llm_providers(settings)
+    # Import the configured providers' SDKs now rather than on the first connection
+    available_stt = load_stt_service_classes(get_available_stt_providers(settings))
+    available_llm = load_llm_service_classes(get_available_llm_providers(settings))
 
     if not available_stt:
         logger.error("No STT providers available. Configure at least one STT API key.")
@@ -350,29 +519,195 @@ def initialize_services(settings: Settings) -> AppServices | None:
 
     logger.info(f"Available STT providers: {[p.value for p in available_stt]}")
     logger.info(f"Available LLM providers: {[p.value for p in available_llm]}")
+    for profile in PromptProfile:
+        logger.info(
+            f"Prompt profile {profile.value} default sections (~tokens): "
+            f"{prompt_profile_token_counts(profile)}"
+        )
+
+    if settings.worker_url is not None:
+        # One of several workers: share state with the others unless told otherwise
+        settings = settings.with_worker_defaults()
+    state_store = create_state_store(settings)
+    rate_limit_counters = create_window_counters(settings, state_store)
+    use_window_counters(rate_limit_counters)
+    TrustedProxy.token = resolve_proxy_token(settings.proxy_token, state_store)
+    if settings.worker_url is not None and settings.state_backend == "memory":
+        logger.warning(
+            "WORKER_URL is set but STATE_BACKEND is memory: other workers cannot see this "
+            "worker's clients (use sqlite or redis)"
+        )
+
+    formatting_cache = (
+        FormattingResultCache(
+            max_bytes=settings.formatting_cache_max_bytes,
+            ttl_secs=settings.formatting_cache_ttl_secs,
+        )
+        if settings.formatting_cache_enabled
+        else None
+    )
+
+    transcript_formatter = TranscriptFormatter(
+        max_concurrency=settings.batch_formatting_max_concurrency,
+        max_output_ratio=settings.formatting_max_output_ratio,
+        min_output_tokens=settings.formatting_min_output_tokens,
+    )
+
+    ollama_model_manager = (
+        OllamaModelManager(
+            base_url=settings.ollama_base_url,
+            model=settings.ollama_model,
+            keep_alive=settings.ollama_keep_alive,
+            refresh_interval_secs=settings.ollama_keep_alive_refresh_secs,
+        )
+        if LLMProviderId.OLLAMA in available_llm
+        and settings.ollama_preload_enabled
+        and settings.ollama_model
+        else None
+    )
+
+    load_monitor = LoadMonitor()
+    try:
+        admission = AdmissionController(
+            load_monitor,
+            max_pipelines=settings.admission_max_pipelines,
+            reserved_pipelines=settings.admission_reserved_pipelines,
+            max_loop_lag_secs=settings.admission_max_loop_lag_secs,
+            max_cpu_percent=settings.admission_max_cpu_percent,
+        )
+    except ValueError as e:
+        logger.error(f"Invalid admission control settings: {e}")
+        return None
+
+    warm_up_components = ["vad"]
+    if STTProviderId.WHISPER in available_stt:
+        warm_up_components.append("whisper")
+    if ollama_model_manager is not None:
+        warm_up_components.append("ollama")
 
     return AppServices(
         settings=settings,
         webrtc_handler=SmallWebRTCRequestHandler(ice_servers=ICE_SERVERS),
         active_pipeline_tasks=set(),
-        client_manager=ClientConnectionManager(),
+        client_manager=ClientConnectionManager(
+            state_store,
+            worker_url=settings.worker_url,
+            registration_ttl_secs=(
+                settings.client_registration_ttl_days * SECONDS_PER_DAY
+                if settings.client_registration_ttl_days > 0
+                else None
+            ),
+            registry_cache_size=settings.client_registry_cache_size,
+        ),
+        state_store=state_store,
+        rate_limit_counters=rate_limit_counters,
+        worker_forwarder=(
+            WorkerForwarder(state_store) if settings.worker_url is not None else None
+        ),
         available_stt_providers=available_stt,
         available_llm_providers=available_llm,
+        formatting_cache=formatting_cache,
+        transcript_formatter=transcript_formatter,
+        batch_transcriber=BatchTranscriber(
+            settings, build_vad_params(settings), transcript_formatter
+        ),
+        batch_llm_services={},
+        ollama_model_manager=ollama_model_manager,
+        load_monitor=load_monitor,
+        admission=admission,
+        warm_up=WarmUp(warm_up_components),
+        llm_observers=set(),
     )
 
 
+def default_system_prompt(settings: Settings, provider_id: LLMProviderId) -> str:
+    """Get the system prompt of a new client (default sections) using an LLM provider."""
+    return DictationContextManager(
+        dictionary_prompt_token_budget=(
+            settings.dictionary_prompt_token_budget
+            if settings.dictionary_retrieval_enabled
+            else None
+        ),
+        prompt_profile=(
+            PromptProfile(settings.llm_prompt_profile)
+            if settings.llm_prompt_profile is not None
+            else get_llm_prompt_profile(provider_id)
+        ),
+    ).system_prompt
+
+
+async def warm_up(services: AppServices) -> None:
+    """Load the VAD and Whisper models and the Ollama model after startup.
+
+    Runs in the background while the server already answers /health, with
+    /ready reporting not ready until every component has loaded or failed
+    (failed ones load on first use instead).
+    """
+    settings = services.settings
+
+    async def warm(component: str, load: Awaitable[object]) -> None:
+        try:
+            await load
+        except Exception as e:
+            services.warm_up.mark_failed(component, e)
+        else:
+            services.warm_up.mark_warm(component)
+
+    # The first Silero model of a process also initializes ONNX Runtime
+    loads = [
+        warm(
+            "vad",
+            asyncio.to_thread(lambda: SileroVADAnalyzer(params=build_vad_params(settings))),
+        )
+    ]
+    # Loads the model every connection's Whisper service shares
+    if STTProviderId.WHISPER in services.available_stt_providers:
+        loads.append(
+            warm(
+                "whisper",
+                asyncio.to_thread(create_stt_service, STTProviderId.WHISPER, settings),
+            )
+        )
+    if services.ollama_model_manager is not None:
+        loads.append(
+            warm(
+                "ollama",
+                services.ollama_model_manager.start(
+                    default_system_prompt(settings, LLMProviderId.OLLAMA)
+                ),
+            )
+        )
+    await asyncio.gather(*loads)
+    logger.success("Warm-up complete")
+
+
 @asynccontextmanager
 async def lifespan(fastapi_app: FastAPI):  # noqa: ANN201
-    """FastAPI lifespan context manager for cleanup."""
+    """FastAPI lifespan context manager for startup warmup and cleanup."""
+    # Get services from app state (may not exist if startup failed)
+    services: AppServices | None = getattr(fastapi_app.state, "services", None)
+    warm_up_task: asyncio.Task[None] | None = None
+    if services is not None:
+        services.load_monitor.start()
+        warm_up_task = asyncio.create_task(warm_up(services))
+
     yield
     logger.info("Shutting down server...")
 
-    # Get services from app state (may not exist if startup failed)
-    services: AppServices | None = getattr(fastapi_app.state, "services", None)
     if services is None:
         logger.warning("Services not initialized, skipping cleanup")
         return
 
+    # Not ready from here on, and no new pipelines
+    services.admission.drain()
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await warm_up_task
+    await services.load_monitor.stop()
+    if services.ollama_model_manager is not None:
+        await services.ollama_model_manager.stop()
+
     # Cancel all active pipeline tasks for graceful shutdown
     if services.active_pipeline_tasks:
         logger.info(f"Cancelling {len(services.active_pipeline_tasks)} active pipeline tasks...")
@@ -388,6 +723,11 @@ async def lifespan(fastapi_app: FastAPI):  # noqa: ANN201
 
     # SmallWebRTCRequestHandler manages all connections - close them cleanly
     await services.webrtc_handler.close()
+    await close_batch_llm_services(services)
+    if services.worker_forwarder is not None:
+        await services.worker_forwarder.close()
+    services.rate_limit_counters.close()
+    services.state_store.close()
     logger.success("All connections cleaned up")
 
 
@@ -424,8 +764,24 @@ async def global_exception_handler(request: Request, exc: Exception) -> JSONResp
     )
 
 
-# Include config routes
+@app.middleware("http")
+async def forward_to_owning_worker(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Forward requests for a client hosted by another worker to that worker."""
+    services: AppServices | None = getattr(request.app.state, "services", None)
+    if services is not None and services.worker_forwarder is not None:
+        owner_url = await find_remote_owner(request, services.client_manager)
+        if owner_url is not None:
+            response = await services.worker_forwarder.forward(request, owner_url)
+            if response is not None:
+                return response
+    return await call_next(request)
+
+
+# Include config and batch routes
 app.include_router(config_router)
+app.include_router(batch_router)
 
 
 @app.get("/health")
@@ -435,6 +791,45 @@ async def health_check(request: Request) -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/ready")
+@limiter.limit(RATE_LIMIT_HEALTH, key_func=get_ip_only)
+async def readiness_check(request: Request) -> JSONResponse:
+    """Readiness check for load balancers (see utils.readiness).
+
+    Answers 503 while warming up or draining and 200 otherwise, with this
+    worker's load and capacity score, which routers use to place new clients
+    (see utils.signaling_router).
+    """
+    services: AppServices = request.app.state.services
+    active_pipelines = len(services.active_pipeline_tasks)
+    load = services.admission.load()
+    state = readiness_state(services.warm_up, draining=services.admission.draining)
+    report = ReadinessReport(
+        state=state,
+        warm_up=services.warm_up.states(),
+        active_pipelines=active_pipelines,
+        in_flight_llm_calls=sum(observer.in_flight for observer in services.llm_observers),
+        loop_lag_secs=load.loop_lag_secs,
+        cpu_percent=load.cpu_percent,
+        cpu_secs=time.process_time(),
+        capacity=(
+            services.admission.capacity(active_pipelines) if state == ReadinessState.READY else 0.0
+        ),
+    )
+    return JSONResponse(status_code=200 if report.is_ready else 503, content=report.to_dict())
+
+
+@app.get("/metrics")
+@limiter.limit(RATE_LIMIT_HEALTH, key_func=get_ip_only)
+async def metrics(request: Request) -> Response:
+    """Admission decisions and load in the Prometheus text format."""
+    services: AppServices = request.app.state.services
+    return Response(
+        format_metrics(services.admission, len(services.active_pipeline_tasks)),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 # =============================================================================
 # Client Registration Endpoints
 # =============================================================================
@@ -454,7 +849,7 @@ async def register_client(request: Request) -> dict[str, str]:
         A dictionary containing the newly generated UUID.
     """
     services: AppServices = request.app.state.services
-    client_uuid = services.client_manager.generate_and_register_uuid()
+    client_uuid = await services.client_manager.generate_and_register_uuid()
     logger.success(f"Registered new client: {client_uuid}")
     return {"uuid": client_uuid}
 
@@ -473,7 +868,7 @@ async def verify_client(client_uuid: str, request: Request) -> dict[str, bool]:
         A dictionary with 'registered' boolean indicating if UUID is valid.
     """
     services: AppServices = request.app.state.services
-    is_registered = services.client_manager.is_registered(client_uuid)
+    is_registered = await services.client_manager.is_registered(client_uuid)
     return {"registered": is_registered}
 
 
@@ -522,35 +917,35 @@ async def webrtc_offer(
         )
 
     # Validate UUID is registered
-    if not services.client_manager.is_registered(client_uuid):
+    if not await services.client_manager.is_registered(client_uuid):
         logger.warning(f"Rejected unregistered client UUID: {client_uuid}")
         raise HTTPException(
             status_code=401,
             detail="Unregistered client UUID. Please register first.",
         )
 
-    # Handle existing connection with same UUID (one client = one connection)
-    # 1. Synchronously remove old connection from tracking (frees UUID slot immediately)
-    # 2. Clean up old connection in background (non-blocking)
-    # This avoids the race condition where background cleanup accidentally kills new connection
-    old_connection = services.client_manager.take_existing_connection(client_uuid)
-    if old_connection:
-        create_background_task(services.client_manager.cleanup_connection(old_connection))
-    logger.info(f"Client connecting with UUID: {client_uuid}")
-
-    # Filter mDNS candidates from SDP to prevent aioice resolution issues.
-    # See filter_mdns_candidates_from_sdp() docstring for details.
-    filtered_sdp = filter_mdns_candidates_from_sdp(webrtc_request.sdp)
-    if filtered_sdp != webrtc_request.sdp:
-        logger.info("Filtered mDNS candidates from SDP offer")
-        webrtc_request = SmallWebRTCRequest(
-            sdp=filtered_sdp,
-            type=webrtc_request.type,
-            pc_id=webrtc_request.pc_id,
-            restart_pc=webrtc_request.restart_pc,
-            request_data=webrtc_request.request_data,
+    # Turn the offer away over capacity, before touching the client's existing connection
+    admission = services.admission.check(
+        client_uuid,
+        len(services.active_pipeline_tasks),
+        has_pipeline=services.client_manager.get_connection(client_uuid) is not None,
+    )
+    if not admission.admitted:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Server over capacity ({admission.reason.value}). Please retry later.",
+            headers={"Retry-After": str(services.settings.admission_retry_after_secs)},
         )
 
+    # The admitted offer holds a pipeline slot until its pipeline task is registered
+    holds_admission = True
+
+    def release_admission() -> None:
+        nonlocal holds_admission
+        if holds_admission:
+            holds_admission = False
+            services.admission.release()
+
     async def connection_callback(connection: SmallWebRTCConnection) -> None:
         """Callback invoked when connection is ready - spawns the pipeline."""
         # Create fresh service instances for this connection to ensure isolation
@@ -569,9 +964,110 @@ async def webrtc_offer(
 
         # Create pipeline processors
         # DictationContextManager wraps LLMContextAggregatorPair with dictation-specific features
-        context_manager = DictationContextManager()
+        context_manager = DictationContextManager(
+            dictionary_prompt_token_budget=(
+                services.settings.dictionary_prompt_token_budget
+                if services.settings.dictionary_retrieval_enabled
+                else None
+            ),
+            prompt_profile=(
+                PromptProfile(services.settings.llm_prompt_profile)
+                if services.settings.llm_prompt_profile is not None
+                else None
+            ),
+        )
+        stt_vocabulary_booster = (
+            STTVocabularyBooster(
+                {
+                    service: boost
+                    for provider_id, service in stt_services.items()
+                    if (boost := get_stt_vocabulary_boost(provider_id)) is not None
+                }
+            )
+            if services.settings.stt_vocabulary_boost_enabled
+            else None
+        )
+        if stt_vocabulary_booster is not None:
+            context_manager.set_stt_vocabulary_booster(stt_vocabulary_booster)
         turn_controller = TurnController()
-        llm_gate = LLMGateFilter()
+        transcript_history = (
+            TranscriptHistory(
+                context_manager,
+                max_transcripts=services.settings.transcript_history_size,
+                max_output_ratio=services.settings.formatting_max_output_ratio,
+                min_output_tokens=services.settings.formatting_min_output_tokens,
+            )
+            if services.settings.transcript_history_size > 0
+            else None
+        )
+        dictionary_processor = DictionaryReplacementProcessor(
+            context_manager=context_manager,
+            phonetic_max_edit_ratio=(
+                services.settings.dictionary_phonetic_max_edit_ratio
+                if services.settings.dictionary_phonetic_matching_enabled
+                else None
+            ),
+            transcript_history=transcript_history,
+        )
+        formatting_router = (
+            FormattingRouter(
+                FormattingRouteThresholds(
+                    min_stt_confidence=services.settings.formatting_router_min_stt_confidence,
+                    max_raw_words=services.settings.formatting_router_max_raw_words,
+                )
+            )
+            if services.settings.formatting_router_enabled
+            else None
+        )
+        llm_gate = LLMGateFilter(
+            formatting_router=formatting_router,
+            progressive_raw_delivery=services.settings.raw_transcription_progressive_enabled,
+        )
+        formatting_cache = (
+            FormattingCacheProcessorPair(
+                services.formatting_cache,
+                in_flight_wait_secs=services.settings.formatting_cache_in_flight_wait_secs,
+                client_uuid=client_uuid,
+                enabled=not await services.client_manager.is_formatting_cache_opted_out(
+                    client_uuid
+                ),
+            )
+            if services.formatting_cache is not None
+            else None
+        )
+        output_guard = (
+            FormattingOutputGuardPair(
+                max_output_ratio=services.settings.formatting_max_output_ratio,
+                min_output_tokens=services.settings.formatting_min_output_tokens,
+            )
+            if services.settings.formatting_output_guard_enabled
+            else None
+        )
+        chunking = (
+            ChunkingConfig(
+                min_words=services.settings.chunked_formatting_min_words,
+                chunk_words=services.settings.chunked_formatting_chunk_words,
+                overlap_words=services.settings.chunked_formatting_overlap_words,
+                concurrency=services.settings.chunked_formatting_concurrency,
+            )
+            if services.settings.chunked_formatting_enabled
+            else None
+        )
+        incremental_formatting = (
+            IncrementalFormattingPair(
+                context_manager,
+                min_segment_words=(
+                    services.settings.incremental_formatting_min_segment_words
+                    if services.settings.incremental_formatting_enabled
+                    else None
+                ),
+                max_output_ratio=services.settings.formatting_max_output_ratio,
+                min_output_tokens=services.settings.formatting_min_output_tokens,
+                chunking=chunking,
+            )
+            if services.settings.incremental_formatting_enabled or chunking is not None
+            else None
+        )
         # Wire up turn controller to context manager for context reset coordination
         turn_controller.set_context_manager(context_manager)
 
@@ -583,28 +1079,66 @@ async def webrtc_offer(
                 llm_services=llm_services,
                 context_manager=context_manager,
                 turn_controller=turn_controller,
+                dictionary_processor=dictionary_processor,
                 llm_gate=llm_gate,
+                formatting_cache=formatting_cache,
+                output_guard=output_guard,
+                formatting_router=formatting_router,
+                stt_vocabulary_booster=stt_vocabulary_booster,
+                incremental_formatting=incremental_formatting,
+                transcript_history=transcript_history,
             )
         )
         services.active_pipeline_tasks.add(task)
+        release_admission()
         task.add_done_callback(services.active_pipeline_tasks.discard)
+        task.add_done_callback(lambda _: services.admission.note_disconnected(client_uuid))
 
         # Track connection by UUID with component references for HTTP API access
-        services.client_manager.register_connection(
+        await services.client_manager.register_connection(
             client_uuid,
             connection,
             task,
             context_manager=context_manager,
             turn_controller=turn_controller,
             llm_gate=llm_gate,
+            formatting_cache=formatting_cache,
             stt_services=stt_services,
             llm_services=llm_services,
+            stt_vocabulary_booster=stt_vocabulary_booster,
+            transcript_history=transcript_history,
         )
 
-    answer = await services.webrtc_handler.handle_web_request(
-        request=webrtc_request,
-        webrtc_connection_callback=connection_callback,
-    )
+    try:
+        # Handle existing connection with same UUID (one client = one connection)
+        # 1. Remove old connection from tracking first (frees UUID slot immediately)
+        # 2. Clean up old connection in background (non-blocking)
+        # This avoids the race condition where background cleanup accidentally kills new connection
+        old_connection = await services.client_manager.take_existing_connection(client_uuid)
+        if old_connection:
+            create_background_task(services.client_manager.cleanup_connection(old_connection))
+        logger.info(f"Client connecting with UUID: {client_uuid}")
+
+        # Filter mDNS candidates from SDP to prevent aioice resolution issues.
+        # See filter_mdns_candidates_from_sdp() docstring for details.
+        filtered_sdp = filter_mdns_candidates_from_sdp(webrtc_request.sdp)
+        if filtered_sdp != webrtc_request.sdp:
+            logger.info("Filtered mDNS candidates from SDP offer")
+            webrtc_request = SmallWebRTCRequest(
+                sdp=filtered_sdp,
+                type=webrtc_request.type,
+                pc_id=webrtc_request.pc_id,
+                restart_pc=webrtc_request.restart_pc,
+                request_data=webrtc_request.request_data,
+            )
+
+        answer = await services.webrtc_handler.handle_web_request(
+            request=webrtc_request,
+            webrtc_connection_callback=connection_callback,
+        )
+    finally:
+        # Failed offers (and renegotiations, which start no pipeline) give their slot back
+        release_admission()
 
     return answer
 
@@ -649,14 +1183,227 @@ async def webrtc_ice_candidate(
     return {"status": "success"}
 
 
+class ServerRole(StrEnum):
+    """What a server process does."""
+
+    SERVER = "server"  # Hosts client pipelines
+    ROUTER = "router"  # Routes client requests to server nodes
+
+
+def run_router(
+    host: str | None, port: int | None, backend_urls: list[str] | None, verbose: bool
+) -> None:
+    """Run the router role, proxying client requests to backend server nodes."""
+    try:
+        settings = RouterSettings()
+    except Exception as e:
+        print(f"Configuration error: {e}")
+        raise SystemExit(1) from e
+    effective_backend_urls = backend_urls or settings.backend_urls
+    if not effective_backend_urls:
+        print("The router needs backend nodes: pass --backend or set ROUTER_BACKENDS.")
+        raise SystemExit(1)
+
+    configure_logging("DEBUG" if verbose else None)
+    effective_host = host or settings.host
+    effective_port = port or settings.port
+    logger.success(f"Tambourine Router on http://{effective_host}:{effective_port}")
+    logger.info(f"Backend nodes: {', '.join(effective_backend_urls)}")
+    uvicorn.run(
+        create_router_app(
+            effective_backend_urls,
+            settings.router_health_interval_secs,
+            proxy_token=settings.proxy_token,
+        ),
+        host=effective_host,
+        port=effective_port,
+        log_level="warning",
+    )
+
+
+def preload_workers(settings: Settings) -> None:
+    """Import the configured providers and fetch model files in the fork server."""
+    load_stt_service_classes(get_available_stt_providers(settings))
+    load_llm_service_classes(get_available_llm_providers(settings))
+    if settings.whisper_enabled:
+        from services.whisper_stt import DEFAULT_WHISPER_MODEL, fetch_whisper_model_files
+
+        try:
+            fetch_whisper_model_files(settings.whisper_model or DEFAULT_WHISPER_MODEL)
+        except Exception as e:
+            logger.warning(f"Could not fetch the Whisper model files: {e}")
+
+
+def run_worker(port: int) -> None:
+    """Run a forked pipeline worker, reading WORKER_URL from its environment."""
+    run_server(Settings(), "127.0.0.1", port)
+
+
+def run_supervisor(
+    settings: Settings,
+    host: str,
+    port: int,
+    worker_count: int,
+    verbose: bool,
+    use_fork_server: bool,
+) -> None:
+    """Run the signaling front end over worker processes hosting the pipelines."""
+    settings = settings.with_worker_defaults()
+    if settings.state_backend == "memory":
+        logger.error("--workers needs a shared state backend (STATE_BACKEND=sqlite or redis)")
+        raise SystemExit(1)
+
+    fork_server: ForkServer | None = None
+    launch_worker: Callable[[int], WorkerProcess]
+    if use_fork_server:
+        if not hasattr(os, "fork"):
+            logger.error("--fork-server needs os.fork, which this platform does not have")
+            raise SystemExit(1)
+        # Forked before the supervisor and front end start any thread
+        fork_server = ForkServer(run_worker, preload=lambda: preload_workers(settings))
+        fork_server.start()
+        launch_worker = fork_server.launch
+    else:
+        launch_worker = subprocess_launcher(
+            [sys.executable, __file__, *(["--verbose"] if verbose else [])]
+        )
+    # The workers trust the client IP the front end forwards with their shared proxy token
+    state_store = create_state_store(settings)
+    try:
+        proxy_token = resolve_proxy_token(settings.proxy_token, state_store)
+    finally:
+        state_store.close()
+
+    supervisor = WorkerSupervisor(launch_worker, worker_count, first_port=port + 1)
+    supervisor.start()
+    logger.success(f"Tambourine Server front end on http://{host}:{port}")
+    logger.info(f"Pipeline workers: {', '.join(supervisor.worker_urls)}")
+    front_end = create_router_app(
+        supervisor.worker_urls,
+        WORKER_HEALTH_INTERVAL_SECS,
+        place_offers_by_load=True,
+        proxy_token=proxy_token,
+    )
+    try:
+        # Drains on SIGTERM (with /ready reporting it) before stopping the workers
+        DrainingServer(
+            uvicorn.Config(front_end, host=host, port=port, log_level="warning"),
+            drain_secs=settings.drain_secs,
+            on_drain=front_end.state.router.drain,
+        ).run()
+    finally:
+        supervisor.stop()
+        if fork_server is not None:
+            fork_server.close()
+
+
+# What a server process imports before serving: main.py, then its configured providers
+STARTUP_IMPORTS: Final[str] = """
+import main
+from config.settings import Settings
+from services.providers import (
+    get_available_llm_providers,
+    get_available_stt_providers,
+    load_llm_service_classes,
+    load_stt_service_classes,
+)
+settings = Settings()
+load_stt_service_classes(get_available_stt_providers(settings))
+load_llm_service_classes(get_available_llm_providers(settings))
+"""
+
+
+async def _time_app_startup() -> float:
+    """Run the app's startup and shutdown, timing its startup."""
+    started_at = time.perf_counter()
+    async with lifespan(app):
+        return time.perf_counter() - started_at
+
+
+def run_startup_profile(settings: Settings) -> None:
+    """Report per-module import times and time to ready, then exit."""
+    logger.info("Profiling startup (timing imports in a fresh interpreter)...")
+    profile = StartupProfile()
+    import_secs, profile.module_import_times = time_imports(STARTUP_IMPORTS, Path(__file__).parent)
+    profile.phase_secs["interpreter start and imports"] = import_secs
+
+    # The providers' imports were timed above; import them here untimed
+    load_stt_service_classes(get_available_stt_providers(settings))
+    load_llm_service_classes(get_available_llm_providers(settings))
+    started_at = time.perf_counter()
+    services = initialize_services(settings)
+    if services is None:
+        raise SystemExit(1)
+    app.state.services = services
+    profile.phase_secs["service initialization"] = time.perf_counter() - started_at
+    profile.phase_secs["app startup"] = asyncio.run(_time_app_startup())
+
+    logger.info(f"Startup profile:\n{profile.format_report()}")
+
+
+def run_server(settings: Settings, host: str, port: int) -> None:
+    """Run a server process hosting client pipelines."""
+    # Initialize services and store on app.state
+    services = initialize_services(settings)
+    if services is None:
+        raise SystemExit(1)
+    app.state.services = services
+
+    logger.info("=" * 60)
+    logger.success("Tambourine Server Ready!")
+    logger.info("=" * 60)
+    logger.info(f"Server endpoint: http://{host}:{port}")
+    logger.info(f"WebRTC offer endpoint: http://{host}:{port}/api/offer")
+    logger.info(f"Config API endpoint: http://{host}:{port}/api/*")
+    logger.info("Waiting for Tauri client connection...")
+    logger.info("Press Ctrl+C to stop")
+    logger.info("=" * 60)
+
+    # Run the server, draining on SIGTERM before shutting down
+    server = DrainingServer(
+        uvicorn.Config(app, host=host, port=port, log_level="warning"),
+        drain_secs=settings.drain_secs,
+        on_drain=services.admission.drain,
+    )
+    server.run()
+
+
 def main(
     host: Annotated[str | None, typer.Option(help="Host to bind to")] = None,
     port: Annotated[int | None, typer.Option(help="Port to listen on")] = None,
     verbose: Annotated[
         bool, typer.Option("-v", "--verbose", help="Enable verbose logging")
     ] = False,
+    role: Annotated[
+        ServerRole, typer.Option(help="server hosts pipelines; router routes to server nodes")
+    ] = ServerRole.SERVER,
+    backend: Annotated[
+        list[str] | None,
+        typer.Option(help="Backend server node URL for the router role (repeatable)"),
+    ] = None,
+    workers: Annotated[
+        int,
+        typer.Option(
+            min=1,
+            help="Pipeline worker processes behind this front end (ports after --port)",
+        ),
+    ] = 1,
+    fork_server: Annotated[
+        bool,
+        typer.Option(
+            help="Fork --workers from one preloaded process so they share its memory (POSIX)",
+        ),
+    ] = False,
+    profile_startup: Annotated[
+        bool,
+        typer.Option(help="Report per-module import times and time to ready, then exit"),
+    ] = False,
 ) -> None:
     """Tambourine Server - Voice dictation with AI cleanup."""
+    if role == ServerRole.ROUTER:
+        run_router(host, port, backend, verbose)
+        return
+
     # Load settings first so we can use them as defaults
     try:
         settings = Settings()
@@ -677,29 +1424,15 @@ def main(
     if verbose:
         logger.debug("Verbose logging enabled")
 
-    # Initialize services and store on app.state
-    services = initialize_services(settings)
-    if services is None:
-        raise SystemExit(1)
-    app.state.services = services
+    if profile_startup:
+        run_startup_profile(settings)
+        return
 
-    logger.info("=" * 60)
-    logger.success("Tambourine Server Ready!")
-    logger.info("=" * 60)
-    logger.info(f"Server endpoint: http://{effective_host}:{effective_port}")
-    logger.info(f"WebRTC offer endpoint: http://{effective_host}:{effective_port}/api/offer")
-    logger.info(f"Config API endpoint: http://{effective_host}:{effective_port}/api/*")
-    logger.info("Waiting for Tauri client connection...")
-    logger.info("Press Ctrl+C to stop")
-    logger.info("=" * 60)
+    if workers > 1:
+        run_supervisor(settings, effective_host, effective_port, workers, verbose, fork_server)
+        return
 
-    # Run the server
-    uvicorn.run(
-        app,
-        host=effective_host,
-        port=effective_port,
-        log_level="warning",
-    )
+    run_server(settings, effective_host, effective_port)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+"""Splitting long transcripts into overlapping chunks that are formatted in parallel.
+
+When a recording could not be formatted incrementally (no pause closed a
+segment, e.g. because the STT provider only finalizes at stop), a long final
+transcript would go to the LLM as one request whose output time grows with
+its length. Instead, IncrementalFormattingPair splits it into chunks at STT
+finalization (pause) and sentence boundaries, formats the chunks
+concurrently, and stitches them back together.
+
+Each chunk after the first repeats the last words of the previous chunk, so
+the LLM sees where a sentence it continues began. The formatted overlap is
+removed again when stitching by aligning the end of the previous formatted
+chunk with the start of the next one.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Final
+
+from utils.logger import logger
+
+SENTENCE_BOUNDARY_PATTERN: Final[re.Pattern[str]] = re.compile(r"(?<=[.!?])\s+")
+WORD_TOKEN_PATTERN: Final[re.Pattern[str]] = re.compile(r"[^\W_]+")
+
+# Formatting may add or drop a few words around the overlap (fillers, contractions)
+OVERLAP_SLACK_WORDS: Final[int] = 3
+
+# Punctuation left at the start of a chunk once its overlap is removed
+LEADING_PUNCTUATION: Final[str] = " \t,;:.!?"
+
+
+@dataclass(frozen=True)
+class ChunkingConfig:
+    """When and how long transcripts are split for parallel formatting.
+
+    Attributes:
+        min_words: Transcripts with fewer words are formatted in one request
+        chunk_words: Target words per chunk (excluding the overlap)
+        overlap_words: Words of the previous chunk repeated at the start of a chunk
+        concurrency: Maximum chunks formatted at once
+    """
+
+    min_words: int
+    chunk_words: int
+    overlap_words: int
+    concurrency: int
+
+
+@dataclass(frozen=True)
+class TranscriptChunk:
+    """One chunk of a transcript to format.
+
+    Attributes:
+        text: The chunk, starting with the overlap
+        overlap_words: Words at the start repeated from the previous chunk
+    """
+
+    text: str
+    overlap_words: int
+
+
+def _split_sentences(transcript_parts: list[str], chunk_words: int) -> list[list[str]]:
+    """Split transcript parts into word lists at sentence boundaries, capped at chunk_words."""
+    sentences: list[list[str]] = []
+    for transcript_part in transcript_parts:
+        for sentence in SENTENCE_BOUNDARY_PATTERN.split(transcript_part.strip()):
+            words = sentence.split()
+            # Unpunctuated runs longer than a chunk are split by word count
+            for start in range(0, len(words), chunk_words):
+                sentences.append(words[start : start + chunk_words])
+    return [sentence for sentence in sentences if sentence]
+
+
+def split_transcript(
+    transcript_parts: list[str], chunk_words: int, overlap_words: int
+) -> list[TranscriptChunk]:
+    """Split a transcript into overlapping chunks at pause and sentence boundaries.
+
+    Args:
+        transcript_parts: The recording's final STT transcripts (each ends at a pause)
+        chunk_words: Target words per chunk (excluding the overlap)
+        overlap_words: Words of the previous chunk repeated at the start of each chunk
+
+    Returns:
+        The chunks in transcript order (a single chunk for short transcripts)
+    """
+    chunk_word_lists: list[list[str]] = []
+    current_words: list[str] = []
+    for sentence_words in _split_sentences(transcript_parts, chunk_words):
+        if current_words and len(current_words) + len(sentence_words) > chunk_words:
+            chunk_word_lists.append(current_words)
+            current_words = []
+        current_words = [*current_words, *sentence_words]
+    if current_words:
+        chunk_word_lists.append(current_words)
+
+    chunks: list[TranscriptChunk] = []
+    for chunk_index, chunk_words_list in enumerate(chunk_word_lists):
+        overlap = (
+            chunk_word_lists[chunk_index - 1][-overlap_words:]
+            if chunk_index and overlap_words
+            else []
+        )
+        chunks.append(
+            TranscriptChunk(
+                text=" ".join([*overlap, *chunk_words_list]), overlap_words=len(overlap)
+            )
+        )
+    return chunks
+
+
+def _normalized_words(text: str) -> list[str]:
+    return [word.lower() for word in WORD_TOKEN_PATTERN.findall(text)]
+
+
+def remove_formatted_overlap(previous_text: str, chunk_text: str, overlap_words: int) -> str:
+    """Remove the start of a formatted chunk that repeats the previous formatted chunk.
+
+    The longest run of words that ends the previous chunk and starts this one
+    (ignoring case and punctuation) is removed, if it covers at least half of
+    the overlap. Otherwise the chunk is kept whole: repeating a few words is
+    better than losing dictated text.
+
+    Args:
+        previous_text: The formatted previous chunk
+        chunk_text: The formatted chunk, starting with its formatted overlap
+        overlap_words: Words repeated from the previous chunk before formatting
+
+    Returns:
+        The formatted chunk without its overlap
+    """
+    if overlap_words == 0:
+        return chunk_text
+    previous_words = _normalized_words(previous_text)
+    chunk_word_matches = list(WORD_TOKEN_PATTERN.finditer(chunk_text))
+    chunk_words = [match.group().lower() for match in chunk_word_matches]
+    max_aligned_words = min(
+        len(previous_words), len(chunk_words), overlap_words + OVERLAP_SLACK_WORDS
+    )
+    for aligned_words in range(max_aligned_words, max(1, overlap_words // 2) - 1, -1):
+        if previous_words[-aligned_words:] == chunk_words[:aligned_words]:
+            overlap_end = chunk_word_matches[aligned_words - 1].end()
+            return chunk_text[overlap_end:].lstrip(LEADING_PUNCTUATION)
+
+    logger.warning("Chunk overlap not found in formatted output, keeping the chunk whole")
+    return chunk_text
@@ -4,26 +4,37 @@ Manages client registrations and active connections to ensure:
 1. One client = one connection (old connections disconnected when same client reconnects)
 2. Server tracks clients by persistent UUID
 3. Future-compatible with auth system (endpoint becomes auth login)
+
+Registrations (see ClientRegistry) and connection owners live in a
+StateStore shared by all workers, so any worker can verify a client and find
+the worker hosting its pipeline. Pipeline components (ConnectionInfo) stay in
+the owning worker. The store is read and written in a worker thread, never
+on the event loop the pipelines run on.
 """
 
 import asyncio
 import contextlib
-import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import TYPE_CHECKING
 
 from loguru import logger
 
+from processors.client_registry import ClientRegistry
+from utils.state_store import MemoryStateStore, StateStore
+
 if TYPE_CHECKING:
     from pipecat.services.ai_services import STTService
     from pipecat.services.llm_service import LLMService
     from pipecat.transports.smallwebrtc.connection import SmallWebRTCConnection
 
     from processors.context_manager import DictationContextManager
+    from processors.formatting_cache import FormattingCacheProcessorPair
     from processors.llm_gate import LLMGateFilter
+    from processors.transcript_history import TranscriptHistory
     from processors.turn_controller import TurnController
     from services.provider_registry import LLMProviderId, STTProviderId
+    from services.stt_vocabulary import STTVocabularyBooster
 
 
 @dataclass
@@ -38,35 +49,59 @@ class ConnectionInfo:
     context_manager: "DictationContextManager | None" = None
     turn_controller: "TurnController | None" = None
     llm_gate: "LLMGateFilter | None" = None
+    formatting_cache: "FormattingCacheProcessorPair | None" = None
     stt_services: "dict[STTProviderId, STTService] | None" = None
     llm_services: "dict[LLMProviderId, LLMService] | None" = None
+    stt_vocabulary_booster: "STTVocabularyBooster | None" = None
+    transcript_history: "TranscriptHistory | None" = None
 
 
 class ClientConnectionManager:
-    """Manages client UUIDs and active connections (in-memory only).
+    """Manages client UUIDs and active connections.
 
-    UUIDs are stored in-memory only. After server restart, clients receive 401
-    and re-register automatically. This is by design - future auth will add
-    persistent storage.
+    UUIDs are kept in the state store until they go unused for the
+    registration TTL. With the memory store, clients receive 401 after a
+    server restart and re-register automatically.
+
+    When the worker has a URL, the store records it as the owner of each
+    connection (by client UUID and peer connection ID), so other workers can
+    forward that client's requests here.
     """
 
-    def __init__(self) -> None:
-        """Initialize the client connection manager."""
-        self._registered_uuids: set[str] = set()
+    def __init__(
+        self,
+        state_store: StateStore | None = None,
+        worker_url: str | None = None,
+        *,
+        registration_ttl_secs: float | None = None,
+        registry_cache_size: int = 10000,
+    ) -> None:
+        """Initialize the client connection manager.
+
+        Args:
+            state_store: Shared state store (default: in-memory, for a single worker)
+            worker_url: URL other workers reach this worker at, or None for a single worker
+            registration_ttl_secs: Unregister UUIDs not seen for this long (None: never)
+            registry_cache_size: Most registered UUIDs cached in memory
+        """
+        self._state_store = state_store or MemoryStateStore()
+        self._worker_url = worker_url
+        self._registry = ClientRegistry(
+            self._state_store, ttl_secs=registration_ttl_secs, cache_size=registry_cache_size
+        )
         self._connections: dict[str, ConnectionInfo] = {}
 
-    def generate_and_register_uuid(self) -> str:
+    async def generate_and_register_uuid(self) -> str:
         """Generate a new UUID and register it.
 
         Returns:
             The newly generated and registered UUID string.
         """
-        new_uuid = str(uuid.uuid4())
-        self._registered_uuids.add(new_uuid)
+        new_uuid = await self._registry.register()
         logger.debug(f"Generated and registered new UUID: {new_uuid}")
         return new_uuid
 
-    def is_registered(self, client_uuid: str) -> bool:
+    async def is_registered(self, client_uuid: str) -> bool:
         """Check if a UUID is registered.
 
         Args:
@@ -75,9 +110,31 @@ class ClientConnectionManager:
         Returns:
             True if the UUID is registered, False otherwise.
         """
-        return client_uuid in self._registered_uuids
+        return await self._registry.is_registered(client_uuid)
+
+    async def set_formatting_cache_opt_out(self, client_uuid: str, opted_out: bool) -> None:
+        """Record whether a client has opted out of the formatting result cache.
+
+        Args:
+            client_uuid: The client's UUID.
+            opted_out: True to keep the client's transcripts out of the cache.
+        """
+        await asyncio.to_thread(
+            self._state_store.set_formatting_cache_opt_out, client_uuid, opted_out
+        )
+
+    async def is_formatting_cache_opted_out(self, client_uuid: str) -> bool:
+        """Check whether a client has opted out of the formatting result cache.
+
+        Args:
+            client_uuid: The client's UUID.
+
+        Returns:
+            True if the client's transcripts must be kept out of the cache.
+        """
+        return await asyncio.to_thread(self._state_store.is_formatting_cache_opted_out, client_uuid)
 
-    def register_connection(
+    async def register_connection(
         self,
         client_uuid: str,
         connection: "SmallWebRTCConnection",
@@ -86,8 +143,11 @@ class ClientConnectionManager:
         context_manager: "DictationContextManager | None" = None,
         turn_controller: "TurnController | None" = None,
         llm_gate: "LLMGateFilter | None" = None,
+        formatting_cache: "FormattingCacheProcessorPair | None" = None,
         stt_services: "dict[STTProviderId, STTService] | None" = None,
         llm_services: "dict[LLMProviderId, LLMService] | None" = None,
+        stt_vocabulary_booster: "STTVocabularyBooster | None" = None,
+        transcript_history: "TranscriptHistory | None" = None,
     ) -> None:
         """Register an active connection for a client UUID.
 
@@ -98,8 +158,11 @@ class ClientConnectionManager:
             context_manager: The DictationContextManager for this connection.
             turn_controller: The TurnController for this connection.
             llm_gate: The LLMGateFilter for this connection.
+            formatting_cache: The formatting cache processors for this connection.
             stt_services: Dictionary mapping STT provider IDs to services.
             llm_services: Dictionary mapping LLM provider IDs to services.
+            stt_vocabulary_booster: The STT vocabulary booster for this connection.
+            transcript_history: The final transcript history for this connection.
         """
         self._connections[client_uuid] = ConnectionInfo(
             client_uuid=client_uuid,
@@ -108,22 +171,53 @@ class ClientConnectionManager:
             context_manager=context_manager,
             turn_controller=turn_controller,
             llm_gate=llm_gate,
+            formatting_cache=formatting_cache,
             stt_services=stt_services,
             llm_services=llm_services,
+            stt_vocabulary_booster=stt_vocabulary_booster,
+            transcript_history=transcript_history,
         )
+        if self._worker_url is not None:
+            await asyncio.to_thread(
+                self._set_owner, client_uuid, connection.pc_id, self._worker_url
+            )
         logger.debug(f"Registered connection for client: {client_uuid}")
 
-    def unregister_connection(self, client_uuid: str) -> None:
+    async def get_remote_owner(
+        self, client_uuid: str | None = None, pc_id: str | None = None
+    ) -> str | None:
+        """Get the URL of another worker hosting a client's connection.
+
+        Runs on every request when workers share state, so the state store is
+        read in a worker thread rather than on the event loop.
+
+        Args:
+            client_uuid: The client's UUID.
+            pc_id: A peer connection ID (looked up when no client UUID is given).
+
+        Returns:
+            The owning worker's URL, or None if this worker owns it, nobody
+            does, or the server runs a single worker.
+        """
+        if self._worker_url is None:
+            return None
+        if client_uuid is not None and client_uuid in self._connections:
+            return None
+        key = client_uuid if client_uuid is not None else f"pc:{pc_id}"
+        owner = await asyncio.to_thread(self._state_store.get_owner, key)
+        return owner if owner != self._worker_url else None
+
+    async def unregister_connection(self, client_uuid: str) -> None:
         """Unregister a connection for a client UUID.
 
         Args:
             client_uuid: The client's UUID to unregister.
         """
         if client_uuid in self._connections:
-            del self._connections[client_uuid]
+            await self._release_owner(self._connections.pop(client_uuid))
             logger.debug(f"Unregistered connection for client: {client_uuid}")
 
-    def take_existing_connection(self, client_uuid: str) -> ConnectionInfo | None:
+    async def take_existing_connection(self, client_uuid: str) -> ConnectionInfo | None:
         """Remove and return any existing connection for a client UUID.
 
         This atomically removes the connection from tracking, freeing the UUID
@@ -136,7 +230,27 @@ class ClientConnectionManager:
         Returns:
             The ConnectionInfo if one existed, None otherwise.
         """
-        return self._connections.pop(client_uuid, None)
+        connection_info = self._connections.pop(client_uuid, None)
+        if connection_info is not None:
+            await self._release_owner(connection_info)
+        return connection_info
+
+    def _set_owner(self, client_uuid: str, pc_id: str, owner: str) -> None:
+        self._state_store.set_owner(client_uuid, owner)
+        self._state_store.set_owner(f"pc:{pc_id}", owner)
+
+    async def _release_owner(self, connection_info: ConnectionInfo) -> None:
+        if self._worker_url is not None:
+            await asyncio.to_thread(
+                self._release_owner_keys,
+                connection_info.client_uuid,
+                connection_info.connection.pc_id,
+                self._worker_url,
+            )
+
+    def _release_owner_keys(self, client_uuid: str, pc_id: str, owner: str) -> None:
+        self._state_store.release_owner(client_uuid, owner)
+        self._state_store.release_owner(f"pc:{pc_id}", owner)
 
     async def cleanup_connection(self, connection_info: ConnectionInfo) -> None:
         """Clean up a disconnected connection (cancel task, close WebRTC).
@@ -169,13 +283,13 @@ class ClientConnectionManager:
         """
         return len(self._connections)
 
-    def get_registered_uuid_count(self) -> int:
+    async def get_registered_uuid_count(self) -> int:
         """Get the number of registered UUIDs.
 
         Returns:
             The count of registered UUIDs.
         """
-        return len(self._registered_uuids)
+        return await self._registry.count()
 
     def get_connection(self, client_uuid: str) -> ConnectionInfo | None:
         """Get the connection info for a client UUID.
@@ -0,0 +1,141 @@
+"""Bounded client UUID registry with last-seen tracking and TTL eviction.
+
+Registrations live in the state store. With a persistent backend (sqlite or
+redis) they survive restarts, so clients are not forced to re-register after
+every deploy. In front of the store, an LRU cache of recently seen UUIDs answers
+most lookups with a dictionary hit:
+- Last-seen times are written back at most once per
+  LAST_SEEN_UPDATE_INTERVAL_SECS per client, not on every request
+- UUIDs not seen for the TTL are unregistered by a periodic sweep, so the
+  store stays bounded by the number of active clients rather than growing
+  with every registration ever made
+
+Store reads, writes and sweeps can wait on a busy database or a slow Redis,
+so they run in a worker thread rather than on the event loop; the cache is
+only touched on the event loop.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Final
+
+from loguru import logger
+
+from utils.state_store import StateStore
+
+LAST_SEEN_UPDATE_INTERVAL_SECS: Final[float] = 3600.0
+EVICTION_INTERVAL_SECS: Final[float] = 3600.0
+
+
+class ClientRegistry:
+    """Registered client UUIDs, cached in front of the shared state store."""
+
+    def __init__(
+        self,
+        state_store: StateStore,
+        ttl_secs: float | None,
+        cache_size: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize the registry.
+
+        Args:
+            state_store: The state store holding the registrations
+            ttl_secs: Unregister UUIDs not seen for this long, or None to keep them forever
+            cache_size: Most UUIDs kept in the in-memory cache
+            clock: Returns the current time in epoch seconds
+        """
+        self._state_store = state_store
+        self._ttl_secs = ttl_secs
+        self._cache_size = cache_size
+        self._clock = clock
+        # UUID -> last-seen time written to the store, least recently used first
+        self._cache: OrderedDict[str, float] = OrderedDict()
+        self._update_interval_secs = (
+            min(LAST_SEEN_UPDATE_INTERVAL_SECS, ttl_secs / 2)
+            if ttl_secs is not None
+            else LAST_SEEN_UPDATE_INTERVAL_SECS
+        )
+        # The first sweep waits an interval, so startup's first registration stays fast
+        self._next_eviction_at = clock() + EVICTION_INTERVAL_SECS
+
+    async def register(self) -> str:
+        """Generate and register a new client UUID.
+
+        Returns:
+            The new UUID
+        """
+        now = self._clock()
+        await self._evict_stale_if_due(now)
+        client_uuid = str(uuid.uuid4())
+        await asyncio.to_thread(self._state_store.add_registered_uuid, client_uuid, now)
+        self._remember(client_uuid, now)
+        return client_uuid
+
+    async def is_registered(self, client_uuid: str) -> bool:
+        """Check if a UUID is registered (and not expired), recording that it was seen."""
+        now = self._clock()
+        seen_at = self._cache.get(client_uuid)
+        if seen_at is None:
+            seen_at = await asyncio.to_thread(
+                self._state_store.get_registered_uuid_last_seen, client_uuid
+            )
+            if seen_at is None:
+                return False
+
+        if self._is_expired(seen_at, now):
+            self._cache.pop(client_uuid, None)
+            return False
+        if now - seen_at >= self._update_interval_secs:
+            if not await asyncio.to_thread(
+                self._state_store.touch_registered_uuid, client_uuid, now
+            ):
+                # Unregistered by another worker
+                self._cache.pop(client_uuid, None)
+                return False
+            seen_at = now
+        self._remember(client_uuid, seen_at)
+        return True
+
+    async def count(self) -> int:
+        """Get the number of registered UUIDs (including expired ones not yet evicted)."""
+        return await asyncio.to_thread(self._state_store.registered_uuid_count)
+
+    async def evict_stale(self) -> int:
+        """Unregister UUIDs not seen for the TTL.
+
+        Returns:
+            The number of UUIDs unregistered
+        """
+        if self._ttl_secs is None:
+            return 0
+        now = self._clock()
+        self._next_eviction_at = now + EVICTION_INTERVAL_SECS
+        evicted_count = await asyncio.to_thread(
+            self._state_store.evict_registered_uuids, now - self._ttl_secs
+        )
+        for client_uuid in [
+            client_uuid
+            for client_uuid, seen_at in self._cache.items()
+            if self._is_expired(seen_at, now)
+        ]:
+            del self._cache[client_uuid]
+        if evicted_count:
+            logger.info(f"Unregistered {evicted_count} client UUIDs not seen for the TTL")
+        return evicted_count
+
+    async def _evict_stale_if_due(self, now: float) -> None:
+        if self._ttl_secs is not None and now >= self._next_eviction_at:
+            await self.evict_stale()
+
+    def _is_expired(self, seen_at: float, now: float) -> bool:
+        return self._ttl_secs is not None and now - seen_at > self._ttl_secs
+
+    def _remember(self, client_uuid: str, seen_at: float) -> None:
+        self._cache[client_uuid] = seen_at
+        self._cache.move_to_end(client_uuid)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
@@ -0,0 +1,137 @@
+"""Common English words that phonetic dictionary matching never rewrites.
+
+A transcript word that is itself an ordinary word (e.g., "cloud" against the
+term Claude) was almost always heard correctly, so rewriting it to a
+dictionary term that sounds alike corrupts the transcript. The list covers
+function words and the everyday vocabulary of dictation; apostrophes are
+dropped, as phonetic matching compares tokens without them.
+"""
+
+from typing import Final
+
+COMMON_WORDS: Final[frozenset[str]] = frozenset(
+    """
+    a able about above absolutely accept access accord according account accounts
+    across act action actions active activity actual actually ad add added adding
+    address admin administration advance advice affect afraid after afternoon again
+    against age agency agenda agent ago agree agreed agreement ahead aid aim air
+    airport alarm album alert all allow allowed almost alone along already also
+    although always am amazing among amount an analysis and angle angry animal
+    annual another answer answers any anybody anyone anything anyway anywhere apart
+    app apple apply appointment approach approve approved apps april area areas
+    argue argument arm around arrange arrive arrived art article as ask asked asking
+    assume at attach attached attack attempt attend attention audience audio august
+    author auto available average avoid await away awesome baby back background
+    backup bad badly bag balance ball band bank bar base based basic basically basis
+    bath battery be beach bear beat beautiful became because become bed been before
+    began begin beginning behind being believe below benefit best better between
+    beyond big bigger bill billing bills bit black blame block blog blood blue board
+    boat body book booked books boot born boss both bottle bottom bought box boy
+    brain branch brand break breakfast bridge brief bring broad broke broken brother
+    brought brown budget bug bugs build building built bunch business busy but
+    button buy buyer by call called calls calm came camera campaign can cancel
+    cannot cant capital car card care career careful carry case cases cash cat catch
+    cause cell center central certain certainly chair challenge chance change
+    changed changes channel chapter charge chart chat cheap check checked checking
+    cheese chicken chief child children choice choose chose church city claim class
+    clean clear clearly click client clients climb clock close closed closer cloud
+    clouds club code coffee cold collect college color column come comes comfortable
+    coming comment comments commit common community company compare complete
+    completely computer concern condition conference confirm connect connection
+    consider contact contain content context continue contract control cook cool
+    copy corner correct cost costs could couldnt count country couple course court
+    cover crazy create created credit crew critical cross cup current currently
+    customer customers cut cycle dad daily damage dark data date daughter day days
+    dead deal dear death debt december decide decided decision deep default defense
+    define definitely degree delay delete deliver delivery demand depend deploy
+    describe design desk detail details develop developer development device did
+    didnt die diet difference different difficult dinner direct direction directly
+    director discuss discussion disease display distance do doc doctor document
+    documents does doesnt dog doing dollar dollars domain done dont door double
+    doubt down download draft draw dream dress drink drive driver drop due during
+    each early earn east easy eat economy edge edit editor education effect effort
+    eight either election else email emails employee end ended energy engine
+    engineer enjoy enough ensure enter entire entry environment equal error errors
+    especially estimate even evening event events ever every everybody everyone
+    everything evidence exact exactly example except exchange excited exercise exist
+    expect expected expense expensive experience explain extra eye eyes face fact
+    factor fail failed failure fair fall false family far fast father fault fear
+    feature features february fee feedback feel feeling feet felt few field fight
+    figure file files fill film final finally finance financial find fine finger
+    finish finished fire firm first fish fit five fix fixed flat flight floor flow
+    focus folder follow following food foot for force forget form format forward
+    found four free friday friend friends from front full fully fun function fund
+    funny future game garden gas gave general get gets getting gift girl give given
+    glad glass go goal goes going gone good got government grade great green ground
+    group grow growth guess guest guide guy guys had hair half hand handle hang
+    happen happened happy hard has hasnt hat hate have havent having he head health
+    hear heard heart heat heavy hello help helpful her here hers herself hey hi high
+    higher him himself hire his history hit hold holiday home hope hopefully horse
+    hospital host hot hotel hour hours house how however huge human hundred husband
+    i id idea ideas if ill im image images imagine impact important improve in
+    include included including income increase indeed industry info information
+    input inside instance instead interest interested interesting internal
+    international internet interview into invoice involved is isnt issue issues it
+    item items its itself ive january job jobs join joke journey judge july jump
+    june just keep key keys kid kids kill kind kitchen knew know knowledge known lab
+    labor lack lady land language laptop large last late later laugh launch law
+    lawyer lay layer lead leader learn least leave led left leg legal less lesson
+    let lets letter level library lie life light like likely limit line lines link
+    links list listen little live load loan local location lock log login long look
+    looked looking lose loss lost lot lots loud love low lower lunch machine made
+    mail main maintain major make makes making male man manage manager many map
+    march mark market marketing match material matter may maybe me meal mean meaning
+    means measure media medical meet meeting meetings member members memory mention
+    menu merge message messages met method middle might mile million mind mine
+    minute minutes miss missing mission mistake mode model modern mom moment monday
+    money month months mood more morning most mostly mother mouse mouth move moved
+    movie much music must my myself name names nation national natural nature near
+    nearly need needed needs negative network never new news next nice night nine no
+    nobody node none nor normal north not note notes nothing notice november now
+    number numbers object obviously october odd of off offer office officer often oh
+    oil ok okay old on once one ones online only open operation opinion option
+    options or order other others otherwise our ours out output outside over own
+    owner page pages paid pain paper parent parents park part partner party pass
+    past patch patient pattern pay payment peace people per percent perfect perhaps
+    period person personal phone photo pick picture piece pipe place plan plane
+    plans play player please plus point points police policy political poor popular
+    position positive possible post potential power practice prepare present
+    president press pretty prevent price print priority private probably problem
+    problems process produce product production products program progress project
+    projects promise proper property protect prove provide public pull purpose push
+    put quality quarter question questions quick quickly quite race radio rain raise
+    range rate rather reach read reading ready real reality realize really reason
+    receive received recent recently record recording red reduce refer region
+    release remember remind remote remove repeat replace reply report reports
+    request require research resource respond response rest result results return
+    review rich right rise risk road role room round rule rules run running safe
+    said sale sales same saturday save saw say saying says schedule school science
+    score screen script search season seat second section security see seem seems
+    seen sell send sense sent september series serious serve server service services
+    session set setting settings setup seven several share she sheet shell shift
+    ship shop short shot should shouldnt show shown side sign signal signed simple
+    simply since single sister sit site six size skill skills sleep slide slides
+    slow small smart so social software sold some somebody someone something
+    sometimes somewhere son song soon sorry sort sound source south space speak
+    special speech speed spend spent sport spring staff stage stand standard start
+    started state statement station status stay step still stock stop store story
+    strategy street strong student study stuff style subject success successful such
+    suggest summer sun sunday super supply support suppose sure surface system table
+    take taken talk talked talking task tasks tax team tech test tested testing
+    tests text than thank thanks that thats the their them theme themselves then
+    theory there theres these they theyre thing things think thinking third this
+    those though thought thousand three through thursday ticket time times tip title
+    to today together told tomorrow tonight too took tool tools top topic total
+    touch toward town track trade traffic train training travel treat tree trial
+    trip trouble true trust truth try trying tuesday turn tv twice two type up
+    update updated upload upon us usage use used useful user users using usual
+    usually value various version very video view visit voice vote wait want wanted
+    war warm was wasnt watch water way ways we wear weather web website wednesday
+    week weekend weeks weight welcome well went were werent west what whatever when
+    where whether which while white who whole whom whose why wide wife will win
+    window wish with within without woman wonder wont word words work worked worker
+    working works world worry worse worth would wouldnt write writing written wrong
+    wrote yeah year years yes yesterday yet you youd youll young your youre yours
+    yourself youve zero
+    """.split()  # noqa: SIM905
+)
@@ -3,7 +3,8 @@
 This module provides a context manager that integrates pipecat's LLMContextAggregatorPair
 with the dictation-specific requirements:
 - Three-section prompt system (main/advanced/dictionary)
-- Context reset before each recording (no conversation history)
+- A fresh context for each recording (no conversation history), owned by
+  the recording's job so overlapping recordings never share one
 - External turn control via UserStartedSpeakingFrame/UserStoppedSpeakingFrame
 """
 
@@ -14,24 +15,36 @@ import re
 from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse
 
-from openai.types.chat import ChatCompletionSystemMessageParam
+from openai.types.chat import ChatCompletionSystemMessageParam, ChatCompletionUserMessageParam
 from pipecat.processors.aggregators.llm_context import LLMContext, LLMContextMessage
 from pipecat.processors.aggregators.llm_response_universal import (
+    LLMAssistantAggregator,
     LLMAssistantAggregatorParams,
-    LLMContextAggregatorPair,
     LLMUserAggregatorParams,
 )
 from pipecat.turns.user_turn_strategies import ExternalUserTurnStrategies
 
-from processors.llm import combine_prompt_sections
+from processors.dictionary import (
+    CompiledDictionary,
+    DictionaryPromptSelection,
+    DictionaryRetrievalIndex,
+    compile_dictionary_section,
+)
+from processors.llm import (
+    PROMPT_SECTION_DEFAULTS,
+    PromptProfile,
+    combine_prompt_sections,
+    estimate_token_count,
+)
+from processors.recording_jobs import RecordingJob, RecordingUserAggregator
 from protocol.messages import ActiveAppContextSnapshot
 from utils.logger import logger
 
 if TYPE_CHECKING:
-    from pipecat.processors.aggregators.llm_response_universal import (
-        LLMAssistantAggregator,
-        LLMUserAggregator,
-    )
+    from pipecat.pipeline.llm_switcher import LLMSwitcher
+    from pipecat.services.llm_service import LLMService
+
+    from services.stt_vocabulary import STTVocabularyBooster
 
 FOCUS_TEXT_CONTROL_CHARACTER_PATTERN = re.compile(r"[\x00-\x1F\x7F]")
 FOCUS_TEXT_WHITESPACE_PATTERN = re.compile(r"\s+")
@@ -98,49 +111,158 @@ class SanitizedFocusText:
 class DictationContextManager:
     """Manages LLM context for dictation with custom prompt support.
 
-    Wraps LLMContextAggregatorPair and provides:
+    Wraps the user and assistant aggregators and provides:
     - Three-section prompt system (main/advanced/dictionary)
-    - Context reset before each recording
+    - Full or lite default sections, chosen per client, server or active LLM provider
+    - Compiled dictionary for deterministic replacement (exact mappings are
+      applied by DictionaryReplacementProcessor and left out of the prompt)
+    - Per-recording dictionary retrieval within a token budget
+    - Dictionary terms left out of the prompt while the active STT boosts them
+    - A recording job with a fresh context for each recording
     - Aggregator access for pipeline placement
 
-    The aggregator pair uses ExternalUserTurnStrategies, meaning turn boundaries
+    The user aggregator uses ExternalUserTurnStrategies, meaning turn boundaries
     are controlled externally via UserStartedSpeakingFrame/UserStoppedSpeakingFrame
     emitted by TranscriptionBufferProcessor.
     """
 
-    def __init__(self, **kwargs: Any) -> None:
-        """Initialize the dictation context manager."""
+    def __init__(
+        self,
+        dictionary_prompt_token_budget: int | None = None,
+        prompt_profile: PromptProfile | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the dictation context manager.
+
+        Args:
+            dictionary_prompt_token_budget: Token budget for the dictionary section
+                selected per recording, or None to always send every unresolved entry
+            prompt_profile: Server-wide prompt profile, or None to select it from
+                the active LLM provider
+        """
+        self._dictionary_prompt_token_budget = dictionary_prompt_token_budget
+        # Prompt profile resolution: client override, then server setting, then provider
+        self._server_prompt_profile = prompt_profile
+        self._client_prompt_profile: PromptProfile | None = None
+        self._llm_switcher: LLMSwitcher | None = None
+        self._provider_prompt_profiles: dict[LLMService, PromptProfile] = {}
+        self._stt_vocabulary_booster: STTVocabularyBooster | None = None
         # Prompt section configuration (same structure as TranscriptionToLLMConverter)
         self._main_custom: str | None = None
         self._advanced_enabled: bool = True
         self._advanced_custom: str | None = None
         self._dictionary_enabled: bool = True
         self._dictionary_custom: str | None = None
+        self._compiled_dictionaries: dict[PromptProfile, CompiledDictionary | None] = {}
 
-        # Create shared context (will be reset before each recording)
+        # Context of the most recently started recording (each recording gets a new one)
         self._context = LLMContext()
         self._active_app_context: ActiveAppContextSnapshot | None = None
+        self._recording_count = 0
 
-        # Create aggregator pair with external turn control
+        # Create the user aggregator with external turn control
         # External strategies mean TranscriptionBufferProcessor controls when turns start/stop
-        self._aggregator_pair = LLMContextAggregatorPair(
+        self._user_aggregator = RecordingUserAggregator(
             self._context,
-            user_params=LLMUserAggregatorParams(
+            params=LLMUserAggregatorParams(
                 user_turn_strategies=ExternalUserTurnStrategies(),
                 user_turn_stop_timeout=10.0,  # Long timeout since we control stops externally
             ),
-            assistant_params=LLMAssistantAggregatorParams(),
+        )
+        # Responses are not part of any recording's context (no conversation history)
+        self._assistant_aggregator = LLMAssistantAggregator(
+            LLMContext(), params=LLMAssistantAggregatorParams()
         )
 
     @property
     def system_prompt(self) -> str:
-        """Get the combined system prompt from all sections."""
+        """Get the combined system prompt from all sections.
+
+        The dictionary section only contains entries that were not resolved
+        into exact mappings (or STT keyword boosting), and is omitted entirely
+        when none remain.
+        """
+        compiled_dictionary = self.compiled_dictionary
+        return self._combine_system_prompt(
+            self._dictionary_prompt(compiled_dictionary)[0] if compiled_dictionary else None
+        )
+
+    def _dictionary_prompt(
+        self, compiled_dictionary: CompiledDictionary
+    ) -> tuple[str | None, DictionaryRetrievalIndex]:
+        if (
+            self._stt_vocabulary_booster is not None
+            and self._stt_vocabulary_booster.is_active_service_boosted(compiled_dictionary)
+        ):
+            return (
+                compiled_dictionary.stt_boosted_prompt,
+                compiled_dictionary.stt_boosted_retrieval_index,
+            )
+        return compiled_dictionary.unresolved_prompt, compiled_dictionary.retrieval_index
+
+    def _combine_system_prompt(self, dictionary_prompt: str | None) -> str:
         return combine_prompt_sections(
             main_custom=self._main_custom,
             advanced_enabled=self._advanced_enabled,
             advanced_custom=self._advanced_custom,
-            dictionary_enabled=self._dictionary_enabled,
-            dictionary_custom=self._dictionary_custom,
+            dictionary_enabled=dictionary_prompt is not None,
+            dictionary_custom=dictionary_prompt,
+            profile=self.prompt_profile,
+        )
+
+    @property
+    def prompt_profile(self) -> PromptProfile:
+        """Get the prompt profile for the next recording.
+
+        A client override wins over the server setting, which wins over the
+        active LLM provider's profile. Defaults to the full profile.
+        """
+        if self._client_prompt_profile is not None:
+            return self._client_prompt_profile
+        if self._server_prompt_profile is not None:
+            return self._server_prompt_profile
+        if self._llm_switcher is not None:
+            return self._provider_prompt_profiles.get(
+                self._llm_switcher.active_llm, PromptProfile.FULL
+            )
+        return PromptProfile.FULL
+
+    def set_prompt_profile(self, profile: PromptProfile | None) -> None:
+        """Set this client's prompt profile, or None to select it automatically."""
+        self._client_prompt_profile = profile
+        logger.info(
+            f"Prompt profile set to {profile or 'auto'} (resolves to {self.prompt_profile})"
+        )
+
+    def set_llm_switcher(
+        self, llm_switcher: LLMSwitcher, provider_prompt_profiles: dict[LLMService, PromptProfile]
+    ) -> None:
+        """Select the prompt profile from the active LLM provider.
+
+        Args:
+            llm_switcher: The connection's LLM switcher
+            provider_prompt_profiles: Prompt profile of each LLM service in the switcher
+        """
+        self._llm_switcher = llm_switcher
+        self._provider_prompt_profiles = provider_prompt_profiles
+
+    def set_stt_vocabulary_booster(self, stt_vocabulary_booster: STTVocabularyBooster) -> None:
+        """Leave dictionary terms out of the prompt while the active STT boosts them."""
+        self._stt_vocabulary_booster = stt_vocabulary_booster
+
+    @property
+    def compiled_dictionary(self) -> CompiledDictionary | None:
+        """Get the compiled dictionary, or None if the dictionary section is disabled."""
+        profile = self.prompt_profile
+        if profile not in self._compiled_dictionaries:
+            self._compiled_dictionaries[profile] = self._compile_dictionary(profile)
+        return self._compiled_dictionaries[profile]
+
+    def _compile_dictionary(self, profile: PromptProfile) -> CompiledDictionary | None:
+        if not self._dictionary_enabled:
+            return None
+        return compile_dictionary_section(
+            self._dictionary_custom or PROMPT_SECTION_DEFAULTS[profile].dictionary
         )
 
     def set_prompt_sections(
@@ -168,6 +290,7 @@ class DictationContextManager:
         self._advanced_custom = advanced_custom
         self._dictionary_enabled = dictionary_enabled
         self._dictionary_custom = dictionary_custom
+        self._compiled_dictionaries = {}
         logger.info("Formatting prompt sections updated")
 
     def set_active_app_context(self, active_app_context: ActiveAppContextSnapshot | None) -> None:
@@ -280,18 +403,147 @@ class DictationContextManager:
 
         return "\n".join(formatted_active_app_context_lines)
 
-    def reset_context_for_new_recording(self) -> None:
-        """Reset the context for a new recording session.
+    def reset_context_for_new_recording(self) -> RecordingJob:
+        """Create the job and fresh context of a new recording.
 
-        Called by TranscriptionBufferProcessor when recording starts.
-        Clears all previous messages and sets the system prompt.
-        This ensures each dictation is independent with no conversation history.
+        Called by TurnController when recording starts. The new context holds
+        only the system messages, so each dictation is independent with no
+        conversation history. Contexts of earlier recordings are left alone,
+        so a recording still being formatted is unaffected.
+
+        Returns:
+            The recording's job, announced to the pipeline via RecordingJobFrame
         """
+        self._recording_count += 1
+        self._context = LLMContext(
+            self._build_recording_messages(self.system_prompt, self._active_app_context)
+        )
+        self._assistant_aggregator.set_messages([])
+        logger.debug(f"Context created for recording {self._recording_count}")
+        return RecordingJob(
+            recording_id=self._recording_count,
+            context=self._context,
+            active_app_context=self._active_app_context,
+        )
+
+    def select_dictionary_for_transcript(
+        self, transcript: str, job: RecordingJob | None = None
+    ) -> None:
+        """Narrow the dictionary section to entries relevant to the final transcript.
+
+        Called by DictionaryReplacementProcessor when the turn ends, before the
+        user aggregator triggers the LLM. Replaces the system messages set by
+        reset_context_for_new_recording() and logs prompt-size metrics. Does
+        nothing when retrieval is disabled or no dictionary entries reach the LLM.
+
+        Args:
+            transcript: The dictionary-corrected transcript of the recording
+            job: The recording's job, or None for the most recent recording
+        """
+        selection = self._select_dictionary_prompt(transcript)
+        if selection is None:
+            return
+
+        system_prompt = self._combine_system_prompt(selection.prompt)
+        context, active_app_context = (
+            (job.context, job.active_app_context)
+            if job is not None
+            else (self._context, self._active_app_context)
+        )
+        context.set_messages(self._build_recording_messages(system_prompt, active_app_context))
+        logger.info(
+            f"Dictionary prompt for recording: {selection.selected_entry_count}/"
+            f"{selection.unresolved_entry_count} entries, "
+            f"~{selection.prompt_token_estimate} tokens "
+            f"(all entries ~{selection.unresolved_prompt_token_estimate}, "
+            f"budget {self._dictionary_prompt_token_budget}), "
+            f"system prompt ~{estimate_token_count(system_prompt)} tokens "
+            f"({self.prompt_profile} profile)"
+        )
+
+    def _select_dictionary_prompt(self, transcript: str) -> DictionaryPromptSelection | None:
+        compiled_dictionary = self.compiled_dictionary
+        if self._dictionary_prompt_token_budget is None or compiled_dictionary is None:
+            return None
+        dictionary_prompt, retrieval_index = self._dictionary_prompt(compiled_dictionary)
+        if dictionary_prompt is None:
+            return None
+        return retrieval_index.select(transcript, self._dictionary_prompt_token_budget)
+
+    def build_segment_context(
+        self, transcript: str, preceding_text: str | None, job: RecordingJob | None = None
+    ) -> LLMContext:
+        """Build a standalone context formatting one segment of a long recording.
+
+        Used by IncrementalFormattingPair, outside the pipeline's shared context.
+        The segment gets the same system messages as a whole recording (with the
+        dictionary narrowed to the segment), plus the formatted text of the
+        previous segment so formatting stays consistent across segments.
+
+        Args:
+            transcript: The dictionary-corrected transcript of the segment
+            preceding_text: Formatted text of the previous segment, if any
+            job: The recording's job, or None for the most recent recording
+
+        Returns:
+            A new context ending with the segment as the user message
+        """
+        messages = self._build_transcript_system_messages(
+            transcript, job.active_app_context if job is not None else self._active_app_context
+        )
+        if preceding_text:
+            messages.append(
+                ChatCompletionSystemMessageParam(
+                    role="system",
+                    content=(
+                        "This dictation continues from the already formatted text below. "
+                        "Format only the new transcript so that it follows on from it, "
+                        "and do not repeat it:\n"
+                        f"{preceding_text}"
+                    ),
+                )
+            )
+        messages.append(ChatCompletionUserMessageParam(role="user", content=transcript))
+        return LLMContext(messages)
+
+    def build_reformat_context(
+        self, transcript: str, active_app_context: ActiveAppContextSnapshot | None
+    ) -> LLMContext:
+        """Build a standalone context formatting a stored transcript again.
+
+        Used by TranscriptHistory to reformat a previous recording without new
+        STT work, and by batch transcription of uploaded files. The context gets
+        the current system messages (so prompt and provider changes take
+        effect) with the recording's own app context.
+
+        Args:
+            transcript: The stored dictionary-corrected transcript
+            active_app_context: The app context of the stored recording
+
+        Returns:
+            A new context ending with the transcript as the user message
+        """
+        messages = self._build_transcript_system_messages(transcript, active_app_context)
+        messages.append(ChatCompletionUserMessageParam(role="user", content=transcript))
+        return LLMContext(messages)
+
+    def _build_transcript_system_messages(
+        self, transcript: str, active_app_context: ActiveAppContextSnapshot | None
+    ) -> list[LLMContextMessage]:
+        selection = self._select_dictionary_prompt(transcript)
+        system_prompt = (
+            self._combine_system_prompt(selection.prompt) if selection else self.system_prompt
+        )
+        return self._build_recording_messages(system_prompt, active_app_context)
+
+    def _build_recording_messages(
+        self, system_prompt: str, active_app_context: ActiveAppContextSnapshot | None
+    ) -> list[LLMContextMessage]:
         messages: list[LLMContextMessage] = [
-            ChatCompletionSystemMessageParam(role="system", content=self.system_prompt),
+            ChatCompletionSystemMessageParam(role="system", content=system_prompt),
         ]
 
-        match self._active_app_context:
+        match active_app_context:
             case ActiveAppContextSnapshot() as latest_active_app_context:
                 if not self._is_entire_active_app_context_unknown(latest_active_app_context):
                     focus_block = self._format_active_app_context_block(latest_active_app_context)
@@ -301,32 +553,24 @@ class DictationContextManager:
             case None:
                 pass
 
-        self._context.set_messages(messages)
-        logger.debug("Context reset for new recording")
-
-    async def reset_aggregator(self) -> None:
-        """Reset the user aggregator's internal buffer.
-
-        This clears any accumulated transcriptions that haven't been processed.
-        Should be called when starting a new recording to prevent text leakage
-        from previous recordings (especially when LLM was disabled).
-        """
-        await self._aggregator_pair.user().reset()
-        logger.debug("User aggregator buffer reset")
+        return messages
 
-    def user_aggregator(self) -> LLMUserAggregator:
+    def user_aggregator(self) -> RecordingUserAggregator:
         """Get the user aggregator for pipeline placement.
 
         The user aggregator collects transcriptions between UserStartedSpeakingFrame
         and UserStoppedSpeakingFrame, then emits LLMContextFrame to trigger LLM.
+        It switches to each recording's context (and drops leftover transcriptions
+        of a bypassed recording) when the recording's RecordingJobFrame arrives.
         """
-        return self._aggregator_pair.user()
+        return self._user_aggregator
 
     def assistant_aggregator(self) -> LLMAssistantAggregator:
         """Get the assistant aggregator for pipeline placement.
 
-        The assistant aggregator collects LLM responses and adds them to context.
-        For dictation, we don't need response history, but this maintains
-        compatibility with pipecat's expected pipeline structure.
+        The assistant aggregator collects LLM responses into its own context,
+        cleared for each recording. For dictation, we don't need response
+        history, but this maintains compatibility with pipecat's expected
+        pipeline structure.
         """
-        return self._aggregator_pair.assistant()
+        return self._assistant_aggregator
@@ -0,0 +1,795 @@
+"""Deterministic personal dictionary replacement applied before the LLM.
+
+The dictionary prompt section is parsed into structured entries:
+- DictionaryMapping: Explicit `spoken form = written form` entries
+- DictionaryTerm: Single terms the LLM should correct phonetic mismatches towards
+- DictionaryRule: Natural-language instructions that only the LLM can apply
+
+Explicit mappings are compiled into an Aho-Corasick automaton and applied to
+transcriptions by DictionaryReplacementProcessor, so the LLM no longer spends
+prompt tokens on them. Mappings and terms are also indexed phonetically so that
+near-misses ("pipe cat" for Pipecat) are rewritten before LLM formatting.
+Only unresolved entries (terms and rules) stay in the prompt, and for each
+recording they can be narrowed further to the entries relevant to the final
+transcript (DictionaryRetrievalIndex) within a token budget. Terms are also
+sent to the STT provider's keyword boosting, and while the active STT boosts
+them, terms without a gloss are left out of the prompt as well. Compiled
+dictionaries are cached by content hash and shared across connections, since
+most clients send one of a handful of dictionary versions.
+
+Pipeline position:
+    TurnController → DictionaryReplacementProcessor → LLMGateFilter
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Final
+
+from pipecat.frames.frames import (
+    Frame,
+    TranscriptionFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from processors.llm import estimate_token_count
+from processors.phonetic import MIN_PHONETIC_MATCH_LETTERS, PhoneticIndex, phonetic_key
+from processors.recording_jobs import RecordingJob, RecordingJobFrame
+from utils.logger import logger
+
+if TYPE_CHECKING:
+    from processors.context_manager import DictationContextManager
+    from processors.transcript_history import TranscriptHistory
+
+# Compiled dictionaries kept in memory (shared by all connections)
+MAX_CACHED_COMPILED_DICTIONARIES: Final[int] = 64
+
+# Entries with longer spoken forms are treated as natural-language rules
+MAX_MAPPING_SPOKEN_FORM_WORDS: Final[int] = 8
+
+# Single-term entries longer than this are treated as natural-language rules
+MAX_TERM_WORDS: Final[int] = 5
+
+# Terms sent to STT keyword boosting (the smallest provider limit, AssemblyAI keyterms)
+MAX_STT_BOOST_TERMS: Final[int] = 100
+MAX_STT_BOOST_TERM_LENGTH: Final[int] = 50
+
+ENTRIES_HEADING_PATTERN: Final[re.Pattern[str]] = re.compile(
+    r"^#{2,6}\s*entries\s*$", re.IGNORECASE
+)
+SUBHEADING_PATTERN: Final[re.Pattern[str]] = re.compile(r"^#{3,6}\s+\S")
+BULLET_PATTERN: Final[re.Pattern[str]] = re.compile(r"^\s*[-*+]\s+(?P<content>.+?)\s*$")
+TRAILING_GLOSS_PATTERN: Final[re.Pattern[str]] = re.compile(
+    r"^(?P<term>.+?)\s*\((?P<gloss>[^()]*)\)$"
+)
+SENTENCE_PUNCTUATION_PATTERN: Final[re.Pattern[str]] = re.compile(r"[.!?;:]\s|[.!?]$")
+WHITESPACE_PATTERN: Final[re.Pattern[str]] = re.compile(r"\s+")
+LEXICAL_TOKEN_PATTERN: Final[re.Pattern[str]] = re.compile(r"[^\W_]+")
+
+# Shorter words are too common to select dictionary entries lexically
+MIN_LEXICAL_TOKEN_LENGTH: Final[int] = 3
+
+
+# =============================================================================
+# Dictionary Entry Types
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class DictionaryMapping:
+    """Explicit mapping from a spoken form to its written form (e.g. `ant row pick = Anthropic`)."""
+
+    spoken_form: str
+    written_form: str
+    source_line: str
+
+
+@dataclass(frozen=True)
+class DictionaryTerm:
+    """Single term whose phonetic mismatches should be corrected (e.g. `Pipecat`)."""
+
+    term: str
+    gloss: str | None
+    source_line: str
+
+
+@dataclass(frozen=True)
+class DictionaryRule:
+    """Natural-language instruction that can only be applied by the LLM."""
+
+    text: str
+    source_line: str
+
+
+DictionaryEntry = DictionaryMapping | DictionaryTerm | DictionaryRule
+
+
+def _strip_inline_code(value: str) -> str:
+    return value.strip().strip("`").strip()
+
+
+def _normalize_spoken_form(spoken_form: str) -> str:
+    return WHITESPACE_PATTERN.sub(" ", _fold_case(spoken_form)).strip()
+
+
+def _fold_case(text: str) -> str:
+    """Lowercase text without changing its length, so match offsets stay valid."""
+    return "".join(
+        lowered if len(lowered := character.lower()) == 1 else character for character in text
+    )
+
+
+def parse_dictionary_entry(entry_text: str) -> DictionaryEntry:
+    """Classify a single dictionary bullet into a typed entry.
+
+    Args:
+        entry_text: The bullet content without its leading marker
+
+    Returns:
+        The parsed mapping, term, or rule
+    """
+    stripped_entry_text = _strip_inline_code(entry_text)
+    spoken_part, separator, written_part = stripped_entry_text.partition("=")
+    spoken_form = _strip_inline_code(spoken_part)
+    written_form_with_gloss = _strip_inline_code(written_part)
+
+    if (
+        separator
+        and spoken_form
+        and written_form_with_gloss
+        and len(spoken_form.split()) <= MAX_MAPPING_SPOKEN_FORM_WORDS
+        and not SENTENCE_PUNCTUATION_PATTERN.search(spoken_form)
+    ):
+        gloss_match = TRAILING_GLOSS_PATTERN.match(written_form_with_gloss)
+        written_form = gloss_match.group("term") if gloss_match else written_form_with_gloss
+        return DictionaryMapping(
+            spoken_form=spoken_form,
+            written_form=written_form,
+            source_line=entry_text,
+        )
+
+    gloss_match = TRAILING_GLOSS_PATTERN.match(stripped_entry_text)
+    term = gloss_match.group("term") if gloss_match else stripped_entry_text
+    if (
+        not separator
+        and len(term.split()) <= MAX_TERM_WORDS
+        and not SENTENCE_PUNCTUATION_PATTERN.search(term)
+    ):
+        return DictionaryTerm(
+            term=term,
+            gloss=gloss_match.group("gloss") if gloss_match else None,
+            source_line=entry_text,
+        )
+
+    return DictionaryRule(text=stripped_entry_text, source_line=entry_text)
+
+
+@dataclass(frozen=True)
+class _EntryGroup:
+    """Entries listed under one sub-heading (or none) in the entries block."""
+
+    heading: str | None
+    entries: tuple[DictionaryEntry, ...]
+
+
+@dataclass(frozen=True)
+class ParsedDictionarySection:
+    """Dictionary prompt section split into instructions and structured entries."""
+
+    preamble: str
+    entries_heading: str | None
+    entry_groups: tuple[_EntryGroup, ...]
+
+    @property
+    def entries(self) -> tuple[DictionaryEntry, ...]:
+        return tuple(entry for group in self.entry_groups for entry in group.entries)
+
+    def render(self, keep_entry: Callable[[DictionaryEntry], bool]) -> str | None:
+        """Render the section keeping only entries accepted by `keep_entry`.
+
+        Sub-headings without remaining entries are dropped. Returns None when
+        no entries remain, so the whole section can be omitted from the prompt.
+        """
+        rendered_groups: list[str] = []
+        for group in self.entry_groups:
+            kept_lines = [f"- {entry.source_line}" for entry in group.entries if keep_entry(entry)]
+            if not kept_lines:
+                continue
+            group_lines = [group.heading, *kept_lines] if group.heading else kept_lines
+            rendered_groups.append("\n".join(group_lines))
+
+        if not rendered_groups:
+            return None
+
+        header_parts = [part for part in (self.preamble, self.entries_heading) if part]
+        return "\n\n".join([*header_parts, *rendered_groups])
+
+
+def parse_dictionary_section(section_text: str) -> ParsedDictionarySection:
+    """Parse a dictionary prompt section into preamble and grouped entries.
+
+    Entries are the bullets after the `### Entries` heading. Sections without
+    that heading (hand-written custom dictionaries) treat every bullet as an entry.
+    Non-bullet lines inside the entries block are kept as natural-language rules.
+
+    Args:
+        section_text: The full dictionary section (default or custom)
+
+    Returns:
+        The parsed section
+    """
+    lines = section_text.splitlines()
+    entries_heading_index = next(
+        (index for index, line in enumerate(lines) if ENTRIES_HEADING_PATTERN.match(line.strip())),
+        None,
+    )
+
+    preamble_lines: list[str] = []
+    entry_lines: list[str]
+    if entries_heading_index is None:
+        entry_lines = []
+        for line in lines:
+            (entry_lines if BULLET_PATTERN.match(line) else preamble_lines).append(line)
+        entries_heading = None
+    else:
+        preamble_lines = lines[:entries_heading_index]
+        entry_lines = lines[entries_heading_index + 1 :]
+        entries_heading = lines[entries_heading_index].strip()
+
+    entry_groups: list[_EntryGroup] = []
+    current_heading: str | None = None
+    current_entries: list[DictionaryEntry] = []
+    for line in entry_lines:
+        stripped_line = line.strip()
+        if not stripped_line:
+            continue
+        if SUBHEADING_PATTERN.match(stripped_line):
+            if current_entries:
+                entry_groups.append(_EntryGroup(current_heading, tuple(current_entries)))
+            current_heading = stripped_line
+            current_entries = []
+            continue
+        bullet_match = BULLET_PATTERN.match(line)
+        if bullet_match:
+            current_entries.append(parse_dictionary_entry(bullet_match.group("content")))
+        else:
+            current_entries.append(DictionaryRule(text=stripped_line, source_line=stripped_line))
+
+    if current_entries:
+        entry_groups.append(_EntryGroup(current_heading, tuple(current_entries)))
+
+    return ParsedDictionarySection(
+        preamble="\n".join(preamble_lines).strip(),
+        entries_heading=entries_heading,
+        entry_groups=tuple(entry_groups),
+    )
+
+
+# =============================================================================
+# Aho-Corasick Automaton
+# =============================================================================
+
+
+class AhoCorasickAutomaton:
+    """Multi-pattern string matcher that finds all patterns in one pass over the text.
+
+    Patterns are matched case-insensitively. Matching cost is linear in the text
+    length plus the number of matches, independent of dictionary size.
+    """
+
+    def __init__(self, patterns: list[str]) -> None:
+        """Build the automaton.
+
+        Args:
+            patterns: Patterns to match (already normalized)
+        """
+        self._pattern_lengths: list[int] = [len(pattern) for pattern in patterns]
+        self._transitions: list[dict[str, int]] = [{}]
+        self._failure_links: list[int] = [0]
+        self._outputs: list[list[int]] = [[]]
+
+        for pattern_index, pattern in enumerate(patterns):
+            state = 0
+            for character in pattern:
+                next_state = self._transitions[state].get(character)
+                if next_state is None:
+                    next_state = len(self._transitions)
+                    self._transitions.append({})
+                    self._failure_links.append(0)
+                    self._outputs.append([])
+                    self._transitions[state][character] = next_state
+                state = next_state
+            self._outputs[state].append(pattern_index)
+
+        # Breadth-first construction of failure links
+        queue: list[int] = list(self._transitions[0].values())
+        queue_position = 0
+        while queue_position < len(queue):
+            state = queue[queue_position]
+            queue_position += 1
+            for character, next_state in self._transitions[state].items():
+                queue.append(next_state)
+                failure_state = self._failure_links[state]
+                while failure_state and character not in self._transitions[failure_state]:
+                    failure_state = self._failure_links[failure_state]
+                fallback_state = self._transitions[failure_state].get(character, 0)
+                self._failure_links[next_state] = (
+                    fallback_state if fallback_state != next_state else 0
+                )
+                self._outputs[next_state].extend(self._outputs[self._failure_links[next_state]])
+
+    def find_all(self, folded_text: str) -> list[tuple[int, int, int]]:
+        """Find every pattern occurrence, including overlapping ones.
+
+        Args:
+            folded_text: Text lowercased with `_fold_case` (same length as the original)
+
+        Returns:
+            List of (start, end, pattern_index) tuples
+        """
+        matches: list[tuple[int, int, int]] = []
+        state = 0
+        for position, character in enumerate(folded_text):
+            while state and character not in self._transitions[state]:
+                state = self._failure_links[state]
+            state = self._transitions[state].get(character, 0)
+            for pattern_index in self._outputs[state]:
+                end = position + 1
+                matches.append((end - self._pattern_lengths[pattern_index], end, pattern_index))
+        return matches
+
+
+# =============================================================================
+# Relevance Retrieval
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class DictionaryPromptSelection:
+    """Dictionary prompt section narrowed to entries relevant to one transcript.
+
+    Attributes:
+        prompt: Rendered section, or None if no entry was selected
+        selected_entry_count: Entries kept in the prompt
+        unresolved_entry_count: Entries the LLM would see without retrieval
+        prompt_token_estimate: Estimated tokens of the selected section
+        unresolved_prompt_token_estimate: Estimated tokens without retrieval
+    """
+
+    prompt: str | None
+    selected_entry_count: int
+    unresolved_entry_count: int
+    prompt_token_estimate: int
+    unresolved_prompt_token_estimate: int
+
+
+def _lexical_tokens(text: str) -> set[str]:
+    return {
+        token
+        for token in LEXICAL_TOKEN_PATTERN.findall(_fold_case(text))
+        if len(token) >= MIN_LEXICAL_TOKEN_LENGTH
+    }
+
+
+def _word_phonetic_keys(text: str) -> set[str]:
+    return {
+        phonetic_key(word)
+        for word in LEXICAL_TOKEN_PATTERN.findall(_fold_case(text))
+        if len(word) >= MIN_PHONETIC_MATCH_LETTERS
+    }
+
+
+class DictionaryRetrievalIndex:
+    """Lexical and phonetic index over the entries the LLM still has to handle.
+
+    Terms are indexed by their words (and gloss words) and by phonetic keys
+    of the whole term and of each word, so "pipe cat" in a transcript selects
+    the Pipecat entry. Natural-language rules cannot be matched reliably and
+    are always selected first.
+    """
+
+    def __init__(
+        self,
+        section: ParsedDictionarySection,
+        unresolved_prompt: str | None,
+        keep_entry: Callable[[DictionaryEntry], bool] | None = None,
+    ) -> None:
+        """Build the index.
+
+        Args:
+            section: The parsed dictionary section
+            unresolved_prompt: The section rendered with all prompted entries
+            keep_entry: Which unresolved entries may be prompted, or None for all
+        """
+        self._section = section
+        self._unresolved_prompt_token_estimate = (
+            estimate_token_count(unresolved_prompt) if unresolved_prompt else 0
+        )
+        self._entry_indices_by_lexical_token: dict[str, list[int]] = {}
+        self._entry_indices_by_phonetic_key: dict[str, list[int]] = {}
+        self._always_selected_indices: list[int] = []
+        self._unresolved_entry_count = 0
+        self._max_term_words = 1
+
+        self._entries = section.entries
+        self._entry_headings = [
+            group.heading for group in section.entry_groups for _ in group.entries
+        ]
+        for entry_index, entry in enumerate(self._entries):
+            if keep_entry is not None and not keep_entry(entry):
+                continue
+            match entry:
+                case DictionaryTerm(term=term, gloss=gloss):
+                    self._unresolved_entry_count += 1
+                    self._max_term_words = max(self._max_term_words, len(term.split()))
+                    for token in _lexical_tokens(f"{term} {gloss or ''}"):
+                        self._entry_indices_by_lexical_token.setdefault(token, []).append(
+                            entry_index
+                        )
+                    for key in {phonetic_key(term), *_word_phonetic_keys(term)}:
+                        if key:
+                            self._entry_indices_by_phonetic_key.setdefault(key, []).append(
+                                entry_index
+                            )
+                case DictionaryRule():
+                    self._unresolved_entry_count += 1
+                    self._always_selected_indices.append(entry_index)
+                case DictionaryMapping():
+                    pass
+
+    def _transcript_phonetic_keys(self, transcript: str) -> set[str]:
+        words = LEXICAL_TOKEN_PATTERN.findall(_fold_case(transcript))
+        keys: set[str] = set()
+        # Adjacent words are also joined, so split near-misses reach one-word terms
+        for start in range(len(words)):
+            for end in range(start + 1, min(start + self._max_term_words + 1, len(words)) + 1):
+                if len("".join(words[start:end])) >= MIN_PHONETIC_MATCH_LETTERS:
+                    keys.add(phonetic_key(" ".join(words[start:end])))
+        return keys
+
+    def select(self, transcript: str, token_budget: int) -> DictionaryPromptSelection:
+        """Select the entries relevant to a transcript within a token budget.
+
+        Rules come first, then terms ranked by how many lexical and phonetic
+        keys they share with the transcript. The section is rendered in its
+        original order.
+
+        Args:
+            transcript: The final (dictionary-corrected) transcript
+            token_budget: Maximum estimated tokens of the rendered section
+
+        Returns:
+            The selected prompt section with size metrics
+        """
+        match_counts: dict[int, int] = {}
+        for token in _lexical_tokens(transcript):
+            for entry_index in self._entry_indices_by_lexical_token.get(token, ()):
+                match_counts[entry_index] = match_counts.get(entry_index, 0) + 1
+        for key in self._transcript_phonetic_keys(transcript):
+            for entry_index in self._entry_indices_by_phonetic_key.get(key, ()):
+                match_counts[entry_index] = match_counts.get(entry_index, 0) + 1
+
+        ranked_indices = [
+            *self._always_selected_indices,
+            *sorted(
+                match_counts, key=lambda entry_index: (-match_counts[entry_index], entry_index)
+            ),
+        ]
+
+        header_text = "\n\n".join(
+            part for part in (self._section.preamble, self._section.entries_heading) if part
+        )
+        used_tokens = estimate_token_count(header_text)
+        used_headings: set[str] = set()
+        selected_entries: set[int] = set()
+        for entry_index in ranked_indices:
+            heading = self._entry_headings[entry_index]
+            entry_tokens = estimate_token_count(f"- {self._entries[entry_index].source_line}")
+            if heading and heading not in used_headings:
+                entry_tokens += estimate_token_count(heading)
+            if used_tokens + entry_tokens > token_budget:
+                continue
+            used_tokens += entry_tokens
+            selected_entries.add(entry_index)
+            if heading:
+                used_headings.add(heading)
+
+        # Entries are compared by identity: identical lines may appear in several groups
+        selected_entry_ids = {id(self._entries[entry_index]) for entry_index in selected_entries}
+        prompt = self._section.render(lambda entry: id(entry) in selected_entry_ids)
+        return DictionaryPromptSelection(
+            prompt=prompt,
+            selected_entry_count=len(selected_entries),
+            unresolved_entry_count=self._unresolved_entry_count,
+            prompt_token_estimate=estimate_token_count(prompt) if prompt else 0,
+            unresolved_prompt_token_estimate=self._unresolved_prompt_token_estimate,
+        )
+
+
+# =============================================================================
+# Compiled Dictionary
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class DictionaryReplacementResult:
+    """Transcript after exact dictionary mappings were applied."""
+
+    text: str
+    replacement_count: int
+
+
+def _is_word_boundary(text: str, index: int) -> bool:
+    return index < 0 or index >= len(text) or not text[index].isalnum()
+
+
+def _match_case(matched_text: str, written_form: str) -> str:
+    """Keep sentence-initial capitalization for all-lowercase written forms."""
+    if written_form.islower() and matched_text[:1].isupper():
+        return written_form[:1].upper() + written_form[1:]
+    return written_form
+
+
+@dataclass(frozen=True)
+class CompiledDictionary:
+    """A dictionary section compiled for deterministic replacement.
+
+    Attributes:
+        content_hash: SHA-256 of the section text (cache key)
+        section: The parsed section
+        mappings: Explicit mappings in automaton pattern order
+        unresolved_prompt: Prompt section with only entries the LLM must still
+            handle, or None if every entry was resolved deterministically
+        phonetic_index: Phonetic index over mapping spoken forms and single terms
+        retrieval_index: Index selecting unresolved entries relevant to a transcript
+        stt_boost_terms: Terms to send to STT keyword boosting
+        stt_boosted_prompt: Unresolved prompt without the boosted terms that
+            carry no gloss, used while the active STT boosts `stt_boost_terms`
+        stt_boosted_retrieval_index: Retrieval index over `stt_boosted_prompt`
+    """
+
+    content_hash: str
+    section: ParsedDictionarySection
+    mappings: tuple[DictionaryMapping, ...]
+    unresolved_prompt: str | None
+    phonetic_index: PhoneticIndex = field(repr=False)
+    retrieval_index: DictionaryRetrievalIndex = field(repr=False)
+    stt_boost_terms: tuple[str, ...]
+    stt_boosted_prompt: str | None
+    stt_boosted_retrieval_index: DictionaryRetrievalIndex = field(repr=False)
+    _automaton: AhoCorasickAutomaton = field(repr=False)
+
+    def apply_exact_mappings(self, text: str) -> DictionaryReplacementResult:
+        """Replace whole-word occurrences of mapped spoken forms with their written forms.
+
+        Overlapping matches resolve leftmost-longest, so `see dee forty-five`
+        wins over a shorter mapping that starts at the same position.
+        """
+        if not self.mappings or not text:
+            return DictionaryReplacementResult(text=text, replacement_count=0)
+
+        candidate_matches = [
+            (start, end, pattern_index)
+            for start, end, pattern_index in self._automaton.find_all(_fold_case(text))
+            if (not text[start].isalnum() or _is_word_boundary(text, start - 1))
+            and (not text[end - 1].isalnum() or _is_word_boundary(text, end))
+        ]
+        if not candidate_matches:
+            return DictionaryReplacementResult(text=text, replacement_count=0)
+
+        candidate_matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+
+        replaced_parts: list[str] = []
+        cursor = 0
+        replacement_count = 0
+        for start, end, pattern_index in candidate_matches:
+            if start < cursor:
+                continue
+            replaced_parts.append(text[cursor:start])
+            replaced_parts.append(
+                _match_case(text[start:end], self.mappings[pattern_index].written_form)
+            )
+            cursor = end
+            replacement_count += 1
+        replaced_parts.append(text[cursor:])
+
+        return DictionaryReplacementResult(
+            text="".join(replaced_parts), replacement_count=replacement_count
+        )
+
+    def apply_phonetic_matches(
+        self, text: str, max_edit_ratio: float
+    ) -> DictionaryReplacementResult:
+        """Rewrite near-miss spellings of dictionary phrases.
+
+        Args:
+            text: Transcript text (after exact mappings)
+            max_edit_ratio: Maximum edit distance relative to the dictionary phrase length
+        """
+        phonetic_result = self.phonetic_index.rewrite(text, max_edit_ratio)
+        return DictionaryReplacementResult(
+            text=phonetic_result.text, replacement_count=phonetic_result.replacement_count
+        )
+
+
+def _build_compiled_dictionary(section_text: str, content_hash: str) -> CompiledDictionary:
+    section = parse_dictionary_section(section_text)
+
+    mappings_by_spoken_form: dict[str, DictionaryMapping] = {}
+    phonetic_phrases: list[tuple[str, str]] = []
+    stt_boost_terms_by_folded_term: dict[str, str] = {}
+    for entry in section.entries:
+        match entry:
+            case DictionaryMapping(spoken_form=spoken_form, written_form=written_form):
+                normalized_spoken_form = _normalize_spoken_form(spoken_form)
+                mappings_by_spoken_form.setdefault(normalized_spoken_form, entry)
+                phonetic_phrases.append((spoken_form, written_form))
+            case DictionaryTerm(term=term):
+                phonetic_phrases.append((term, term))
+                if (
+                    len(term) <= MAX_STT_BOOST_TERM_LENGTH
+                    and len(stt_boost_terms_by_folded_term) < MAX_STT_BOOST_TERMS
+                ):
+                    stt_boost_terms_by_folded_term.setdefault(_fold_case(term), term)
+            case DictionaryRule():
+                pass
+
+    mappings = tuple(mappings_by_spoken_form.values())
+
+    def is_unresolved(entry: DictionaryEntry) -> bool:
+        match entry:
+            case DictionaryMapping():
+                return False
+            case DictionaryTerm() | DictionaryRule():
+                return True
+
+    def is_prompted_with_stt_boost(entry: DictionaryEntry) -> bool:
+        # Glosses carry meaning the STT cannot use, so those terms stay in the prompt
+        match entry:
+            case DictionaryTerm(term=term, gloss=None):
+                return _fold_case(term) not in stt_boost_terms_by_folded_term
+            case _:
+                return is_unresolved(entry)
+
+    unresolved_prompt = section.render(is_unresolved)
+    stt_boosted_prompt = section.render(is_prompted_with_stt_boost)
+    return CompiledDictionary(
+        content_hash=content_hash,
+        section=section,
+        mappings=mappings,
+        unresolved_prompt=unresolved_prompt,
+        phonetic_index=PhoneticIndex(phonetic_phrases),
+        retrieval_index=DictionaryRetrievalIndex(section, unresolved_prompt),
+        stt_boost_terms=tuple(stt_boost_terms_by_folded_term.values()),
+        stt_boosted_prompt=stt_boosted_prompt,
+        stt_boosted_retrieval_index=DictionaryRetrievalIndex(
+            section, stt_boosted_prompt, keep_entry=is_prompted_with_stt_boost
+        ),
+        _automaton=AhoCorasickAutomaton(list(mappings_by_spoken_form.keys())),
+    )
+
+
+_compiled_dictionary_cache: OrderedDict[str, CompiledDictionary] = OrderedDict()
+
+
+def compile_dictionary_section(section_text: str) -> CompiledDictionary:
+    """Compile a dictionary section, reusing a cached result for identical content.
+
+    Args:
+        section_text: The full dictionary section (default or custom)
+
+    Returns:
+        The compiled dictionary
+    """
+    content_hash = hashlib.sha256(section_text.encode("utf-8")).hexdigest()
+    cached_dictionary = _compiled_dictionary_cache.get(content_hash)
+    if cached_dictionary is not None:
+        _compiled_dictionary_cache.move_to_end(content_hash)
+        return cached_dictionary
+
+    compiled_dictionary = _build_compiled_dictionary(section_text, content_hash)
+    _compiled_dictionary_cache[content_hash] = compiled_dictionary
+    if len(_compiled_dictionary_cache) > MAX_CACHED_COMPILED_DICTIONARIES:
+        _compiled_dictionary_cache.popitem(last=False)
+
+    logger.info(
+        f"Compiled dictionary {content_hash[:12]}: {len(compiled_dictionary.mappings)} exact "
+        f"mappings, {len(compiled_dictionary.section.entries) - len(compiled_dictionary.mappings)} "
+        "entries left for the LLM"
+    )
+    return compiled_dictionary
+
+
+# =============================================================================
+# Dictionary Replacement Processor
+# =============================================================================
+
+
+class DictionaryReplacementProcessor(FrameProcessor):
+    """Applies dictionary corrections to transcriptions before the LLM.
+
+    Exact mappings are applied first, then confident phonetic matches (when
+    enabled). Reads the compiled dictionary from the connection's
+    DictationContextManager, so prompt updates via the config API take effect
+    on the next transcription.
+
+    Corrected transcriptions are collected for the current recording. When the
+    turn ends, the context manager narrows the dictionary prompt in the
+    recording job's context to entries relevant to the transcript, before the
+    aggregator triggers the LLM, and the transcript is recorded in the
+    connection's transcript history (when enabled) for later reformatting.
+    """
+
+    def __init__(
+        self,
+        context_manager: DictationContextManager,
+        phonetic_max_edit_ratio: float | None = None,
+        transcript_history: TranscriptHistory | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the dictionary replacement processor.
+
+        Args:
+            context_manager: Source of the currently configured dictionary
+            phonetic_max_edit_ratio: Edit-distance threshold for phonetic matches,
+                or None to disable phonetic matching
+            transcript_history: Where final transcripts are recorded for
+                reformatting, or None to keep no history
+        """
+        super().__init__(**kwargs)
+        self._context_manager = context_manager
+        self._phonetic_max_edit_ratio = phonetic_max_edit_ratio
+        self._transcript_history = transcript_history
+        self._recording_transcript_parts: list[str] = []
+        self._recording_job: RecordingJob | None = None
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
+        """Rewrite transcription text using the active compiled dictionary."""
+        await super().process_frame(frame, direction)
+
+        match frame:
+            case TranscriptionFrame(text=text) if text:
+                compiled_dictionary = self._context_manager.compiled_dictionary
+                if compiled_dictionary is not None:
+                    replacement_result = compiled_dictionary.apply_exact_mappings(text)
+                    replacement_count = replacement_result.replacement_count
+                    if self._phonetic_max_edit_ratio is not None:
+                        replacement_result = compiled_dictionary.apply_phonetic_matches(
+                            replacement_result.text, self._phonetic_max_edit_ratio
+                        )
+                        replacement_count += replacement_result.replacement_count
+                    if replacement_count:
+                        logger.debug(
+                            f"Dictionary applied {replacement_count} "
+                            f"replacements: '{text}' -> '{replacement_result.text}'"
+                        )
+                        frame.text = replacement_result.text
+                self._recording_transcript_parts.append(frame.text)
+                await self.push_frame(frame, direction)
+
+            case RecordingJobFrame(job=job):
+                self._recording_job = job
+                await self.push_frame(frame, direction)
+
+            case UserStartedSpeakingFrame():
+                self._recording_transcript_parts = []
+                await self.push_frame(frame, direction)
+
+            case UserStoppedSpeakingFrame():
+                transcript = " ".join(self._recording_transcript_parts)
+                self._context_manager.select_dictionary_for_transcript(
+                    transcript, self._recording_job
+                )
+                if self._transcript_history is not None:
+                    self._transcript_history.record(transcript, self._recording_job)
+                self._recording_transcript_parts = []
+                await self.push_frame(frame, direction)
+
+            case _:
+                await self.push_frame(frame, direction)
@@ -0,0 +1,539 @@
+"""Exact-match cache for LLM formatting results, shared by all connections.
+
+Short dictated phrases recur constantly, and for the same system prompt and
+model the formatted output is the same. FormattingResultCache stores results
+keyed by (normalized transcript, system prompt hash, LLM provider/model)
+with LRU eviction under a memory cap and a TTL. Concurrent identical requests
+are collapsed: the first one claims the key and calls the LLM, later ones
+wait for its result instead of issuing their own call (single-flight).
+
+Each connection places a FormattingCacheProcessorPair around the LLM:
+- The lookup processor answers cache hits with LLM response frames, so the
+  assistant aggregator and the client see a normal LLM response
+- The store processor records the streamed LLM response for claimed keys
+
+Stored results remember the client that stored them. A client that opts out
+has its stored results purged, so other clients no longer receive text
+dictated by it; the opt-out is kept in the state store by client UUID and
+applied again when the client reconnects.
+
+Pipeline position:
+    LLMUserAggregator → lookup → LLMSwitcher → store → LLMAssistantAggregator
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Final, cast
+
+from pipecat.frames.frames import (
+    ErrorFrame,
+    Frame,
+    InterruptionFrame,
+    LLMContextFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from utils.logger import logger
+
+if TYPE_CHECKING:
+    from pipecat.pipeline.llm_switcher import LLMSwitcher
+    from pipecat.processors.aggregators.llm_context import LLMContextMessage
+
+# Approximate per-entry overhead (key hash, bookkeeping) counted against the memory cap
+CACHE_ENTRY_OVERHEAD_BYTES: Final[int] = 256
+
+# Marks response frames that must not be stored (cache hits, fallback output)
+NOT_CACHEABLE_METADATA_KEY: Final[str] = "formatting_not_cacheable"
+# Marks the end frame of a response standing in for an abandoned LLM response,
+# whose claimed key is released
+ABANDONED_RESPONSE_METADATA_KEY: Final[str] = "formatting_response_abandoned"
+
+WHITESPACE_PATTERN: Final[re.Pattern[str]] = re.compile(r"\s+")
+
+
+# =============================================================================
+# Cache Keys and Lookup Results
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class FormattingCacheKey:
+    """Identifies one formatting request.
+
+    Attributes:
+        transcript: Transcript with whitespace normalized (case and punctuation kept,
+            since the formatted output can depend on them)
+        system_prompt_hash: SHA-256 of all system messages sent with the transcript
+        llm_identity: LLM provider class and model name
+    """
+
+    transcript: str
+    system_prompt_hash: str
+    llm_identity: str
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.transcript.encode("utf-8")) + CACHE_ENTRY_OVERHEAD_BYTES
+
+
+@dataclass(frozen=True)
+class FormattingCacheHit:
+    """A stored result was found."""
+
+    text: str
+
+
+@dataclass(frozen=True)
+class FormattingCacheInFlight:
+    """An identical request is already running; its result resolves the future.
+
+    The future resolves to None if that request fails or is abandoned.
+    """
+
+    result: asyncio.Future[str | None]
+
+
+@dataclass(frozen=True)
+class FormattingCacheMiss:
+    """No result is stored; the caller now owns the key and must complete or abandon it."""
+
+
+FormattingCacheLookup = FormattingCacheHit | FormattingCacheInFlight | FormattingCacheMiss
+
+
+@dataclass(frozen=True)
+class FormattingCacheStats:
+    """Point-in-time cache metrics."""
+
+    entry_count: int
+    size_bytes: int
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups answered without a new LLM call."""
+        lookups = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / lookups if lookups else 0.0
+
+
+@dataclass(frozen=True)
+class _CachedFormatting:
+    text: str
+    size_bytes: int
+    expires_at: float
+    client_uuid: str | None
+
+
+# =============================================================================
+# Formatting Result Cache
+# =============================================================================
+
+
+class FormattingResultCache:
+    """LRU + TTL cache of formatting results with single-flight de-duplication.
+
+    All methods must be called from the event loop thread.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl_secs: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Memory cap for stored transcripts and results
+            ttl_secs: Seconds a stored result stays valid
+            clock: Monotonic time source (injectable for tests)
+        """
+        self._max_bytes = max_bytes
+        self._ttl_secs = ttl_secs
+        self._clock = clock
+        self._entries: OrderedDict[FormattingCacheKey, _CachedFormatting] = OrderedDict()
+        self._in_flight: dict[FormattingCacheKey, asyncio.Future[str | None]] = {}
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+
+    def lookup(self, key: FormattingCacheKey) -> FormattingCacheLookup:
+        """Look up a result, claiming the key on a miss.
+
+        Args:
+            key: The formatting request
+
+        Returns:
+            A hit, an in-flight request to wait for, or a miss that the caller
+            must resolve with complete() or abandon()
+        """
+        cached = self._entries.get(key)
+        if cached is not None:
+            if cached.expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return FormattingCacheHit(text=cached.text)
+            self._remove(key)
+
+        in_flight_result = self._in_flight.get(key)
+        if in_flight_result is not None:
+            self._coalesced += 1
+            return FormattingCacheInFlight(result=in_flight_result)
+
+        self._misses += 1
+        self._in_flight[key] = asyncio.get_running_loop().create_future()
+        return FormattingCacheMiss()
+
+    def complete(self, key: FormattingCacheKey, text: str, client_uuid: str | None = None) -> None:
+        """Store the result of a claimed key and release waiting requests.
+
+        Args:
+            key: The claimed formatting request
+            text: The formatted result
+            client_uuid: The client whose transcript was formatted (for purge_client())
+        """
+        self._resolve_in_flight(key, text)
+
+        entry_size = key.size_bytes + len(text.encode("utf-8"))
+        if entry_size > self._max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _CachedFormatting(
+            text=text,
+            size_bytes=entry_size,
+            expires_at=self._clock() + self._ttl_secs,
+            client_uuid=client_uuid,
+        )
+        self._size_bytes += entry_size
+        while self._size_bytes > self._max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self._evictions += 1
+
+    def abandon(self, key: FormattingCacheKey) -> None:
+        """Release a claimed key without storing; waiting requests fall back to the LLM."""
+        self._resolve_in_flight(key, None)
+
+    def purge_client(self, client_uuid: str) -> int:
+        """Remove the results stored for a client.
+
+        Returns:
+            The number of results removed
+        """
+        client_keys = [
+            key for key, cached in self._entries.items() if cached.client_uuid == client_uuid
+        ]
+        for key in client_keys:
+            self._remove(key)
+        return len(client_keys)
+
+    def stats(self) -> FormattingCacheStats:
+        """Get the current cache metrics."""
+        return FormattingCacheStats(
+            entry_count=len(self._entries),
+            size_bytes=self._size_bytes,
+            hits=self._hits,
+            misses=self._misses,
+            coalesced=self._coalesced,
+            evictions=self._evictions,
+        )
+
+    def _resolve_in_flight(self, key: FormattingCacheKey, text: str | None) -> None:
+        in_flight_result = self._in_flight.pop(key, None)
+        if in_flight_result is not None and not in_flight_result.done():
+            in_flight_result.set_result(text)
+
+    def _remove(self, key: FormattingCacheKey) -> None:
+        removed = self._entries.pop(key)
+        self._size_bytes -= removed.size_bytes
+
+
+# =============================================================================
+# Cache Key Extraction
+# =============================================================================
+
+
+def message_text_content(message: dict[str, Any]) -> str | None:
+    """Get the text of a context message, or None if it has non-text content."""
+    match message.get("content"):
+        case str() as content:
+            return content
+        case list() as content_parts:
+            return "".join(
+                part.get("text", "")
+                for part in content_parts
+                if isinstance(part, dict) and part.get("type") == "text"
+            )
+        case _:
+            return None
+
+
+def build_formatting_cache_key(
+    messages: list[LLMContextMessage], llm_identity: str
+) -> FormattingCacheKey | None:
+    """Build a cache key from the messages sent to the LLM.
+
+    Args:
+        messages: The LLM context messages (system prompt and user transcript)
+        llm_identity: LLM provider class and model name
+
+    Returns:
+        The cache key, or None if the context has no user transcript
+    """
+    system_prompt_hash = hashlib.sha256()
+    user_transcript: str | None = None
+    for message in messages:
+        if not isinstance(message, dict):
+            return None
+        message_payload = cast(dict[str, Any], message)
+        text = message_text_content(message_payload)
+        if text is None:
+            return None
+        match message_payload.get("role"):
+            case "system":
+                system_prompt_hash.update(text.encode("utf-8"))
+                system_prompt_hash.update(b"\0")
+            case "user":
+                user_transcript = text
+            case _:
+                return None
+
+    if user_transcript is None:
+        return None
+    normalized_transcript = WHITESPACE_PATTERN.sub(" ", user_transcript).strip()
+    if not normalized_transcript:
+        return None
+
+    return FormattingCacheKey(
+        transcript=normalized_transcript,
+        system_prompt_hash=system_prompt_hash.hexdigest(),
+        llm_identity=llm_identity,
+    )
+
+
+# =============================================================================
+# Pipeline Processors
+# =============================================================================
+
+
+@dataclass
+class _PendingFormatting:
+    """A claimed key waiting for the LLM response, in request order."""
+
+    key: FormattingCacheKey
+    failed: bool = False
+
+
+class FormattingCacheProcessorPair:
+    """Per-connection lookup/store processors around the LLM switcher.
+
+    Caching can be disabled per client (privacy); a disabled pair neither
+    reads nor stores transcripts, and disabling it purges the client's results.
+    """
+
+    def __init__(
+        self,
+        cache: FormattingResultCache,
+        in_flight_wait_secs: float,
+        client_uuid: str | None = None,
+        enabled: bool = True,
+    ) -> None:
+        """Initialize the processor pair.
+
+        Args:
+            cache: The shared formatting result cache
+            in_flight_wait_secs: Maximum time to wait for an identical in-flight request
+            client_uuid: The connected client, recorded with the results it stores
+            enabled: False if the client has opted out of caching
+        """
+        self._cache = cache
+        self._in_flight_wait_secs = in_flight_wait_secs
+        self._client_uuid = client_uuid
+        self._enabled = enabled
+        self._llm_switcher: LLMSwitcher | None = None
+        self._pending: deque[_PendingFormatting] = deque()
+        self._lookup = _FormattingCacheLookupProcessor(self)
+        self._store = _FormattingCacheStoreProcessor(self)
+
+    def set_enabled(self, enabled: bool) -> None:
+        """Set whether this client's formatting results are cached.
+
+        Args:
+            enabled: False to bypass the cache entirely for this client
+        """
+        self._enabled = enabled
+        if not enabled:
+            # Responses already requested finish uncached
+            self._mark_pending_failed()
+            if self._client_uuid is not None:
+                purged_count = self._cache.purge_client(self._client_uuid)
+                logger.info(f"Purged {purged_count} cached formatting results for connection")
+        logger.info(f"Formatting cache {'enabled' if enabled else 'disabled'} for connection")
+
+    def get_enabled(self) -> bool:
+        """Get whether this client's formatting results are cached."""
+        return self._enabled
+
+    def set_llm_switcher(self, llm_switcher: LLMSwitcher) -> None:
+        """Set the LLM switcher whose active service identifies cached results."""
+        self._llm_switcher = llm_switcher
+
+    def lookup(self) -> FrameProcessor:
+        """Get the lookup processor (placed before the LLM switcher)."""
+        return self._lookup
+
+    def store(self) -> FrameProcessor:
+        """Get the store processor (placed after the LLM switcher)."""
+        return self._store
+
+    def _build_key(self, frame: LLMContextFrame) -> FormattingCacheKey | None:
+        if not self._enabled or self._llm_switcher is None:
+            return None
+        active_llm = self._llm_switcher.active_llm
+        if active_llm is None:
+            return None
+        llm_identity = f"{type(active_llm).__name__}:{active_llm.model_name}"
+        return build_formatting_cache_key(frame.context.get_messages(), llm_identity)
+
+    def _log_stats(self, outcome: str) -> None:
+        stats = self._cache.stats()
+        logger.info(
+            f"Formatting cache {outcome} (hit ratio {stats.hit_ratio:.1%}, "
+            f"{stats.entry_count} entries, {stats.size_bytes / 1024:.1f} KiB)"
+        )
+
+    def _mark_pending_failed(self) -> None:
+        for pending in self._pending:
+            pending.failed = True
+
+    def _abandon_pending(self) -> None:
+        while self._pending:
+            self._cache.abandon(self._pending.popleft().key)
+
+
+class _FormattingCacheLookupProcessor(FrameProcessor):
+    """Answers LLMContextFrames from the cache or claims them for the LLM."""
+
+    def __init__(self, pair: FormattingCacheProcessorPair, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._pair = pair
+
+    async def cleanup(self) -> None:
+        """Release keys still waiting for a response so other clients don't wait on them."""
+        self._pair._abandon_pending()
+        await super().cleanup()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
+        """Serve cached results and claim uncached requests."""
+        await super().process_frame(frame, direction)
+
+        match frame:
+            case LLMContextFrame() if direction == FrameDirection.DOWNSTREAM:
+                key = self._pair._build_key(frame)
+                if key is None:
+                    await self.push_frame(frame, direction)
+                    return
+                cached_text = await self._resolve(key)
+                if cached_text is None:
+                    await self.push_frame(frame, direction)
+                else:
+                    await self._push_cached_response(cached_text)
+
+            case ErrorFrame():
+                # LLM errors travel upstream; never cache a response that errored
+                self._pair._mark_pending_failed()
+                await self.push_frame(frame, direction)
+
+            case _:
+                await self.push_frame(frame, direction)
+
+    async def _resolve(self, key: FormattingCacheKey) -> str | None:
+        """Return a cached result, or claim the key and return None to call the LLM."""
+        match self._pair._cache.lookup(key):
+            case FormattingCacheHit(text=text):
+                self._pair._log_stats("hit")
+                return text
+            case FormattingCacheInFlight(result=in_flight_result):
+                try:
+                    coalesced_text = await asyncio.wait_for(
+                        asyncio.shield(in_flight_result), self._pair._in_flight_wait_secs
+                    )
+                except TimeoutError:
+                    coalesced_text = None
+                if coalesced_text is not None:
+                    self._pair._log_stats("coalesced")
+                    return coalesced_text
+                # The identical request failed; call the LLM without caching
+                return None
+            case FormattingCacheMiss():
+                self._pair._pending.append(_PendingFormatting(key=key))
+                self._pair._log_stats("miss")
+                return None
+
+    async def _push_cached_response(self, text: str) -> None:
+        response_frames: list[Frame] = [
+            LLMFullResponseStartFrame(),
+            LLMTextFrame(text=text),
+            LLMFullResponseEndFrame(),
+        ]
+        for response_frame in response_frames:
+            response_frame.metadata[NOT_CACHEABLE_METADATA_KEY] = True
+            await self.push_frame(response_frame, FrameDirection.DOWNSTREAM)
+
+
+class _FormattingCacheStoreProcessor(FrameProcessor):
+    """Records streamed LLM responses for keys claimed by the lookup processor."""
+
+    def __init__(self, pair: FormattingCacheProcessorPair, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._pair = pair
+        self._response_parts: list[str] = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
+        """Collect LLM text and store it when the response ends."""
+        await super().process_frame(frame, direction)
+
+        if frame.metadata.get(ABANDONED_RESPONSE_METADATA_KEY):
+            if isinstance(frame, LLMFullResponseEndFrame) and self._pair._pending:
+                self._pair._cache.abandon(self._pair._pending.popleft().key)
+            self._response_parts = []
+        elif not frame.metadata.get(NOT_CACHEABLE_METADATA_KEY):
+            match frame:
+                case InterruptionFrame():
+                    # Interrupted responses are incomplete; release their keys
+                    self._pair._abandon_pending()
+                    self._response_parts = []
+                case LLMFullResponseStartFrame():
+                    self._response_parts = []
+                case LLMTextFrame(text=text):
+                    self._response_parts.append(text)
+                case LLMFullResponseEndFrame() if self._pair._pending:
+                    pending = self._pair._pending.popleft()
+                    response_text = "".join(self._response_parts)
+                    if pending.failed or not response_text.strip():
+                        self._pair._cache.abandon(pending.key)
+                    else:
+                        self._pair._cache.complete(
+                            pending.key, response_text, self._pair._client_uuid
+                        )
+                    self._response_parts = []
+                case _:
+                    pass
+
+        await self.push_frame(frame, direction)
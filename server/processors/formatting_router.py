@@ -0,0 +1,292 @@
+"""Per-recording routing between raw STT output and LLM formatting.
+
+Providers such as Deepgram and Speechmatics already return punctuated,
+capitalized text. When a transcript is short, already punctuated, free of
+filler words and of spoken edit commands (backtracks, list cues, dictated
+punctuation), and the STT is confident, the LLM adds latency without
+changing the result. The FormattingRouter scores each final transcript and
+sends such recordings straight to the client as a RawTranscriptionMessage.
+
+The router only decides; LLMGateFilter applies the decision, and
+FormattingRouteLatencyObserver reports when each routed result reaches the
+client so that per-route latency can be compared.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any, Final, cast
+
+from utils.logger import logger
+
+WORD_PATTERN: Final[re.Pattern[str]] = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+FILLER_WORDS: Final[frozenset[str]] = frozenset(
+    {"um", "umm", "uh", "uhh", "uhm", "er", "erm", "ah", "hmm", "mm", "mhm"}
+)
+
+# Spoken corrections the LLM is expected to resolve
+BACKTRACK_CUES: Final[tuple[str, ...]] = (
+    "scratch that",
+    "no wait",
+    "wait no",
+    "i mean",
+    "or rather",
+    "i meant",
+    "delete that",
+    "let me rephrase",
+    "strike that",
+)
+
+# Spoken structure and dictated punctuation the LLM is expected to apply
+LIST_CUES: Final[tuple[str, ...]] = (
+    "bullet point",
+    "new line",
+    "new paragraph",
+    "next item",
+    "number one",
+    "number two",
+    "firstly",
+    "secondly",
+    "period",
+    "comma",
+    "question mark",
+    "exclamation mark",
+    "full stop",
+    "colon",
+)
+
+TERMINAL_PUNCTUATION: Final[tuple[str, ...]] = (".", "!", "?")
+
+
+class FormattingRoute(StrEnum):
+    """Where a recording's transcript is sent."""
+
+    RAW = "raw"
+    LLM = "llm"
+
+
+@dataclass(frozen=True)
+class FormattingRouteThresholds:
+    """Thresholds a transcript must meet to skip the LLM.
+
+    Attributes:
+        min_stt_confidence: Minimum STT confidence (0.0 - 1.0). Transcripts
+            without a reported confidence always go to the LLM.
+        max_raw_words: Longer transcripts go to the LLM (paragraphing, lists)
+    """
+
+    min_stt_confidence: float
+    max_raw_words: int
+
+
+@dataclass(frozen=True)
+class FormattingRouteDecision:
+    """Routing decision for one transcript.
+
+    Attributes:
+        route: Where the transcript is sent
+        reasons: Why the LLM is needed (empty for the raw route)
+    """
+
+    route: FormattingRoute
+    reasons: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class FormattingRouteStats:
+    """Per-connection counters for one route."""
+
+    decisions: int
+    completed: int
+    total_latency_secs: float
+
+    @property
+    def mean_latency_secs(self) -> float:
+        """Mean seconds from routing to the result reaching the client."""
+        return self.total_latency_secs / self.completed if self.completed else 0.0
+
+
+def _contains_phrase(padded_words: str, phrases: tuple[str, ...]) -> bool:
+    return any(f" {phrase} " in padded_words for phrase in phrases)
+
+
+def route_transcript(
+    text: str, confidence: float | None, thresholds: FormattingRouteThresholds
+) -> FormattingRouteDecision:
+    """Decide whether a transcript can skip LLM formatting.
+
+    Args:
+        text: The final transcript
+        confidence: STT confidence for the transcript, or None if not reported
+        thresholds: Routing thresholds
+
+    Returns:
+        The raw route when every check passes, otherwise the LLM route with reasons
+    """
+    stripped_text = text.strip()
+    words = WORD_PATTERN.findall(stripped_text.lower())
+    padded_words = f" {' '.join(words)} "
+    reasons: list[str] = []
+
+    if not stripped_text.endswith(TERMINAL_PUNCTUATION) or not stripped_text[:1].isupper():
+        reasons.append("unpunctuated")
+    if len(words) > thresholds.max_raw_words:
+        reasons.append("long")
+    if any(word in FILLER_WORDS for word in words):
+        reasons.append("filler words")
+    if _contains_phrase(padded_words, BACKTRACK_CUES):
+        reasons.append("backtrack cue")
+    if _contains_phrase(padded_words, LIST_CUES):
+        reasons.append("list or punctuation cue")
+    if confidence is None:
+        reasons.append("no STT confidence")
+    elif confidence < thresholds.min_stt_confidence:
+        reasons.append("low STT confidence")
+
+    route = FormattingRoute.LLM if reasons else FormattingRoute.RAW
+    return FormattingRouteDecision(route=route, reasons=tuple(reasons))
+
+
+def transcription_confidence(result: object) -> float | None:
+    """Extract an STT confidence from a provider's TranscriptionFrame.result.
+
+    Understands utterance-level confidences (Deepgram, Google, Azure-style
+    alternatives) and averages word-level ones (Speechmatics, AssemblyAI).
+
+    Args:
+        result: The provider result attached to the TranscriptionFrame
+
+    Returns:
+        The confidence (0.0 - 1.0), or None if the provider did not report one
+    """
+    match result:
+        case None | str() | bool():
+            return None
+        case int() | float():
+            return float(result)
+        case list() | tuple():
+            confidences = [transcription_confidence(item) for item in result]
+            known_confidences = [c for c in confidences if c is not None]
+            if not known_confidences:
+                return None
+            return sum(known_confidences) / len(known_confidences)
+        case dict():
+            payload = cast(dict[str, Any], result)
+            for field_name in ("confidence", "channel", "alternatives", "words"):
+                if field_name in payload:
+                    return transcription_confidence(_first_alternative(payload[field_name]))
+            return None
+        case _:
+            for field_name in ("confidence", "channel", "alternatives", "words"):
+                field_value = getattr(result, field_name, None)
+                if field_value is not None:
+                    return transcription_confidence(_first_alternative(field_value))
+            return None
+
+
+def _first_alternative(value: object) -> object:
+    # Alternatives lists are ranked best-first; only the transcript that was used counts
+    if isinstance(value, list) and value and _is_alternative(value[0]):
+        return value[0]
+    return value
+
+
+def _is_alternative(value: object) -> bool:
+    if isinstance(value, dict):
+        return "transcript" in value or "content" in value
+    return hasattr(value, "transcript")
+
+
+class FormattingRouter:
+    """Per-connection router that records decisions and per-route latency.
+
+    Recordings can overlap, so pending routes are kept per recording ID; a
+    recording's latency runs from its routing decision until its result
+    reaches the client.
+    """
+
+    def __init__(
+        self,
+        thresholds: FormattingRouteThresholds,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Initialize the router.
+
+        Args:
+            thresholds: Routing thresholds
+            clock: Monotonic clock in seconds (injectable for tests)
+        """
+        self._thresholds = thresholds
+        self._clock = clock
+        self._pending_routes: dict[int | None, tuple[FormattingRoute, float]] = {}
+        self._stats: dict[FormattingRoute, FormattingRouteStats] = {
+            route: FormattingRouteStats(decisions=0, completed=0, total_latency_secs=0.0)
+            for route in FormattingRoute
+        }
+
+    def route(
+        self, text: str, confidence: float | None, recording_id: int | None = None
+    ) -> FormattingRouteDecision:
+        """Route a final transcript and start timing it.
+
+        Args:
+            text: The final transcript
+            confidence: STT confidence for the transcript, or None if not reported
+            recording_id: ID of the recording the transcript belongs to
+
+        Returns:
+            The routing decision
+        """
+        decision = route_transcript(text, confidence, self._thresholds)
+        route_stats = self._stats[decision.route]
+        self._stats[decision.route] = FormattingRouteStats(
+            decisions=route_stats.decisions + 1,
+            completed=route_stats.completed,
+            total_latency_secs=route_stats.total_latency_secs,
+        )
+        self._pending_routes[recording_id] = (decision.route, self._clock())
+
+        confidence_text = f"{confidence:.2f}" if confidence is not None else "n/a"
+        match decision.route:
+            case FormattingRoute.RAW:
+                logger.info(f"Formatting route: raw (STT confidence {confidence_text})")
+            case FormattingRoute.LLM:
+                logger.info(
+                    f"Formatting route: llm ({', '.join(decision.reasons)}; "
+                    f"STT confidence {confidence_text})"
+                )
+        return decision
+
+    def complete(self, recording_id: int | None = None) -> None:
+        """Record that a routed recording's result reached the client.
+
+        Args:
+            recording_id: ID of the recording whose result was sent
+        """
+        pending_route = self._pending_routes.pop(recording_id, None)
+        if pending_route is None:
+            return
+        route, started_at = pending_route
+        latency_secs = self._clock() - started_at
+        route_stats = self._stats[route]
+        self._stats[route] = FormattingRouteStats(
+            decisions=route_stats.decisions,
+            completed=route_stats.completed + 1,
+            total_latency_secs=route_stats.total_latency_secs + latency_secs,
+        )
+        raw_stats = self._stats[FormattingRoute.RAW]
+        llm_stats = self._stats[FormattingRoute.LLM]
+        logger.info(
+            f"Formatting route {route} completed in {latency_secs * 1000:.0f}ms "
+            f"(raw: {raw_stats.decisions} routed, mean {raw_stats.mean_latency_secs * 1000:.0f}ms; "
+            f"llm: {llm_stats.decisions} routed, mean {llm_stats.mean_latency_secs * 1000:.0f}ms)"
+        )
+
+    def stats(self) -> dict[FormattingRoute, FormattingRouteStats]:
+        """Get this connection's per-route counters."""
+        return dict(self._stats)
@@ -0,0 +1,497 @@
+"""Incremental per-segment formatting for long recordings.
+
+Without it, a recording is formatted in one LLM request after stop, so the
+latency after stop grows with the recording's length. With incremental
+formatting, each natural pause during a recording (VAD stopped speaking, and
+enough words since the previous pause) closes a segment that is formatted in
+the background, with the previous segment's formatted text as context. At
+stop, only the last segment is still pending; the formatted segments are then
+joined in order and delivered as one LLM response.
+
+Long recordings without a segment boundary can instead be split into
+overlapping chunks at stop and formatted in parallel (see chunked_formatting).
+Other recordings take the normal LLM path, so short dictations keep the
+formatting cache and the output guard.
+
+Each connection places an IncrementalFormattingPair around the LLM stage:
+- The segmenter holds the aggregator's turn start until it knows whether the
+  recording was segmented or chunked, and formats segments and chunks out of
+  band via the active LLM. A stopped recording's remaining formatting is
+  awaited in a background task that pushes its result, so the next
+  recording's frames are never held up behind it (RecordingResponseFrame tags
+  each result with its recording)
+- The delivery processor turns the joined result into LLM response frames and
+  reports post-stop latency against recording length for both paths
+
+Pipeline position:
+    LLMGateFilter → segmenter → LLMUserAggregator → LLM stage → delivery → LLMAssistantAggregator
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any, Final
+
+from pipecat.frames.frames import (
+    DataFrame,
+    EndFrame,
+    Frame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+    TranscriptionFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+    VADUserStartedSpeakingFrame,
+    VADUserStoppedSpeakingFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from processors.chunked_formatting import ChunkingConfig, remove_formatted_overlap, split_transcript
+from processors.output_guard import run_formatting_with_output_limit
+from processors.recording_jobs import RecordingJob, RecordingJobFrame, RecordingResponseFrame
+from utils.logger import logger
+
+if TYPE_CHECKING:
+    from pipecat.pipeline.llm_switcher import LLMSwitcher
+
+    from processors.context_manager import DictationContextManager
+
+# A formatted segment starting with a list item goes on its own line
+LIST_ITEM_PATTERN: Final[re.Pattern[str]] = re.compile(r"^(?:\d+[.)]|[-*•])\s")
+
+
+class RecordingFormattingMode(StrEnum):
+    """How a recording was formatted."""
+
+    WHOLE = "whole"
+    INCREMENTAL = "incremental"
+    CHUNKED = "chunked"
+
+
+@dataclass(frozen=True)
+class PostStopLatencyStats:
+    """Per-connection post-stop latency counters for one formatting mode."""
+
+    recordings: int
+    total_recording_secs: float
+    total_post_stop_latency_secs: float
+
+    @property
+    def mean_recording_secs(self) -> float:
+        """Mean recording length in seconds."""
+        return self.total_recording_secs / self.recordings if self.recordings else 0.0
+
+    @property
+    def mean_post_stop_latency_secs(self) -> float:
+        """Mean seconds from stop until the formatted result reached the client."""
+        return self.total_post_stop_latency_secs / self.recordings if self.recordings else 0.0
+
+
+@dataclass
+class IncrementalFormattingResultFrame(DataFrame):
+    """Joined formatted segments of a recording, converted to an LLM response on delivery."""
+
+    text: str
+
+
+def join_formatted_segments(formatted_segments: list[str]) -> str:
+    """Join formatted segments in recording order.
+
+    Segments are joined with a space, or a line break before a segment that
+    starts with a list item or after one that ends with a colon.
+    """
+    joined_text = ""
+    for formatted_segment in formatted_segments:
+        segment_text = formatted_segment.strip()
+        if not segment_text:
+            continue
+        if not joined_text:
+            joined_text = segment_text
+        elif LIST_ITEM_PATTERN.match(segment_text) or joined_text.endswith(":"):
+            joined_text = f"{joined_text}\n{segment_text}"
+        else:
+            joined_text = f"{joined_text} {segment_text}"
+    return joined_text
+
+
+# =============================================================================
+# Pipeline Processors
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class _PendingDelivery:
+    """A stopped recording waiting for its formatted result to reach the client."""
+
+    mode: RecordingFormattingMode
+    recording_secs: float
+    stopped_at: float
+
+
+class IncrementalFormattingPair:
+    """Per-connection segmenter and delivery processors around the LLM stage."""
+
+    def __init__(
+        self,
+        context_manager: DictationContextManager,
+        min_segment_words: int | None,
+        max_output_ratio: float,
+        min_output_tokens: int,
+        chunking: ChunkingConfig | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Initialize the processor pair.
+
+        Args:
+            context_manager: Builds the system messages for each segment
+            min_segment_words: Words a segment needs before a pause closes it,
+                or None to disable segmenting at pauses
+            max_output_ratio: Allowed segment output length as a multiple of the
+                segment transcript (longer output falls back to the transcript)
+            min_output_tokens: Lower bound of the output limit for short segments
+            chunking: Parallel chunked formatting of long unsegmented recordings,
+                or None to disable it
+            clock: Monotonic clock in seconds (injectable for tests)
+        """
+        self._context_manager = context_manager
+        self._min_segment_words = min_segment_words
+        self._max_output_ratio = max_output_ratio
+        self._min_output_tokens = min_output_tokens
+        self._chunking = chunking
+        self._clock = clock
+        self._llm_switcher: LLMSwitcher | None = None
+        # Recordings can overlap, so deliveries are kept per recording ID
+        self._pending_deliveries: dict[int | None, _PendingDelivery] = {}
+        self._stats: dict[RecordingFormattingMode, PostStopLatencyStats] = {
+            mode: PostStopLatencyStats(
+                recordings=0, total_recording_secs=0.0, total_post_stop_latency_secs=0.0
+            )
+            for mode in RecordingFormattingMode
+        }
+        self._segmenter = _RecordingSegmenter(self)
+        self._delivery = _FormattedResultDelivery(self)
+
+    def set_llm_switcher(self, llm_switcher: LLMSwitcher) -> None:
+        """Set the LLM switcher whose active service formats segments."""
+        self._llm_switcher = llm_switcher
+
+    def segmenter(self) -> FrameProcessor:
+        """Get the segmenter (placed before the user aggregator)."""
+        return self._segmenter
+
+    def delivery(self) -> FrameProcessor:
+        """Get the delivery processor (placed before the assistant aggregator)."""
+        return self._delivery
+
+    def stats(self) -> dict[RecordingFormattingMode, PostStopLatencyStats]:
+        """Get this connection's post-stop latency counters per formatting mode."""
+        return dict(self._stats)
+
+    def _start_delivery(
+        self, recording_id: int | None, mode: RecordingFormattingMode, recording_secs: float
+    ) -> None:
+        self._pending_deliveries[recording_id] = _PendingDelivery(
+            mode=mode, recording_secs=recording_secs, stopped_at=self._clock()
+        )
+
+    def _complete_delivery(self, recording_id: int | None) -> None:
+        pending_delivery = self._pending_deliveries.pop(recording_id, None)
+        if pending_delivery is None:
+            return
+        latency_secs = self._clock() - pending_delivery.stopped_at
+        mode_stats = self._stats[pending_delivery.mode]
+        self._stats[pending_delivery.mode] = PostStopLatencyStats(
+            recordings=mode_stats.recordings + 1,
+            total_recording_secs=mode_stats.total_recording_secs + pending_delivery.recording_secs,
+            total_post_stop_latency_secs=mode_stats.total_post_stop_latency_secs + latency_secs,
+        )
+        mode_summaries = "; ".join(
+            f"{mode}: {mode_stats.recordings} recordings, mean "
+            f"{mode_stats.mean_recording_secs:.1f}s -> "
+            f"{mode_stats.mean_post_stop_latency_secs * 1000:.0f}ms"
+            for mode, mode_stats in self._stats.items()
+        )
+        logger.info(
+            f"Post-stop latency {latency_secs * 1000:.0f}ms for a "
+            f"{pending_delivery.recording_secs:.1f}s recording ({pending_delivery.mode}; "
+            f"{mode_summaries})"
+        )
+
+    async def _format_segment(
+        self,
+        transcript: str,
+        previous_segment: asyncio.Task[str] | None,
+        job: RecordingJob | None,
+    ) -> str:
+        """Format one segment once the previous one is formatted (its text is context)."""
+        preceding_text = await previous_segment if previous_segment is not None else None
+        return await self._format_transcript(transcript, preceding_text, job)
+
+    async def _format_chunked(
+        self, transcript_parts: list[str], chunking: ChunkingConfig, job: RecordingJob | None
+    ) -> str:
+        """Format overlapping chunks of a long transcript concurrently and stitch them."""
+        chunks = split_transcript(transcript_parts, chunking.chunk_words, chunking.overlap_words)
+        concurrency_limit = asyncio.Semaphore(chunking.concurrency)
+
+        async def format_chunk(chunk_text: str) -> str:
+            async with concurrency_limit:
+                return await self._format_transcript(chunk_text, None, job)
+
+        formatted_chunks = await asyncio.gather(*(format_chunk(chunk.text) for chunk in chunks))
+        stitched_chunks = [formatted_chunks[0]]
+        for chunk, formatted_chunk, previous_chunk in zip(
+            chunks[1:], formatted_chunks[1:], formatted_chunks, strict=False
+        ):
+            stitched_chunks.append(
+                remove_formatted_overlap(previous_chunk, formatted_chunk, chunk.overlap_words)
+            )
+        logger.info(f"Chunked formatting: {len(chunks)} chunks, {chunking.concurrency} at a time")
+        return join_formatted_segments(stitched_chunks)
+
+    async def _format_transcript(
+        self, transcript: str, preceding_text: str | None, job: RecordingJob | None
+    ) -> str:
+        if self._llm_switcher is None:
+            return transcript
+
+        llm_service = self._llm_switcher.active_llm
+        context = self._context_manager.build_segment_context(transcript, preceding_text, job)
+        result = await run_formatting_with_output_limit(
+            transcript,
+            lambda max_tokens: llm_service.run_inference(context, max_tokens=max_tokens),
+            self._max_output_ratio,
+            self._min_output_tokens,
+            description="Segment formatting",
+        )
+        if result.text is None:
+            logger.debug(f"Using the segment transcript ({result.fallback_reason})")
+            return transcript
+        return result.text
+
+
+class _RecordingSegmenter(FrameProcessor):
+    """Closes segments at natural pauses and formats them in the background."""
+
+    def __init__(self, pair: IncrementalFormattingPair, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._pair = pair
+        self._held_turn_start: UserStartedSpeakingFrame | None = None
+        self._recording_job: RecordingJob | None = None
+        self._recording_started_at = 0.0
+        self._user_speaking = False
+        self._segment_parts: list[str] = []
+        self._segment_tasks: list[asyncio.Task[str]] = []
+        # Stopped recordings whose formatting is still being awaited
+        self._completion_tasks: set[asyncio.Task[None]] = set()
+
+    async def cleanup(self) -> None:
+        """Cancel segment formatting still in flight."""
+        await self._cancel_segments()
+        for completion_task in list(self._completion_tasks):
+            await self.cancel_task(completion_task)
+        await super().cleanup()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
+        """Hold the turn start, cut segments at pauses and finish the recording at stop."""
+        await super().process_frame(frame, direction)
+
+        if direction != FrameDirection.DOWNSTREAM:
+            await self.push_frame(frame, direction)
+            return
+
+        match frame:
+            case RecordingJobFrame(job=job):
+                self._recording_job = job
+                await self.push_frame(frame, direction)
+
+            case UserStartedSpeakingFrame():
+                await self._cancel_segments()
+                self._held_turn_start = frame
+                self._recording_started_at = self._pair._clock()
+                self._segment_parts = []
+
+            case VADUserStartedSpeakingFrame():
+                self._user_speaking = True
+                await self.push_frame(frame, direction)
+
+            case VADUserStoppedSpeakingFrame():
+                self._user_speaking = False
+                self._close_segment_at_pause()
+                await self.push_frame(frame, direction)
+
+            case TranscriptionFrame(text=text) if text and self._held_turn_start is not None:
+                self._segment_parts.append(text)
+                # A final transcript arriving after the pause still belongs to its segment
+                if not self._user_speaking:
+                    self._close_segment_at_pause()
+                await self.push_frame(frame, direction)
+
+            case UserStoppedSpeakingFrame() if self._held_turn_start is not None:
+                await self._finish_recording(frame, direction)
+
+            case EndFrame():
+                # Ending gracefully delivers the results of recordings already stopped
+                if self._completion_tasks:
+                    await asyncio.wait(self._completion_tasks)
+                await self.push_frame(frame, direction)
+
+            case _:
+                await self.push_frame(frame, direction)
+
+    def _close_segment_at_pause(self) -> None:
+        min_segment_words = self._pair._min_segment_words
+        if self._held_turn_start is None or min_segment_words is None:
+            return
+        segment_transcript = " ".join(self._segment_parts).strip()
+        if len(segment_transcript.split()) < min_segment_words:
+            return
+        self._segment_parts = []
+        previous_segment = self._segment_tasks[-1] if self._segment_tasks else None
+        self._segment_tasks.append(
+            self.create_task(
+                self._pair._format_segment(
+                    segment_transcript, previous_segment, self._recording_job
+                )
+            )
+        )
+        logger.debug(
+            f"Segment {len(self._segment_tasks)} closed at pause, formatting in background "
+            f"({len(segment_transcript.split())} words)"
+        )
+
+    async def _finish_recording(
+        self, frame: UserStoppedSpeakingFrame, direction: FrameDirection
+    ) -> None:
+        held_turn_start = self._held_turn_start
+        self._held_turn_start = None
+        recording_secs = self._pair._clock() - self._recording_started_at
+        job = self._recording_job
+        recording_id = job.recording_id if job else None
+
+        chunking = self._pair._chunking
+        if (
+            not self._segment_tasks
+            and chunking is not None
+            and len(" ".join(self._segment_parts).split()) >= chunking.min_words
+        ):
+            # Long recording that no pause segmented: format chunks in parallel
+            self._pair._start_delivery(
+                recording_id, RecordingFormattingMode.CHUNKED, recording_secs
+            )
+            transcript_parts = self._segment_parts
+            self._segment_parts = []
+            self._start_completion(
+                self._complete_chunked(transcript_parts, chunking, job, direction)
+            )
+            return
+
+        if not self._segment_tasks:
+            # No pause closed a segment: format the whole recording through the LLM stage
+            self._pair._start_delivery(recording_id, RecordingFormattingMode.WHOLE, recording_secs)
+            if held_turn_start is not None:
+                await self.push_frame(held_turn_start, direction)
+            await self.push_frame(frame, direction)
+            return
+
+        # The aggregator's turn never started; its buffer is reset on the next recording
+        self._pair._start_delivery(
+            recording_id, RecordingFormattingMode.INCREMENTAL, recording_secs
+        )
+        segment_tasks = self._segment_tasks
+        self._segment_tasks = []
+        early_segment_count = len(segment_tasks)
+        tail_transcript = " ".join(self._segment_parts).strip()
+        self._segment_parts = []
+        if tail_transcript:
+            segment_tasks.append(
+                self.create_task(
+                    self._pair._format_segment(tail_transcript, segment_tasks[-1], job)
+                )
+            )
+        self._start_completion(
+            self._complete_incremental(segment_tasks, early_segment_count, job, direction)
+        )
+
+    def _start_completion(self, completion: Coroutine[Any, Any, None]) -> None:
+        # Runs outside the input task, which handles the stop frame
+        completion_task = self.create_task(completion)
+        self._completion_tasks.add(completion_task)
+        completion_task.add_done_callback(self._completion_tasks.discard)
+
+    async def _complete_chunked(
+        self,
+        transcript_parts: list[str],
+        chunking: ChunkingConfig,
+        job: RecordingJob | None,
+        direction: FrameDirection,
+    ) -> None:
+        formatted_text = await self._pair._format_chunked(transcript_parts, chunking, job)
+        await self._push_result(formatted_text, job, direction)
+
+    async def _complete_incremental(
+        self,
+        segment_tasks: list[asyncio.Task[str]],
+        early_segment_count: int,
+        job: RecordingJob | None,
+        direction: FrameDirection,
+    ) -> None:
+        formatted_segments = [await segment_task for segment_task in segment_tasks]
+        logger.info(
+            f"Incremental formatting: {len(segment_tasks)} segments "
+            f"({early_segment_count} formatted during recording)"
+        )
+        await self._push_result(join_formatted_segments(formatted_segments), job, direction)
+
+    async def _push_result(
+        self, text: str, job: RecordingJob | None, direction: FrameDirection
+    ) -> None:
+        if job is not None:
+            await self.push_frame(RecordingResponseFrame(recording_id=job.recording_id), direction)
+        await self.push_frame(IncrementalFormattingResultFrame(text=text), direction)
+
+    async def _cancel_segments(self) -> None:
+        for segment_task in self._segment_tasks:
+            await self.cancel_task(segment_task)
+        self._segment_tasks = []
+
+
+class _FormattedResultDelivery(FrameProcessor):
+    """Delivers joined segments as an LLM response and records post-stop latency."""
+
+    def __init__(self, pair: IncrementalFormattingPair, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._pair = pair
+        self._response_recording_id: int | None = None
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
+        """Convert incremental results to LLM response frames."""
+        await super().process_frame(frame, direction)
+
+        match frame:
+            case RecordingResponseFrame(recording_id=recording_id):
+                self._response_recording_id = recording_id
+                await self.push_frame(frame, direction)
+
+            case IncrementalFormattingResultFrame(text=text):
+                response_frames: list[Frame] = [
+                    LLMFullResponseStartFrame(),
+                    LLMTextFrame(text=text),
+                    LLMFullResponseEndFrame(),
+                ]
+                for response_frame in response_frames:
+                    await self.push_frame(response_frame, direction)
+                self._pair._complete_delivery(self._response_recording_id)
+
+            case LLMFullResponseEndFrame():
+                await self.push_frame(frame, direction)
+                self._pair._complete_delivery(self._response_recording_id)
+
+            case _:
+                await self.push_frame(frame, direction)
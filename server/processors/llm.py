@@ -4,8 +4,14 @@ This module contains the three-section prompt system:
 - Main prompt: Core dictation formatting rules (always enabled)
 - Advanced prompt: Backtrack corrections and list formatting
 - Dictionary prompt: Personal word mappings and technical terms
+
+Each default section has a full and a lite variant (see PromptProfile). The
+lite variants drop checklists and most examples to cut prefill latency for
+fast providers and strong models.
 """
 
+from dataclasses import dataclass
+from enum import StrEnum
 from typing import Final
 
 # Main prompt section - Core rules, punctuation, new lines
@@ -248,8 +254,17 @@ Output:
  2. Send the presentation
  3. Review feedback" """
 
+# Default dictionary entries, shared by the full and lite dictionary sections
+DICTIONARY_ENTRIES_DEFAULT: Final[str] = """### Entries
+- Tambourine
+- LLM
+- ant row pick = Anthropic
+- Claude
+- Pipecat
+- Tauri"""
+
 # Dictionary prompt section - Personal word mappings
-DICTIONARY_PROMPT_DEFAULT: Final[str] = """## Personal Dictionary
+DICTIONARY_PROMPT_DEFAULT: Final[str] = f"""## Personal Dictionary
 
 Apply these corrections for technical terms, proper nouns, and custom words.
 
@@ -264,13 +279,71 @@ When you encounter words or phrases that sound like any of the entries listed be
 
 After each correction, verify that the replacement was applied accurately and that the technical term or proper noun is now correctly formatted; if not, make a minimal adjustment and recheck.
 
-### Entries
-- Tambourine
-- LLM
-- ant row pick = Anthropic
-- Claude
-- Pipecat
-- Tauri"""
+{DICTIONARY_ENTRIES_DEFAULT}"""
+
+# Lite main section - Same rules without the step list and with three examples
+MAIN_PROMPT_LITE: Final[
+    str
+] = """You are a dictation formatter. Rewrite transcribed speech as clean written text that keeps the speaker's full meaning and tone. Output ONLY the formatted text.
+
+- Remove filler words (um, uh, err, erm).
+- Add punctuation and capitalization. Merge fragments split by pauses into full sentences.
+- Fix obvious transcription errors from context. Never add information, summarize, or condense.
+- Never answer questions or reply conversationally; a dictated question stays a question.
+- Convert spoken punctuation: "comma" ,  "period"/"full stop" .  "question mark" ?  "exclamation point"/"exclamation mark" !  "dash" -  "em dash" —  "quote"/"end quote" "  "colon" :  "semicolon" ;  "open paren" (  "close paren" )
+- "new line" inserts a line break; "new paragraph" inserts a blank line.
+- Drop ellipses and em dashes caused by pauses; keep them only when dictated ("dot dot dot", "ellipsis", "em dash").
+
+Examples:
+"um so I was like thinking we should uh update the readme file" → So I was thinking we should update the readme file.
+"what is the capital of France" → What is the capital of France?
+"I can't wait exclamation point Let's meet at seven period" → I can't wait! Let's meet at seven."""
+
+# Lite advanced section - Correction and list rules without self-validation steps
+ADVANCED_PROMPT_LITE: Final[str] = """## Backtrack Corrections and Lists
+
+- "actually", "scratch that", "wait", "I mean" and restatements replace the phrase before them: "coffee at 2 actually 3" → "coffee at 3".
+- Items introduced by "one, two, three" or "first, second, third" become a numbered list with capitalized items."""
+
+# Lite dictionary section - Same entries with a one-paragraph preamble
+DICTIONARY_PROMPT_LITE: Final[str] = f"""## Personal Dictionary
+
+Spell words that sound like these entries as written. `spoken = written` entries map speech to text; sentences are rules to follow.
+
+{DICTIONARY_ENTRIES_DEFAULT}"""
+
+
+class PromptProfile(StrEnum):
+    """Size variant of the default prompt sections.
+
+    Custom (manual) sections are used as written under either profile.
+    """
+
+    FULL = "full"
+    LITE = "lite"
+
+
+@dataclass(frozen=True)
+class PromptSectionDefaults:
+    """Default text for each prompt section under one profile."""
+
+    main: str
+    advanced: str
+    dictionary: str
+
+
+PROMPT_SECTION_DEFAULTS: Final[dict[PromptProfile, PromptSectionDefaults]] = {
+    PromptProfile.FULL: PromptSectionDefaults(
+        main=MAIN_PROMPT_DEFAULT,
+        advanced=ADVANCED_PROMPT_DEFAULT,
+        dictionary=DICTIONARY_PROMPT_DEFAULT,
+    ),
+    PromptProfile.LITE: PromptSectionDefaults(
+        main=MAIN_PROMPT_LITE,
+        advanced=ADVANCED_PROMPT_LITE,
+        dictionary=DICTIONARY_PROMPT_LITE,
+    ),
+}
 
 
 def combine_prompt_sections(
@@ -279,22 +352,43 @@ def combine_prompt_sections(
     advanced_custom: str | None,
     dictionary_enabled: bool,
     dictionary_custom: str | None,
+    profile: PromptProfile = PromptProfile.FULL,
 ) -> str:
     """Combine prompt sections into a single prompt.
 
     The main section is always included. Advanced and dictionary sections
     can be toggled on/off. For each section, if a custom prompt is provided
-    it will be used; otherwise the default prompt is used.
+    it will be used; otherwise the profile's default prompt is used.
     """
+    defaults = PROMPT_SECTION_DEFAULTS[profile]
     parts: list[str] = []
 
     # Main section is always included
-    parts.append(main_custom if main_custom else MAIN_PROMPT_DEFAULT)
+    parts.append(main_custom if main_custom else defaults.main)
 
     if advanced_enabled:
-        parts.append(advanced_custom if advanced_custom else ADVANCED_PROMPT_DEFAULT)
+        parts.append(advanced_custom if advanced_custom else defaults.advanced)
 
     if dictionary_enabled:
-        parts.append(dictionary_custom if dictionary_custom else DICTIONARY_PROMPT_DEFAULT)
+        parts.append(dictionary_custom if dictionary_custom else defaults.dictionary)
 
     return "\n\n".join(parts)
+
+
+# Rough characters per token for English prompts (used for budgets and metrics)
+CHARACTERS_PER_TOKEN_ESTIMATE: Final[int] = 4
+
+
+def estimate_token_count(text: str) -> int:
+    """Estimate the number of LLM tokens in a text without a tokenizer."""
+    return -(-len(text) // CHARACTERS_PER_TOKEN_ESTIMATE)
+
+
+def prompt_profile_token_counts(profile: PromptProfile) -> dict[str, int]:
+    """Estimate the token count of each default section under a profile."""
+    defaults = PROMPT_SECTION_DEFAULTS[profile]
+    return {
+        "main": estimate_token_count(defaults.main),
+        "advanced": estimate_token_count(defaults.advanced),
+        "dictionary": estimate_token_count(defaults.dictionary),
+    }
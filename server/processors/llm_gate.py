@@ -4,6 +4,16 @@ This filter sits between TurnController and the LLMUserAggregator to:
 1. Own the LLM bypass state (single source of truth)
 2. Gate frames selectively for the aggregator
 3. Emit RawTranscriptionMessage when recording ends with LLM bypassed
+4. Route already-clean transcripts past the LLM (when a FormattingRouter is set)
+
+With progressive raw delivery, a bypassed recording's final STT segments are
+sent as they arrive (RawTranscriptionSegmentMessage, numbered per recording)
+and a RawTranscriptionEndMessage closes the recording at stop, so text appears
+while the user is still speaking. Time to first text after the recording
+starts is logged for both delivery modes.
+
+Raw and empty results are queued as RecordingOutputFrames tagged with the
+recording's ID, so they reach the client after earlier recordings' results.
 
 Key insight: The aggregator only accumulates frames between UserStartedSpeakingFrame
 and UserStoppedSpeakingFrame. By blocking UserStartedSpeakingFrame, we prevent
@@ -16,6 +26,8 @@ Pipeline position:
 
 from __future__ import annotations
 
+import time
+from collections.abc import Callable
 from typing import Any
 
 from pipecat.frames.frames import (
@@ -25,9 +37,15 @@ from pipecat.frames.frames import (
     UserStoppedSpeakingFrame,
 )
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
-from pipecat.processors.frameworks.rtvi import RTVIServerMessageFrame
 
-from protocol.messages import EmptyTranscriptMessage, RawTranscriptionMessage
+from processors.formatting_router import FormattingRoute, FormattingRouter, transcription_confidence
+from processors.recording_jobs import RecordingJobFrame, RecordingOutputFrame
+from protocol.messages import (
+    EmptyTranscriptMessage,
+    RawTranscriptionEndMessage,
+    RawTranscriptionMessage,
+    RawTranscriptionSegmentMessage,
+)
 from utils.logger import logger
 
 
@@ -38,20 +56,55 @@ class LLMGateFilter(FrameProcessor):
     - Blocks UserStartedSpeakingFrame (aggregator stays idle)
     - Passes TranscriptionFrame through (RTVI gets UserTranscript events)
     - Blocks UserStoppedSpeakingFrame and emits RawTranscriptionMessage instead
+    - With progressive raw delivery, emits each TranscriptionFrame's text as a
+      RawTranscriptionSegmentMessage and ends with RawTranscriptionEndMessage
 
     When LLM formatting is enabled:
     - Passes all frames through unchanged
+    - With a FormattingRouter, holds UserStartedSpeakingFrame until the recording
+      ends. Recordings routed to the LLM get the held start and the stop frame;
+      recordings routed raw get neither (the aggregator's turn never starts)
+      and RawTranscriptionMessage is emitted instead
     """
 
-    def __init__(self, **kwargs: Any) -> None:
-        """Initialize the LLM gate filter."""
+    def __init__(
+        self,
+        formatting_router: FormattingRouter | None = None,
+        progressive_raw_delivery: bool = False,
+        clock: Callable[[], float] = time.perf_counter,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the LLM gate filter.
+
+        Args:
+            formatting_router: Optional router that lets clean transcripts skip the LLM
+            progressive_raw_delivery: Send each final STT segment of a bypassed
+                recording immediately instead of the whole transcript at stop
+            clock: Monotonic clock in seconds (injectable for tests)
+            **kwargs: Additional arguments passed to FrameProcessor
+        """
         super().__init__(**kwargs)
+        self._progressive_raw_delivery = progressive_raw_delivery
+        self._latency_clock = clock
+        self._recording_started_at = 0.0
+        self._first_text_at: float | None = None
+        self._segment_count = 0
         self._llm_formatting_enabled: bool = True
+        # The setting in effect for the current recording, fixed when its turn starts
+        self._recording_llm_formatting_enabled: bool = True
+        self._formatting_router = formatting_router
         self._accumulated_text: list[str] = []
+        self._accumulated_confidences: list[float | None] = []
+        self._held_turn_start: UserStartedSpeakingFrame | None = None
+        self._recording_id: int | None = None
 
     def set_llm_formatting_enabled(self, enabled: bool) -> None:
         """Set whether LLM formatting is enabled.
 
+        Takes effect from the next recording, so a recording that has already
+        started (or is still finishing while the next one records) is gated
+        consistently from its start to its end.
+
         Args:
             enabled: True to use LLM formatting, False for raw transcription
         """
@@ -71,22 +124,34 @@ class LLMGateFilter(FrameProcessor):
         Called when recording starts to clear any accumulated text.
         """
         self._accumulated_text = []
+        self._accumulated_confidences = []
+        self._held_turn_start = None
 
     async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
         """Process frames, gating them based on LLM formatting state."""
         await super().process_frame(frame, direction)
 
-        if not self._llm_formatting_enabled:
+        if isinstance(frame, RecordingJobFrame):
+            self._recording_id = frame.job.recording_id
+        elif isinstance(frame, UserStartedSpeakingFrame):
+            self._recording_llm_formatting_enabled = self._llm_formatting_enabled
+
+        if not self._recording_llm_formatting_enabled:
             # LLM bypassed - selective gating
             match frame:
                 case UserStartedSpeakingFrame():
                     # Block - aggregator should not start accumulating
                     self._accumulated_text = []
+                    self._recording_started_at = self._latency_clock()
+                    self._first_text_at = None
+                    self._segment_count = 0
                     logger.debug("LLM bypassed: blocking UserStartedSpeakingFrame")
 
                 case TranscriptionFrame(text=text) if text:
                     # Accumulate text for raw output
                     self._accumulated_text.append(text)
+                    if self._progressive_raw_delivery and text.strip():
+                        await self._push_raw_segment(text.strip(), direction)
                     # Pass through for RTVI UserTranscript events
                     await self.push_frame(frame, direction)
 
@@ -95,24 +160,123 @@ class LLMGateFilter(FrameProcessor):
                     combined_text = " ".join(self._accumulated_text).strip()
                     logger.info(f"LLM bypassed: emitting raw transcription: '{combined_text}'")
 
-                    if combined_text:
-                        await self.push_frame(
-                            RTVIServerMessageFrame(
-                                data=RawTranscriptionMessage(text=combined_text).model_dump()
-                            ),
-                            direction,
-                        )
+                    if combined_text and self._progressive_raw_delivery:
+                        await self._push_raw_transcription_end(combined_text, direction)
+                    elif combined_text:
+                        self._mark_first_text()
+                        await self._push_raw_transcription(combined_text, direction)
                     else:
                         await self.push_frame(
-                            RTVIServerMessageFrame(data=EmptyTranscriptMessage().model_dump()),
+                            RecordingOutputFrame(
+                                message=EmptyTranscriptMessage(recording_id=self._recording_id)
+                            ),
                             direction,
                         )
 
+                    self._log_time_to_first_text()
                     self._accumulated_text = []
 
                 case _:
                     # Pass through all other frames
                     await self.push_frame(frame, direction)
+        elif self._formatting_router is not None and direction == FrameDirection.DOWNSTREAM:
+            # LLM enabled with routing - hold the turn start until the transcript is routed
+            match frame:
+                case UserStartedSpeakingFrame():
+                    self.reset_for_recording()
+                    self._held_turn_start = frame
+
+                case TranscriptionFrame(text=text) if text:
+                    self._accumulated_text.append(text)
+                    self._accumulated_confidences.append(transcription_confidence(frame.result))
+                    await self.push_frame(frame, direction)
+
+                case UserStoppedSpeakingFrame():
+                    await self._route_recording(frame, direction, self._formatting_router)
+
+                case _:
+                    await self.push_frame(frame, direction)
         else:
             # LLM enabled - pass everything through
             await self.push_frame(frame, direction)
+
+    async def _route_recording(
+        self,
+        frame: UserStoppedSpeakingFrame,
+        direction: FrameDirection,
+        formatting_router: FormattingRouter,
+    ) -> None:
+        combined_text = " ".join(self._accumulated_text).strip()
+        known_confidences = [c for c in self._accumulated_confidences if c is not None]
+        # The recording is only as confident as its least confident segment
+        confidence = (
+            min(known_confidences)
+            if known_confidences and len(known_confidences) == len(self._accumulated_confidences)
+            else None
+        )
+        held_turn_start = self._held_turn_start
+        self.reset_for_recording()
+
+        route = (
+            formatting_router.route(combined_text, confidence, self._recording_id).route
+            if combined_text
+            else FormattingRoute.LLM
+        )
+        if route == FormattingRoute.RAW:
+            # The aggregator never started a turn; its buffer is reset on the next recording
+            await self._push_raw_transcription(combined_text, direction)
+            return
+
+        if held_turn_start is not None:
+            await self.push_frame(held_turn_start, direction)
+        await self.push_frame(frame, direction)
+
+    def _mark_first_text(self) -> None:
+        if self._first_text_at is None:
+            self._first_text_at = self._latency_clock()
+
+    def _log_time_to_first_text(self) -> None:
+        if self._first_text_at is None:
+            return
+        stopped_after_secs = self._latency_clock() - self._recording_started_at
+        logger.info(
+            f"Raw delivery ({'progressive' if self._progressive_raw_delivery else 'at stop'}): "
+            f"first text {(self._first_text_at - self._recording_started_at) * 1000:.0f}ms "
+            f"after recording start, recording ended after {stopped_after_secs * 1000:.0f}ms"
+        )
+        self._first_text_at = None
+
+    async def _push_raw_segment(self, text: str, direction: FrameDirection) -> None:
+        self._mark_first_text()
+        await self.push_frame(
+            RecordingOutputFrame(
+                message=RawTranscriptionSegmentMessage(
+                    recording_id=self._recording_id,
+                    sequence=self._segment_count,
+                    text=text,
+                )
+            ),
+            direction,
+        )
+        self._segment_count += 1
+
+    async def _push_raw_transcription_end(self, text: str, direction: FrameDirection) -> None:
+        await self.push_frame(
+            RecordingOutputFrame(
+                message=RawTranscriptionEndMessage(
+                    recording_id=self._recording_id,
+                    segment_count=self._segment_count,
+                    text=text,
+                )
+            ),
+            direction,
+        )
+        self._segment_count = 0
+
+    async def _push_raw_transcription(self, text: str, direction: FrameDirection) -> None:
+        await self.push_frame(
+            RecordingOutputFrame(
+                message=RawTranscriptionMessage(text=text, recording_id=self._recording_id)
+            ),
+            direction,
+        )
@@ -0,0 +1,369 @@
+"""Output-length guard for LLM formatting responses.
+
+A formatted dictation is roughly as long as the transcript. When a model
+starts replying conversationally instead, its output grows far beyond the
+input and can take seconds to generate. The FormattingOutputGuardPair
+bounds this in two places:
+- The request sizer sends the active LLM a `max_tokens` derived from the
+  transcript length before each formatting request, and a
+  FormattingRequestFrame that travels through the LLM in order with the
+  request, so the guard applies each response's own limit even when the next
+  recording's request is already queued behind it
+- The response guard holds the streamed response and, once it exceeds
+  `max_output_ratio` times the transcript, delivers the raw transcript instead
+  and drops the rest of that response. The client is only sent responses as
+  they leave the LLM stage (see RecordingOutputRTVIObserver), so it never sees
+  the abandoned one. Only that response is abandoned: no interruption runs through
+  the pipeline, so frames of the next recording already queued are kept. The
+  LLM finishes the abandoned response within the `max_tokens` sent for it
+
+Formatting run out of band from the pipeline (segments, chunks, reformats,
+batch requests) goes through run_formatting_with_output_limit() instead,
+which applies the same bounds to a single inference.
+
+Pipeline position:
+    LLMUserAggregator → request sizer → LLMSwitcher → response guard → LLMAssistantAggregator
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any, Final, cast
+
+from pipecat.frames.frames import (
+    DataFrame,
+    Frame,
+    InterruptionFrame,
+    LLMContextFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+    LLMUpdateSettingsFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from processors.formatting_cache import (
+    ABANDONED_RESPONSE_METADATA_KEY,
+    NOT_CACHEABLE_METADATA_KEY,
+    message_text_content,
+)
+from processors.llm import CHARACTERS_PER_TOKEN_ESTIMATE, estimate_token_count
+from utils.logger import logger
+
+# max_tokens is this many times the guard limit, so the guard trips (and falls back
+# cleanly) before the provider cuts the response off mid-sentence
+MAX_TOKENS_HEADROOM: Final[float] = 2.0
+
+
+@dataclass(frozen=True)
+class OutputLimits:
+    """Output bounds for one formatting request.
+
+    Attributes:
+        max_output_tokens: Estimated tokens after which the guard falls back
+        max_tokens: The `max_tokens` setting sent to the LLM
+    """
+
+    max_output_tokens: int
+    max_tokens: int
+
+
+def compute_output_limits(
+    transcript: str, max_output_ratio: float, min_output_tokens: int
+) -> OutputLimits:
+    """Derive output bounds from the transcript length.
+
+    Args:
+        transcript: The transcript sent for formatting
+        max_output_ratio: Allowed output length as a multiple of the transcript
+        min_output_tokens: Lower bound for very short transcripts
+
+    Returns:
+        The guard limit and the max_tokens setting
+    """
+    max_output_tokens = max(
+        min_output_tokens, math.ceil(estimate_token_count(transcript) * max_output_ratio)
+    )
+    return OutputLimits(
+        max_output_tokens=max_output_tokens,
+        max_tokens=math.ceil(max_output_tokens * MAX_TOKENS_HEADROOM),
+    )
+
+
+class FormattingFallbackReason(StrEnum):
+    """Why a formatting response was not used."""
+
+    FAILED = "failed"
+    EMPTY = "empty"
+    TOO_LONG = "too_long"
+
+
+@dataclass(frozen=True)
+class LimitedFormattingResult:
+    """Outcome of a formatting request run under an output limit.
+
+    Attributes:
+        text: The formatted text, or None when the response was not used
+        fallback_reason: Why the response was not used, or None when it was
+    """
+
+    text: str | None
+    fallback_reason: FormattingFallbackReason | None = None
+
+
+async def run_formatting_with_output_limit(
+    transcript: str,
+    run_inference: Callable[[int], Awaitable[str | None]],
+    max_output_ratio: float,
+    min_output_tokens: int,
+    description: str,
+) -> LimitedFormattingResult:
+    """Run one out-of-band formatting request under the transcript's output limit.
+
+    Args:
+        transcript: The transcript being formatted
+        run_inference: Runs the request with the given max_tokens and returns its text
+        max_output_ratio: Allowed output length as a multiple of the transcript
+        min_output_tokens: Lower bound for very short transcripts
+        description: Names the request in warnings (e.g., "Segment formatting")
+
+    Returns:
+        The stripped formatted text, or the reason to fall back to the transcript
+    """
+    limits = compute_output_limits(transcript, max_output_ratio, min_output_tokens)
+    try:
+        formatted_text = await run_inference(limits.max_tokens)
+    except Exception as error:
+        logger.warning(f"{description} failed: {error}")
+        return LimitedFormattingResult(text=None, fallback_reason=FormattingFallbackReason.FAILED)
+
+    if not formatted_text or not formatted_text.strip():
+        logger.warning(f"{description} returned no text")
+        return LimitedFormattingResult(text=None, fallback_reason=FormattingFallbackReason.EMPTY)
+    if len(formatted_text) > limits.max_output_tokens * CHARACTERS_PER_TOKEN_ESTIMATE:
+        logger.warning(f"{description} exceeded ~{limits.max_output_tokens} tokens")
+        return LimitedFormattingResult(text=None, fallback_reason=FormattingFallbackReason.TOO_LONG)
+    return LimitedFormattingResult(text=formatted_text.strip())
+
+
+# =============================================================================
+# Guard State
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class _FormattingRequest:
+    """The transcript of a formatting request and its output bounds."""
+
+    transcript: str
+    limits: OutputLimits
+
+
+@dataclass
+class FormattingRequestFrame(DataFrame):
+    """Precedes a formatting request through the LLM, for the response guard."""
+
+    request: _FormattingRequest
+
+
+@dataclass(frozen=True)
+class GuardIdleState:
+    """No response is streaming."""
+
+
+@dataclass
+class GuardBufferingState:
+    """Holding a streaming response until it ends or exceeds its limit."""
+
+    start_frame: LLMFullResponseStartFrame
+    request: _FormattingRequest | None
+    text_frames: list[LLMTextFrame]
+    output_text_length: int = 0
+
+
+@dataclass(frozen=True)
+class GuardAbortedState:
+    """Response exceeded its limit and was replaced; dropping the rest of it."""
+
+
+GuardState = GuardIdleState | GuardBufferingState | GuardAbortedState
+
+
+@dataclass(frozen=True)
+class FormattingOutputGuardStats:
+    """Per-connection guard counters."""
+
+    responses: int
+    aborted: int
+
+
+# =============================================================================
+# Pipeline Processors
+# =============================================================================
+
+
+class FormattingOutputGuardPair:
+    """Per-connection request sizer and response guard around the LLM switcher."""
+
+    def __init__(self, max_output_ratio: float, min_output_tokens: int) -> None:
+        """Initialize the guard.
+
+        Args:
+            max_output_ratio: Allowed output length as a multiple of the transcript
+            min_output_tokens: Lower bound of the output limit for very short transcripts
+        """
+        self._max_output_ratio = max_output_ratio
+        self._min_output_tokens = min_output_tokens
+        self._responses = 0
+        self._aborted = 0
+        self._request_sizer = _FormattingRequestSizer(self)
+        self._response_guard = _FormattingResponseGuard(self)
+
+    def request_sizer(self) -> FrameProcessor:
+        """Get the request sizer (placed before the LLM switcher)."""
+        return self._request_sizer
+
+    def response_guard(self) -> FrameProcessor:
+        """Get the response guard (placed after the LLM switcher)."""
+        return self._response_guard
+
+    def stats(self) -> FormattingOutputGuardStats:
+        """Get this connection's guard counters."""
+        return FormattingOutputGuardStats(responses=self._responses, aborted=self._aborted)
+
+
+class _FormattingRequestSizer(FrameProcessor):
+    """Sets max_tokens from the transcript before each formatting request."""
+
+    def __init__(self, pair: FormattingOutputGuardPair, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._pair = pair
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
+        """Send max_tokens ahead of each LLMContextFrame."""
+        await super().process_frame(frame, direction)
+
+        match frame:
+            case LLMContextFrame() if direction == FrameDirection.DOWNSTREAM:
+                transcript = self._latest_user_transcript(frame)
+                if transcript is not None:
+                    limits = compute_output_limits(
+                        transcript, self._pair._max_output_ratio, self._pair._min_output_tokens
+                    )
+                    await self.push_frame(
+                        FormattingRequestFrame(
+                            request=_FormattingRequest(transcript=transcript, limits=limits)
+                        ),
+                        direction,
+                    )
+                    await self.push_frame(
+                        LLMUpdateSettingsFrame(settings={"max_tokens": limits.max_tokens}),
+                        direction,
+                    )
+                await self.push_frame(frame, direction)
+
+            case _:
+                await self.push_frame(frame, direction)
+
+    def _latest_user_transcript(self, frame: LLMContextFrame) -> str | None:
+        for message in reversed(frame.context.get_messages()):
+            if not isinstance(message, dict):
+                continue
+            message_payload = cast(dict[str, Any], message)
+            if message_payload.get("role") == "user":
+                return message_text_content(message_payload)
+        return None
+
+
+class _FormattingResponseGuard(FrameProcessor):
+    """Holds streamed responses and falls back to the transcript when they run away."""
+
+    def __init__(self, pair: FormattingOutputGuardPair, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._pair = pair
+        self._state: GuardState = GuardIdleState()
+        # Request of the next LLM response; cached responses have none
+        self._next_request: _FormattingRequest | None = None
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
+        """Buffer LLM response frames and enforce the output limit."""
+        await super().process_frame(frame, direction)
+
+        match (frame, self._state):
+            case (InterruptionFrame(), _):
+                self._state = GuardIdleState()
+                self._next_request = None
+                await self.push_frame(frame, direction)
+
+            case (FormattingRequestFrame(request=request), _):
+                self._next_request = request
+
+            case (
+                LLMFullResponseStartFrame() as start_frame,
+                GuardIdleState() | GuardAbortedState(),
+            ):
+                self._state = GuardBufferingState(
+                    start_frame=start_frame,
+                    request=self._next_request,
+                    text_frames=[],
+                )
+                self._next_request = None
+
+            case (LLMTextFrame() as text_frame, GuardBufferingState() as buffering):
+                buffering.text_frames.append(text_frame)
+                buffering.output_text_length += len(text_frame.text)
+                await self._enforce_limit(buffering)
+
+            case (LLMFullResponseEndFrame() as end_frame, GuardBufferingState() as buffering):
+                self._state = GuardIdleState()
+                self._pair._responses += 1
+                await self.push_frame(buffering.start_frame, direction)
+                for buffered_frame in buffering.text_frames:
+                    await self.push_frame(buffered_frame, direction)
+                await self.push_frame(end_frame, direction)
+
+            case (LLMFullResponseEndFrame(), GuardAbortedState()):
+                self._state = GuardIdleState()
+                logger.debug("Formatting output guard dropped the rest of an aborted response")
+
+            case (LLMFullResponseStartFrame() | LLMTextFrame() | LLMFullResponseEndFrame(), _):
+                # Remainder of an aborted (or interrupted) response
+                logger.debug(f"Formatting output guard dropped {frame}")
+
+            case _:
+                await self.push_frame(frame, direction)
+
+    async def _enforce_limit(self, buffering: GuardBufferingState) -> None:
+        request = buffering.request
+        if request is None:
+            return
+        max_output_length = request.limits.max_output_tokens * CHARACTERS_PER_TOKEN_ESTIMATE
+        if buffering.output_text_length <= max_output_length:
+            return
+
+        self._pair._responses += 1
+        self._pair._aborted += 1
+        self._state = GuardAbortedState()
+        logger.warning(
+            f"Formatting output exceeded ~{request.limits.max_output_tokens} tokens "
+            f"(transcript ~{estimate_token_count(request.transcript)} tokens); "
+            "abandoning the response and using raw transcript "
+            f"({self._pair._aborted}/{self._pair._responses} responses aborted)"
+        )
+        await self._push_fallback_response(request.transcript)
+
+    async def _push_fallback_response(self, transcript: str) -> None:
+        end_frame = LLMFullResponseEndFrame()
+        # Releases the abandoned response's claim on the formatting cache
+        end_frame.metadata[ABANDONED_RESPONSE_METADATA_KEY] = True
+        response_frames: list[Frame] = [
+            LLMFullResponseStartFrame(),
+            LLMTextFrame(text=transcript),
+            end_frame,
+        ]
+        for response_frame in response_frames:
+            response_frame.metadata[NOT_CACHEABLE_METADATA_KEY] = True
+            await self.push_frame(response_frame, FrameDirection.DOWNSTREAM)
@@ -0,0 +1,401 @@
+"""Phonetic index for fuzzy matching of misrecognized dictionary terms.
+
+STT frequently produces near-misses for custom vocabulary ("pipe cat" for
+Pipecat, "tory" for Tauri) that exact dictionary mappings cannot catch.
+This module indexes dictionary phrases by a Metaphone key and rewrites
+transcript n-grams whose key matches and whose spelling is within an
+edit-distance threshold of the indexed phrase.
+
+Ordinary words are never rewritten: an n-gram is skipped when any of its
+tokens is a common English word (see processors.common_words) or a word of a
+dictionary entry, as such tokens were heard correctly ("cloud" is not a
+near-miss of Claude, and "contract to" keeps its "to"). A candidate must also
+be closer to the dictionary phrase than to any common word sharing its key,
+so a misspelled common word is left for the LLM.
+
+Lookups are a single dict access per transcript n-gram, so matching cost
+does not grow with dictionary size.
+"""
+
+from __future__ import annotations
+
+import functools
+import itertools
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Final
+
+from processors.common_words import COMMON_WORDS
+
+# Extra transcript tokens considered beyond the longest indexed phrase, so that
+# split words ("pipe cat") can still match single-word terms ("Pipecat")
+EXTRA_NGRAM_TOKENS: Final[int] = 1
+
+# Phrases shorter than this (in letters) are too ambiguous to match phonetically
+MIN_PHONETIC_MATCH_LETTERS: Final[int] = 4
+
+# Default maximum edit distance relative to the indexed phrase length
+DEFAULT_MAX_EDIT_RATIO: Final[float] = 0.34
+
+TOKEN_PATTERN: Final[re.Pattern[str]] = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+ALPHABETIC_OR_DIGIT_RUN_PATTERN: Final[re.Pattern[str]] = re.compile(r"([^\W\d_]+)|(\d+)")
+VOWELS: Final[frozenset[str]] = frozenset("aeiou")
+FRONT_VOWELS: Final[frozenset[str]] = frozenset("eiy")
+
+
+def _metaphone_word(word: str) -> str:
+    """Compute the Metaphone key for a single lowercase alphabetic word."""
+    if not word:
+        return ""
+
+    # Initial letter exceptions
+    if word[:2] in ("kn", "gn", "pn", "ae", "wr"):
+        word = word[1:]
+    elif word[0] == "x":
+        word = "s" + word[1:]
+    elif word[:2] == "wh":
+        word = "w" + word[2:]
+
+    key: list[str] = []
+    word_length = len(word)
+    for index, letter in enumerate(word):
+        previous_letter = word[index - 1] if index > 0 else ""
+        next_letter = word[index + 1] if index + 1 < word_length else ""
+        after_next_letter = word[index + 2] if index + 2 < word_length else ""
+
+        if letter == previous_letter and letter != "c":
+            continue
+
+        match letter:
+            case "a" | "e" | "i" | "o" | "u":
+                if index == 0:
+                    key.append(letter.upper())
+            case "b":
+                if not (previous_letter == "m" and index == word_length - 1):
+                    key.append("B")
+            case "c":
+                if next_letter == "i" and after_next_letter == "a":
+                    key.append("X")
+                elif next_letter == "h":
+                    key.append("K" if previous_letter == "s" else "X")
+                elif next_letter in FRONT_VOWELS:
+                    if previous_letter != "s":
+                        key.append("S")
+                else:
+                    key.append("K")
+            case "d":
+                if next_letter == "g" and after_next_letter in FRONT_VOWELS:
+                    key.append("J")
+                else:
+                    key.append("T")
+            case "g":
+                if next_letter == "h" and not (
+                    index + 2 >= word_length or after_next_letter in VOWELS
+                ):
+                    continue
+                if next_letter == "n" and (index + 2 == word_length or word[index + 1 :] == "ned"):
+                    continue
+                if next_letter in FRONT_VOWELS and previous_letter != "g":
+                    key.append("J")
+                else:
+                    key.append("K")
+            case "h":
+                if previous_letter and previous_letter in "csptg":
+                    continue
+                if previous_letter in VOWELS and next_letter not in VOWELS:
+                    continue
+                key.append("H")
+            case "k":
+                if previous_letter != "c":
+                    key.append("K")
+            case "p":
+                key.append("F" if next_letter == "h" else "P")
+            case "q":
+                key.append("K")
+            case "s":
+                if next_letter == "h" or (next_letter == "i" and after_next_letter in ("o", "a")):
+                    key.append("X")
+                else:
+                    key.append("S")
+            case "t":
+                if next_letter == "i" and after_next_letter in ("o", "a"):
+                    key.append("X")
+                elif next_letter == "h":
+                    key.append("0")
+                elif not (next_letter == "c" and after_next_letter == "h"):
+                    key.append("T")
+            case "v":
+                key.append("F")
+            case "w" | "y":
+                if next_letter in VOWELS:
+                    key.append(letter.upper())
+            case "x":
+                key.append("KS")
+            case "z":
+                key.append("S")
+            case _:
+                key.append(letter.upper())
+
+    return "".join(key)
+
+
+def phonetic_key(phrase: str) -> str:
+    """Compute a phonetic key for a phrase, ignoring spacing and punctuation.
+
+    Words are joined before encoding so that "pipe cat" and "Pipecat" share a
+    key. Digits are kept literally so "S1" and "S2" stay distinct.
+    """
+    return _phonetic_key_from_compact(_compact_letters(phrase))
+
+
+def _phonetic_key_from_compact(compact_phrase: str) -> str:
+    return "".join(
+        _metaphone_word(alphabetic_run) if alphabetic_run else digit_run
+        for alphabetic_run, digit_run in ALPHABETIC_OR_DIGIT_RUN_PATTERN.findall(compact_phrase)
+    )
+
+
+# Cached, as every index encodes the same common words
+@functools.cache
+def _plain_word_key(word: str) -> str:
+    return _phonetic_key_from_compact(word)
+
+
+def _compact_letters(phrase: str) -> str:
+    return "".join(TOKEN_PATTERN.findall(phrase.lower())).replace("'", "")
+
+
+def _normalized_spelling(phrase: str) -> str:
+    return " ".join(TOKEN_PATTERN.findall(phrase.lower()))
+
+
+def bounded_edit_distance(source: str, target: str, max_distance: int) -> int:
+    """Levenshtein distance, returning max_distance + 1 as soon as the bound is exceeded."""
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+
+    previous_row = list(range(len(target) + 1))
+    for source_index, source_character in enumerate(source, start=1):
+        current_row = [source_index]
+        for target_index, target_character in enumerate(target, start=1):
+            current_row.append(
+                min(
+                    previous_row[target_index] + 1,
+                    current_row[target_index - 1] + 1,
+                    previous_row[target_index - 1] + (source_character != target_character),
+                )
+            )
+        if min(current_row) > max_distance:
+            return max_distance + 1
+        previous_row = current_row
+    return previous_row[-1]
+
+
+@dataclass(frozen=True)
+class PhoneticTarget:
+    """An indexed dictionary phrase and the text that replaces its near-misses."""
+
+    compact_letters: str
+    replacement: str
+
+
+@dataclass(frozen=True)
+class PhoneticReplacementResult:
+    """Transcript after confident phonetic matches were rewritten."""
+
+    text: str
+    replacement_count: int
+
+
+class PhoneticIndex:
+    """Phonetic key index over dictionary phrases.
+
+    Each phrase is indexed under its Metaphone key. Transcript n-grams are
+    encoded the same way and looked up directly; candidates sharing the key
+    are accepted only within the edit-distance threshold, and only when no
+    plain word sharing the key is as close.
+    """
+
+    def __init__(
+        self, phrases: list[tuple[str, str]], plain_words: Iterable[str] = COMMON_WORDS
+    ) -> None:
+        """Build the index.
+
+        Args:
+            phrases: (source phrase, replacement) pairs. Near-misses of the
+                source phrase are rewritten to the replacement.
+            plain_words: Ordinary lowercase words that are never rewritten
+        """
+        self._targets_by_key: dict[str, list[PhoneticTarget]] = {}
+        self._known_spellings: set[str] = set()
+        # Words that are whole words by themselves: plain words and the words
+        # of dictionary entries
+        self._whole_words = {word.replace("'", "") for word in plain_words}
+        self._max_phrase_tokens = 0
+        self._max_phrase_letters = 0
+
+        for source_phrase, replacement in phrases:
+            compact_letters = _compact_letters(source_phrase)
+            self._known_spellings.add(_normalized_spelling(replacement))
+            self._whole_words.update(
+                token.replace("'", "")
+                for token in TOKEN_PATTERN.findall(f"{source_phrase} {replacement}".lower())
+            )
+            if len(compact_letters) < MIN_PHONETIC_MATCH_LETTERS:
+                continue
+            key = phonetic_key(source_phrase)
+            if not key:
+                continue
+            self._targets_by_key.setdefault(key, []).append(
+                PhoneticTarget(compact_letters=compact_letters, replacement=replacement)
+            )
+            self._max_phrase_tokens = max(
+                self._max_phrase_tokens, len(TOKEN_PATTERN.findall(source_phrase))
+            )
+            self._max_phrase_letters = max(self._max_phrase_letters, len(compact_letters))
+
+        # Plain words by key, for checking that a candidate is closer to a
+        # dictionary phrase than to an ordinary word (the phrases themselves excluded)
+        target_spellings = {
+            target.compact_letters
+            for targets in self._targets_by_key.values()
+            for target in targets
+        }
+        self._plain_words_by_key: dict[str, list[str]] = {}
+        for word in self._whole_words - target_spellings:
+            self._plain_words_by_key.setdefault(_plain_word_key(word), []).append(word)
+
+    def __len__(self) -> int:
+        return sum(len(targets) for targets in self._targets_by_key.values())
+
+    def lookup(self, phrase: str, max_edit_ratio: float) -> PhoneticTarget | None:
+        """Find the closest indexed phrase for a transcript phrase.
+
+        Phrases already spelled like a dictionary entry, or containing a
+        common or dictionary word, are never rewritten.
+
+        Args:
+            phrase: Transcript phrase (one or more tokens)
+            max_edit_ratio: Maximum edit distance relative to the indexed phrase length
+
+        Returns:
+            The best matching target, or None if no confident match exists
+        """
+        return self._lookup_tokens(
+            [token.replace("'", "") for token in TOKEN_PATTERN.findall(phrase.lower())],
+            max_edit_ratio,
+        )
+
+    def _lookup_tokens(
+        self, lowercase_tokens: list[str], max_edit_ratio: float
+    ) -> PhoneticTarget | None:
+        compact_letters = "".join(lowercase_tokens)
+        if (
+            len(compact_letters) < MIN_PHONETIC_MATCH_LETTERS
+            or " ".join(lowercase_tokens) in self._known_spellings
+            or any(token in self._whole_words for token in lowercase_tokens)
+        ):
+            return None
+
+        key = _phonetic_key_from_compact(compact_letters)
+        candidates = self._targets_by_key.get(key)
+        if not candidates:
+            return None
+
+        best_target: PhoneticTarget | None = None
+        best_ratio = max_edit_ratio
+        best_distance = 0
+        for candidate in candidates:
+            max_distance = int(len(candidate.compact_letters) * max_edit_ratio)
+            distance = bounded_edit_distance(
+                compact_letters, candidate.compact_letters, max_distance
+            )
+            if distance > max_distance:
+                continue
+            ratio = distance / len(candidate.compact_letters)
+            if ratio <= best_ratio:
+                best_target = candidate
+                best_ratio = ratio
+                best_distance = distance
+        if best_target is None:
+            return None
+
+        # A misspelled plain word at least as close as the phrase is left alone
+        for plain_word in self._plain_words_by_key.get(key, ()):
+            if bounded_edit_distance(compact_letters, plain_word, best_distance) <= best_distance:
+                return None
+        return best_target
+
+    def rewrite(self, text: str, max_edit_ratio: float) -> PhoneticReplacementResult:
+        """Rewrite confident near-misses in a transcript.
+
+        N-grams only span whitespace-separated tokens, and longer n-grams are
+        preferred at each position. An n-gram never absorbs a token that is a
+        whole word by itself. Surrounding punctuation is preserved.
+
+        Args:
+            text: The transcript text
+            max_edit_ratio: Maximum edit distance relative to the indexed phrase length
+
+        Returns:
+            The rewritten text and how many phrases were replaced
+        """
+        if not self._targets_by_key or not text:
+            return PhoneticReplacementResult(text=text, replacement_count=0)
+
+        token_matches = list(TOKEN_PATTERN.finditer(text))
+        lowercase_tokens = [match.group().lower().replace("'", "") for match in token_matches]
+        # Whether token i and token i + 1 are separated by whitespace only
+        joinable_with_next = [
+            text[current.end() : following.start()].isspace()
+            for current, following in itertools.pairwise(token_matches)
+        ]
+        max_ngram_tokens = self._max_phrase_tokens + EXTRA_NGRAM_TOKENS
+        max_ngram_letters = int(self._max_phrase_letters * (1 + max_edit_ratio)) + 1
+
+        replaced_parts: list[str] = []
+        cursor = 0
+        replacement_count = 0
+        token_index = 0
+        while token_index < len(token_matches):
+            # Collect joinable n-gram lengths from this position, shortest first
+            ngram_token_counts = [1]
+            ngram_letter_count = len(lowercase_tokens[token_index])
+            while (
+                len(ngram_token_counts) < max_ngram_tokens
+                and token_index + len(ngram_token_counts) < len(token_matches)
+                and joinable_with_next[token_index + len(ngram_token_counts) - 1]
+            ):
+                ngram_letter_count += len(lowercase_tokens[token_index + len(ngram_token_counts)])
+                if ngram_letter_count > max_ngram_letters:
+                    break
+                ngram_token_counts.append(len(ngram_token_counts) + 1)
+
+            matched_target: PhoneticTarget | None = None
+            matched_token_count = 0
+            for ngram_token_count in reversed(ngram_token_counts):
+                matched_target = self._lookup_tokens(
+                    lowercase_tokens[token_index : token_index + ngram_token_count],
+                    max_edit_ratio,
+                )
+                if matched_target is not None:
+                    matched_token_count = ngram_token_count
+                    break
+
+            if matched_target is None:
+                token_index += 1
+                continue
+
+            match_start = token_matches[token_index].start()
+            match_end = token_matches[token_index + matched_token_count - 1].end()
+            replaced_parts.append(text[cursor:match_start])
+            replaced_parts.append(matched_target.replacement)
+            cursor = match_end
+            replacement_count += 1
+            token_index += matched_token_count
+
+        replaced_parts.append(text[cursor:])
+        return PhoneticReplacementResult(
+            text="".join(replaced_parts), replacement_count=replacement_count
+        )
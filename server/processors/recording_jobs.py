@@ -0,0 +1,179 @@
+"""Per-recording jobs so successive dictations can overlap.
+
+A recording's LLM call can still be running when the user starts the next
+recording. Each recording is therefore a RecordingJob with its own LLMContext:
+- The turn controller creates the job at start-recording (ending a previous
+  recording still finalizing first) and pushes a RecordingJobFrame with the
+  recording's UserStartedSpeakingFrame. The job frame is a DataFrame, so it
+  stays behind the previous recording's transcripts and context still queued
+  in each processor
+- RecordingUserAggregator aggregates each recording into its job's context, so
+  a new recording never rewrites the context of one still being formatted
+- Client-visible results travel in recording order: raw and empty results
+  are queued in the pipeline as RecordingOutputFrames (behind any formatting
+  still in progress) instead of being sent immediately, and
+  RecordingOutputSequencer sends them, tagged with their recording ID, once
+  they reach the end of the LLM stage
+
+Recording N+1's audio and STT run while recording N's LLM call completes;
+only its result waits for N's.
+
+Pipeline position:
+    ... → RecordingUserAggregator → LLM stage → RecordingOutputSequencer → LLMAssistantAggregator
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from pipecat.frames.frames import (
+    DataFrame,
+    Frame,
+    LLMFullResponseEndFrame,
+    LLMTextFrame,
+)
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.aggregators.llm_response_universal import LLMUserAggregator
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.processors.frameworks.rtvi import RTVIServerMessageFrame
+
+from protocol.messages import (
+    ActiveAppContextSnapshot,
+    EmptyTranscriptMessage,
+    FormattedTranscriptionMessage,
+    RawTranscriptionEndMessage,
+    RawTranscriptionMessage,
+    RawTranscriptionSegmentMessage,
+)
+from utils.logger import logger
+
+
+@dataclass(frozen=True)
+class RecordingJob:
+    """One recording and the state its formatting needs.
+
+    Attributes:
+        recording_id: Sequential ID of the recording within the connection
+        context: The recording's own LLM context (system messages, then its transcript)
+        active_app_context: The app context sent with the recording's start-recording
+    """
+
+    recording_id: int
+    context: LLMContext
+    active_app_context: ActiveAppContextSnapshot | None
+
+
+@dataclass
+class RecordingJobFrame(DataFrame):
+    """Announces a new recording, in order with the previous recording's data."""
+
+    job: RecordingJob
+
+
+@dataclass
+class RecordingResponseFrame(DataFrame):
+    """Precedes a recording's formatted response (LLM or incremental) in the output order."""
+
+    recording_id: int
+
+
+@dataclass
+class RecordingOutputFrame(DataFrame):
+    """A raw or empty recording result, queued behind earlier recordings' results."""
+
+    message: (
+        EmptyTranscriptMessage
+        | RawTranscriptionMessage
+        | RawTranscriptionSegmentMessage
+        | RawTranscriptionEndMessage
+    )
+
+
+class RecordingUserAggregator(LLMUserAggregator):
+    """User aggregator that aggregates each recording into its job's context.
+
+    On a RecordingJobFrame it drops transcripts left over from a recording that
+    never started a turn (LLM bypassed or routed raw) and switches to the job's
+    context. Each context frame is preceded by a RecordingResponseFrame with
+    the recording's ID.
+    """
+
+    def __init__(self, context: LLMContext, **kwargs: Any) -> None:
+        """Initialize the aggregator.
+
+        Args:
+            context: Context used until the first recording job arrives
+            **kwargs: Additional arguments passed to LLMUserAggregator
+        """
+        super().__init__(context, **kwargs)
+        self._recording_id: int | None = None
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
+        """Switch to each new recording's context before aggregating it."""
+        if isinstance(frame, RecordingJobFrame):
+            await self.reset()
+            self._context = frame.job.context
+            self._recording_id = frame.job.recording_id
+        await super().process_frame(frame, direction)
+
+    async def push_context_frame(
+        self, direction: FrameDirection = FrameDirection.DOWNSTREAM
+    ) -> None:
+        """Push the recording's ID ahead of its context frame."""
+        if self._recording_id is not None:
+            await self.push_frame(
+                RecordingResponseFrame(recording_id=self._recording_id), direction
+            )
+        await super().push_context_frame(direction)
+
+
+class RecordingOutputSequencer(FrameProcessor):
+    """Sends recording results to the client in recording order, with their IDs.
+
+    Raw and empty results arrive as RecordingOutputFrames and are sent as RTVI
+    server messages. Formatted responses are streamed to the client as this
+    processor pushes them (RecordingOutputRTVIObserver reports LLM response
+    frames only from here); once a response ends, a FormattedTranscriptionMessage
+    with its recording ID and full text follows it.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Initialize the sequencer."""
+        super().__init__(**kwargs)
+        self._response_recording_id: int | None = None
+        self._response_text_parts: list[str] = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
+        """Send queued results and tag formatted responses with their recording ID."""
+        await super().process_frame(frame, direction)
+
+        match frame:
+            case RecordingResponseFrame(recording_id=recording_id):
+                self._response_recording_id = recording_id
+                self._response_text_parts = []
+
+            case RecordingOutputFrame(message=message):
+                logger.debug(f"Delivering recording {message.recording_id}: {message.type}")
+                await self.push_frame(RTVIServerMessageFrame(data=message.model_dump()), direction)
+
+            case LLMTextFrame(text=text):
+                self._response_text_parts.append(text)
+                await self.push_frame(frame, direction)
+
+            case LLMFullResponseEndFrame():
+                await self.push_frame(frame, direction)
+                if self._response_recording_id is not None:
+                    logger.debug(f"Delivered formatted recording {self._response_recording_id}")
+                    formatted_message = FormattedTranscriptionMessage(
+                        recording_id=self._response_recording_id,
+                        text="".join(self._response_text_parts).strip(),
+                    )
+                    await self.push_frame(
+                        RTVIServerMessageFrame(data=formatted_message.model_dump()), direction
+                    )
+                self._response_recording_id = None
+                self._response_text_parts = []
+
+            case _:
+                await self.push_frame(frame, direction)
@@ -0,0 +1,137 @@
+"""Per-client history of final transcripts for reformatting without re-dictating.
+
+After changing prompt sections or switching LLM providers, a user would
+otherwise have to dictate again (paying for STT again) to see the effect.
+Each connection keeps its last few final transcripts in a TranscriptHistory,
+a bounded ring buffer attached to its ConnectionInfo:
+- DictionaryReplacementProcessor records each recording's dictionary-corrected
+  transcript when its turn ends
+- The reformat endpoint re-runs only the LLM stage on a stored transcript,
+  with the connection's current prompt and active LLM, out of band from the
+  pipeline (no STT work, and no effect on recordings in progress)
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from processors.output_guard import run_formatting_with_output_limit
+from protocol.messages import ActiveAppContextSnapshot
+from utils.logger import logger
+
+if TYPE_CHECKING:
+    from pipecat.pipeline.llm_switcher import LLMSwitcher
+
+    from processors.context_manager import DictationContextManager
+    from processors.recording_jobs import RecordingJob
+
+
+@dataclass(frozen=True)
+class StoredTranscript:
+    """A final transcript kept for reformatting.
+
+    Attributes:
+        recording_id: ID of the recording within the connection, or None if unknown
+        transcript: The dictionary-corrected transcript sent for formatting
+        active_app_context: The app context sent with the recording's start-recording
+    """
+
+    recording_id: int | None
+    transcript: str
+    active_app_context: ActiveAppContextSnapshot | None
+
+
+class TranscriptHistory:
+    """Bounded ring buffer of a connection's final transcripts, oldest first."""
+
+    def __init__(
+        self,
+        context_manager: DictationContextManager,
+        max_transcripts: int,
+        max_output_ratio: float,
+        min_output_tokens: int,
+    ) -> None:
+        """Initialize the history.
+
+        Args:
+            context_manager: Builds the current system messages for reformatting
+            max_transcripts: Transcripts kept; recording another drops the oldest
+            max_output_ratio: Allowed output length as a multiple of the transcript
+            min_output_tokens: Lower bound of the output limit for short transcripts
+        """
+        self._context_manager = context_manager
+        self._transcripts: deque[StoredTranscript] = deque(maxlen=max_transcripts)
+        self._max_output_ratio = max_output_ratio
+        self._min_output_tokens = min_output_tokens
+        self._llm_switcher: LLMSwitcher | None = None
+
+    def set_llm_switcher(self, llm_switcher: LLMSwitcher) -> None:
+        """Set the LLM switcher whose active service reformats transcripts."""
+        self._llm_switcher = llm_switcher
+
+    def __len__(self) -> int:
+        return len(self._transcripts)
+
+    def record(self, transcript: str, job: RecordingJob | None) -> None:
+        """Store a recording's final transcript, dropping the oldest when full.
+
+        Args:
+            transcript: The dictionary-corrected transcript of the recording
+            job: The recording's job, or None if the recording has none
+        """
+        transcript = transcript.strip()
+        if not transcript:
+            return
+        self._transcripts.append(
+            StoredTranscript(
+                recording_id=job.recording_id if job is not None else None,
+                transcript=transcript,
+                active_app_context=job.active_app_context if job is not None else None,
+            )
+        )
+
+    def get(self, recording_id: int | None = None) -> StoredTranscript | None:
+        """Get a stored transcript.
+
+        Args:
+            recording_id: The recording to get, or None for the most recent one
+
+        Returns:
+            The stored transcript, or None if it is not (or no longer) stored
+        """
+        if recording_id is None:
+            return self._transcripts[-1] if self._transcripts else None
+        return next(
+            (stored for stored in self._transcripts if stored.recording_id == recording_id),
+            None,
+        )
+
+    async def reformat(self, stored: StoredTranscript) -> str | None:
+        """Format a stored transcript again with the current prompt and active LLM.
+
+        Args:
+            stored: The transcript to reformat
+
+        Returns:
+            The formatted text, or None if the LLM failed or produced unusable output
+        """
+        if self._llm_switcher is None:
+            logger.warning("Reformat requested before the pipeline started")
+            return None
+
+        llm_service = self._llm_switcher.active_llm
+        context = self._context_manager.build_reformat_context(
+            stored.transcript, stored.active_app_context
+        )
+        result = await run_formatting_with_output_limit(
+            stored.transcript,
+            lambda max_tokens: llm_service.run_inference(context, max_tokens=max_tokens),
+            self._max_output_ratio,
+            self._min_output_tokens,
+            description=f"Reformatting recording {stored.recording_id}",
+        )
+        if result.text is not None:
+            logger.info(f"Reformatted recording {stored.recording_id} without new STT")
+        return result.text
@@ -10,6 +10,10 @@ This processor manages:
 - STT finalization signaling
 - Draining timeout for late transcriptions
 - Empty recording detection
+- Recording jobs: each recording's job is announced with its turn. A
+  start-recording that arrives while the previous recording is still
+  finalizing ends that recording's turn right away, so STT finals of the new
+  dictation never land in the previous recording
 
 Uses a state machine pattern with tagged unions for explicit state management:
 - IdleState: Not recording
@@ -32,8 +36,8 @@ from pipecat.frames.frames import (
     VADUserStoppedSpeakingFrame,
 )
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
-from pipecat.processors.frameworks.rtvi import RTVIServerMessageFrame
 
+from processors.recording_jobs import RecordingJobFrame, RecordingOutputFrame
 from protocol.messages import EmptyTranscriptMessage
 from utils.logger import logger
 
@@ -118,6 +122,8 @@ class TurnController(FrameProcessor):
         self._transcription_wait_timeout = DEFAULT_TRANSCRIPTION_WAIT_TIMEOUT_SECONDS
         # Context manager for reset coordination (set from main.py)
         self._context_manager: DictationContextManager | None = None
+        # ID of the current recording's job (None without a context manager)
+        self._recording_id: int | None = None
 
     def set_context_manager(self, context_manager: DictationContextManager) -> None:
         """Set the context manager for context reset coordination.
@@ -194,18 +200,34 @@ class TurnController(FrameProcessor):
     # =========================================================================
 
     async def _handle_start_recording(self) -> None:
-        """Transition to RecordingState from any state."""
+        """Transition to RecordingState, ending a previous recording still finalizing."""
         # Cancel any pending tasks from previous states
         self._cancel_timeout()
         self._cancel_draining()
 
-        # Reset context for new recording (no conversation history for dictation)
-        if self._context_manager:
-            self._context_manager.reset_context_for_new_recording()
+        # Finals that arrive from now on belong to the new dictation, so a previous
+        # recording still waiting for STT ends with what it already has
+        match self._state:
+            case (
+                WaitingForSTTState(has_content=has_content, direction=direction)
+                | DrainingState(has_content=has_content, direction=direction)
+            ):
+                logger.info("Start-recording received while finalizing, ending previous recording")
+                await self._end_recording(has_content, direction)
+            case IdleState() | RecordingState():
+                pass
 
         logger.info("Start-recording received, entering RecordingState")
         self._state = RecordingState()
 
+        # Each recording gets its own job and context (no conversation history for
+        # dictation). The (system) turn start may overtake the job frame, but the
+        # recording's transcripts never do
+        if self._context_manager:
+            job = self._context_manager.reset_context_for_new_recording()
+            self._recording_id = job.recording_id
+            await self.push_frame(RecordingJobFrame(job=job), FrameDirection.DOWNSTREAM)
+
         # Signal user turn start to downstream processors
         # LLMGateFilter will decide whether to pass this to the aggregator
         await self.push_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
@@ -233,7 +255,7 @@ class TurnController(FrameProcessor):
             case IdleState():
                 # Not recording - send empty response
                 logger.warning("Stop-recording received while idle")
-                await self._emit_empty_response(direction)
+                await self._emit_empty_response(direction, None)
 
             case DrainingState():
                 # Already draining - ignore
@@ -358,13 +380,8 @@ class TurnController(FrameProcessor):
             # No transcription for draining timeout - signal turn end now
             match self._state:
                 case DrainingState(has_content=has_content) as state:
-                    if has_content:
-                        logger.info("Draining complete, signaling turn end")
-                        await self._emit_turn_end(state.direction)
-                    else:
-                        logger.info("Draining complete with no content, sending empty")
-                        await self._emit_empty_response(direction)
-                    self._state = IdleState()
+                    logger.info(f"Draining complete (has_content: {has_content})")
+                    await self._end_recording(has_content, state.direction)
                 case _:
                     pass  # State changed, nothing to do
         except asyncio.CancelledError:
@@ -381,6 +398,14 @@ class TurnController(FrameProcessor):
     # Output Helpers
     # =========================================================================
 
+    async def _end_recording(self, has_content: bool, direction: FrameDirection) -> None:
+        """End the current recording's turn, or send an empty response, and go idle."""
+        if has_content:
+            await self._emit_turn_end(direction)
+        else:
+            await self._emit_empty_response(direction, self._recording_id)
+        self._state = IdleState()
+
     async def _emit_turn_end(self, direction: FrameDirection) -> None:
         """Signal end of user turn to downstream processors.
 
@@ -389,7 +414,9 @@ class TurnController(FrameProcessor):
         """
         await self.push_frame(UserStoppedSpeakingFrame(), direction)
 
-    async def _emit_empty_response(self, direction: FrameDirection) -> None:
-        """Send an empty response message to the client."""
-        frame = RTVIServerMessageFrame(data=EmptyTranscriptMessage().model_dump())
+    async def _emit_empty_response(
+        self, direction: FrameDirection, recording_id: int | None
+    ) -> None:
+        """Queue an empty response for the client, behind earlier recordings' results."""
+        frame = RecordingOutputFrame(message=EmptyTranscriptMessage(recording_id=recording_id))
         await self.push_frame(frame, direction)
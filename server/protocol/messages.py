@@ -280,20 +280,65 @@ def parse_client_message(raw: Mapping[str, object]) -> _ClientMessageUnion | Unk
 
 
 class EmptyTranscriptMessage(BaseModel):
-    """Server notification that recording processing is complete (no content)."""
+    """Server notification that recording processing is complete (no content).
+
+    recording_id is None for a stop-recording that had no recording to stop.
+    """
 
     type: Literal["recording-complete-with-zero-words"] = "recording-complete-with-zero-words"
+    recording_id: int | None = None
 
 
 class RawTranscriptionMessage(BaseModel):
     """Server message containing raw transcription (LLM bypassed).
 
-    Sent when LLM formatting is disabled via the config API.
+    Sent when LLM formatting is disabled via the config API, or when the
+    formatting router finds the transcript already clean.
     Contains the unformatted transcription directly from STT.
     """
 
     type: Literal["raw-transcription"] = "raw-transcription"
     text: str
+    recording_id: int | None = None
+
+
+class RawTranscriptionSegmentMessage(BaseModel):
+    """Server message containing one final STT segment of a recording (LLM bypassed).
+
+    Sent while the user is still speaking when progressive raw delivery is
+    enabled. Sequence numbers start at 0 for each recording; the recording's
+    RawTranscriptionEndMessage follows its last segment.
+    """
+
+    type: Literal["raw-transcription-segment"] = "raw-transcription-segment"
+    recording_id: int | None = None
+    sequence: int
+    text: str
+
+
+class RawTranscriptionEndMessage(BaseModel):
+    """Server message ending a progressively delivered raw transcription.
+
+    Carries the number of segments sent and their combined text, so the client
+    can detect missing segments and record the whole transcription.
+    """
+
+    type: Literal["raw-transcription-end"] = "raw-transcription-end"
+    recording_id: int | None = None
+    segment_count: int
+    text: str
+
+
+class FormattedTranscriptionMessage(BaseModel):
+    """Server message identifying the recording of a completed formatted response.
+
+    Sent right after the response's BotLlmStopped event, with the full text
+    that was streamed via BotLlmText events.
+    """
+
+    type: Literal["formatted-transcription"] = "formatted-transcription"
+    recording_id: int
+    text: str
 
 
 class ConfigUpdatedMessage(BaseModel):
@@ -314,6 +359,12 @@ class ConfigErrorMessage(BaseModel):
 
 
 RTVICustomServerMessage = Annotated[
-    EmptyTranscriptMessage | RawTranscriptionMessage | ConfigUpdatedMessage | ConfigErrorMessage,
+    EmptyTranscriptMessage
+    | RawTranscriptionMessage
+    | RawTranscriptionSegmentMessage
+    | RawTranscriptionEndMessage
+    | FormattedTranscriptionMessage
+    | ConfigUpdatedMessage
+    | ConfigErrorMessage,
     Field(discriminator="type"),
 ]
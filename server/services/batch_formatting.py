@@ -0,0 +1,206 @@
+"""Out-of-band formatting of text transcripts, with latency and token usage.
+
+Used by the text-only batch formatting API (transcripts from other STT
+systems) and by batch transcription of uploaded files. Each transcript gets
+the same treatment as a live dictation: dictionary exact mappings, then the
+DictationContextManager prompt (with the dictionary narrowed to the
+transcript) and an output limit derived from its length.
+
+All batch formatting shares one TranscriptFormatter, so the number of
+formatting requests in flight to LLM providers stays bounded however many
+batch requests arrive at once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, cast
+
+from processors.llm import estimate_token_count
+from processors.output_guard import run_formatting_with_output_limit
+
+if TYPE_CHECKING:
+    from pipecat.adapters.services.open_ai_adapter import OpenAILLMInvocationParams
+    from pipecat.processors.aggregators.llm_context import LLMContext
+    from pipecat.services.llm_service import LLMService
+
+    from processors.context_manager import DictationContextManager
+
+
+@dataclass(frozen=True)
+class FormattingUsage:
+    """Token usage of one formatting request.
+
+    Attributes:
+        prompt_tokens: Tokens sent to the LLM (system prompt and transcript)
+        completion_tokens: Tokens generated by the LLM
+        estimated: True if the provider did not report usage and it was estimated
+    """
+
+    prompt_tokens: int
+    completion_tokens: int
+    estimated: bool
+
+
+@dataclass(frozen=True)
+class FormattedTranscript:
+    """Result of formatting one transcript.
+
+    Attributes:
+        text: The formatted text (the transcript itself when formatting failed)
+        formatted: Whether the LLM's output was used
+        latency_secs: Time spent formatting, excluding time waiting for a slot
+        usage: Token usage, or None if the LLM request failed
+    """
+
+    text: str
+    formatted: bool
+    latency_secs: float
+    usage: FormattingUsage | None
+
+
+async def run_inference_with_usage(
+    llm_service: LLMService, context: LLMContext, max_tokens: int
+) -> tuple[str | None, FormattingUsage]:
+    """Run a one-shot inference and report its token usage.
+
+    pipecat's run_inference() returns only the text, so OpenAI-compatible
+    services are called through their client with the same parameters to read
+    the reported usage. Other services use run_inference() and estimated usage.
+
+    Args:
+        llm_service: The LLM service to run the inference with
+        context: The context to complete
+        max_tokens: Maximum tokens to generate
+
+    Returns:
+        The generated text (None if there was none) and its token usage
+    """
+    # Imported here: the OpenAI SDK is slow to import and only needed once a batch runs
+    from pipecat.services.openai.base_llm import BaseOpenAILLMService
+
+    if isinstance(llm_service, BaseOpenAILLMService):
+        invocation_params: OpenAILLMInvocationParams = (
+            llm_service.get_llm_adapter().get_llm_invocation_params(context)
+        )
+        params = llm_service.build_chat_completion_params(invocation_params)
+        params["stream"] = False
+        params.pop("stream_options", None)
+        if "max_completion_tokens" in params:
+            params["max_completion_tokens"] = max_tokens
+        else:
+            params["max_tokens"] = max_tokens
+        response = await llm_service._client.chat.completions.create(**params)
+        text = response.choices[0].message.content
+        if response.usage is not None:
+            return text, FormattingUsage(
+                prompt_tokens=response.usage.prompt_tokens,
+                completion_tokens=response.usage.completion_tokens,
+                estimated=False,
+            )
+    else:
+        text = await llm_service.run_inference(context, max_tokens=max_tokens)
+
+    prompt_text = " ".join(
+        str(cast(dict[str, Any], message).get("content", ""))
+        for message in context.get_messages()
+        if isinstance(message, dict)
+    )
+    return text, FormattingUsage(
+        prompt_tokens=estimate_token_count(prompt_text),
+        completion_tokens=estimate_token_count(text or ""),
+        estimated=True,
+    )
+
+
+class TranscriptFormatter:
+    """Formats transcripts out of band with a shared concurrency budget."""
+
+    def __init__(
+        self, max_concurrency: int, max_output_ratio: float, min_output_tokens: int
+    ) -> None:
+        """Initialize the formatter.
+
+        Args:
+            max_concurrency: Formatting requests in flight at once (all batches)
+            max_output_ratio: Allowed output length as a multiple of the transcript
+            min_output_tokens: Lower bound of the output limit for short transcripts
+        """
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._max_output_ratio = max_output_ratio
+        self._min_output_tokens = min_output_tokens
+
+    async def format_many(
+        self,
+        transcripts: Sequence[str],
+        llm_service: LLMService,
+        context_manager: DictationContextManager,
+    ) -> list[FormattedTranscript]:
+        """Format transcripts concurrently, returning the results in input order.
+
+        Args:
+            transcripts: The transcripts to format
+            llm_service: The LLM service to format with
+            context_manager: The prompt sections and dictionary to format with
+
+        Returns:
+            One result per transcript, in the order given
+        """
+        return list(
+            await asyncio.gather(
+                *(
+                    self.format(transcript, llm_service, context_manager)
+                    for transcript in transcripts
+                )
+            )
+        )
+
+    async def format(
+        self, transcript: str, llm_service: LLMService, context_manager: DictationContextManager
+    ) -> FormattedTranscript:
+        """Format one transcript, falling back to it when the LLM fails.
+
+        Args:
+            transcript: The transcript to format
+            llm_service: The LLM service to format with
+            context_manager: The prompt sections and dictionary to format with
+
+        Returns:
+            The formatting result
+        """
+        compiled_dictionary = context_manager.compiled_dictionary
+        if compiled_dictionary is not None:
+            transcript = compiled_dictionary.apply_exact_mappings(transcript).text
+        transcript = transcript.strip()
+        if not transcript:
+            return FormattedTranscript(text="", formatted=False, latency_secs=0.0, usage=None)
+
+        context = context_manager.build_reformat_context(transcript, None)
+        usage: FormattingUsage | None = None
+
+        async def run_inference(max_tokens: int) -> str | None:
+            nonlocal usage
+            formatted_text, usage = await run_inference_with_usage(llm_service, context, max_tokens)
+            return formatted_text
+
+        async with self._slots:
+            started_at = time.perf_counter()
+            result = await run_formatting_with_output_limit(
+                transcript,
+                run_inference,
+                self._max_output_ratio,
+                self._min_output_tokens,
+                description="Batch formatting",
+            )
+            latency_secs = time.perf_counter() - started_at
+
+        if result.text is None:
+            return FormattedTranscript(
+                text=transcript, formatted=False, latency_secs=latency_secs, usage=usage
+            )
+        return FormattedTranscript(
+            text=result.text, formatted=True, latency_secs=latency_secs, usage=usage
+        )
@@ -0,0 +1,260 @@
+"""Headless batch transcription of recorded audio files.
+
+Live dictation needs a WebRTC session. Batch transcription runs an uploaded
+WAV file through the same STT providers and DictationContextManager
+formatting without a transport, so backlogs of recorded notes can be
+processed faster than real time:
+- The upload is decoded as it streams in (never fully buffered) and fed to a
+  headless VAD → STT pipeline as 16 kHz mono audio frames, pausing the upload
+  while too much audio is still waiting for the STT service
+- Once the audio ends, the transcript is formatted out of band by the shared
+  TranscriptFormatter with the requesting client's prompt sections
+- Jobs run under a bounded worker budget; requests beyond it wait for a slot
+"""
+
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Final
+
+from loguru import logger
+from pipecat.audio.utils import create_stream_resampler
+from pipecat.audio.vad.silero import SileroVADAnalyzer
+from pipecat.audio.vad.vad_analyzer import VADParams
+from pipecat.frames.frames import EndFrame, Frame, InputAudioRawFrame, TranscriptionFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.audio.vad_processor import VADProcessor
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from processors.context_manager import DictationContextManager
+from protocol.providers import STTProviderId
+from services.batch_formatting import FormattedTranscript, TranscriptFormatter
+from services.providers import create_stt_service
+from utils.wav_stream import WavFormat, downmix_to_mono, read_wav_stream
+
+if TYPE_CHECKING:
+    from pipecat.services.llm_service import LLMService
+
+    from config.settings import Settings
+
+# Audio is fed to VAD and STT as 16 kHz mono 16-bit PCM (Silero VAD supports 8 or 16 kHz)
+PIPELINE_SAMPLE_RATE: Final[int] = 16000
+FRAME_DURATION_SECS: Final[float] = 0.02
+# Silence appended to the file, so VAD ends the last utterance
+TRAILING_SILENCE_SECS: Final[float] = 2.0
+# Audio fed ahead of the STT service before the upload is paused
+MAX_AUDIO_IN_FLIGHT_SECS: Final[float] = 30.0
+# After the audio ends, transcription is done once no transcript arrives for this long
+TRANSCRIPT_SETTLE_SECS: Final[float] = 1.5
+MAX_TRANSCRIPT_WAIT_SECS: Final[float] = 60.0
+
+
+# =============================================================================
+# Headless Pipeline
+# =============================================================================
+
+
+class _TranscriptCollector(FrameProcessor):
+    """Collects final transcripts and tracks how much audio the STT service has consumed."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.transcripts: list[str] = []
+        self.consumed_audio_bytes = 0
+        self.last_activity_at = time.monotonic()
+        self._progress = asyncio.Event()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
+        await super().process_frame(frame, direction)
+        match frame:
+            case InputAudioRawFrame(audio=audio):
+                # Audio ends here (it was passed through by the STT service)
+                self.consumed_audio_bytes += len(audio)
+                self.last_activity_at = time.monotonic()
+                self._progress.set()
+
+            case TranscriptionFrame(text=text) if text.strip():
+                self.transcripts.append(text.strip())
+                self.last_activity_at = time.monotonic()
+                await self.push_frame(frame, direction)
+
+            case _:
+                await self.push_frame(frame, direction)
+
+    async def wait_for_progress(self, timeout_secs: float) -> None:
+        """Wait until more audio is consumed (or the timeout passes)."""
+        self._progress.clear()
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._progress.wait(), timeout_secs)
+
+
+@dataclass(frozen=True)
+class BatchTranscriptionResult:
+    """Result of one batch transcription job.
+
+    Attributes:
+        raw_text: The combined STT transcript
+        formatting: The formatting result, or None if not formatted
+        audio_secs: Duration of the uploaded audio
+        processing_secs: Wall-clock time of the job, excluding time waiting for a slot
+    """
+
+    raw_text: str
+    formatting: FormattedTranscript | None
+    audio_secs: float
+    processing_secs: float
+
+
+class BatchTranscriber:
+    """Runs batch transcription jobs under a bounded worker budget (shared by all clients)."""
+
+    def __init__(
+        self, settings: "Settings", vad_params: VADParams, formatter: TranscriptFormatter
+    ) -> None:
+        """Initialize the transcriber.
+
+        Args:
+            settings: Application settings (provider credentials and limits)
+            vad_params: VAD parameters, as used for live dictation
+            formatter: The shared formatter of batch transcripts
+        """
+        self._settings = settings
+        self._vad_params = vad_params
+        self._formatter = formatter
+        self._max_audio_secs = settings.batch_transcription_max_audio_secs
+        self._job_slots = asyncio.Semaphore(settings.batch_transcription_max_concurrent_jobs)
+
+    async def transcribe(
+        self,
+        chunks: AsyncIterator[bytes],
+        stt_provider: STTProviderId,
+        llm_service: "LLMService | None",
+        context_manager: DictationContextManager,
+    ) -> BatchTranscriptionResult:
+        """Transcribe (and optionally format) a streamed WAV file.
+
+        Args:
+            chunks: The WAV file, streamed in chunks
+            stt_provider: The STT provider to transcribe with
+            llm_service: The LLM service to format with, or None for the raw transcript
+            context_manager: The prompt sections and dictionary to format with
+
+        Returns:
+            The transcript and job timings
+
+        Raises:
+            ValueError: If the audio is not a 16-bit PCM WAV file or is too long
+        """
+        queued_at = time.monotonic()
+        async with self._job_slots:
+            started_at = time.monotonic()
+            if started_at - queued_at > 0.1:
+                logger.info(f"Batch transcription waited {started_at - queued_at:.1f}s for a slot")
+
+            raw_text, audio_secs = await self._transcribe_audio(chunks, stt_provider)
+            formatting = (
+                await self._formatter.format(raw_text, llm_service, context_manager)
+                if llm_service is not None and raw_text
+                else None
+            )
+
+            processing_secs = time.monotonic() - started_at
+            logger.info(
+                f"Batch transcription of {audio_secs:.1f}s audio took {processing_secs:.1f}s "
+                f"({audio_secs / max(processing_secs, 1e-6):.1f}x real time, "
+                f"{stt_provider.value}, "
+                f"{'formatted' if formatting is not None and formatting.formatted else 'raw'})"
+            )
+            return BatchTranscriptionResult(
+                raw_text=raw_text,
+                formatting=formatting,
+                audio_secs=audio_secs,
+                processing_secs=processing_secs,
+            )
+
+    async def _transcribe_audio(
+        self, chunks: AsyncIterator[bytes], stt_provider: STTProviderId
+    ) -> tuple[str, float]:
+        wav_format, pcm_chunks = await read_wav_stream(chunks)
+        collector = _TranscriptCollector()
+        task = PipelineTask(
+            Pipeline(
+                [
+                    VADProcessor(vad_analyzer=SileroVADAnalyzer(params=self._vad_params)),
+                    create_stt_service(stt_provider, self._settings),
+                    collector,
+                ]
+            ),
+            params=PipelineParams(audio_in_sample_rate=PIPELINE_SAMPLE_RATE),
+            enable_rtvi=False,
+            idle_timeout_secs=None,
+        )
+        runner_task = asyncio.create_task(PipelineRunner(handle_sigint=False).run(task))
+        try:
+            audio_secs = await self._feed_audio(task, collector, wav_format, pcm_chunks)
+            await self._wait_for_transcripts(collector)
+            await task.queue_frame(EndFrame())
+            await runner_task
+        except BaseException:
+            await task.cancel()
+            raise
+        return " ".join(collector.transcripts), audio_secs
+
+    async def _feed_audio(
+        self,
+        task: PipelineTask,
+        collector: _TranscriptCollector,
+        wav_format: WavFormat,
+        pcm_chunks: AsyncIterator[bytes],
+    ) -> float:
+        resampler = create_stream_resampler()
+        frame_bytes = int(PIPELINE_SAMPLE_RATE * FRAME_DURATION_SECS) * 2
+        max_in_flight_bytes = int(PIPELINE_SAMPLE_RATE * MAX_AUDIO_IN_FLIGHT_SECS) * 2
+        pending = b""
+        file_pcm_bytes = 0
+        queued_bytes = 0
+
+        async def queue_audio(audio: bytes) -> None:
+            nonlocal queued_bytes
+            for start in range(0, len(audio), frame_bytes):
+                await task.queue_frame(
+                    InputAudioRawFrame(
+                        audio=audio[start : start + frame_bytes],
+                        sample_rate=PIPELINE_SAMPLE_RATE,
+                        num_channels=1,
+                    )
+                )
+            queued_bytes += len(audio)
+            # Pause the upload while the STT service is too far behind
+            while queued_bytes - collector.consumed_audio_bytes > max_in_flight_bytes:
+                await collector.wait_for_progress(timeout_secs=1.0)
+
+        async for pcm in pcm_chunks:
+            file_pcm_bytes += len(pcm)
+            if wav_format.duration_secs(file_pcm_bytes) > self._max_audio_secs:
+                raise ValueError(f"Audio is longer than {self._max_audio_secs:.0f}s")
+            mono = downmix_to_mono(pcm, wav_format.num_channels)
+            pending += await resampler.resample(mono, wav_format.sample_rate, PIPELINE_SAMPLE_RATE)
+            whole_bytes = len(pending) - len(pending) % frame_bytes
+            if whole_bytes:
+                await queue_audio(pending[:whole_bytes])
+                pending = pending[whole_bytes:]
+
+        silence = bytes(int(PIPELINE_SAMPLE_RATE * TRAILING_SILENCE_SECS) * 2)
+        await queue_audio(pending + silence)
+        return wav_format.duration_secs(file_pcm_bytes)
+
+    async def _wait_for_transcripts(self, collector: _TranscriptCollector) -> None:
+        # Streaming STT services deliver the final transcripts after the last audio
+        waited_secs = 0.0
+        while waited_secs < MAX_TRANSCRIPT_WAIT_SECS:
+            idle_secs = time.monotonic() - collector.last_activity_at
+            if idle_secs >= TRANSCRIPT_SETTLE_SECS:
+                return
+            await asyncio.sleep(TRANSCRIPT_SETTLE_SECS - idle_secs)
+            waited_secs += TRANSCRIPT_SETTLE_SECS - idle_secs
+        logger.warning("Batch transcription: STT still busy, ending with the transcripts so far")
@@ -0,0 +1,192 @@
+"""Ollama model preloading, keep-alive pinning and prompt prefix warming.
+
+A local Ollama server unloads an idle model (after 5 minutes by default), so
+the first dictation after a pause pays a model load that can take many
+seconds, and every request prefills the long dictation system prompt.
+OllamaModelManager uses Ollama's native API (the OpenAI-compatible endpoint
+used for formatting has no keep-alive or timing fields) to:
+- Preload the configured model at startup and pin it with keep_alive
+- Prefill the default system prompt once, so requests with the same prefix
+  reuse Ollama's KV cache. The system prompt puts the static sections first
+  and the per-recording dictionary selection and app context last, so custom
+  prompt sections become the cached prefix after their first dictation
+- Re-pin the model periodically, since each OpenAI-compatible request resets
+  its keep-alive to the server default (OLLAMA_KEEP_ALIVE)
+- Report load and prefill timings from Ollama's response metadata
+"""
+
+import asyncio
+import contextlib
+from dataclasses import dataclass
+from typing import Any, Final
+
+import httpx
+from loguru import logger
+
+DEFAULT_OLLAMA_BASE_URL: Final[str] = "http://localhost:11434"
+# Loading a large model from disk can take minutes
+OLLAMA_REQUEST_TIMEOUT_SECS: Final[float] = 300.0
+NANOSECONDS_PER_SECOND: Final[float] = 1e9
+
+
+class OllamaUnavailableError(Exception):
+    """The Ollama server could not load the model or warm its prompt prefix."""
+
+
+def ollama_native_base_url(base_url: str | None) -> str:
+    """Get the native API base URL from a configured (possibly /v1) base URL."""
+    url = (base_url or DEFAULT_OLLAMA_BASE_URL).rstrip("/")
+    return url.removesuffix("/v1")
+
+
+@dataclass(frozen=True)
+class OllamaTimings:
+    """Timings reported in the metadata of an Ollama response.
+
+    Attributes:
+        load_secs: Time spent loading the model (near zero when already loaded)
+        prompt_eval_count: Prompt tokens evaluated (excludes tokens reused from the KV cache)
+        prompt_eval_secs: Time spent prefilling the prompt
+        eval_count: Tokens generated
+        total_secs: Total time of the request
+    """
+
+    load_secs: float
+    prompt_eval_count: int
+    prompt_eval_secs: float
+    eval_count: int
+    total_secs: float
+
+    @classmethod
+    def from_response(cls, payload: dict[str, Any]) -> "OllamaTimings":
+        """Read the timings of a non-streaming /api/generate or /api/chat response."""
+        return cls(
+            load_secs=payload.get("load_duration", 0) / NANOSECONDS_PER_SECOND,
+            prompt_eval_count=payload.get("prompt_eval_count", 0),
+            prompt_eval_secs=payload.get("prompt_eval_duration", 0) / NANOSECONDS_PER_SECOND,
+            eval_count=payload.get("eval_count", 0),
+            total_secs=payload.get("total_duration", 0) / NANOSECONDS_PER_SECOND,
+        )
+
+    def describe(self) -> str:
+        """Summarize the timings for logging."""
+        return (
+            f"load {self.load_secs * 1000:.0f}ms, "
+            f"prefill {self.prompt_eval_count} tokens in {self.prompt_eval_secs * 1000:.0f}ms, "
+            f"total {self.total_secs * 1000:.0f}ms"
+        )
+
+
+class OllamaModelManager:
+    """Keeps the configured Ollama model loaded with its prompt prefix warm."""
+
+    def __init__(
+        self,
+        base_url: str | None,
+        model: str,
+        keep_alive: str,
+        refresh_interval_secs: float,
+    ) -> None:
+        """Initialize the manager.
+
+        Args:
+            base_url: Configured Ollama base URL (with or without /v1)
+            model: The Ollama model to keep loaded
+            keep_alive: Ollama keep_alive duration (e.g., "30m", or "-1" to pin indefinitely)
+            refresh_interval_secs: Interval of keep-alive refreshes, or 0 to only pin at startup
+        """
+        self._model = model
+        self._keep_alive: int | str = (
+            int(keep_alive) if keep_alive.lstrip("-").isdigit() else keep_alive
+        )
+        self._refresh_interval_secs = refresh_interval_secs
+        self._client = httpx.AsyncClient(
+            base_url=ollama_native_base_url(base_url),
+            timeout=OLLAMA_REQUEST_TIMEOUT_SECS,
+        )
+        self._refresh_task: asyncio.Task[None] | None = None
+        self.last_timings: OllamaTimings | None = None
+
+    async def start(self, system_prompt: str | None) -> None:
+        """Preload the model, warm the system prompt prefix and start refreshing.
+
+        Refreshes start even when the Ollama server cannot be reached yet, so
+        the model is pinned once it comes up.
+
+        Args:
+            system_prompt: System prompt to prefill, or None to only load the model
+
+        Raises:
+            OllamaUnavailableError: If the model was not loaded or its prefix not warmed
+        """
+        if self._refresh_interval_secs > 0:
+            self._refresh_task = asyncio.create_task(self._refresh_keep_alive())
+        timings = await self.preload()
+        if timings is None:
+            raise OllamaUnavailableError(f"Ollama model {self._model} was not loaded")
+        if system_prompt and await self.warm_prompt_prefix(system_prompt) is None:
+            raise OllamaUnavailableError(
+                f"Ollama model {self._model} system prompt prefix was not warmed"
+            )
+
+    async def stop(self) -> None:
+        """Stop refreshing the keep-alive and close the HTTP client."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresh_task
+            self._refresh_task = None
+        await self._client.aclose()
+
+    async def preload(self) -> OllamaTimings | None:
+        """Load the model (an empty generate request) and pin it with keep_alive."""
+        timings = await self._post(
+            "/api/generate", {"model": self._model, "keep_alive": self._keep_alive}
+        )
+        if timings is not None:
+            logger.info(
+                f"Ollama model {self._model} loaded in {timings.load_secs:.1f}s "
+                f"(keep_alive={self._keep_alive})"
+            )
+        return timings
+
+    async def warm_prompt_prefix(self, system_prompt: str) -> OllamaTimings | None:
+        """Prefill the system prompt so requests starting with it reuse the KV cache."""
+        timings = await self._post(
+            "/api/chat",
+            {
+                "model": self._model,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": ""},
+                ],
+                "stream": False,
+                "keep_alive": self._keep_alive,
+                "options": {"num_predict": 1},
+            },
+        )
+        if timings is not None:
+            logger.info(f"Ollama system prompt prefix warmed ({timings.describe()})")
+        return timings
+
+    async def _refresh_keep_alive(self) -> None:
+        while True:
+            await asyncio.sleep(self._refresh_interval_secs)
+            timings = await self._post(
+                "/api/generate", {"model": self._model, "keep_alive": self._keep_alive}
+            )
+            if timings is not None and timings.load_secs >= 1.0:
+                logger.warning(
+                    f"Ollama model {self._model} had been unloaded, "
+                    f"reloaded in {timings.load_secs:.1f}s"
+                )
+
+    async def _post(self, path: str, payload: dict[str, Any]) -> OllamaTimings | None:
+        try:
+            response = await self._client.post(path, json=payload)
+            response.raise_for_status()
+        except httpx.HTTPError as error:
+            logger.warning(f"Ollama {path} request for {self._model} failed: {error}")
+            return None
+        self.last_timings = OllamaTimings.from_response(response.json())
+        return self.last_timings
@@ -1,43 +1,37 @@
 """Provider registry for STT and LLM services.
 
-This module defines the available providers using direct class imports for
-compile-time type safety. If pipecat changes class names, we get import errors
-at startup instead of runtime failures.
+This module defines the available providers. Service classes are referenced
+by module and class name and imported the first time they are used, so
+importing the registry (which validating Settings does) does not import
+every provider SDK; a deployment typically configures two providers. The
+server imports the configured providers' classes at startup (see
+services.providers.load_stt_service_classes), and a test checks that every
+reference names a class that exists.
 
 Provider ID enums are defined in protocol.providers (single source of truth).
 """
 
+import importlib
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, Final
-
-# Direct imports from pipecat - type checked at import time
-from pipecat.services.anthropic.llm import AnthropicLLMService
-from pipecat.services.assemblyai.stt import AssemblyAISTTService
-from pipecat.services.aws.llm import AWSBedrockLLMService
-from pipecat.services.aws.stt import AWSTranscribeSTTService
-from pipecat.services.azure.stt import AzureSTTService
-from pipecat.services.cartesia.stt import CartesiaSTTService
-from pipecat.services.cerebras.llm import CerebrasLLMService
-from pipecat.services.deepgram.stt import DeepgramSTTService
-from pipecat.services.google.llm import GoogleLLMService
-from pipecat.services.google.stt import GoogleSTTService
-from pipecat.services.groq.llm import GroqLLMService
-from pipecat.services.groq.stt import GroqSTTService
+from typing import TYPE_CHECKING, Any, Final, cast
+
 from pipecat.services.llm_service import LLMService
-from pipecat.services.ollama.llm import OLLamaLLMService
-from pipecat.services.openai.llm import OpenAILLMService
-from pipecat.services.openai.stt import OpenAISTTService
-from pipecat.services.openrouter.llm import OpenRouterLLMService
-from pipecat.services.speechmatics.stt import SpeechmaticsSTTService
 from pipecat.services.stt_service import STTService
-from pipecat.services.whisper.stt import WhisperSTTService
+
+from processors.llm import PromptProfile
 
 # Provider ID enums from protocol (single source of truth)
 from protocol.providers import LLMProviderId, STTProviderId
 
-# Custom service for Nemotron ASR
-from services.nvidia_stt import NVidiaWebSocketSTTService
+# Personal dictionary keyword boosting per provider
+from services.stt_vocabulary import (
+    AssemblyAIKeytermBoost,
+    AzurePhraseListBoost,
+    DeepgramKeytermBoost,
+    SpeechmaticsVocabBoost,
+    STTVocabularyBoost,
+)
 
 if TYPE_CHECKING:
     from config.settings import Settings
@@ -149,6 +143,33 @@ class NoAuthMapper(CredentialMapper):
         return result
 
 
+# =============================================================================
+# Lazily Imported Service Classes
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class ServiceClassRef[ServiceT]:
+    """A service class, imported the first time it is loaded.
+
+    Attributes:
+        module: Module defining the class (e.g., "pipecat.services.deepgram.stt")
+        name: Class name within the module
+    """
+
+    module: str
+    name: str
+
+    def load(self) -> type[ServiceT]:
+        """Import the class.
+
+        Raises:
+            Exception: If the module or its SDK cannot be imported (pipecat raises
+                a plain Exception naming the missing module)
+        """
+        return cast("type[ServiceT]", getattr(importlib.import_module(self.module), self.name))
+
+
 # =============================================================================
 # Provider Configuration Dataclasses
 # =============================================================================
@@ -161,16 +182,22 @@ class STTProviderConfig:
     Attributes:
         provider_id: Enum identifier for this provider
         display_name: Human-readable name for UI (e.g., "Deepgram")
-        service_class: The actual pipecat service class (type-checked at import time)
+        service_class: The pipecat service class, imported when first loaded
         credential_mapper: Maps Settings fields to constructor kwargs
         default_kwargs: Additional kwargs to pass to constructor
+        input_params: Fields of the service class's InputParams, passed to the
+            constructor as params (empty to pass none)
+        vocabulary_boost: Pushes dictionary terms into the provider's keyword
+            boosting, or None if the provider has none
     """
 
     provider_id: STTProviderId
     display_name: str
-    service_class: type[STTService]
+    service_class: ServiceClassRef[STTService]
     credential_mapper: CredentialMapper
     default_kwargs: dict[str, Any] = field(default_factory=dict)
+    input_params: dict[str, Any] = field(default_factory=dict)
+    vocabulary_boost: STTVocabularyBoost | None = None
 
 
 @dataclass(frozen=True)
@@ -180,16 +207,18 @@ class LLMProviderConfig:
     Attributes:
         provider_id: Enum identifier for this provider
         display_name: Human-readable name for UI (e.g., "OpenAI")
-        service_class: The actual pipecat service class (type-checked at import time)
+        service_class: The pipecat service class, imported when first loaded
         credential_mapper: Maps Settings fields to constructor kwargs
         default_kwargs: Additional kwargs to pass to constructor
+        prompt_profile: Default prompt profile (lite for latency-sensitive providers)
     """
 
     provider_id: LLMProviderId
     display_name: str
-    service_class: type[LLMService]
+    service_class: ServiceClassRef[LLMService]
     credential_mapper: CredentialMapper
     default_kwargs: dict[str, Any] = field(default_factory=dict)
+    prompt_profile: PromptProfile = PromptProfile.FULL
 
 
 # =============================================================================
@@ -200,24 +229,24 @@ STT_PROVIDERS: Final[dict[STTProviderId, STTProviderConfig]] = {
     STTProviderId.SPEECHMATICS: STTProviderConfig(
         provider_id=STTProviderId.SPEECHMATICS,
         display_name="Speechmatics",
-        service_class=SpeechmaticsSTTService,
+        service_class=ServiceClassRef(
+            "pipecat.services.speechmatics.stt", "SpeechmaticsSTTService"
+        ),
         credential_mapper=ApiKeyMapper("speechmatics_api_key"),
-        default_kwargs={
-            "params": SpeechmaticsSTTService.InputParams(
-                end_of_utterance_silence_trigger=0.5,
-            )
-        },
+        input_params={"end_of_utterance_silence_trigger": 0.5},
+        vocabulary_boost=SpeechmaticsVocabBoost(),
     ),
     STTProviderId.ASSEMBLYAI: STTProviderConfig(
         provider_id=STTProviderId.ASSEMBLYAI,
         display_name="AssemblyAI",
-        service_class=AssemblyAISTTService,
+        service_class=ServiceClassRef("pipecat.services.assemblyai.stt", "AssemblyAISTTService"),
         credential_mapper=ApiKeyMapper("assemblyai_api_key"),
+        vocabulary_boost=AssemblyAIKeytermBoost(),
     ),
     STTProviderId.AWS: STTProviderConfig(
         provider_id=STTProviderId.AWS,
         display_name="AWS Transcribe",
-        service_class=AWSTranscribeSTTService,
+        service_class=ServiceClassRef("pipecat.services.aws.stt", "AWSTranscribeSTTService"),
         credential_mapper=MultiFieldMapper(
             {
                 "aws_access_key_id": "aws_access_key_id",
@@ -230,30 +259,32 @@ STT_PROVIDERS: Final[dict[STTProviderId, STTProviderConfig]] = {
     STTProviderId.AZURE: STTProviderConfig(
         provider_id=STTProviderId.AZURE,
         display_name="Azure Speech",
-        service_class=AzureSTTService,
+        service_class=ServiceClassRef("pipecat.services.azure.stt", "AzureSTTService"),
         credential_mapper=MultiFieldMapper(
             {
                 "azure_speech_key": "api_key",
                 "azure_speech_region": "region",
             }
         ),
+        vocabulary_boost=AzurePhraseListBoost(),
     ),
     STTProviderId.CARTESIA: STTProviderConfig(
         provider_id=STTProviderId.CARTESIA,
         display_name="Cartesia",
-        service_class=CartesiaSTTService,
+        service_class=ServiceClassRef("pipecat.services.cartesia.stt", "CartesiaSTTService"),
         credential_mapper=ApiKeyMapper("cartesia_api_key"),
     ),
     STTProviderId.DEEPGRAM: STTProviderConfig(
         provider_id=STTProviderId.DEEPGRAM,
         display_name="Deepgram",
-        service_class=DeepgramSTTService,
+        service_class=ServiceClassRef("pipecat.services.deepgram.stt", "DeepgramSTTService"),
         credential_mapper=ApiKeyMapper("deepgram_api_key"),
+        vocabulary_boost=DeepgramKeytermBoost(),
     ),
     STTProviderId.GOOGLE: STTProviderConfig(
         provider_id=STTProviderId.GOOGLE,
         display_name="Google Speech",
-        service_class=GoogleSTTService,
+        service_class=ServiceClassRef("pipecat.services.google.stt", "GoogleSTTService"),
         credential_mapper=MultiFieldMapper(
             {"google_application_credentials": "credentials_path"},
             required_fields=("google_application_credentials",),
@@ -262,13 +293,13 @@ STT_PROVIDERS: Final[dict[STTProviderId, STTProviderConfig]] = {
     STTProviderId.GROQ: STTProviderConfig(
         provider_id=STTProviderId.GROQ,
         display_name="Groq",
-        service_class=GroqSTTService,
+        service_class=ServiceClassRef("pipecat.services.groq.stt", "GroqSTTService"),
         credential_mapper=ApiKeyMapper("groq_api_key"),
     ),
     STTProviderId.NEMOTRON: STTProviderConfig(
         provider_id=STTProviderId.NEMOTRON,
         display_name="Nemotron ASR",
-        service_class=NVidiaWebSocketSTTService,
+        service_class=ServiceClassRef("services.nvidia_stt", "NVidiaWebSocketSTTService"),
         credential_mapper=NoAuthMapper(
             availability_fields=("nemotron_asr_url",),
             field_mapping={"nemotron_asr_url": "url"},
@@ -277,13 +308,13 @@ STT_PROVIDERS: Final[dict[STTProviderId, STTProviderConfig]] = {
     STTProviderId.OPENAI: STTProviderConfig(
         provider_id=STTProviderId.OPENAI,
         display_name="OpenAI",
-        service_class=OpenAISTTService,
+        service_class=ServiceClassRef("pipecat.services.openai.stt", "OpenAISTTService"),
         credential_mapper=ApiKeyMapper("openai_api_key"),
     ),
     STTProviderId.WHISPER: STTProviderConfig(
         provider_id=STTProviderId.WHISPER,
         display_name="Whisper",
-        service_class=WhisperSTTService,
+        service_class=ServiceClassRef("services.whisper_stt", "SharedWhisperSTTService"),
         credential_mapper=NoAuthMapper(
             availability_fields=("whisper_enabled",),
             field_mapping={
@@ -304,13 +335,13 @@ LLM_PROVIDERS: Final[dict[LLMProviderId, LLMProviderConfig]] = {
     LLMProviderId.ANTHROPIC: LLMProviderConfig(
         provider_id=LLMProviderId.ANTHROPIC,
         display_name="Anthropic Claude",
-        service_class=AnthropicLLMService,
+        service_class=ServiceClassRef("pipecat.services.anthropic.llm", "AnthropicLLMService"),
         credential_mapper=ApiKeyMapper("anthropic_api_key"),
     ),
     LLMProviderId.BEDROCK: LLMProviderConfig(
         provider_id=LLMProviderId.BEDROCK,
         display_name="AWS Bedrock",
-        service_class=AWSBedrockLLMService,
+        service_class=ServiceClassRef("pipecat.services.aws.llm", "AWSBedrockLLMService"),
         credential_mapper=NoAuthMapper(
             availability_fields=("aws_bedrock_model_id",),
             field_mapping={
@@ -325,26 +356,28 @@ LLM_PROVIDERS: Final[dict[LLMProviderId, LLMProviderConfig]] = {
     LLMProviderId.CEREBRAS: LLMProviderConfig(
         provider_id=LLMProviderId.CEREBRAS,
         display_name="Cerebras",
-        service_class=CerebrasLLMService,
+        service_class=ServiceClassRef("pipecat.services.cerebras.llm", "CerebrasLLMService"),
         credential_mapper=ApiKeyMapper("cerebras_api_key"),
         default_kwargs={"retry_on_timeout": True, "retry_timeout_secs": 10.0},
+        prompt_profile=PromptProfile.LITE,
     ),
     LLMProviderId.GEMINI: LLMProviderConfig(
         provider_id=LLMProviderId.GEMINI,
         display_name="Google Gemini",
-        service_class=GoogleLLMService,
+        service_class=ServiceClassRef("pipecat.services.google.llm", "GoogleLLMService"),
         credential_mapper=ApiKeyMapper("google_api_key"),
     ),
     LLMProviderId.GROQ: LLMProviderConfig(
         provider_id=LLMProviderId.GROQ,
         display_name="Groq",
-        service_class=GroqLLMService,
+        service_class=ServiceClassRef("pipecat.services.groq.llm", "GroqLLMService"),
         credential_mapper=ApiKeyMapper("groq_api_key"),
+        prompt_profile=PromptProfile.LITE,
     ),
     LLMProviderId.OLLAMA: LLMProviderConfig(
         provider_id=LLMProviderId.OLLAMA,
         display_name="Ollama",
-        service_class=OLLamaLLMService,
+        service_class=ServiceClassRef("pipecat.services.ollama.llm", "OLLamaLLMService"),
         credential_mapper=NoAuthMapper(
             availability_fields=("ollama_base_url", "ollama_model"),
             field_mapping={
@@ -356,7 +389,7 @@ LLM_PROVIDERS: Final[dict[LLMProviderId, LLMProviderConfig]] = {
     LLMProviderId.OPENAI: LLMProviderConfig(
         provider_id=LLMProviderId.OPENAI,
         display_name="OpenAI",
-        service_class=OpenAILLMService,
+        service_class=ServiceClassRef("pipecat.services.openai.llm", "OpenAILLMService"),
         credential_mapper=MultiFieldMapper(
             {
                 "openai_api_key": "api_key",
@@ -368,7 +401,7 @@ LLM_PROVIDERS: Final[dict[LLMProviderId, LLMProviderConfig]] = {
     LLMProviderId.OPENROUTER: LLMProviderConfig(
         provider_id=LLMProviderId.OPENROUTER,
         display_name="OpenRouter",
-        service_class=OpenRouterLLMService,
+        service_class=ServiceClassRef("pipecat.services.openrouter.llm", "OpenRouterLLMService"),
         credential_mapper=ApiKeyMapper("openrouter_api_key"),
     ),
 }
@@ -1,15 +1,17 @@
 """Provider factory functions for STT and LLM services.
 
 This module provides factory functions that use the provider registry to
-create service instances with direct class instantiation (no importlib).
+create service instances, importing each provider's service class the first
+time it is needed.
 """
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, cast
 
 from loguru import logger
 from pipecat.services.llm_service import LLMService
 from pipecat.services.stt_service import STTService
 
+from processors.llm import PromptProfile
 from services.provider_registry import (
     LLM_PROVIDERS,
     STT_PROVIDERS,
@@ -22,6 +24,7 @@ from services.provider_registry import (
     get_stt_provider_config,
     get_stt_provider_labels,
 )
+from services.stt_vocabulary import STTVocabularyBoost
 
 if TYPE_CHECKING:
     from config.settings import Settings
@@ -33,8 +36,12 @@ __all__ = [
     "create_all_available_stt_services",
     "create_llm_service",
     "create_stt_service",
+    "get_llm_prompt_profile",
     "get_llm_provider_labels",
     "get_stt_provider_labels",
+    "get_stt_vocabulary_boost",
+    "load_llm_service_classes",
+    "load_stt_service_classes",
 ]
 
 
@@ -69,8 +76,10 @@ def _create_stt_service_from_config(
 
     logger.info(f"Creating STT service: {config.provider_id.value}")
 
-    # Direct instantiation - service_class is type-checked at import time
-    return config.service_class(**kwargs)
+    service_class = config.service_class.load()
+    if config.input_params:
+        kwargs["params"] = cast("Any", service_class).InputParams(**config.input_params)
+    return service_class(**kwargs)
 
 
 def _create_llm_service_from_config(
@@ -104,8 +113,7 @@ def _create_llm_service_from_config(
 
     logger.info(f"Creating LLM service: {config.provider_id.value}")
 
-    # Direct instantiation - service_class is type-checked at import time
-    return config.service_class(**kwargs)
+    return config.service_class.load()(**kwargs)
 
 
 def create_stt_service(provider_id: STTProviderId, settings: "Settings") -> STTService:
@@ -127,6 +135,32 @@ def create_stt_service(provider_id: STTProviderId, settings: "Settings") -> STTS
     return _create_stt_service_from_config(config, settings)
 
 
+def get_llm_prompt_profile(provider_id: LLMProviderId) -> PromptProfile:
+    """Get the default prompt profile for an LLM provider.
+
+    Args:
+        provider_id: The LLM provider ID enum
+
+    Returns:
+        The provider's prompt profile, or the full profile for unknown providers
+    """
+    config = get_llm_provider_config(provider_id)
+    return config.prompt_profile if config else PromptProfile.FULL
+
+
+def get_stt_vocabulary_boost(provider_id: STTProviderId) -> STTVocabularyBoost | None:
+    """Get the keyword boost for an STT provider.
+
+    Args:
+        provider_id: The STT provider ID enum
+
+    Returns:
+        The provider's vocabulary boost, or None if it does not support boosting
+    """
+    config = get_stt_provider_config(provider_id)
+    return config.vocabulary_boost if config else None
+
+
 def create_llm_service(provider_id: LLMProviderId, settings: "Settings") -> LLMService:
     """Create an LLM service instance for the given provider.
 
@@ -178,6 +212,46 @@ def get_available_llm_providers(settings: "Settings") -> list[LLMProviderId]:
     ]
 
 
+def load_stt_service_classes(provider_ids: list[STTProviderId]) -> list[STTProviderId]:
+    """Import the service classes of STT providers ahead of their first use.
+
+    Args:
+        provider_ids: STT provider IDs, typically the available ones
+
+    Returns:
+        The provider IDs whose service classes imported; the others are logged
+    """
+    loaded: list[STTProviderId] = []
+    for provider_id in provider_ids:
+        try:
+            STT_PROVIDERS[provider_id].service_class.load()
+        except Exception as e:
+            logger.error(f"Failed to import STT provider '{provider_id.value}': {e}")
+        else:
+            loaded.append(provider_id)
+    return loaded
+
+
+def load_llm_service_classes(provider_ids: list[LLMProviderId]) -> list[LLMProviderId]:
+    """Import the service classes of LLM providers ahead of their first use.
+
+    Args:
+        provider_ids: LLM provider IDs, typically the available ones
+
+    Returns:
+        The provider IDs whose service classes imported; the others are logged
+    """
+    loaded: list[LLMProviderId] = []
+    for provider_id in provider_ids:
+        try:
+            LLM_PROVIDERS[provider_id].service_class.load()
+        except Exception as e:
+            logger.error(f"Failed to import LLM provider '{provider_id.value}': {e}")
+        else:
+            loaded.append(provider_id)
+    return loaded
+
+
 def create_all_available_stt_services(
     settings: "Settings",
     available_providers: list[STTProviderId],
@@ -0,0 +1,204 @@
+"""Personal dictionary keyword boosting for STT providers.
+
+Several STT providers accept a vocabulary of terms to bias recognition
+towards (Deepgram keyterms/keywords, AssemblyAI keyterms, Speechmatics
+additional vocabulary, Azure phrase lists). Getting a term right at STT time
+is cheaper than asking the LLM to correct it, so the dictionary's terms are
+sent to every STT service that supports boosting, and while the active STT
+boosts them the LLM prompt leaves them out (see CompiledDictionary).
+
+Each provider's boost is declared in the provider registry. The vocabulary is
+part of the provider's connection settings, so changing it after the pipeline
+has started reconnects the service (Azure phrase lists apply immediately).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Protocol, cast
+
+from loguru import logger
+
+from processors.llm import estimate_token_count
+
+if TYPE_CHECKING:
+    from pipecat.pipeline.service_switcher import ServiceSwitcher
+    from pipecat.services.assemblyai.stt import AssemblyAISTTService
+    from pipecat.services.azure.stt import AzureSTTService
+    from pipecat.services.deepgram.stt import DeepgramSTTService
+    from pipecat.services.speechmatics.stt import SpeechmaticsSTTService
+    from pipecat.services.stt_service import STTService
+
+    from processors.dictionary import CompiledDictionary
+
+
+class _ReconnectableSTTService(Protocol):
+    async def _connect(self) -> None: ...
+
+    async def _disconnect(self) -> None: ...
+
+
+# =============================================================================
+# Provider Boosts
+# =============================================================================
+
+
+class STTVocabularyBoost(ABC):
+    """Writes boost terms into one provider's connection settings."""
+
+    @abstractmethod
+    def configure(self, service: STTService, terms: tuple[str, ...]) -> bool:
+        """Store the terms in the service's settings (an empty tuple clears them).
+
+        Args:
+            service: The provider's STT service
+            terms: Terms to boost
+
+        Returns:
+            True if the terms take effect on the next connection (or immediately)
+        """
+
+    async def reconnect(self, service: STTService) -> None:
+        """Reconnect a running service so configured terms take effect."""
+        reconnectable_service = cast(_ReconnectableSTTService, service)
+        await reconnectable_service._disconnect()
+        await reconnectable_service._connect()
+
+
+class DeepgramKeytermBoost(STTVocabularyBoost):
+    """Deepgram `keyterm` prompting (Nova-3 and Flux), `keywords` for older models."""
+
+    def configure(self, service: STTService, terms: tuple[str, ...]) -> bool:
+        """Set `keyterm` or `keywords` in the live options."""
+        live_options = cast("DeepgramSTTService", service)._settings
+        model = str(live_options.get("model") or "")
+        option_name = "keyterm" if model.startswith(("nova-3", "flux")) else "keywords"
+        live_options.pop("keyterm", None)
+        live_options.pop("keywords", None)
+        if terms:
+            live_options[option_name] = list(terms)
+        return True
+
+
+class AssemblyAIKeytermBoost(STTVocabularyBoost):
+    """AssemblyAI streaming `keyterms_prompt` (the successor of word boost)."""
+
+    def configure(self, service: STTService, terms: tuple[str, ...]) -> bool:
+        """Set `keyterms_prompt` in the connection params."""
+        assemblyai_service = cast("AssemblyAISTTService", service)
+        assemblyai_service._connection_params = assemblyai_service._connection_params.model_copy(
+            update={"keyterms_prompt": list(terms) or None}
+        )
+        return True
+
+
+class SpeechmaticsVocabBoost(STTVocabularyBoost):
+    """Speechmatics `additional_vocab`."""
+
+    def configure(self, service: STTService, terms: tuple[str, ...]) -> bool:
+        """Set `additional_vocab` in the voice agent config."""
+        speechmatics_service = cast("SpeechmaticsSTTService", service)
+        speechmatics_service._config.additional_vocab = [
+            speechmatics_service.AdditionalVocabEntry(content=term) for term in terms
+        ]
+        return True
+
+
+class AzurePhraseListBoost(STTVocabularyBoost):
+    """Azure Speech phrase list, applied to the running recognizer without reconnecting.
+
+    The recognizer is created when the service starts, so terms configured
+    before then are not applied; the next prompt update applies them.
+    """
+
+    def configure(self, service: STTService, terms: tuple[str, ...]) -> bool:
+        """Replace the recognizer's phrase list."""
+        from azure.cognitiveservices.speech import PhraseListGrammar
+
+        speech_recognizer: Any = cast("AzureSTTService", service)._speech_recognizer
+        if speech_recognizer is None:
+            return False
+        phrase_list = PhraseListGrammar.from_recognizer(speech_recognizer)
+        phrase_list.clear()
+        for term in terms:
+            phrase_list.addPhrase(term)
+        return True
+
+    async def reconnect(self, service: STTService) -> None:
+        """Phrase lists apply to the running recognizer."""
+
+
+# =============================================================================
+# Per-Connection Booster
+# =============================================================================
+
+
+class STTVocabularyBooster:
+    """Keeps one connection's STT services boosted with its dictionary terms."""
+
+    def __init__(self, boosts: dict[STTService, STTVocabularyBoost]) -> None:
+        """Initialize the booster.
+
+        Args:
+            boosts: Boost for each STT service of the connection that supports one
+        """
+        self._boosts = boosts
+        self._stt_switcher: ServiceSwitcher | None = None
+        self._pipeline_started = False
+        self._boosted_terms: dict[STTService, tuple[str, ...]] = {}
+        # Reconnects from concurrent prompt updates must not interleave
+        self._lock = asyncio.Lock()
+
+    def set_stt_switcher(self, stt_switcher: ServiceSwitcher) -> None:
+        """Set the connection's STT switcher (the source of the active service)."""
+        self._stt_switcher = stt_switcher
+
+    def set_pipeline_started(self) -> None:
+        """Record that the STT services are connected, so changes need a reconnect."""
+        self._pipeline_started = True
+
+    def is_active_service_boosted(self, compiled_dictionary: CompiledDictionary) -> bool:
+        """Check whether the active STT service boosts this dictionary's terms."""
+        if self._stt_switcher is None or not compiled_dictionary.stt_boost_terms:
+            return False
+        active_service = cast("STTService", self._stt_switcher.strategy.active_service)
+        return self._boosted_terms.get(active_service) == compiled_dictionary.stt_boost_terms
+
+    async def boost(self, compiled_dictionary: CompiledDictionary | None) -> None:
+        """Send the dictionary's terms to every STT service that supports boosting.
+
+        Services that already boost the same terms are left alone; the others
+        are reconnected once the pipeline has started.
+
+        Args:
+            compiled_dictionary: The connection's dictionary, or None to clear boosting
+        """
+        terms = compiled_dictionary.stt_boost_terms if compiled_dictionary else ()
+        async with self._lock:
+            for service, boost in self._boosts.items():
+                if self._boosted_terms.get(service, ()) == terms:
+                    continue
+                self._boosted_terms.pop(service, None)
+                if not boost.configure(service, terms):
+                    logger.debug(f"{service} cannot boost vocabulary yet")
+                    continue
+                if self._pipeline_started:
+                    try:
+                        await boost.reconnect(service)
+                    except Exception as error:
+                        logger.warning(
+                            f"Failed to reconnect {service} with new vocabulary: {error}"
+                        )
+                        continue
+                self._boosted_terms[service] = terms
+
+        if compiled_dictionary is not None and terms:
+            unresolved_tokens = estimate_token_count(compiled_dictionary.unresolved_prompt or "")
+            boosted_tokens = estimate_token_count(compiled_dictionary.stt_boosted_prompt or "")
+            logger.info(
+                f"STT vocabulary boost: {len(terms)} dictionary terms sent to "
+                f"{len(self._boosted_terms)}/{len(self._boosts)} STT services; dictionary "
+                f"prompt ~{unresolved_tokens} -> ~{boosted_tokens} tokens while boosted "
+                f"(saves ~{unresolved_tokens - boosted_tokens} prompt tokens per request)"
+            )
@@ -0,0 +1,65 @@
+"""Local Whisper speech-to-text sharing one loaded model per process.
+
+Pipecat's WhisperSTTService loads its faster-whisper model when constructed,
+and an STT service is constructed for every client connection, so each
+connection used to load its own copy of the weights (hundreds of MB for the
+larger models). SharedWhisperSTTService loads each model once per process and
+shares it between connections; faster-whisper models are safe to transcribe
+with from several threads at once.
+"""
+
+import threading
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from pipecat.services.whisper.stt import Model, WhisperSTTService
+
+DEFAULT_WHISPER_MODEL = Model.DISTIL_MEDIUM_EN.value
+
+_models: dict[tuple[str, str, str], Any] = {}
+_models_lock = threading.Lock()
+
+
+def load_whisper_model(model_name: str, device: str, compute_type: str) -> Any:
+    """Load a faster-whisper model, or get the copy this process already loaded.
+
+    Raises:
+        ModuleNotFoundError: If faster-whisper is not installed
+    """
+    key = (model_name, device, compute_type)
+    with _models_lock:
+        if key not in _models:
+            from faster_whisper import WhisperModel
+
+            logger.debug(f"Loading Whisper model {model_name}...")
+            _models[key] = WhisperModel(model_name, device=device, compute_type=compute_type)
+            logger.debug(f"Loaded Whisper model {model_name}")
+        return _models[key]
+
+
+def fetch_whisper_model_files(model_name: str) -> None:
+    """Download a Whisper model's files ahead of its first load.
+
+    Does nothing for a model given as a local directory.
+
+    Raises:
+        ModuleNotFoundError: If faster-whisper is not installed
+    """
+    if Path(model_name).is_dir():
+        return
+    from faster_whisper import download_model
+
+    download_model(model_name)
+
+
+class SharedWhisperSTTService(WhisperSTTService):
+    """WhisperSTTService whose instances share one model per process."""
+
+    def _load(self) -> None:
+        try:
+            self._model = load_whisper_model(self.model_name, self._device, self._compute_type)
+        except ModuleNotFoundError as e:
+            logger.error(f"Exception: {e}")
+            logger.error("In order to use Whisper, you need to `pip install pipecat-ai[whisper]`.")
+            self._model = None
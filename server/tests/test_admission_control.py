@@ -0,0 +1,174 @@
+"""Tests for admission control of new pipelines."""
+
+import asyncio
+import time
+
+import pytest
+
+from utils.admission_control import (
+    RECONNECT_WINDOW_SECS,
+    AdmissionController,
+    AdmissionReason,
+    LoadMonitor,
+    format_metrics,
+)
+
+
+class _Clock:
+    """A settable clock."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> _Clock:
+    return _Clock()
+
+
+class TestAdmissionController:
+    """Tests for AdmissionController."""
+
+    def test_reserved_pipelines_are_kept_for_reconnecting_clients(self, clock: _Clock) -> None:
+        controller = AdmissionController(
+            LoadMonitor(), max_pipelines=10, reserved_pipelines=2, clock=clock
+        )
+        controller.note_disconnected("returning")
+
+        assert controller.check("new", 7).admitted
+        controller.release()
+        assert controller.check("new", 8).reason == AdmissionReason.MAX_PIPELINES
+        assert not controller.check("new", 8).admitted
+        assert controller.check("returning", 9).reason == AdmissionReason.RECONNECT
+        controller.release()
+        assert not controller.check("returning", 10).admitted
+        # Replacing a running pipeline does not add load
+        assert controller.check("connected", 10, has_pipeline=True).admitted
+
+    def test_reconnects_expire(self, clock: _Clock) -> None:
+        controller = AdmissionController(
+            LoadMonitor(), max_pipelines=10, reserved_pipelines=2, clock=clock
+        )
+        controller.note_disconnected("returning")
+
+        clock.now += RECONNECT_WINDOW_SECS + 1
+        assert not controller.check("returning", 9).admitted
+
+    def test_new_clients_are_shed_under_loop_lag_or_cpu(self) -> None:
+        load_monitor = LoadMonitor()
+        controller = AdmissionController(load_monitor, max_loop_lag_secs=0.1, max_cpu_percent=90.0)
+        controller.note_disconnected("returning")
+
+        load_monitor.record_sample(loop_lag_secs=0.3, cpu_percent=50.0)
+        assert controller.check("new", 1).reason == AdmissionReason.LOOP_LAG
+        assert controller.check("returning", 1).admitted
+
+        load_monitor.record_sample(loop_lag_secs=0.0, cpu_percent=95.0)
+        # Half the lag spike still counts
+        assert controller.check("new", 1).reason == AdmissionReason.LOOP_LAG
+        load_monitor.record_sample(loop_lag_secs=0.0, cpu_percent=95.0)
+        assert controller.check("new", 1).reason == AdmissionReason.CPU
+
+        load_monitor.record_sample(loop_lag_secs=0.0, cpu_percent=10.0)
+        assert controller.check("new", 1).reason == AdmissionReason.WITHIN_CAPACITY
+
+    def test_admitted_offers_hold_a_slot_until_released(self, clock: _Clock) -> None:
+        controller = AdmissionController(LoadMonitor(), max_pipelines=2, clock=clock)
+
+        assert controller.check("a", 0).admitted
+        assert controller.check("b", 0).admitted
+        assert controller.capacity(0) == 0.0
+        assert controller.check("c", 0).reason == AdmissionReason.MAX_PIPELINES
+
+        # One offer failed, the other's pipeline is now counted as active
+        controller.release()
+        controller.release()
+        assert controller.check("c", 1).admitted
+
+    def test_concurrent_burst_of_offers_stays_within_max_pipelines(self) -> None:
+        controller = AdmissionController(LoadMonitor(), max_pipelines=3)
+        active_pipelines: set[str] = set()
+
+        async def offer(client_uuid: str) -> bool:
+            if not controller.check(client_uuid, len(active_pipelines)).admitted:
+                return False
+            # SDP negotiation runs before the pipeline task is registered
+            await asyncio.sleep(0.01)
+            active_pipelines.add(client_uuid)
+            controller.release()
+            return True
+
+        async def burst() -> list[bool]:
+            return list(await asyncio.gather(*(offer(f"client-{i}") for i in range(10))))
+
+        assert sum(asyncio.run(burst())) == 3
+        assert len(active_pipelines) == 3
+        assert not controller.check("late", len(active_pipelines)).admitted
+
+    def test_draining_sheds_every_offer(self, clock: _Clock) -> None:
+        controller = AdmissionController(LoadMonitor(), max_pipelines=10, clock=clock)
+        controller.note_disconnected("returning")
+        controller.drain()
+
+        assert controller.draining
+        for decision in [
+            controller.check("new", 0),
+            controller.check("returning", 0),
+            controller.check("connected", 1, has_pipeline=True),
+        ]:
+            assert decision.reason == AdmissionReason.DRAINING
+            assert not decision.admitted
+
+    def test_capacity_is_left_of_the_most_used_limit(self) -> None:
+        load_monitor = LoadMonitor()
+        controller = AdmissionController(
+            load_monitor, max_pipelines=10, reserved_pipelines=2, max_loop_lag_secs=0.2
+        )
+
+        assert controller.capacity(0) == 1.0
+        assert controller.capacity(2) == pytest.approx(0.75)
+        load_monitor.record_sample(loop_lag_secs=0.15, cpu_percent=300.0)
+        assert controller.capacity(2) == pytest.approx(0.25)
+        assert controller.capacity(9) == 0.0
+        # Limits left unset do not count
+        assert AdmissionController(load_monitor).capacity(50) == 1.0
+
+    def test_reserve_must_leave_pipelines_for_new_clients(self) -> None:
+        with pytest.raises(ValueError):
+            AdmissionController(LoadMonitor(), max_pipelines=2, reserved_pipelines=2)
+
+    def test_decisions_are_exposed_as_metrics(self) -> None:
+        controller = AdmissionController(LoadMonitor(), max_pipelines=1)
+        controller.check("a", 0)
+        controller.check("b", 1)
+        controller.check("c", 1)
+
+        metrics = format_metrics(controller, active_pipelines=1)
+        assert (
+            'tambourine_admission_decisions_total{outcome="admitted",reason="within_capacity"} 1'
+            in metrics
+        )
+        assert (
+            'tambourine_admission_decisions_total{outcome="shed",reason="max_pipelines"} 2'
+            in metrics
+        )
+        assert "tambourine_active_pipelines 1\n" in metrics
+
+
+class TestLoadMonitor:
+    """Tests for LoadMonitor."""
+
+    def test_measures_a_blocked_event_loop(self) -> None:
+        async def block_loop() -> float:
+            load_monitor = LoadMonitor(interval_secs=0.05)
+            load_monitor.start()
+            await asyncio.sleep(0.1)
+            time.sleep(0.3)
+            await asyncio.sleep(0.1)
+            await load_monitor.stop()
+            return load_monitor.load().loop_lag_secs
+
+        assert asyncio.run(block_loop()) > 0.1
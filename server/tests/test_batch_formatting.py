@@ -0,0 +1,134 @@
+"""Tests for batch formatting against a local OpenAI-compatible stub server."""
+
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+from pipecat.services.openai.llm import OpenAILLMService
+
+from processors.context_manager import DictationContextManager
+from services.batch_formatting import TranscriptFormatter
+
+
+class _StubState:
+    """Requests seen by the stub server."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.bodies: list[dict[str, Any]] = []
+
+
+def _make_handler(state: _StubState) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with state.lock:
+                state.bodies.append(body)
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            transcript = body["messages"][-1]["content"]
+            time.sleep(0.05)
+            with state.lock:
+                state.in_flight -= 1
+
+            if transcript == "fail":
+                self.send_response(500)
+                self.end_headers()
+                return
+            payload = {
+                "id": "stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": transcript.capitalize()},
+                    }
+                ],
+                "usage": {"prompt_tokens": 100, "completion_tokens": 7, "total_tokens": 107},
+            }
+            data = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            _ = format, args
+
+    return Handler
+
+
+@pytest.fixture
+def stub_server() -> Iterator[tuple[str, _StubState]]:
+    state = _StubState()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(state))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/v1", state
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _context_manager() -> DictationContextManager:
+    context_manager = DictationContextManager()
+    context_manager.set_prompt_sections(dictionary_enabled=False)
+    return context_manager
+
+
+class TestTranscriptFormatter:
+    """Tests for TranscriptFormatter."""
+
+    def test_results_keep_input_order_within_the_concurrency_bound(
+        self, stub_server: tuple[str, _StubState]
+    ) -> None:
+        base_url, state = stub_server
+        llm_service = OpenAILLMService(api_key="test", base_url=base_url, model="stub")
+        formatter = TranscriptFormatter(
+            max_concurrency=2, max_output_ratio=3.0, min_output_tokens=64
+        )
+        transcripts = [f"note number {index}" for index in range(6)]
+
+        results = asyncio.run(formatter.format_many(transcripts, llm_service, _context_manager()))
+
+        assert [result.text for result in results] == [f"Note number {index}" for index in range(6)]
+        assert all(result.formatted for result in results)
+        assert state.max_in_flight == 2
+        assert state.bodies[0]["stream"] is False
+        usage = results[0].usage
+        assert usage is not None
+        assert (usage.prompt_tokens, usage.completion_tokens, usage.estimated) == (100, 7, False)
+
+    def test_failed_transcript_is_returned_unformatted(
+        self, stub_server: tuple[str, _StubState]
+    ) -> None:
+        base_url, _ = stub_server
+        llm_service = OpenAILLMService(api_key="test", base_url=base_url, model="stub")
+        formatter = TranscriptFormatter(
+            max_concurrency=4, max_output_ratio=3.0, min_output_tokens=64
+        )
+        # The OpenAI client retries server errors, so disable its retries
+        llm_service._client = llm_service._client.with_options(max_retries=0)
+
+        results = asyncio.run(
+            formatter.format_many(["first note", "fail", "  "], llm_service, _context_manager())
+        )
+
+        assert [(result.text, result.formatted) for result in results] == [
+            ("First note", True),
+            ("fail", False),
+            ("", False),
+        ]
+        assert results[1].usage is None
@@ -0,0 +1,39 @@
+"""Tests for splitting and stitching chunked transcripts."""
+
+from processors.chunked_formatting import remove_formatted_overlap, split_transcript
+
+
+class TestSplitTranscript:
+    """Tests for split_transcript()."""
+
+    def test_chunks_break_at_sentences_and_repeat_the_overlap(self) -> None:
+        chunks = split_transcript(
+            ["one two three. four five six.", "seven eight nine ten."],
+            chunk_words=7,
+            overlap_words=2,
+        )
+        assert [chunk.text for chunk in chunks] == [
+            "one two three. four five six.",
+            "five six. seven eight nine ten.",
+        ]
+        assert [chunk.overlap_words for chunk in chunks] == [0, 2]
+
+    def test_unpunctuated_runs_are_split_by_word_count(self) -> None:
+        chunks = split_transcript(["a b c d e f g"], chunk_words=3, overlap_words=0)
+        assert [chunk.text for chunk in chunks] == ["a b c", "d e f", "g"]
+
+
+class TestRemoveFormattedOverlap:
+    """Tests for remove_formatted_overlap()."""
+
+    def test_formatted_overlap_is_removed(self) -> None:
+        stitched = remove_formatted_overlap(
+            "We met at noon, then left.", "Then left. Later we had coffee.", overlap_words=2
+        )
+        assert stitched == "Later we had coffee."
+
+    def test_unaligned_chunk_is_kept_whole(self) -> None:
+        chunk_text = "Something else entirely."
+        assert remove_formatted_overlap("We met at noon.", chunk_text, overlap_words=2) == (
+            chunk_text
+        )
@@ -0,0 +1,146 @@
+"""Tests for the client UUID registry's persistence, TTL and in-memory cache."""
+
+import asyncio
+from pathlib import Path
+
+from processors.client_registry import EVICTION_INTERVAL_SECS, ClientRegistry
+from utils.state_store import MemoryStateStore, SqliteStateStore, StateStore
+
+DAY_SECS = 86400.0
+
+
+class _Clock:
+    """A settable clock for registry tests."""
+
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _CountingStore(MemoryStateStore):
+    """A memory store counting registry lookups and last-seen writes."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups = 0
+        self.touches = 0
+
+    def get_registered_uuid_last_seen(self, client_uuid: str) -> float | None:
+        self.lookups += 1
+        return super().get_registered_uuid_last_seen(client_uuid)
+
+    def touch_registered_uuid(self, client_uuid: str, seen_at: float) -> bool:
+        self.touches += 1
+        return super().touch_registered_uuid(client_uuid, seen_at)
+
+
+def _registry(
+    store: StateStore, clock: _Clock, ttl_secs: float | None = 90 * DAY_SECS, cache_size: int = 100
+) -> ClientRegistry:
+    return ClientRegistry(store, ttl_secs=ttl_secs, cache_size=cache_size, clock=clock)
+
+
+class TestClientRegistry:
+    """Tests for ClientRegistry."""
+
+    def test_registrations_survive_a_restart(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "state.db")
+        clock = _Clock()
+        before_restart = SqliteStateStore(path)
+        client_uuid = asyncio.run(_registry(before_restart, clock).register())
+        before_restart.close()
+
+        after_restart = SqliteStateStore(path)
+        assert asyncio.run(_registry(after_restart, clock).is_registered(client_uuid))
+        after_restart.close()
+
+    def test_unseen_uuids_expire_and_are_evicted(self) -> None:
+        clock = _Clock()
+        store = MemoryStateStore()
+        registry = _registry(store, clock)
+        stale_uuid = asyncio.run(registry.register())
+
+        clock.now += 60 * DAY_SECS
+        active_uuid = asyncio.run(registry.register())
+        clock.now += 31 * DAY_SECS
+
+        assert not asyncio.run(registry.is_registered(stale_uuid))
+        assert asyncio.run(registry.is_registered(active_uuid))
+        assert asyncio.run(registry.evict_stale()) == 1
+        assert asyncio.run(registry.count()) == 1
+
+    def test_eviction_runs_on_register_when_due(self) -> None:
+        clock = _Clock()
+        registry = _registry(MemoryStateStore(), clock, ttl_secs=DAY_SECS)
+        asyncio.run(registry.register())
+
+        clock.now += 2 * DAY_SECS
+        asyncio.run(registry.register())
+        assert asyncio.run(registry.count()) == 1
+
+        clock.now += EVICTION_INTERVAL_SECS / 2
+        asyncio.run(registry.register())
+        assert asyncio.run(registry.count()) == 2
+
+    def test_no_ttl_keeps_uuids_forever(self) -> None:
+        clock = _Clock()
+        registry = _registry(MemoryStateStore(), clock, ttl_secs=None)
+        client_uuid = asyncio.run(registry.register())
+
+        clock.now += 10_000 * DAY_SECS
+        assert asyncio.run(registry.is_registered(client_uuid))
+        assert asyncio.run(registry.evict_stale()) == 0
+
+    def test_cached_lookups_throttle_last_seen_writes(self) -> None:
+        clock = _Clock()
+        store = _CountingStore()
+        registry = _registry(store, clock)
+        client_uuid = asyncio.run(registry.register())
+
+        for _ in range(100):
+            clock.now += 10
+            assert asyncio.run(registry.is_registered(client_uuid))
+        assert (store.lookups, store.touches) == (0, 0)
+
+        clock.now += 2 * 3600
+        assert asyncio.run(registry.is_registered(client_uuid))
+        assert store.touches == 1
+        assert store.get_registered_uuid_last_seen(client_uuid) == clock.now
+
+    def test_cache_is_bounded(self) -> None:
+        clock = _Clock()
+        store = _CountingStore()
+        registry = _registry(store, clock, cache_size=2)
+        first_uuid, *later_uuids = [asyncio.run(registry.register()) for _ in range(3)]
+
+        for client_uuid in later_uuids:
+            assert asyncio.run(registry.is_registered(client_uuid))
+        assert store.lookups == 0
+
+        assert asyncio.run(registry.is_registered(first_uuid))
+        assert store.lookups == 1
+
+    def test_uuid_unregistered_elsewhere_is_rejected(self) -> None:
+        clock = _Clock()
+        store = MemoryStateStore()
+        registry = _registry(store, clock)
+        client_uuid = asyncio.run(registry.register())
+
+        store.evict_registered_uuids(seen_before=clock.now + 1)
+        clock.now += 2 * 3600
+        assert not asyncio.run(registry.is_registered(client_uuid))
+
+    def test_first_sweep_waits_an_interval(self) -> None:
+        clock = _Clock()
+        store = MemoryStateStore()
+        store.add_registered_uuid("stale", clock.now - 2 * DAY_SECS)
+        registry = _registry(store, clock, ttl_secs=DAY_SECS)
+
+        asyncio.run(registry.register())
+        assert store.get_registered_uuid_last_seen("stale") is not None
+
+        clock.now += EVICTION_INTERVAL_SECS
+        asyncio.run(registry.register())
+        assert store.get_registered_uuid_last_seen("stale") is None
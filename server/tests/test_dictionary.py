@@ -0,0 +1,178 @@
+"""Tests for dictionary parsing and deterministic replacement."""
+
+from typing import Any, cast
+
+from processors.context_manager import DictationContextManager
+from processors.dictionary import (
+    DictionaryMapping,
+    DictionaryRule,
+    DictionaryTerm,
+    compile_dictionary_section,
+    parse_dictionary_entry,
+)
+from processors.llm import DICTIONARY_PROMPT_DEFAULT, MAIN_PROMPT_LITE, PromptProfile
+
+MEDICAL_DICTIONARY_SECTION = """## Personal Dictionary
+
+Apply these corrections.
+
+### Entries
+
+#### Cytokines
+- interleukin six = IL-6
+- see dee four = CD4
+- see dee forty-five = CD45
+- see dee = CD
+
+#### Terms
+- troponin = troponin
+- metoprolol
+- The abbreviation 'EF' refers to ejection fraction."""
+
+
+class TestParseDictionaryEntry:
+    """Tests for parse_dictionary_entry() classification."""
+
+    def test_explicit_mapping_strips_trailing_gloss(self) -> None:
+        entry = parse_dictionary_entry("row as = ROAS (Return on Ad Spend)")
+        assert entry == DictionaryMapping(
+            spoken_form="row as",
+            written_form="ROAS",
+            source_line="row as = ROAS (Return on Ad Spend)",
+        )
+
+    def test_single_term_keeps_gloss(self) -> None:
+        entry = parse_dictionary_entry("FACS (fluorescence-activated cell sorting)")
+        assert isinstance(entry, DictionaryTerm)
+        assert entry.term == "FACS"
+        assert entry.gloss == "fluorescence-activated cell sorting"
+
+    def test_sentence_is_natural_language_rule(self) -> None:
+        entry = parse_dictionary_entry("The name 'Claude' should always be capitalized.")
+        assert isinstance(entry, DictionaryRule)
+
+
+class TestCompiledDictionary:
+    """Tests for exact mapping replacement and unresolved prompt rendering."""
+
+    def test_default_dictionary_replaces_explicit_mapping(self) -> None:
+        compiled = compile_dictionary_section(DICTIONARY_PROMPT_DEFAULT)
+        result = compiled.apply_exact_mappings("I work at ant row pick on pipecat")
+        assert result.text == "I work at Anthropic on pipecat"
+        assert result.replacement_count == 1
+
+    def test_longest_match_wins_at_same_position(self) -> None:
+        compiled = compile_dictionary_section(MEDICAL_DICTIONARY_SECTION)
+        result = compiled.apply_exact_mappings("see dee forty-five and see dee four cells")
+        assert result.text == "CD45 and CD4 cells"
+
+    def test_matches_respect_word_boundaries(self) -> None:
+        compiled = compile_dictionary_section(MEDICAL_DICTIONARY_SECTION)
+        result = compiled.apply_exact_mappings("oversee deep waters")
+        assert result.text == "oversee deep waters"
+        assert result.replacement_count == 0
+
+    def test_lowercase_written_form_keeps_sentence_capitalization(self) -> None:
+        compiled = compile_dictionary_section(MEDICAL_DICTIONARY_SECTION)
+        result = compiled.apply_exact_mappings("Troponin was elevated. Interleukin six too")
+        assert result.text == "Troponin was elevated. IL-6 too"
+
+    def test_unresolved_prompt_keeps_only_terms_and_rules(self) -> None:
+        compiled = compile_dictionary_section(MEDICAL_DICTIONARY_SECTION)
+        assert compiled.unresolved_prompt is not None
+        assert "metoprolol" in compiled.unresolved_prompt
+        assert "ejection fraction" in compiled.unresolved_prompt
+        assert "IL-6" not in compiled.unresolved_prompt
+        assert "#### Cytokines" not in compiled.unresolved_prompt
+        assert "#### Terms" in compiled.unresolved_prompt
+
+    def test_fully_resolved_dictionary_has_no_prompt(self) -> None:
+        compiled = compile_dictionary_section("### Entries\n- ant row pick = Anthropic")
+        assert compiled.unresolved_prompt is None
+
+    def test_stt_boosted_prompt_keeps_glossed_terms_and_rules(self) -> None:
+        compiled = compile_dictionary_section(
+            "### Entries\n- metoprolol\n- Metoprolol\n- Pipecat (voice AI framework)\n"
+            "- ant row pick = Anthropic\n- The abbreviation 'EF' refers to ejection fraction."
+        )
+        assert compiled.stt_boost_terms == ("metoprolol", "Pipecat")
+        assert compiled.stt_boosted_prompt is not None
+        assert "metoprolol" not in compiled.stt_boosted_prompt
+        assert "- Pipecat (voice AI framework)" in compiled.stt_boosted_prompt
+        assert "ejection fraction" in compiled.stt_boosted_prompt
+
+    def test_identical_content_reuses_compiled_dictionary(self) -> None:
+        first = compile_dictionary_section(MEDICAL_DICTIONARY_SECTION)
+        second = compile_dictionary_section(str(MEDICAL_DICTIONARY_SECTION))
+        assert first is second
+
+
+class TestDictionaryRetrieval:
+    """Tests for per-transcript dictionary entry selection."""
+
+    def test_selects_lexical_and_rule_entries_only(self) -> None:
+        compiled = compile_dictionary_section(MEDICAL_DICTIONARY_SECTION)
+        selection = compiled.retrieval_index.select("troponin was elevated", 1000)
+        assert selection.prompt is not None
+        assert "ejection fraction" in selection.prompt
+        assert "metoprolol" not in selection.prompt
+        assert selection.selected_entry_count == 1
+        assert selection.unresolved_entry_count == 2
+
+    def test_selects_phonetic_near_miss(self) -> None:
+        compiled = compile_dictionary_section(DICTIONARY_PROMPT_DEFAULT)
+        selection = compiled.retrieval_index.select("built with pipe cat", 1000)
+        assert selection.prompt is not None
+        assert "- Pipecat" in selection.prompt
+        assert "- Tauri" not in selection.prompt
+
+    def test_token_budget_is_never_exceeded(self) -> None:
+        compiled = compile_dictionary_section(MEDICAL_DICTIONARY_SECTION)
+        selection = compiled.retrieval_index.select("metoprolol was started", 25)
+        assert selection.prompt_token_estimate <= 25
+        assert selection.selected_entry_count == 1
+
+
+class TestDictationContextManagerDictionary:
+    """Tests for dictionary integration in the system prompt."""
+
+    def test_system_prompt_omits_resolved_mappings(self) -> None:
+        context_manager = DictationContextManager()
+        context_manager.set_prompt_sections(dictionary_enabled=True)
+        assert "- ant row pick = Anthropic" not in context_manager.system_prompt
+        assert "Pipecat" in context_manager.system_prompt
+
+    def test_fully_resolved_dictionary_is_omitted_from_prompt(self) -> None:
+        context_manager = DictationContextManager()
+        context_manager.set_prompt_sections(
+            advanced_enabled=False,
+            dictionary_enabled=True,
+            dictionary_custom="### Entries\n- ant row pick = Anthropic",
+        )
+        assert "Entries" not in context_manager.system_prompt
+        assert context_manager.compiled_dictionary is not None
+
+    def test_prompt_profile_override_selects_lite_sections(self) -> None:
+        context_manager = DictationContextManager(prompt_profile=PromptProfile.LITE)
+        context_manager.set_prompt_sections(dictionary_enabled=True)
+        assert MAIN_PROMPT_LITE in context_manager.system_prompt
+        assert "checklist" not in context_manager.system_prompt
+        context_manager.set_prompt_profile(PromptProfile.FULL)
+        assert context_manager.prompt_profile == PromptProfile.FULL
+        assert "checklist" in context_manager.system_prompt
+
+    def test_disabled_dictionary_has_no_compiled_dictionary(self) -> None:
+        context_manager = DictationContextManager()
+        context_manager.set_prompt_sections(dictionary_enabled=False)
+        assert context_manager.compiled_dictionary is None
+
+    def test_transcript_selection_replaces_system_prompt(self) -> None:
+        context_manager = DictationContextManager(dictionary_prompt_token_budget=1000)
+        context_manager.set_prompt_sections(
+            dictionary_enabled=True, dictionary_custom=MEDICAL_DICTIONARY_SECTION
+        )
+        context_manager.reset_context_for_new_recording()
+        context_manager.select_dictionary_for_transcript("started on meto prolol")
+        system_message = cast(dict[str, Any], context_manager._context.get_messages()[0])
+        assert "- metoprolol" in system_message["content"]
+        assert "ejection fraction" in system_message["content"]
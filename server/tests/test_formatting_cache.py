@@ -0,0 +1,142 @@
+"""Tests for the formatting result cache."""
+
+import asyncio
+
+from openai.types.chat import (
+    ChatCompletionSystemMessageParam,
+    ChatCompletionUserMessageParam,
+)
+
+from processors.formatting_cache import (
+    FormattingCacheHit,
+    FormattingCacheInFlight,
+    FormattingCacheKey,
+    FormattingCacheMiss,
+    FormattingResultCache,
+    build_formatting_cache_key,
+)
+
+
+def make_key(transcript: str) -> FormattingCacheKey:
+    return FormattingCacheKey(
+        transcript=transcript, system_prompt_hash="prompt", llm_identity="llm:model"
+    )
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestFormattingResultCache:
+    """Tests for FormattingResultCache lookups, eviction and single-flight."""
+
+    def test_completed_result_is_a_hit(self) -> None:
+        async def scenario() -> None:
+            cache = FormattingResultCache(max_bytes=1_000_000, ttl_secs=60)
+            assert isinstance(cache.lookup(make_key("hello world")), FormattingCacheMiss)
+            cache.complete(make_key("hello world"), "Hello world.")
+            assert cache.lookup(make_key("hello world")) == FormattingCacheHit("Hello world.")
+            assert cache.stats().hit_ratio == 0.5
+
+        asyncio.run(scenario())
+
+    def test_expired_result_is_a_miss(self) -> None:
+        async def scenario() -> None:
+            clock = FakeClock()
+            cache = FormattingResultCache(max_bytes=1_000_000, ttl_secs=60, clock=clock)
+            cache.lookup(make_key("hello"))
+            cache.complete(make_key("hello"), "Hello.")
+            clock.now = 61.0
+            assert isinstance(cache.lookup(make_key("hello")), FormattingCacheMiss)
+            assert cache.stats().entry_count == 0
+
+        asyncio.run(scenario())
+
+    def test_memory_cap_evicts_least_recently_used(self) -> None:
+        async def scenario() -> None:
+            cache = FormattingResultCache(max_bytes=700, ttl_secs=60)
+            for transcript in ("first", "second"):
+                cache.lookup(make_key(transcript))
+                cache.complete(make_key(transcript), transcript.title())
+            cache.lookup(make_key("first"))  # Refresh "first"
+            cache.lookup(make_key("third"))
+            cache.complete(make_key("third"), "Third")
+            assert isinstance(cache.lookup(make_key("first")), FormattingCacheHit)
+            assert isinstance(cache.lookup(make_key("second")), FormattingCacheMiss)
+            assert cache.stats().size_bytes <= 700
+            assert cache.stats().evictions == 1
+
+        asyncio.run(scenario())
+
+    def test_concurrent_identical_requests_are_coalesced(self) -> None:
+        async def scenario() -> None:
+            cache = FormattingResultCache(max_bytes=1_000_000, ttl_secs=60)
+            assert isinstance(cache.lookup(make_key("hi")), FormattingCacheMiss)
+            follower = cache.lookup(make_key("hi"))
+            assert isinstance(follower, FormattingCacheInFlight)
+            cache.complete(make_key("hi"), "Hi.")
+            assert await follower.result == "Hi."
+            assert cache.stats().coalesced == 1
+
+        asyncio.run(scenario())
+
+    def test_abandoned_request_releases_waiters_without_storing(self) -> None:
+        async def scenario() -> None:
+            cache = FormattingResultCache(max_bytes=1_000_000, ttl_secs=60)
+            cache.lookup(make_key("hi"))
+            follower = cache.lookup(make_key("hi"))
+            assert isinstance(follower, FormattingCacheInFlight)
+            cache.abandon(make_key("hi"))
+            assert await follower.result is None
+            assert isinstance(cache.lookup(make_key("hi")), FormattingCacheMiss)
+
+        asyncio.run(scenario())
+
+    def test_purge_removes_only_the_clients_results(self) -> None:
+        async def scenario() -> None:
+            cache = FormattingResultCache(max_bytes=1_000_000, ttl_secs=60)
+            for transcript, client_uuid in [("mine", "a"), ("also mine", "a"), ("theirs", "b")]:
+                cache.lookup(make_key(transcript))
+                cache.complete(make_key(transcript), transcript.title(), client_uuid)
+
+            assert cache.purge_client("a") == 2
+            assert isinstance(cache.lookup(make_key("mine")), FormattingCacheMiss)
+            assert cache.lookup(make_key("theirs")) == FormattingCacheHit(text="Theirs")
+            assert cache.stats().entry_count == 1
+
+        asyncio.run(scenario())
+
+
+class TestBuildFormattingCacheKey:
+    """Tests for build_formatting_cache_key()."""
+
+    def test_whitespace_is_normalized_and_prompt_is_hashed(self) -> None:
+        first = build_formatting_cache_key(
+            [
+                ChatCompletionSystemMessageParam(role="system", content="Format text."),
+                ChatCompletionUserMessageParam(role="user", content="  hello   world "),
+            ],
+            "llm:model",
+        )
+        second = build_formatting_cache_key(
+            [
+                ChatCompletionSystemMessageParam(role="system", content="Format text!"),
+                ChatCompletionUserMessageParam(role="user", content="hello world"),
+            ],
+            "llm:model",
+        )
+        assert first is not None
+        assert second is not None
+        assert first.transcript == second.transcript == "hello world"
+        assert first.system_prompt_hash != second.system_prompt_hash
+
+    def test_context_without_transcript_has_no_key(self) -> None:
+        key = build_formatting_cache_key(
+            [ChatCompletionSystemMessageParam(role="system", content="Format text.")],
+            "llm:model",
+        )
+        assert key is None
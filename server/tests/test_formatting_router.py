@@ -0,0 +1,115 @@
+"""Tests for the formatting router."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from processors.formatting_router import (
+    FormattingRoute,
+    FormattingRouter,
+    FormattingRouteThresholds,
+    route_transcript,
+    transcription_confidence,
+)
+
+THRESHOLDS = FormattingRouteThresholds(min_stt_confidence=0.9, max_raw_words=30)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRouteTranscript:
+    """Tests for route_transcript()."""
+
+    def test_clean_confident_transcript_skips_llm(self) -> None:
+        decision = route_transcript("Send the report by Friday.", 0.97, THRESHOLDS)
+        assert decision.route == FormattingRoute.RAW
+        assert decision.reasons == ()
+
+    def test_unclean_transcripts_use_llm(self) -> None:
+        cases = {
+            "send the report by friday": "unpunctuated",
+            "Um, send the report by Friday.": "filler words",
+            "Send it Monday, scratch that, Friday.": "backtrack cue",
+            "Buy eggs new line buy milk.": "list or punctuation cue",
+        }
+        for text, reason in cases.items():
+            decision = route_transcript(text, 0.97, THRESHOLDS)
+            assert decision.route == FormattingRoute.LLM
+            assert reason in decision.reasons
+
+    def test_low_or_missing_confidence_uses_llm(self) -> None:
+        text = "Send the report by Friday."
+        assert route_transcript(text, 0.5, THRESHOLDS).reasons == ("low STT confidence",)
+        assert route_transcript(text, None, THRESHOLDS).reasons == ("no STT confidence",)
+
+    def test_long_transcript_uses_llm(self) -> None:
+        text = " ".join(["Word"] * 31) + "."
+        assert "long" in route_transcript(text, 0.97, THRESHOLDS).reasons
+
+
+class TestTranscriptionConfidence:
+    """Tests for transcription_confidence()."""
+
+    def test_utterance_confidence_from_first_alternative(self) -> None:
+        result = SimpleNamespace(
+            channel=SimpleNamespace(
+                alternatives=[
+                    SimpleNamespace(transcript="hello", confidence=0.95),
+                    SimpleNamespace(transcript="hollow", confidence=0.2),
+                ]
+            )
+        )
+        assert transcription_confidence(result) == 0.95
+
+    def test_word_confidences_are_averaged(self) -> None:
+        result = [
+            {"type": "word", "alternatives": [{"content": "hello", "confidence": 1.0}]},
+            {"type": "word", "alternatives": [{"content": "world", "confidence": 0.8}]},
+        ]
+        assert transcription_confidence(result) == 0.9
+
+    def test_missing_confidence_is_none(self) -> None:
+        assert transcription_confidence(None) is None
+        assert transcription_confidence({"text": "hello"}) is None
+
+
+class TestFormattingRouter:
+    """Tests for FormattingRouter decision and latency bookkeeping."""
+
+    def test_latency_is_recorded_per_route(self) -> None:
+        clock = FakeClock()
+        router = FormattingRouter(THRESHOLDS, clock=clock)
+        router.route("Hello there.", 0.99, recording_id=1)
+        clock.now = 0.01
+        router.complete(1)
+        router.route("um hello there", 0.99, recording_id=2)
+        clock.now = 1.01
+        router.complete(2)
+        router.complete(2)  # No pending route
+
+        stats = router.stats()
+        assert stats[FormattingRoute.RAW].completed == 1
+        assert stats[FormattingRoute.RAW].mean_latency_secs == 0.01
+        assert stats[FormattingRoute.LLM].decisions == 1
+        assert stats[FormattingRoute.LLM].mean_latency_secs == 1.0
+
+    def test_overlapping_recordings_keep_their_own_routes(self) -> None:
+        clock = FakeClock()
+        router = FormattingRouter(THRESHOLDS, clock=clock)
+        router.route("um hello there", 0.99, recording_id=1)
+        clock.now = 0.5
+        router.route("Hello there.", 0.99, recording_id=2)
+        clock.now = 0.6
+        router.complete(2)
+        clock.now = 2.0
+        router.complete(1)
+
+        stats = router.stats()
+        assert stats[FormattingRoute.RAW].mean_latency_secs == pytest.approx(0.1)
+        assert stats[FormattingRoute.LLM].mean_latency_secs == 2.0
@@ -0,0 +1,284 @@
+"""Tests for incremental per-segment formatting."""
+
+import asyncio
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, cast
+
+from pipecat.frames.frames import (
+    Frame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+    TranscriptionFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+    VADUserStartedSpeakingFrame,
+    VADUserStoppedSpeakingFrame,
+)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.tests.utils import SleepFrame, run_test
+
+from processors.chunked_formatting import ChunkingConfig
+from processors.context_manager import DictationContextManager
+from processors.incremental_formatting import (
+    IncrementalFormattingPair,
+    RecordingFormattingMode,
+    join_formatted_segments,
+)
+
+if TYPE_CHECKING:
+    from pipecat.pipeline.llm_switcher import LLMSwitcher
+
+
+class FakeLLM:
+    """Formats a segment by capitalizing it and adding a period."""
+
+    def __init__(
+        self, failing: frozenset[str] = frozenset(), delays: dict[str, float] | None = None
+    ) -> None:
+        self.failing = failing
+        self.delays = delays or {}
+        self.requests: list[list[dict[str, Any]]] = []
+
+    async def run_inference(self, context: LLMContext, max_tokens: int | None = None) -> str:
+        messages = cast(list[dict[str, Any]], context.get_messages())
+        self.requests.append(messages)
+        transcript = messages[-1]["content"]
+        await asyncio.sleep(self.delays.get(transcript, 0.0))
+        if transcript in self.failing:
+            raise RuntimeError("provider unavailable")
+        return f"{transcript[:1].upper()}{transcript[1:]}."
+
+
+def _transcription(text: str) -> TranscriptionFrame:
+    return TranscriptionFrame(text=text, user_id="user", timestamp="")
+
+
+def _spoken(text: str) -> list[Frame]:
+    # System frames overtake queued data frames, so each step is let through first
+    return [
+        VADUserStartedSpeakingFrame(),
+        SleepFrame(sleep=0.02),
+        _transcription(text),
+        SleepFrame(sleep=0.02),
+        VADUserStoppedSpeakingFrame(),
+        SleepFrame(sleep=0.02),
+    ]
+
+
+SPOKEN_FRAMES: list[type[Frame]] = [
+    VADUserStartedSpeakingFrame,
+    TranscriptionFrame,
+    VADUserStoppedSpeakingFrame,
+]
+RESPONSE_FRAMES: list[type[Frame]] = [
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+    LLMFullResponseEndFrame,
+]
+
+
+class TestJoinFormattedSegments:
+    """Tests for join_formatted_segments()."""
+
+    def test_sentences_are_joined_with_spaces(self) -> None:
+        assert join_formatted_segments(["First part.", " Second part. ", ""]) == (
+            "First part. Second part."
+        )
+
+    def test_list_items_start_on_new_lines(self) -> None:
+        joined_text = join_formatted_segments(["My goals are:", "1. Finish the report", "- Ship"])
+        assert joined_text == "My goals are:\n1. Finish the report\n- Ship"
+
+
+class TestSegmentContext:
+    """Tests for DictationContextManager.build_segment_context()."""
+
+    def test_segment_follows_previous_formatted_text(self) -> None:
+        context_manager = DictationContextManager()
+        context_manager.set_prompt_sections(dictionary_enabled=False)
+        messages = cast(
+            list[dict[str, Any]],
+            context_manager.build_segment_context(
+                "and then we left", "We arrived early."
+            ).get_messages(),
+        )
+        assert messages[0]["content"] == context_manager.system_prompt
+        assert "We arrived early." in messages[-2]["content"]
+        assert messages[-1] == {"role": "user", "content": "and then we left"}
+
+
+class TestIncrementalFormatting:
+    """Tests for the segmenter and delivery processors around the LLM stage."""
+
+    def _pair(
+        self, llm: FakeLLM, chunking: ChunkingConfig | None = None
+    ) -> tuple[IncrementalFormattingPair, Pipeline]:
+        context_manager = DictationContextManager()
+        context_manager.set_prompt_sections(dictionary_enabled=False)
+        pair = IncrementalFormattingPair(
+            context_manager,
+            min_segment_words=4,
+            max_output_ratio=3.0,
+            min_output_tokens=16,
+            chunking=chunking,
+        )
+        pair.set_llm_switcher(cast("LLMSwitcher", SimpleNamespace(active_llm=llm)))
+        return pair, Pipeline([pair.segmenter(), pair.delivery()])
+
+    def _run(self, pipeline: Pipeline, spoken: list[str]) -> str:
+        frames_to_send: list[Frame] = [UserStartedSpeakingFrame(), SleepFrame(sleep=0.02)]
+        for text in spoken:
+            frames_to_send.extend(_spoken(text))
+        frames_to_send.append(UserStoppedSpeakingFrame())
+        down_frames, _ = asyncio.run(
+            run_test(
+                pipeline,
+                frames_to_send=frames_to_send,
+                expected_down_frames=SPOKEN_FRAMES * len(spoken) + RESPONSE_FRAMES,
+            )
+        )
+        texts = [frame.text for frame in down_frames if isinstance(frame, LLMTextFrame)]
+        assert len(texts) == 1
+        return texts[0]
+
+    def _transcripts(self, llm: FakeLLM) -> list[str]:
+        return [messages[-1]["content"] for messages in llm.requests]
+
+    def test_pause_closes_a_segment_only_at_min_words(self) -> None:
+        llm = FakeLLM()
+        pair, pipeline = self._pair(llm)
+
+        text = self._run(pipeline, ["one two three", "four five"])
+
+        assert self._transcripts(llm) == ["one two three four five"]
+        assert text == "One two three four five."
+        assert pair.stats()[RecordingFormattingMode.INCREMENTAL].recordings == 1
+
+    def test_tail_is_formatted_after_the_previous_segment(self) -> None:
+        llm = FakeLLM()
+        _, pipeline = self._pair(llm)
+
+        self._run(pipeline, ["one two three four", "and five six"])
+
+        assert self._transcripts(llm) == ["one two three four", "and five six"]
+        assert "One two three four." in llm.requests[1][-2]["content"]
+
+    def test_segments_are_delivered_in_order_as_one_response(self) -> None:
+        # The first segment finishing last must not reorder the result
+        llm = FakeLLM(delays={"one two three four": 0.1})
+        _, pipeline = self._pair(llm)
+
+        text = self._run(pipeline, ["one two three four", "five six seven eight"])
+
+        assert text == "One two three four. Five six seven eight."
+
+    def test_failed_segment_falls_back_to_its_transcript(self) -> None:
+        llm = FakeLLM(failing=frozenset({"one two three four"}))
+        _, pipeline = self._pair(llm)
+
+        text = self._run(pipeline, ["one two three four", "five six seven eight"])
+
+        assert text == "one two three four Five six seven eight."
+
+    def test_unsegmented_recording_passes_the_held_turn_start(self) -> None:
+        llm = FakeLLM()
+        pair, pipeline = self._pair(llm)
+        turn_start = UserStartedSpeakingFrame()
+        down_frames, _ = asyncio.run(
+            run_test(
+                pipeline,
+                frames_to_send=[
+                    turn_start,
+                    SleepFrame(sleep=0.02),
+                    _transcription("short one"),
+                    SleepFrame(sleep=0.02),
+                    UserStoppedSpeakingFrame(),
+                    SleepFrame(sleep=0.02),
+                    LLMFullResponseStartFrame(),
+                    LLMTextFrame(text="Short one."),
+                    LLMFullResponseEndFrame(),
+                ],
+                expected_down_frames=[
+                    TranscriptionFrame,
+                    UserStartedSpeakingFrame,
+                    UserStoppedSpeakingFrame,
+                    *RESPONSE_FRAMES,
+                ],
+            )
+        )
+
+        assert llm.requests == []
+        assert down_frames[1] is turn_start
+        assert pair.stats()[RecordingFormattingMode.WHOLE].recordings == 1
+
+    def test_next_recording_starts_while_segments_are_formatting(self) -> None:
+        # The stop frame must not hold later frames until the first recording is formatted
+        llm = FakeLLM(delays={"one two three four": 0.3})
+        _, pipeline = self._pair(llm)
+        second_turn_start = UserStartedSpeakingFrame()
+        down_frames, _ = asyncio.run(
+            run_test(
+                pipeline,
+                frames_to_send=[
+                    UserStartedSpeakingFrame(),
+                    SleepFrame(sleep=0.02),
+                    *_spoken("one two three four"),
+                    UserStoppedSpeakingFrame(),
+                    SleepFrame(sleep=0.02),
+                    second_turn_start,
+                    SleepFrame(sleep=0.02),
+                    _transcription("short one"),
+                    SleepFrame(sleep=0.02),
+                    UserStoppedSpeakingFrame(),
+                    SleepFrame(sleep=0.5),
+                ],
+                expected_down_frames=[
+                    *SPOKEN_FRAMES,
+                    TranscriptionFrame,
+                    UserStartedSpeakingFrame,
+                    UserStoppedSpeakingFrame,
+                    *RESPONSE_FRAMES,
+                ],
+            )
+        )
+
+        assert down_frames[4] is second_turn_start
+        assert cast(LLMTextFrame, down_frames[-2]).text == "One two three four."
+
+    def test_next_recording_starts_while_chunks_are_formatting(self) -> None:
+        llm = FakeLLM(delays={"alpha beta gamma": 0.3})
+        _, pipeline = self._pair(
+            llm, ChunkingConfig(min_words=3, chunk_words=10, overlap_words=0, concurrency=2)
+        )
+        second_turn_start = UserStartedSpeakingFrame()
+        down_frames, _ = asyncio.run(
+            run_test(
+                pipeline,
+                frames_to_send=[
+                    UserStartedSpeakingFrame(),
+                    SleepFrame(sleep=0.02),
+                    _transcription("alpha beta gamma"),
+                    SleepFrame(sleep=0.02),
+                    UserStoppedSpeakingFrame(),
+                    SleepFrame(sleep=0.02),
+                    second_turn_start,
+                    SleepFrame(sleep=0.02),
+                    _transcription("short one"),
+                    SleepFrame(sleep=0.02),
+                    UserStoppedSpeakingFrame(),
+                    SleepFrame(sleep=0.5),
+                ],
+                expected_down_frames=[
+                    TranscriptionFrame,
+                    TranscriptionFrame,
+                    UserStartedSpeakingFrame,
+                    UserStoppedSpeakingFrame,
+                    *RESPONSE_FRAMES,
+                ],
+            )
+        )
+
+        assert down_frames[2] is second_turn_start
+        assert cast(LLMTextFrame, down_frames[-2]).text == "Alpha beta gamma."
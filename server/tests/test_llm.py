@@ -1,10 +1,15 @@
 """Tests for LLM formatting prompt combination logic."""
 
+from processors.dictionary import compile_dictionary_section
 from processors.llm import (
     ADVANCED_PROMPT_DEFAULT,
     DICTIONARY_PROMPT_DEFAULT,
+    DICTIONARY_PROMPT_LITE,
     MAIN_PROMPT_DEFAULT,
+    MAIN_PROMPT_LITE,
+    PromptProfile,
     combine_prompt_sections,
+    prompt_profile_token_counts,
 )
 
 
@@ -118,3 +123,38 @@ class TestCombinePromptSections:
         assert MAIN_PROMPT_DEFAULT in result
         assert ADVANCED_PROMPT_DEFAULT in result
         assert DICTIONARY_PROMPT_DEFAULT not in result
+
+
+class TestPromptProfiles:
+    """Tests for full and lite prompt profiles."""
+
+    def test_lite_profile_uses_lite_defaults_and_keeps_custom_sections(self) -> None:
+        result = combine_prompt_sections(
+            main_custom=None,
+            advanced_enabled=True,
+            advanced_custom="Advanced",
+            dictionary_enabled=False,
+            dictionary_custom=None,
+            profile=PromptProfile.LITE,
+        )
+        assert result == f"{MAIN_PROMPT_LITE}\n\nAdvanced"
+
+    def test_lite_sections_are_smaller_and_drop_checklists(self) -> None:
+        full_counts = prompt_profile_token_counts(PromptProfile.FULL)
+        lite_counts = prompt_profile_token_counts(PromptProfile.LITE)
+        for section_name, full_count in full_counts.items():
+            assert lite_counts[section_name] < full_count
+        lite_prompt = combine_prompt_sections(
+            main_custom=None,
+            advanced_enabled=True,
+            advanced_custom=None,
+            dictionary_enabled=True,
+            dictionary_custom=None,
+            profile=PromptProfile.LITE,
+        )
+        assert "checklist" not in lite_prompt
+
+    def test_lite_dictionary_has_the_same_entries(self) -> None:
+        full_entries = compile_dictionary_section(DICTIONARY_PROMPT_DEFAULT).section.entries
+        lite_entries = compile_dictionary_section(DICTIONARY_PROMPT_LITE).section.entries
+        assert lite_entries == full_entries
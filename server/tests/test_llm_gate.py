@@ -0,0 +1,93 @@
+"""Tests for LLMGateFilter raw delivery with LLM formatting disabled."""
+
+import asyncio
+
+from pipecat.frames.frames import (
+    TranscriptionFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.tests.utils import SleepFrame, run_test
+
+from processors.llm_gate import LLMGateFilter
+from processors.recording_jobs import RecordingOutputFrame
+
+
+def _transcription(text: str) -> TranscriptionFrame:
+    return TranscriptionFrame(text=text, user_id="user", timestamp="")
+
+
+class TestProgressiveRawDelivery:
+    """Tests for progressive raw delivery in LLM-bypass mode."""
+
+    def test_segments_are_sent_as_they_arrive_then_closed(self) -> None:
+        llm_gate = LLMGateFilter(progressive_raw_delivery=True)
+        llm_gate.set_llm_formatting_enabled(False)
+        down_frames, _ = asyncio.run(
+            run_test(
+                llm_gate,
+                frames_to_send=[
+                    UserStartedSpeakingFrame(),
+                    _transcription("Hello there."),
+                    _transcription(" How are you? "),
+                    # Let the transcriptions through before the (system) stop frame
+                    SleepFrame(sleep=0.05),
+                    UserStoppedSpeakingFrame(),
+                ],
+                expected_down_frames=[
+                    RecordingOutputFrame,
+                    TranscriptionFrame,
+                    RecordingOutputFrame,
+                    TranscriptionFrame,
+                    RecordingOutputFrame,
+                ],
+            )
+        )
+        messages = [
+            frame.message.model_dump()
+            for frame in down_frames
+            if isinstance(frame, RecordingOutputFrame)
+        ]
+        assert messages == [
+            {
+                "type": "raw-transcription-segment",
+                "recording_id": None,
+                "sequence": 0,
+                "text": "Hello there.",
+            },
+            {
+                "type": "raw-transcription-segment",
+                "recording_id": None,
+                "sequence": 1,
+                "text": "How are you?",
+            },
+            {
+                "type": "raw-transcription-end",
+                "recording_id": None,
+                "segment_count": 2,
+                "text": "Hello there.  How are you?",
+            },
+        ]
+
+    def test_without_progressive_delivery_text_is_sent_at_stop(self) -> None:
+        llm_gate = LLMGateFilter()
+        llm_gate.set_llm_formatting_enabled(False)
+        down_frames, _ = asyncio.run(
+            run_test(
+                llm_gate,
+                frames_to_send=[
+                    UserStartedSpeakingFrame(),
+                    _transcription("Hello there."),
+                    SleepFrame(sleep=0.05),
+                    UserStoppedSpeakingFrame(),
+                ],
+                expected_down_frames=[TranscriptionFrame, RecordingOutputFrame],
+            )
+        )
+        raw_output = down_frames[-1]
+        assert isinstance(raw_output, RecordingOutputFrame)
+        assert raw_output.message.model_dump() == {
+            "type": "raw-transcription",
+            "text": "Hello there.",
+            "recording_id": None,
+        }
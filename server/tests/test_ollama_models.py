@@ -0,0 +1,121 @@
+"""Tests for Ollama model preloading against a local fake Ollama server."""
+
+import asyncio
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+from services.ollama_models import (
+    OllamaModelManager,
+    OllamaUnavailableError,
+    ollama_native_base_url,
+)
+
+
+class _FakeOllama:
+    """Requests seen by the fake server, which reports a load only on the first one."""
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, dict[str, Any]]] = []
+        self.fail = False
+
+
+def _make_handler(fake: _FakeOllama) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            fake.requests.append((self.path, body))
+            if fake.fail:
+                self.send_response(500)
+                self.end_headers()
+                return
+            payload: dict[str, Any] = {"model": body["model"], "done": True}
+            payload["load_duration"] = 2_500_000_000 if len(fake.requests) == 1 else 1_000_000
+            if self.path == "/api/chat":
+                payload |= {
+                    "prompt_eval_count": 420,
+                    "prompt_eval_duration": 300_000_000,
+                    "eval_count": 1,
+                    "total_duration": 320_000_000,
+                }
+            data = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            _ = format, args
+
+    return Handler
+
+
+@pytest.fixture
+def fake_ollama() -> Iterator[tuple[str, _FakeOllama]]:
+    fake = _FakeOllama()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(fake))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/v1", fake
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _manager(base_url: str) -> OllamaModelManager:
+    return OllamaModelManager(
+        base_url=base_url, model="llama3.2", keep_alive="-1", refresh_interval_secs=0
+    )
+
+
+class TestOllamaModelManager:
+    """Tests for OllamaModelManager."""
+
+    def test_native_base_url_strips_openai_path(self) -> None:
+        assert ollama_native_base_url("http://host:11434/v1/") == "http://host:11434"
+        assert ollama_native_base_url(None) == "http://localhost:11434"
+
+    def test_start_preloads_pins_and_warms_prefix(
+        self, fake_ollama: tuple[str, _FakeOllama]
+    ) -> None:
+        base_url, fake = fake_ollama
+        manager = _manager(base_url)
+
+        async def run() -> None:
+            await manager.start("You format dictation.")
+            await manager.stop()
+
+        asyncio.run(run())
+
+        (preload_path, preload), (warm_path, warm) = fake.requests
+        assert (preload_path, preload) == ("/api/generate", {"model": "llama3.2", "keep_alive": -1})
+        assert warm_path == "/api/chat"
+        assert warm["keep_alive"] == -1
+        assert warm["messages"][0] == {"role": "system", "content": "You format dictation."}
+        timings = manager.last_timings
+        assert timings is not None
+        assert (timings.prompt_eval_count, timings.prompt_eval_secs) == (420, 0.3)
+
+    def test_unreachable_model_fails_warm_up(self, fake_ollama: tuple[str, _FakeOllama]) -> None:
+        base_url, fake = fake_ollama
+        fake.fail = True
+        manager = _manager(base_url)
+
+        async def run() -> None:
+            try:
+                await manager.start("You format dictation.")
+            finally:
+                await manager.stop()
+
+        with pytest.raises(OllamaUnavailableError):
+            asyncio.run(run())
+
+        # The prefix is not warmed without a loaded model
+        assert len(fake.requests) == 1
+        assert manager.last_timings is None
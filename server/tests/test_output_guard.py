@@ -0,0 +1,209 @@
+"""Tests for formatting output limits and the response guard."""
+
+import asyncio
+from typing import Any
+
+from pipecat.frames.frames import (
+    Frame,
+    InterruptionFrame,
+    LLMContextFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+    LLMUpdateSettingsFrame,
+)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.processors.frameworks.rtvi import (
+    RTVIBotLLMTextMessage,
+    RTVIProcessor,
+    RTVITextMessageData,
+)
+from pipecat.tests.utils import SleepFrame, run_test
+from pydantic import BaseModel
+
+from processors.formatting_cache import ABANDONED_RESPONSE_METADATA_KEY
+from processors.output_guard import (
+    MAX_TOKENS_HEADROOM,
+    FormattingOutputGuardPair,
+    compute_output_limits,
+)
+from processors.recording_jobs import RecordingOutputSequencer
+from utils.observers import RecordingOutputRTVIObserver
+
+TRANSCRIPT = "send the draft to the team"
+
+
+class _RunawayLLM(FrameProcessor):
+    """Answers each context frame with a response far longer than the transcript."""
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
+        await super().process_frame(frame, direction)
+        await self.push_frame(frame, direction)
+        if isinstance(frame, LLMContextFrame):
+            await self.push_frame(LLMFullResponseStartFrame())
+            for _ in range(10):
+                await self.push_frame(LLMTextFrame(text="Sure! Here is a longer answer. "))
+            await self.push_frame(LLMFullResponseEndFrame())
+
+
+class _RecordingRTVIObserver(RecordingOutputRTVIObserver):
+    """Collects the RTVI messages the client would receive."""
+
+    def __init__(self, output_processor: FrameProcessor) -> None:
+        super().__init__(RTVIProcessor(), output_processor)
+        self.messages: list[dict[str, Any]] = []
+
+    async def send_rtvi_message(self, model: BaseModel, exclude_none: bool = True) -> None:
+        self.messages.append(model.model_dump(exclude_none=exclude_none))
+
+    async def _handle_llm_text_frame(self, frame: LLMTextFrame) -> None:
+        # Skips the deprecated bot-transcription aggregation, which needs NLTK data
+        await self.send_rtvi_message(
+            RTVIBotLLMTextMessage(data=RTVITextMessageData(text=frame.text))
+        )
+
+
+class TestComputeOutputLimits:
+    """Tests for compute_output_limits()."""
+
+    def test_limit_scales_with_transcript_length(self) -> None:
+        transcript = "word " * 100  # ~125 estimated tokens
+        limits = compute_output_limits(transcript, max_output_ratio=3.0, min_output_tokens=64)
+        assert limits.max_output_tokens == 375
+        assert limits.max_tokens == 375 * MAX_TOKENS_HEADROOM
+
+    def test_short_transcript_uses_floor(self) -> None:
+        limits = compute_output_limits("hi", max_output_ratio=3.0, min_output_tokens=64)
+        assert limits.max_output_tokens == 64
+        assert limits.max_tokens > limits.max_output_tokens
+
+
+class TestFormattingOutputGuard:
+    """Tests for the request sizer and response guard around the LLM."""
+
+    def _guard(self) -> tuple[FormattingOutputGuardPair, Pipeline]:
+        guard = FormattingOutputGuardPair(max_output_ratio=2.0, min_output_tokens=8)
+        return guard, Pipeline([guard.request_sizer(), guard.response_guard()])
+
+    def _context_frame(self) -> LLMContextFrame:
+        return LLMContextFrame(
+            context=LLMContext(messages=[{"role": "user", "content": TRANSCRIPT}])
+        )
+
+    def test_response_within_limit_passes_unchanged(self) -> None:
+        guard, pipeline = self._guard()
+        down_frames, _ = asyncio.run(
+            run_test(
+                pipeline,
+                frames_to_send=[
+                    self._context_frame(),
+                    LLMFullResponseStartFrame(),
+                    LLMTextFrame(text="Send the draft "),
+                    LLMTextFrame(text="to the team."),
+                    LLMFullResponseEndFrame(),
+                ],
+                expected_down_frames=[
+                    LLMUpdateSettingsFrame,
+                    LLMContextFrame,
+                    LLMFullResponseStartFrame,
+                    LLMTextFrame,
+                    LLMTextFrame,
+                    LLMFullResponseEndFrame,
+                ],
+                expected_up_frames=[],
+            )
+        )
+        limits = compute_output_limits(TRANSCRIPT, max_output_ratio=2.0, min_output_tokens=8)
+        settings_frame = down_frames[0]
+        assert isinstance(settings_frame, LLMUpdateSettingsFrame)
+        assert settings_frame.settings == {"max_tokens": limits.max_tokens}
+        assert [frame.text for frame in down_frames if isinstance(frame, LLMTextFrame)] == [
+            "Send the draft ",
+            "to the team.",
+        ]
+        assert guard.stats().aborted == 0
+
+    def test_over_long_response_delivers_transcript_once(self) -> None:
+        guard, pipeline = self._guard()
+        down_frames, _ = asyncio.run(
+            run_test(
+                pipeline,
+                frames_to_send=[
+                    self._context_frame(),
+                    LLMFullResponseStartFrame(),
+                    LLMTextFrame(text="Sure! Here is a longer answer. " * 10),
+                    LLMTextFrame(text="And it keeps going."),
+                    LLMFullResponseEndFrame(),
+                ],
+                expected_down_frames=[
+                    LLMUpdateSettingsFrame,
+                    LLMContextFrame,
+                    LLMFullResponseStartFrame,
+                    LLMTextFrame,
+                    LLMFullResponseEndFrame,
+                ],
+                # The abort stays within this response; nothing interrupts the pipeline
+                expected_up_frames=[],
+            )
+        )
+        assert [frame.text for frame in down_frames if isinstance(frame, LLMTextFrame)] == [
+            TRANSCRIPT
+        ]
+        assert down_frames[-1].metadata[ABANDONED_RESPONSE_METADATA_KEY]
+        assert (guard.stats().responses, guard.stats().aborted) == (1, 1)
+
+    def test_interruption_while_buffering_resets_state(self) -> None:
+        guard, pipeline = self._guard()
+        down_frames, _ = asyncio.run(
+            run_test(
+                pipeline,
+                frames_to_send=[
+                    self._context_frame(),
+                    LLMFullResponseStartFrame(),
+                    LLMTextFrame(text="Interrupted"),
+                    SleepFrame(sleep=0.05),
+                    InterruptionFrame(),
+                    LLMFullResponseStartFrame(),
+                    LLMTextFrame(text="Send the draft to the team."),
+                    LLMFullResponseEndFrame(),
+                ],
+                expected_down_frames=[
+                    LLMUpdateSettingsFrame,
+                    LLMContextFrame,
+                    InterruptionFrame,
+                    LLMFullResponseStartFrame,
+                    LLMTextFrame,
+                    LLMFullResponseEndFrame,
+                ],
+            )
+        )
+        assert [frame.text for frame in down_frames if isinstance(frame, LLMTextFrame)] == [
+            "Send the draft to the team."
+        ]
+        assert (guard.stats().responses, guard.stats().aborted) == (1, 0)
+
+    def test_client_receives_only_the_fallback_response(self) -> None:
+        guard = FormattingOutputGuardPair(max_output_ratio=2.0, min_output_tokens=8)
+        output_sequencer = RecordingOutputSequencer()
+        observer = _RecordingRTVIObserver(output_sequencer)
+        pipeline = Pipeline(
+            [guard.request_sizer(), _RunawayLLM(), guard.response_guard(), output_sequencer]
+        )
+        asyncio.run(
+            run_test(
+                pipeline,
+                frames_to_send=[self._context_frame(), SleepFrame(sleep=0.1)],
+                observers=[observer],
+            )
+        )
+        bot_llm_messages = [
+            message for message in observer.messages if message["type"].startswith("bot-llm-")
+        ]
+        assert [message["type"] for message in bot_llm_messages] == [
+            "bot-llm-started",
+            "bot-llm-text",
+            "bot-llm-stopped",
+        ]
+        assert bot_llm_messages[1]["data"]["text"] == TRANSCRIPT
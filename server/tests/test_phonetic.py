@@ -0,0 +1,88 @@
+"""Tests for phonetic keys and fuzzy dictionary matching."""
+
+from processors.dictionary import compile_dictionary_section
+from processors.phonetic import (
+    DEFAULT_MAX_EDIT_RATIO,
+    PhoneticIndex,
+    bounded_edit_distance,
+    phonetic_key,
+)
+
+
+class TestPhoneticKey:
+    """Tests for phonetic_key() encoding."""
+
+    def test_split_words_share_key_with_joined_term(self) -> None:
+        assert phonetic_key("pipe cat") == phonetic_key("Pipecat")
+
+    def test_digits_are_kept_literally(self) -> None:
+        assert phonetic_key("S1") != phonetic_key("S2")
+
+
+class TestBoundedEditDistance:
+    """Tests for bounded_edit_distance()."""
+
+    def test_exact_distance_within_bound(self) -> None:
+        assert bounded_edit_distance("kitten", "sitting", 3) == 3
+
+    def test_exceeding_bound_returns_bound_plus_one(self) -> None:
+        assert bounded_edit_distance("kitten", "sitting", 1) == 2
+
+
+class TestPhoneticIndex:
+    """Tests for PhoneticIndex rewriting."""
+
+    def test_split_near_miss_is_rewritten(self) -> None:
+        index = PhoneticIndex([("Pipecat", "Pipecat")])
+        result = index.rewrite("I built it with pype kat.", DEFAULT_MAX_EDIT_RATIO)
+        assert result.text == "I built it with Pipecat."
+        assert result.replacement_count == 1
+
+    def test_ngrams_never_absorb_whole_words(self) -> None:
+        index = PhoneticIndex([("Pipecat", "Pipecat"), ("Contract", "Contract")])
+        text = "a pipe cat and the contract to the other party"
+        assert index.rewrite(text, DEFAULT_MAX_EDIT_RATIO).text == text
+
+    def test_correct_spelling_is_untouched(self) -> None:
+        index = PhoneticIndex([("Pipecat", "Pipecat")])
+        result = index.rewrite("pipecat works", DEFAULT_MAX_EDIT_RATIO)
+        assert result.text == "pipecat works"
+        assert result.replacement_count == 0
+
+    def test_ambiguous_short_word_needs_looser_threshold(self) -> None:
+        index = PhoneticIndex([("Tauri", "Tauri")])
+        assert index.rewrite("a towri app", DEFAULT_MAX_EDIT_RATIO).text == "a towri app"
+        assert index.rewrite("a towri app", 0.6).text == "a Tauri app"
+
+    def test_common_words_are_never_rewritten(self) -> None:
+        index = PhoneticIndex([("Claude", "Claude")])
+        for text in ["upload it to the cloud", "the cloud bill went up"]:
+            result = index.rewrite(text, DEFAULT_MAX_EDIT_RATIO)
+            assert result.text == text
+            assert result.replacement_count == 0
+
+    def test_candidates_closer_to_a_common_word_are_left_alone(self) -> None:
+        index = PhoneticIndex([("Tauri", "Tauri")])
+        # "tory" is one edit from "try" but three from "Tauri"
+        assert index.rewrite("a tory app", 0.6).text == "a tory app"
+
+    def test_ngrams_do_not_span_punctuation(self) -> None:
+        index = PhoneticIndex([("Pipecat", "Pipecat")])
+        result = index.rewrite("a pipe, cat", DEFAULT_MAX_EDIT_RATIO)
+        assert result.replacement_count == 0
+
+
+class TestCompiledDictionaryPhonetic:
+    """Tests for phonetic matching through the compiled dictionary."""
+
+    def test_mapping_spoken_form_near_miss_uses_written_form(self) -> None:
+        compiled = compile_dictionary_section("### Entries\n- ant row pick = Anthropic")
+        result = compiled.apply_phonetic_matches("I work at antrow pik", 0.34)
+        assert result.text == "I work at Anthropic"
+
+    def test_dictionary_words_are_not_rewritten(self) -> None:
+        compiled = compile_dictionary_section(
+            "### Entries\n- ant row pick = Anthropic\n- Contract\n- Party"
+        )
+        for text in ["I work at ant rope ick", "send the contract to the other party"]:
+            assert compiled.apply_phonetic_matches(text, 0.34).text == text
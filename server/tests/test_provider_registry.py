@@ -0,0 +1,67 @@
+"""Tests for the provider registry's lazily imported service classes."""
+
+import dataclasses
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from services.provider_registry import (
+    LLM_PROVIDERS,
+    STT_PROVIDERS,
+    ServiceClassRef,
+    STTProviderId,
+)
+from services.providers import load_stt_service_classes
+
+SERVICE_CLASS_REFS = [
+    config.service_class for config in [*STT_PROVIDERS.values(), *LLM_PROVIDERS.values()]
+]
+
+
+def _module_source(module: str) -> str:
+    """Read a module's source without importing its packages (or their SDKs)."""
+    top_level, *parts = module.split(".")
+    spec = importlib.util.find_spec(top_level)
+    assert spec is not None and spec.submodule_search_locations is not None
+    path = Path(spec.submodule_search_locations[0]).joinpath(*parts[:-1], f"{parts[-1]}.py")
+    return path.read_text()
+
+
+class TestServiceClassRef:
+    """Tests for the registry's service class references."""
+
+    @pytest.mark.parametrize("ref", SERVICE_CLASS_REFS, ids=lambda ref: ref.name)
+    def test_names_a_class_defined_in_its_module(self, ref: ServiceClassRef) -> None:
+        assert f"class {ref.name}(" in _module_source(ref.module)
+
+    def test_importing_the_registry_imports_no_provider(self) -> None:
+        modules = [ref.module for ref in SERVICE_CLASS_REFS]
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, services.provider_registry\n"
+                f"print([m for m in {modules!r} if m in sys.modules])",
+            ],
+            cwd=Path(__file__).parent.parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.strip() == "[]"
+
+    def test_providers_that_fail_to_import_are_skipped(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        missing = dataclasses.replace(
+            STT_PROVIDERS[STTProviderId.OPENAI],
+            service_class=ServiceClassRef("missing_provider_sdk", "MissingSTTService"),
+        )
+        monkeypatch.setitem(STT_PROVIDERS, STTProviderId.OPENAI, missing)
+
+        assert load_stt_service_classes([STTProviderId.OPENAI, STTProviderId.NEMOTRON]) == [
+            STTProviderId.NEMOTRON
+        ]
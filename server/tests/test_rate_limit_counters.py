@@ -0,0 +1,240 @@
+"""Tests for the shared sliding-window rate-limit counters and limiter storage."""
+
+import asyncio
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from limits import parse
+from limits.strategies import SlidingWindowCounterRateLimiter
+
+from utils.rate_limit_counters import (
+    MemoryWindowCounters,
+    SharedMemoryWindowCounters,
+    StateStoreWindowCounters,
+    WindowCounters,
+)
+from utils.rate_limiter import (
+    RATE_LIMIT_ICE,
+    SharedRateLimitStorage,
+    limiter,
+    use_window_counters,
+)
+from utils.state_store import MemoryStateStore, SqliteStateStore
+
+
+class _Clock:
+    """A settable clock, starting at the beginning of a minute."""
+
+    def __init__(self) -> None:
+        self.now = 1_800_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> _Clock:
+    return _Clock()
+
+
+@pytest.fixture
+def shared_path(tmp_path: Path) -> str:
+    return str(tmp_path / "rate_limits")
+
+
+@pytest.fixture(params=["memory", "shared-memory", "state"])
+def counters(request: pytest.FixtureRequest, shared_path: str) -> Iterator[WindowCounters]:
+    match request.param:
+        case "memory":
+            counters: WindowCounters = MemoryWindowCounters()
+        case "shared-memory":
+            counters = SharedMemoryWindowCounters(shared_path, slot_count=64)
+        case _:
+            counters = StateStoreWindowCounters(MemoryStateStore())
+    yield counters
+    counters.close()
+
+
+class TestWindowCounters:
+    """Tests for every WindowCounters backend (within one window)."""
+
+    def test_refuses_hits_over_the_limit(self, counters: WindowCounters) -> None:
+        # Hour-long windows keep the test within one window
+        assert [counters.acquire("ip", limit=3, window_secs=3600) for _ in range(4)] == [
+            True,
+            True,
+            True,
+            False,
+        ]
+        assert counters.get("ip", 3600)[2] == 3
+        assert not counters.acquire("ip", limit=3, window_secs=3600, amount=4)
+
+    def test_keys_are_independent_and_clearable(self, counters: WindowCounters) -> None:
+        assert counters.acquire("a", limit=1, window_secs=3600)
+        assert counters.acquire("b", limit=1, window_secs=3600)
+        assert not counters.acquire("a", limit=1, window_secs=3600)
+
+        counters.clear("a", 3600)
+        assert counters.acquire("a", limit=1, window_secs=3600)
+
+
+class TestMemoryWindowCounters:
+    """Tests for MemoryWindowCounters."""
+
+    def test_previous_window_is_weighted_by_its_overlap(self, clock: _Clock) -> None:
+        counters = MemoryWindowCounters(clock=clock)
+        for _ in range(10):
+            assert counters.acquire("ip", limit=10, window_secs=60)
+
+        # A quarter into the next window, 3/4 of the previous 10 hits still count
+        clock.now += 75
+        assert [counters.acquire("ip", limit=10, window_secs=60) for _ in range(4)] == [
+            True,
+            True,
+            True,
+            False,
+        ]
+        assert counters.get("ip", 60)[:3] == (10, 45.0, 3)
+
+        # Two windows later, all hits have expired
+        clock.now += 120
+        assert counters.get("ip", 60)[::2] == (0, 0)
+
+
+class TestSharedMemoryWindowCounters:
+    """Tests for SharedMemoryWindowCounters."""
+
+    def test_previous_window_is_weighted_by_its_overlap(
+        self, shared_path: str, clock: _Clock
+    ) -> None:
+        counters = SharedMemoryWindowCounters(shared_path, slot_count=64, clock=clock)
+        for _ in range(10):
+            assert counters.acquire("ip", limit=10, window_secs=60)
+
+        # A quarter into the next window, 3/4 of the previous 10 hits still count
+        clock.now += 75
+        assert [counters.acquire("ip", limit=10, window_secs=60) for _ in range(4)] == [
+            True,
+            True,
+            True,
+            False,
+        ]
+        previous_count, previous_ttl, current_count, _ = counters.get("ip", 60)
+        assert (previous_count, previous_ttl, current_count) == (10, 45.0, 3)
+
+        # Two windows later, all hits have expired
+        clock.now += 120
+        assert counters.get("ip", 60)[::2] == (0, 0)
+
+    def test_workers_share_counters(self, shared_path: str, clock: _Clock) -> None:
+        worker_1 = SharedMemoryWindowCounters(shared_path, clock=clock)
+        worker_2 = SharedMemoryWindowCounters(shared_path, slot_count=16, clock=clock)
+
+        assert worker_1.acquire("ip", limit=2, window_secs=60)
+        assert worker_2.acquire("ip", limit=2, window_secs=60)
+        assert not worker_1.acquire("ip", limit=2, window_secs=60)
+        worker_1.close()
+        worker_2.close()
+
+    def test_expired_slots_are_reused_when_full(self, shared_path: str, clock: _Clock) -> None:
+        counters = SharedMemoryWindowCounters(shared_path, slot_count=4, clock=clock)
+        for index in range(4):
+            assert counters.acquire(f"old-{index}", limit=1, window_secs=60)
+
+        clock.now += 120
+        for index in range(4):
+            assert counters.acquire(f"new-{index}", limit=1, window_secs=60)
+            assert not counters.acquire(f"new-{index}", limit=1, window_secs=60)
+        counters.close()
+
+
+class TestStateStoreWindowCounters:
+    """Tests for StateStoreWindowCounters."""
+
+    def test_workers_see_each_others_hits_after_a_sync(self) -> None:
+        store = MemoryStateStore()
+        worker_1 = StateStoreWindowCounters(store, sync_interval_secs=3600)
+        worker_2 = StateStoreWindowCounters(store, sync_interval_secs=3600)
+
+        assert worker_1.acquire("ip", limit=3, window_secs=3600)
+        assert worker_1.acquire("ip", limit=3, window_secs=3600)
+        assert worker_2.acquire("ip", limit=3, window_secs=3600)
+        worker_1.sync()
+        worker_2.sync()
+
+        assert not worker_2.acquire("ip", limit=3, window_secs=3600)
+        assert worker_2.get("ip", 3600)[2] == 3
+        worker_1.close()
+        worker_2.close()
+
+    def test_synced_totals_outlive_a_pass_without_hits(self) -> None:
+        counters = StateStoreWindowCounters(MemoryStateStore(), sync_interval_secs=3600)
+
+        assert counters.acquire("ip", limit=1, window_secs=3600)
+        counters.sync()
+        counters.sync()
+
+        assert not counters.acquire("ip", limit=1, window_secs=3600)
+        counters.close()
+
+
+class TestSharedRateLimitStorage:
+    """Tests for the limiter storage over shared counters."""
+
+    def test_limits_strategy_honours_rate_limit_constants(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(SharedRateLimitStorage, "counters", SharedRateLimitStorage.counters)
+        counters = StateStoreWindowCounters(SqliteStateStore(str(tmp_path / "db")))
+        use_window_counters(counters)
+        strategy = SlidingWindowCounterRateLimiter(SharedRateLimitStorage("shared://"))
+        item = parse(RATE_LIMIT_ICE)
+
+        assert all(strategy.hit(item, "10.0.0.1") for _ in range(item.amount))
+        assert not strategy.hit(item, "10.0.0.1")
+        assert strategy.hit(item, "10.0.0.2")
+        assert strategy.get_window_stats(item, "10.0.0.1").remaining == 0
+        counters.close()
+
+    def test_state_counters_reach_the_store_off_the_event_loop(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(SharedRateLimitStorage, "counters", SharedRateLimitStorage.counters)
+        store = _LoopRecordingStateStore()
+        counters = StateStoreWindowCounters(store)
+        use_window_counters(counters)
+        app = FastAPI()
+        app.state.limiter = limiter
+
+        @app.get("/limited")
+        @limiter.limit("2/minute")
+        async def limited(request: Request) -> dict[str, bool]:
+            return {"ok": True}
+
+        with TestClient(app) as client:
+            statuses = [client.get("/limited").status_code for _ in range(3)]
+
+        counters.close()
+
+        assert statuses == [200, 200, 429]
+        assert store.checked_on_event_loop
+        assert not any(store.checked_on_event_loop)
+
+
+class _LoopRecordingStateStore(MemoryStateStore):
+    """Records whether each counter increment ran on an event loop."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.checked_on_event_loop: list[bool] = []
+
+    def increment_counter(self, key: str, expiry_secs: int, amount: int = 1) -> int:
+        try:
+            asyncio.get_running_loop()
+            self.checked_on_event_loop.append(True)
+        except RuntimeError:
+            self.checked_on_event_loop.append(False)
+        return super().increment_counter(key, expiry_secs, amount)
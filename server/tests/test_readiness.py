@@ -0,0 +1,99 @@
+"""Tests for worker readiness and draining."""
+
+import signal
+import time
+
+import uvicorn
+
+from utils.readiness import (
+    DrainingServer,
+    ReadinessReport,
+    ReadinessState,
+    WarmUp,
+    WarmUpState,
+    readiness_state,
+)
+
+
+class TestReadinessState:
+    """Tests for warm-up tracking and readiness."""
+
+    def test_ready_once_every_component_loaded_or_failed(self) -> None:
+        warm_up = WarmUp(["vad", "whisper"])
+        assert readiness_state(warm_up, draining=False) == ReadinessState.WARMING_UP
+
+        warm_up.mark_warm("vad")
+        assert readiness_state(warm_up, draining=False) == ReadinessState.WARMING_UP
+        warm_up.mark_failed("whisper", RuntimeError("no model"))
+
+        assert readiness_state(warm_up, draining=False) == ReadinessState.READY
+        assert warm_up.states() == {"vad": WarmUpState.WARM, "whisper": WarmUpState.FAILED}
+
+    def test_draining_is_not_ready(self) -> None:
+        assert readiness_state(WarmUp([]), draining=True) == ReadinessState.DRAINING
+        assert readiness_state(WarmUp(["vad"]), draining=True) == ReadinessState.DRAINING
+
+    def test_report_body(self) -> None:
+        report = ReadinessReport(
+            state=ReadinessState.DRAINING,
+            warm_up={"vad": WarmUpState.WARM},
+            active_pipelines=3,
+            in_flight_llm_calls=1,
+            loop_lag_secs=0.01234,
+            cpu_percent=42.25,
+            cpu_secs=12.5,
+            capacity=0.0,
+        )
+
+        assert not report.is_ready
+        assert report.to_dict() == {
+            "status": "draining",
+            "warm_up": {"vad": "warm"},
+            "active_pipelines": 3,
+            "in_flight_llm_calls": 1,
+            "loop_lag_ms": 12.3,
+            "cpu_percent": 42.2,
+            "cpu_secs": 12.5,
+            "capacity": 0.0,
+        }
+
+
+class TestDrainingServer:
+    """Tests for draining on SIGTERM before shutting down."""
+
+    def _server(self, drain_secs: float, drains: list[bool]) -> DrainingServer:
+        return DrainingServer(
+            uvicorn.Config(lambda: None),
+            drain_secs=drain_secs,
+            on_drain=lambda: drains.append(True),
+        )
+
+    def test_first_sigterm_drains_before_exiting(self) -> None:
+        drains: list[bool] = []
+        server = self._server(0.05, drains)
+
+        server.handle_exit(signal.SIGTERM, None)
+        assert drains == [True]
+        assert not server.should_exit
+        time.sleep(0.2)
+        assert server.should_exit
+
+    def test_second_signal_exits_at_once(self) -> None:
+        drains: list[bool] = []
+        server = self._server(60, drains)
+
+        server.handle_exit(signal.SIGTERM, None)
+        server.handle_exit(signal.SIGTERM, None)
+        assert server.should_exit
+        assert drains == [True]
+
+    def test_sigint_or_no_drain_time_exits_at_once(self) -> None:
+        drains: list[bool] = []
+        interrupted = self._server(60, drains)
+        undrained = self._server(0, drains)
+
+        interrupted.handle_exit(signal.SIGINT, None)
+        undrained.handle_exit(signal.SIGTERM, None)
+        assert interrupted.should_exit
+        assert undrained.should_exit
+        assert drains == []
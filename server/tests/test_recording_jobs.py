@@ -0,0 +1,247 @@
+"""Tests for per-recording jobs and in-order result delivery."""
+
+import asyncio
+from typing import Any, cast
+
+from pipecat.frames.frames import (
+    Frame,
+    LLMContextFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+    LLMUpdateSettingsFrame,
+    TranscriptionFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+    VADUserStoppedSpeakingFrame,
+)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.processors.frameworks.rtvi import RTVIServerMessageFrame
+from pipecat.tests.utils import run_test
+
+from processors.context_manager import DictationContextManager
+from processors.output_guard import FormattingOutputGuardPair
+from processors.recording_jobs import (
+    RecordingJobFrame,
+    RecordingOutputFrame,
+    RecordingOutputSequencer,
+    RecordingResponseFrame,
+)
+from processors.turn_controller import TurnController
+from protocol.messages import RawTranscriptionMessage
+
+MEDICAL_DICTIONARY_SECTION = """### Entries
+- metoprolol
+- The abbreviation 'EF' refers to ejection fraction."""
+
+
+class TestRecordingJobs:
+    """Tests for DictationContextManager.reset_context_for_new_recording()."""
+
+    def test_next_recording_leaves_previous_context_untouched(self) -> None:
+        context_manager = DictationContextManager()
+        context_manager.set_prompt_sections(dictionary_enabled=False)
+        first_job = context_manager.reset_context_for_new_recording()
+        first_job.context.add_message({"role": "user", "content": "first dictation"})
+
+        second_job = context_manager.reset_context_for_new_recording()
+
+        assert (first_job.recording_id, second_job.recording_id) == (1, 2)
+        assert second_job.context is not first_job.context
+        assert first_job.context.get_messages()[-1] == {
+            "role": "user",
+            "content": "first dictation",
+        }
+        assert len(second_job.context.get_messages()) == 1
+
+    def test_dictionary_selection_targets_the_recordings_job(self) -> None:
+        context_manager = DictationContextManager(dictionary_prompt_token_budget=1000)
+        context_manager.set_prompt_sections(
+            dictionary_enabled=True, dictionary_custom=MEDICAL_DICTIONARY_SECTION
+        )
+        first_job = context_manager.reset_context_for_new_recording()
+        second_job = context_manager.reset_context_for_new_recording()
+
+        context_manager.select_dictionary_for_transcript("the EF was normal", first_job)
+
+        def system_prompt(messages: list[Any]) -> str:
+            return cast(dict[str, Any], messages[0])["content"]
+
+        assert "metoprolol" not in system_prompt(first_job.context.get_messages())
+        assert "metoprolol" in system_prompt(second_job.context.get_messages())
+
+
+class TestRecordingOutputSequencer:
+    """Tests for RecordingOutputSequencer."""
+
+    def test_results_are_sent_in_order_with_recording_ids(self) -> None:
+        down_frames, _ = asyncio.run(
+            run_test(
+                RecordingOutputSequencer(),
+                frames_to_send=[
+                    RecordingResponseFrame(recording_id=1),
+                    LLMFullResponseStartFrame(),
+                    LLMTextFrame(text="First "),
+                    LLMTextFrame(text="dictation."),
+                    LLMFullResponseEndFrame(),
+                    RecordingOutputFrame(
+                        message=RawTranscriptionMessage(text="second", recording_id=2)
+                    ),
+                ],
+                expected_down_frames=[
+                    LLMFullResponseStartFrame,
+                    LLMTextFrame,
+                    LLMTextFrame,
+                    LLMFullResponseEndFrame,
+                    RTVIServerMessageFrame,
+                    RTVIServerMessageFrame,
+                ],
+            )
+        )
+        messages = [
+            frame.data for frame in down_frames if isinstance(frame, RTVIServerMessageFrame)
+        ]
+        assert messages == [
+            {"type": "formatted-transcription", "recording_id": 1, "text": "First dictation."},
+            {"type": "raw-transcription", "text": "second", "recording_id": 2},
+        ]
+
+
+class CapturingTurnController(TurnController):
+    """Turn controller that records the frames it pushes."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.pushed: list[Frame] = []
+
+    async def push_frame(
+        self, frame: Frame, direction: FrameDirection = FrameDirection.DOWNSTREAM
+    ) -> None:
+        self.pushed.append(frame)
+
+
+class StreamingLLM(FrameProcessor):
+    """Streams a canned response for each context, one request at a time."""
+
+    def __init__(self, responses: dict[str, list[str]]) -> None:
+        super().__init__()
+        self._responses = responses
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
+        await super().process_frame(frame, direction)
+        if not isinstance(frame, LLMContextFrame):
+            await self.push_frame(frame, direction)
+            return
+        transcript = cast(dict[str, Any], frame.context.get_messages()[-1])["content"]
+        await self.push_frame(LLMFullResponseStartFrame())
+        for text in self._responses[transcript]:
+            await asyncio.sleep(0.01)
+            await self.push_frame(LLMTextFrame(text=text))
+        await self.push_frame(LLMFullResponseEndFrame())
+
+
+class TestOverlappingRecordings:
+    """Tests for recordings whose finalizing and formatting overlap."""
+
+    def _record(self, *steps: str) -> list[Frame]:
+        """Run start/stop/final steps through a turn controller and return its frames."""
+
+        async def record() -> list[Frame]:
+            context_manager = DictationContextManager()
+            context_manager.set_prompt_sections(dictionary_enabled=False)
+            turn_controller = CapturingTurnController()
+            turn_controller.set_context_manager(context_manager)
+            turn_controller.set_transcription_timeout(0.05)
+            for step in steps:
+                match step:
+                    case "start":
+                        await turn_controller.start_recording()
+                    case "stop":
+                        await turn_controller.stop_recording()
+                    case text:
+                        await turn_controller.process_frame(
+                            TranscriptionFrame(text=text, user_id="user", timestamp=""),
+                            FrameDirection.DOWNSTREAM,
+                        )
+            await asyncio.sleep(0.5)
+            return turn_controller.pushed
+
+        return asyncio.run(record())
+
+    def test_start_while_finalizing_keeps_new_finals_out_of_the_previous_turn(self) -> None:
+        # The next recording starts before the first one has finalized
+        pushed = self._record("start", "first", "stop", "start", "second", "stop")
+
+        assert [type(frame) for frame in pushed] == [
+            RecordingJobFrame,
+            UserStartedSpeakingFrame,
+            TranscriptionFrame,
+            VADUserStoppedSpeakingFrame,
+            UserStoppedSpeakingFrame,
+            RecordingJobFrame,
+            UserStartedSpeakingFrame,
+            TranscriptionFrame,
+            VADUserStoppedSpeakingFrame,
+            UserStoppedSpeakingFrame,
+        ]
+        second_job = cast(RecordingJobFrame, pushed[5]).job
+        assert second_job.recording_id == 2
+        assert cast(TranscriptionFrame, pushed[7]).text == "second"
+
+    def test_start_while_finalizing_an_empty_recording_sends_its_empty_result(self) -> None:
+        pushed = self._record("start", "stop", "start", "second", "stop")
+
+        assert [type(frame) for frame in pushed][:4] == [
+            RecordingJobFrame,
+            UserStartedSpeakingFrame,
+            VADUserStoppedSpeakingFrame,
+            RecordingOutputFrame,
+        ]
+        empty_output = cast(RecordingOutputFrame, pushed[3])
+        assert empty_output.message.recording_id == 1
+
+    def test_aborted_response_uses_its_own_recordings_transcript(self) -> None:
+        guard = FormattingOutputGuardPair(max_output_ratio=2.0, min_output_tokens=8)
+        llm = StreamingLLM(
+            {
+                "first dictation": ["Sure! I would be happy to help with that. "] * 10,
+                "second dictation": ["Second dictation."],
+            }
+        )
+        pipeline = Pipeline(
+            [guard.request_sizer(), llm, guard.response_guard(), RecordingOutputSequencer()]
+        )
+
+        def request(recording_id: int, transcript: str) -> list[Frame]:
+            context = LLMContext(messages=[{"role": "user", "content": transcript}])
+            return [RecordingResponseFrame(recording_id=recording_id), LLMContextFrame(context)]
+
+        recording_frames: list[type[Frame]] = [
+            LLMUpdateSettingsFrame,
+            LLMFullResponseStartFrame,
+            LLMTextFrame,
+            LLMFullResponseEndFrame,
+            RTVIServerMessageFrame,
+        ]
+        # The second request reaches the guard's sizer while the first still streams
+        down_frames, _ = asyncio.run(
+            run_test(
+                pipeline,
+                frames_to_send=[
+                    *request(1, "first dictation"),
+                    *request(2, "second dictation"),
+                ],
+                expected_down_frames=recording_frames * 2,
+            )
+        )
+
+        messages = [
+            frame.data for frame in down_frames if isinstance(frame, RTVIServerMessageFrame)
+        ]
+        assert messages == [
+            {"type": "formatted-transcription", "recording_id": 1, "text": "first dictation"},
+            {"type": "formatted-transcription", "recording_id": 2, "text": "Second dictation."},
+        ]
+        assert (guard.stats().responses, guard.stats().aborted) == (2, 1)
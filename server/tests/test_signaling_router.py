@@ -0,0 +1,281 @@
+"""Tests for the consistent-hash ring and the router role against local fake nodes."""
+
+import itertools
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from utils.rate_limiter import get_ip_only
+from utils.signaling_router import HashRing, create_router_app, virtual_node_count
+from utils.state_store import SqliteStateStore
+from utils.worker_routing import TrustedProxy, resolve_proxy_token
+
+KEYS = [f"client-{index}" for index in range(2000)]
+
+
+class _FakeNode:
+    """A backend node's name, reported readiness and load, and the paths it served."""
+
+    def __init__(self, name: str, active_pipelines: int = 0) -> None:
+        self.name = name
+        self.status = "ready"
+        self.active_pipelines = active_pipelines
+        self.paths: list[str] = []
+        self.headers: list[dict[str, str]] = []
+        self.registrations = itertools.count()
+
+
+def _make_handler(node: _FakeNode) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path == "/ready":
+                self._reply(
+                    {"status": node.status, "active_pipelines": node.active_pipelines},
+                    status=200 if node.status == "ready" else 503,
+                )
+            else:
+                self._serve()
+
+        def do_POST(self) -> None:
+            self._serve()
+
+        def do_PATCH(self) -> None:
+            self._serve()
+
+        def _serve(self) -> None:
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            node.paths.append(self.path)
+            node.headers.append(dict(self.headers.items()))
+            match self.path:
+                case "/api/client/register":
+                    self._reply({"uuid": f"{node.name}-client-{next(node.registrations)}"})
+                case "/api/offer" if self.command == "POST":
+                    self._reply({"pc_id": f"{node.name}-pc", "sdp": "", "type": "answer"})
+                case _:
+                    self._reply({"node": node.name})
+
+        def _reply(self, payload: dict[str, Any], status: int = 200) -> None:
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            _ = format, args
+
+    return Handler
+
+
+@pytest.fixture
+def fake_nodes() -> Iterator[dict[str, _FakeNode]]:
+    servers: list[ThreadingHTTPServer] = []
+    nodes: dict[str, _FakeNode] = {}
+    for name, active_pipelines in [("a", 0), ("b", 0), ("c", 40)]:
+        node = _FakeNode(name, active_pipelines)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(node))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        nodes[f"http://127.0.0.1:{server.server_address[1]}"] = node
+    try:
+        yield nodes
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+def _backend_client_ip(headers: dict[str, str], peer_ip: str) -> str:
+    """Get the IP a backend rate-limits a request with these headers by."""
+    request = Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+            "client": (peer_ip, 50000),
+        }
+    )
+    return get_ip_only(request)
+
+
+class TestHashRing:
+    """Tests for HashRing."""
+
+    def test_empty_ring_has_no_node(self) -> None:
+        assert HashRing().get_node("client") is None
+
+    def test_node_joining_only_takes_keys(self) -> None:
+        ring = HashRing()
+        ring.set_node("a", 100)
+        ring.set_node("b", 100)
+        before = {key: ring.get_node(key) for key in KEYS}
+
+        ring.set_node("c", 100)
+        moved = [key for key in KEYS if ring.get_node(key) != before[key]]
+        assert {ring.get_node(key) for key in moved} == {"c"}
+        assert 0.2 < len(moved) / len(KEYS) < 0.45
+
+    def test_node_leaving_only_gives_up_its_keys(self) -> None:
+        ring = HashRing()
+        for node in "abc":
+            ring.set_node(node, 100)
+        before = {key: ring.get_node(key) for key in KEYS}
+
+        ring.remove_node("c")
+        assert all(ring.get_node(key) == before[key] for key in KEYS if before[key] != "c")
+
+    def test_busier_nodes_get_fewer_keys(self) -> None:
+        ring = HashRing()
+        ring.set_node("idle", virtual_node_count(0))
+        ring.set_node("busy", virtual_node_count(60))
+        busy_share = sum(ring.get_node(key) == "busy" for key in KEYS) / len(KEYS)
+        assert 0.1 < busy_share < 0.35
+
+
+class TestSignalingRouter:
+    """Tests for the router role proxying to fake backend nodes."""
+
+    def test_client_requests_reach_one_node(self, fake_nodes: dict[str, _FakeNode]) -> None:
+        with TestClient(create_router_app(list(fake_nodes), health_interval_secs=60)) as client:
+            registration = client.post("/api/client/register")
+            client_uuid = registration.json()["uuid"]
+            node = next(node for node in fake_nodes.values() if client_uuid.startswith(node.name))
+            # Registrations go to the least loaded node
+            assert node.name != "c"
+
+            config = client.get("/api/config", headers={"X-Client-UUID": client_uuid})
+            offer = client.post(
+                "/api/offer",
+                json={"sdp": "", "type": "offer", "requestData": {"clientUUID": client_uuid}},
+            )
+            patch = client.patch("/api/offer", json={"pc_id": offer.json()["pc_id"]})
+
+        assert config.json() == {"node": node.name}
+        assert patch.json() == {"node": node.name}
+        assert node.paths == ["/api/client/register", "/api/config", "/api/offer", "/api/offer"]
+
+    def test_unknown_clients_are_consistently_hashed(
+        self, fake_nodes: dict[str, _FakeNode]
+    ) -> None:
+        with TestClient(create_router_app(list(fake_nodes), health_interval_secs=60)) as client:
+            first = [client.get("/api/config", headers={"X-Client-UUID": key}) for key in KEYS[:30]]
+            again = [client.get("/api/config", headers={"X-Client-UUID": key}) for key in KEYS[:30]]
+
+        assert [response.json() for response in first] == [response.json() for response in again]
+        assert len({response.json()["node"] for response in first}) > 1
+
+    def test_offers_placed_by_load_spread_over_idle_nodes(
+        self, fake_nodes: dict[str, _FakeNode]
+    ) -> None:
+        app = create_router_app(
+            list(fake_nodes), health_interval_secs=60, place_offers_by_load=True
+        )
+        with TestClient(app) as client:
+            for index in range(4):
+                client.post(
+                    "/api/offer",
+                    json={"sdp": "", "type": "offer", "requestData": {"clientUUID": f"c{index}"}},
+                )
+            health = client.get("/health").json()
+
+        offers = {node.name: node.paths.count("/api/offer") for node in fake_nodes.values()}
+        assert offers == {"a": 2, "b": 2, "c": 0}
+        assert sorted(node["active_pipelines"] for node in health["nodes"]) == [2, 2, 40]
+
+    def test_nodes_not_ready_keep_pinned_clients_only(
+        self, fake_nodes: dict[str, _FakeNode]
+    ) -> None:
+        app = create_router_app(list(fake_nodes), health_interval_secs=60)
+        with TestClient(app) as client:
+            client_uuid = client.post("/api/client/register").json()["uuid"]
+            node = next(node for node in fake_nodes.values() if client_uuid.startswith(node.name))
+            node.status = "draining"
+            assert client.portal is not None
+            client.portal.call(app.state.router.refresh_nodes)
+
+            pinned = client.get("/api/config", headers={"X-Client-UUID": client_uuid})
+            new_clients = [client.post("/api/client/register").json() for _ in range(10)]
+            health = client.get("/health").json()
+
+        assert pinned.json() == {"node": node.name}
+        assert not any(new["uuid"].startswith(node.name) for new in new_clients)
+        assert {entry["ready"] for entry in health["nodes"]} == {True, False}
+
+    def test_unknown_peer_connection_is_not_found(self, fake_nodes: dict[str, _FakeNode]) -> None:
+        with TestClient(create_router_app(list(fake_nodes), health_interval_secs=60)) as client:
+            response = client.patch("/api/offer", json={"pc_id": "unknown"})
+        assert response.status_code == 404
+
+    def test_no_healthy_nodes_is_unavailable(self) -> None:
+        app = create_router_app(["http://127.0.0.1:9"], health_interval_secs=60)
+        with TestClient(app) as client:
+            assert client.get("/health").status_code == 503
+            response = client.get("/api/config", headers={"X-Client-UUID": "client"})
+        assert response.status_code == 503
+        assert response.json()["code"] == "NO_BACKEND_AVAILABLE"
+
+    @pytest.mark.parametrize(
+        ("router_token", "node_token", "expected_ip"),
+        [
+            ("shared-secret", "shared-secret", "testclient"),
+            (None, "shared-secret", "127.0.0.1"),
+            ("forged-secret", "shared-secret", "127.0.0.1"),
+        ],
+    )
+    def test_backends_rate_limit_by_client_ip_with_proxy_token(
+        self,
+        fake_nodes: dict[str, _FakeNode],
+        monkeypatch: pytest.MonkeyPatch,
+        router_token: str | None,
+        node_token: str,
+        expected_ip: str,
+    ) -> None:
+        app = create_router_app(list(fake_nodes), health_interval_secs=60, proxy_token=router_token)
+        with TestClient(app) as client:
+            client.get("/api/config", headers={"X-Client-UUID": "client"})
+        headers = next(node.headers[-1] for node in fake_nodes.values() if node.headers)
+
+        monkeypatch.setattr(TrustedProxy, "token", node_token)
+        assert _backend_client_ip(headers, peer_ip="127.0.0.1") == expected_ip
+
+    def test_front_end_shares_generated_proxy_token_with_workers(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "state.db")
+        front_end_token = resolve_proxy_token(None, SqliteStateStore(path))
+        assert resolve_proxy_token(None, SqliteStateStore(path)) == front_end_token
+        assert resolve_proxy_token("configured", SqliteStateStore(path)) == "configured"
+
+    def test_ready_until_draining_then_turns_offers_away(
+        self, fake_nodes: dict[str, _FakeNode]
+    ) -> None:
+        app = create_router_app(
+            list(fake_nodes), health_interval_secs=60, place_offers_by_load=True
+        )
+        with TestClient(app) as client:
+            ready = client.get("/ready")
+            app.state.router.drain()
+            draining = client.get("/ready")
+            offer = client.post(
+                "/api/offer",
+                json={"sdp": "", "type": "offer", "requestData": {"clientUUID": "client"}},
+            )
+            config = client.get("/api/config", headers={"X-Client-UUID": "client"})
+
+        assert ready.status_code == 200
+        assert ready.json() == {"status": "ready", "ready_nodes": 3, "active_pipelines": 40}
+        assert draining.status_code == 503
+        assert draining.json()["status"] == "draining"
+        assert offer.status_code == 503
+        assert offer.json()["code"] == "DRAINING"
+        assert offer.headers["Retry-After"]
+        # Clients already connected keep reaching their workers
+        assert config.status_code == 200
+        assert not any("/api/offer" in node.paths for node in fake_nodes.values())
@@ -0,0 +1,41 @@
+"""Tests for startup profiling."""
+
+from pathlib import Path
+
+import pytest
+
+from utils.startup_profile import ModuleImportTime, StartupProfile, time_imports
+
+
+class TestStartupProfile:
+    """Tests for time_imports and StartupProfile."""
+
+    def test_times_each_module_imported(self, tmp_path: Path) -> None:
+        (tmp_path / "slow_package.py").write_text("import time\ntime.sleep(0.05)\n")
+
+        elapsed_secs, module_import_times = time_imports("import slow_package", tmp_path)
+
+        slow_package = next(t for t in module_import_times if t.module == "slow_package")
+        assert slow_package.self_secs >= 0.05
+        assert elapsed_secs >= slow_package.cumulative_secs
+
+    def test_failing_code_raises(self, tmp_path: Path) -> None:
+        with pytest.raises(RuntimeError, match="missing_module"):
+            time_imports("import missing_module", tmp_path)
+
+    def test_report_groups_modules_by_package_and_totals_phases(self) -> None:
+        profile = StartupProfile(
+            module_import_times=[
+                ModuleImportTime("sdk", 0.1, 0.4),
+                ModuleImportTime("sdk.client", 0.3, 0.3),
+                ModuleImportTime("json", 0.01, 0.01),
+            ],
+            phase_secs={"imports": 0.5, "service initialization": 0.25},
+        )
+
+        report = profile.format_report(top=1)
+
+        assert "400.0 ms  sdk\n" in report
+        assert "json" not in report
+        assert "300.0 ms  sdk.client" in report
+        assert "750.0 ms  total" in report
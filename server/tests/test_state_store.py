@@ -0,0 +1,237 @@
+"""Tests for the shared state backends and cross-worker connection ownership."""
+
+import asyncio
+import socketserver
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, cast
+
+import pytest
+
+from config.settings import Settings
+from processors.client_manager import ClientConnectionManager
+from utils.state_store import (
+    MemoryStateStore,
+    RedisStateStore,
+    SqliteStateStore,
+    StateStore,
+)
+
+
+class _RespStandIn(socketserver.StreamRequestHandler):
+    """Answers the Redis commands used by RedisStateStore from an in-memory dict."""
+
+    data: dict[str, Any]
+    expiries: dict[str, float]
+
+    def handle(self) -> None:
+        while line := self.rfile.readline():
+            args = [self._read_bulk() for _ in range(int(line[1:]))]
+            self.wfile.write(self._execute(args[0].upper(), args[1:]))
+
+    def _read_bulk(self) -> str:
+        length = int(self.rfile.readline()[1:])
+        return self.rfile.read(length + 2)[:-2].decode()
+
+    def _execute(self, command: str, args: list[str]) -> bytes:
+        data, expiries = self.data, self.expiries
+        for key in [key for key, expires_at in expiries.items() if expires_at <= time.time()]:
+            data.pop(key, None)
+            del expiries[key]
+        match command, args:
+            case "ZADD", [key, *options, score, member]:
+                scores = data.setdefault(key, {})
+                if member in scores or "XX" not in options:
+                    current = scores.get(member, float("-inf"))
+                    scores[member] = max(current, float(score)) if "GT" in options else float(score)
+                return b":1\r\n"
+            case "ZSCORE", [key, member]:
+                score = data.get(key, {}).get(member)
+                return (
+                    b"$-1\r\n"
+                    if score is None
+                    else b"$%d\r\n%s\r\n"
+                    % (
+                        len(repr(score)),
+                        repr(score).encode(),
+                    )
+                )
+            case "ZREMRANGEBYSCORE", [key, "-inf", maximum]:
+                scores = data.get(key, {})
+                removed = [member for member, score in scores.items() if score < float(maximum[1:])]
+                for member in removed:
+                    del scores[member]
+                return b":%d\r\n" % len(removed)
+            case "ZCARD", [key]:
+                return b":%d\r\n" % len(data.get(key, {}))
+            case "SET", [key, value, *options]:
+                if "NX" not in options or key not in data:
+                    data[key] = value
+                return b"+OK\r\n"
+            case "GET", [key]:
+                value = data.get(key)
+                return (
+                    b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value.encode())
+                )
+            case "DEL", [key]:
+                return b":%d\r\n" % (data.pop(key, None) is not None)
+            case "INCRBY", [key, amount]:
+                data[key] = str(int(data.get(key, "0")) + int(amount))
+                return b":%s\r\n" % data[key].encode()
+            case "EXPIRE", [key, seconds]:
+                expiries[key] = time.time() + int(seconds)
+                return b":1\r\n"
+            case "PTTL", [key]:
+                return b":%d\r\n" % int((expiries.get(key, time.time()) - time.time()) * 1000)
+            case _:
+                return b"-ERR unknown command\r\n"
+
+
+@pytest.fixture
+def redis_url() -> Iterator[str]:
+    handler = type("Handler", (_RespStandIn,), {"data": {}, "expiries": {}})
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"redis://127.0.0.1:{server.server_address[1]}/0"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def state_store(request: pytest.FixtureRequest, tmp_path: Path) -> Iterator[StateStore]:
+    match request.param:
+        case "memory":
+            store: StateStore = MemoryStateStore()
+        case "sqlite":
+            store = SqliteStateStore(str(tmp_path / "state.db"))
+        case _:
+            store = RedisStateStore(request.getfixturevalue("redis_url"))
+    yield store
+    store.close()
+
+
+class TestStateStore:
+    """Tests for every StateStore backend."""
+
+    def test_registrations(self, state_store: StateStore) -> None:
+        state_store.add_registered_uuid("a", 100.0)
+        state_store.add_registered_uuid("a", 100.0)
+        state_store.add_registered_uuid("b", 100.0)
+
+        assert state_store.get_registered_uuid_last_seen("a") == 100.0
+        assert state_store.get_registered_uuid_last_seen("c") is None
+        assert state_store.registered_uuid_count() == 2
+
+    def test_touch_updates_only_registered_uuids(self, state_store: StateStore) -> None:
+        state_store.add_registered_uuid("a", 100.0)
+
+        assert state_store.touch_registered_uuid("a", 200.0)
+        assert state_store.get_registered_uuid_last_seen("a") == 200.0
+        assert not state_store.touch_registered_uuid("c", 200.0)
+        assert state_store.get_registered_uuid_last_seen("c") is None
+
+    def test_evicts_uuids_last_seen_before(self, state_store: StateStore) -> None:
+        state_store.add_registered_uuid("old", 100.0)
+        state_store.add_registered_uuid("recent", 200.0)
+
+        assert state_store.evict_registered_uuids(seen_before=200.0) == 1
+        assert state_store.get_registered_uuid_last_seen("old") is None
+        assert state_store.get_registered_uuid_last_seen("recent") == 200.0
+        assert state_store.registered_uuid_count() == 1
+
+    def test_formatting_cache_opt_out(self, state_store: StateStore) -> None:
+        state_store.set_formatting_cache_opt_out("a", True)
+        assert state_store.is_formatting_cache_opted_out("a")
+        assert not state_store.is_formatting_cache_opted_out("b")
+
+        state_store.set_formatting_cache_opt_out("a", False)
+        assert not state_store.is_formatting_cache_opted_out("a")
+
+    def test_release_keeps_a_newer_owner(self, state_store: StateStore) -> None:
+        state_store.set_owner("client", "http://worker-1")
+        state_store.set_owner("client", "http://worker-2")
+        state_store.release_owner("client", "http://worker-1")
+        assert state_store.get_owner("client") == "http://worker-2"
+
+        state_store.release_owner("client", "http://worker-2")
+        assert state_store.get_owner("client") is None
+
+    def test_counters_count_within_a_window(self, state_store: StateStore) -> None:
+        assert state_store.increment_counter("ip", expiry_secs=60) == 1
+        assert state_store.increment_counter("ip", expiry_secs=60, amount=2) == 3
+        assert state_store.get_counter("ip") == 3
+        assert state_store.get_counter_expiry("ip") > time.time() + 50
+
+        state_store.clear_counter("ip")
+        assert state_store.get_counter("ip") == 0
+
+    def test_first_shared_value_wins(self, state_store: StateStore) -> None:
+        assert state_store.ensure_shared_value("token", "first") == "first"
+        assert state_store.ensure_shared_value("token", "second") == "first"
+
+
+class TestWorkerDefaults:
+    """Tests for the shared state defaults of several workers."""
+
+    def test_single_node_defaults_stay_in_process(self) -> None:
+        settings = Settings.model_construct()
+        assert (settings.state_backend, settings.rate_limit_backend) == ("memory", "memory")
+
+    def test_workers_share_state_unless_set_explicitly(self) -> None:
+        worker_settings = Settings.model_construct().with_worker_defaults()
+        assert worker_settings.state_backend == "sqlite"
+        assert worker_settings.rate_limit_backend == "shared-memory"
+
+        explicit_settings = Settings.model_construct(state_backend="redis").with_worker_defaults()
+        assert explicit_settings.state_backend == "redis"
+        assert explicit_settings.rate_limit_backend == "shared-memory"
+
+
+class TestCrossWorkerOwnership:
+    """Tests for ClientConnectionManager sharing a state store between workers."""
+
+    def test_other_worker_sees_registration_and_owner(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "state.db")
+        worker_1 = ClientConnectionManager(SqliteStateStore(path), worker_url="http://worker-1")
+        worker_2 = ClientConnectionManager(SqliteStateStore(path), worker_url="http://worker-2")
+
+        client_uuid = asyncio.run(worker_1.generate_and_register_uuid())
+        connection = SimpleNamespace(pc_id="pc-1")
+        asyncio.run(
+            worker_1.register_connection(client_uuid, cast(Any, connection), cast(Any, None))
+        )
+
+        assert asyncio.run(worker_2.is_registered(client_uuid))
+        assert asyncio.run(worker_2.get_remote_owner(client_uuid=client_uuid)) == "http://worker-1"
+        assert asyncio.run(worker_2.get_remote_owner(pc_id="pc-1")) == "http://worker-1"
+        assert asyncio.run(worker_1.get_remote_owner(client_uuid=client_uuid)) is None
+
+        asyncio.run(worker_1.take_existing_connection(client_uuid))
+        assert asyncio.run(worker_2.get_remote_owner(client_uuid=client_uuid)) is None
+
+    def test_owner_writes_run_off_the_event_loop(self) -> None:
+        writer_threads: list[threading.Thread] = []
+
+        class _ThreadRecordingStore(MemoryStateStore):
+            def set_owner(self, key: str, owner: str) -> None:
+                writer_threads.append(threading.current_thread())
+                super().set_owner(key, owner)
+
+            def release_owner(self, key: str, owner: str) -> None:
+                writer_threads.append(threading.current_thread())
+                super().release_owner(key, owner)
+
+        manager = ClientConnectionManager(_ThreadRecordingStore(), worker_url="http://worker-1")
+        connection = SimpleNamespace(pc_id="pc-1")
+        asyncio.run(manager.register_connection("client", cast(Any, connection), cast(Any, None)))
+        asyncio.run(manager.unregister_connection("client"))
+
+        assert len(writer_threads) == 4
+        assert threading.main_thread() not in writer_threads
@@ -0,0 +1,106 @@
+"""Tests for STT vocabulary boosting from the personal dictionary."""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, cast
+
+from pipecat.services.assemblyai.models import AssemblyAIConnectionParams
+from pipecat.services.stt_service import STTService
+
+from processors.context_manager import DictationContextManager
+from services.stt_vocabulary import (
+    AssemblyAIKeytermBoost,
+    STTVocabularyBoost,
+    STTVocabularyBooster,
+)
+
+DICTIONARY_SECTION = """### Entries
+- metoprolol
+- Pipecat (voice AI framework)
+- The abbreviation 'EF' refers to ejection fraction."""
+
+
+class RecordingBoost(STTVocabularyBoost):
+    def __init__(self, configurable: bool = True) -> None:
+        self.configurable = configurable
+        self.configured_terms: list[tuple[str, ...]] = []
+        self.reconnect_count = 0
+
+    def configure(self, service: STTService, terms: tuple[str, ...]) -> bool:
+        self.configured_terms.append(terms)
+        return self.configurable
+
+    async def reconnect(self, service: STTService) -> None:
+        self.reconnect_count += 1
+
+
+class FakeSTTService:
+    pass
+
+
+def make_booster(boost: STTVocabularyBoost) -> tuple[STTVocabularyBooster, Any]:
+    service = FakeSTTService()
+    booster = STTVocabularyBooster({cast(STTService, service): boost})
+    booster.set_stt_switcher(
+        cast(Any, SimpleNamespace(strategy=SimpleNamespace(active_service=service)))
+    )
+    return booster, service
+
+
+def make_context_manager(booster: STTVocabularyBooster) -> DictationContextManager:
+    context_manager = DictationContextManager()
+    context_manager.set_stt_vocabulary_booster(booster)
+    context_manager.set_prompt_sections(
+        advanced_enabled=False, dictionary_enabled=True, dictionary_custom=DICTIONARY_SECTION
+    )
+    return context_manager
+
+
+class TestSTTVocabularyBooster:
+    """Tests for the per-connection booster."""
+
+    def test_boosted_terms_leave_the_prompt(self) -> None:
+        boost = RecordingBoost()
+        booster, _service = make_booster(boost)
+        context_manager = make_context_manager(booster)
+        assert "- metoprolol" in context_manager.system_prompt
+
+        asyncio.run(booster.boost(context_manager.compiled_dictionary))
+
+        assert boost.configured_terms == [("metoprolol", "Pipecat")]
+        assert boost.reconnect_count == 0
+        assert "- metoprolol" not in context_manager.system_prompt
+        assert "- Pipecat (voice AI framework)" in context_manager.system_prompt
+
+    def test_started_services_reconnect_only_when_terms_change(self) -> None:
+        boost = RecordingBoost()
+        booster, _service = make_booster(boost)
+        context_manager = make_context_manager(booster)
+
+        async def scenario() -> None:
+            await booster.boost(context_manager.compiled_dictionary)
+            booster.set_pipeline_started()
+            await booster.boost(context_manager.compiled_dictionary)
+            await booster.boost(None)
+
+        asyncio.run(scenario())
+
+        assert boost.configured_terms == [("metoprolol", "Pipecat"), ()]
+        assert boost.reconnect_count == 1
+
+    def test_unconfigurable_service_keeps_terms_in_prompt(self) -> None:
+        booster, _service = make_booster(RecordingBoost(configurable=False))
+        context_manager = make_context_manager(booster)
+
+        asyncio.run(booster.boost(context_manager.compiled_dictionary))
+
+        assert "- metoprolol" in context_manager.system_prompt
+
+    def test_assemblyai_boost_sets_keyterms_prompt(self) -> None:
+        service = SimpleNamespace(_connection_params=AssemblyAIConnectionParams())
+        boost = AssemblyAIKeytermBoost()
+
+        assert boost.configure(cast(STTService, service), ("metoprolol", "Pipecat"))
+        assert service._connection_params.keyterms_prompt == ["metoprolol", "Pipecat"]
+        boost.configure(cast(STTService, service), ())
+        assert service._connection_params.keyterms_prompt is None
@@ -0,0 +1,69 @@
+"""Tests for the per-client transcript history and reformatting."""
+
+import asyncio
+from typing import Any, cast
+
+from pipecat.pipeline.llm_switcher import LLMSwitcher
+from pipecat.processors.aggregators.llm_context import LLMContext
+
+from processors.context_manager import DictationContextManager
+from processors.transcript_history import TranscriptHistory
+
+
+class _RecordingLLM:
+    """Stands in for the active LLM, remembering the context it was given."""
+
+    def __init__(self) -> None:
+        self.contexts: list[LLMContext] = []
+
+    async def run_inference(self, context: LLMContext, max_tokens: int | None = None) -> str:
+        _ = max_tokens
+        self.contexts.append(context)
+        return " Reformatted text. "
+
+
+class _FakeSwitcher:
+    def __init__(self, llm: _RecordingLLM) -> None:
+        self.active_llm = llm
+
+
+def _history(context_manager: DictationContextManager, max_transcripts: int) -> TranscriptHistory:
+    return TranscriptHistory(
+        context_manager, max_transcripts=max_transcripts, max_output_ratio=3.0, min_output_tokens=64
+    )
+
+
+class TestTranscriptHistory:
+    """Tests for TranscriptHistory."""
+
+    def test_oldest_transcript_is_dropped_when_full(self) -> None:
+        context_manager = DictationContextManager()
+        history = _history(context_manager, max_transcripts=2)
+        for transcript in ("first", "second", "  ", "third"):
+            history.record(transcript, context_manager.reset_context_for_new_recording())
+
+        assert len(history) == 2
+        assert history.get(1) is None
+        latest = history.get()
+        assert latest is not None
+        assert (latest.recording_id, latest.transcript) == (4, "third")
+
+    def test_reformat_uses_the_current_prompt(self) -> None:
+        context_manager = DictationContextManager()
+        context_manager.set_prompt_sections(dictionary_enabled=False)
+        history = _history(context_manager, max_transcripts=5)
+        history.record("um send it today", context_manager.reset_context_for_new_recording())
+        llm = _RecordingLLM()
+        history.set_llm_switcher(cast(LLMSwitcher, _FakeSwitcher(llm)))
+
+        context_manager.set_prompt_sections(
+            main_custom="Format as a formal email.", dictionary_enabled=False
+        )
+        stored = history.get()
+        assert stored is not None
+        formatted_text = asyncio.run(history.reformat(stored))
+
+        assert formatted_text == "Reformatted text."
+        messages = cast(list[dict[str, Any]], llm.contexts[0].get_messages())
+        assert "Format as a formal email." in messages[0]["content"]
+        assert messages[-1] == {"role": "user", "content": "um send it today"}
@@ -0,0 +1,58 @@
+"""Tests for streaming WAV decoding."""
+
+import asyncio
+import io
+import wave
+from collections.abc import AsyncIterator
+
+import pytest
+
+from utils.wav_stream import WavFormat, parse_wav_header, read_wav_stream
+
+
+def _wav_bytes(pcm: bytes, sample_rate: int = 16000, num_channels: int = 1) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(num_channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
+
+
+async def _in_chunks(data: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), chunk_size):
+        yield data[start : start + chunk_size]
+
+
+class TestParseWavHeader:
+    """Tests for parse_wav_header()."""
+
+    def test_format_and_data_offset_are_read(self) -> None:
+        wav_data = _wav_bytes(b"\x01\x00" * 8, sample_rate=44100, num_channels=2)
+        assert parse_wav_header(wav_data) == (WavFormat(sample_rate=44100, num_channels=2), 44)
+
+    def test_truncated_header_needs_more_bytes(self) -> None:
+        assert parse_wav_header(_wav_bytes(b"")[:30]) is None
+
+    def test_non_pcm_audio_is_rejected(self) -> None:
+        with pytest.raises(ValueError, match="WAV"):
+            parse_wav_header(b"ID3\x03" + bytes(40))
+
+
+class TestReadWavStream:
+    """Tests for read_wav_stream()."""
+
+    def test_pcm_is_returned_in_whole_sample_frames(self) -> None:
+        pcm = bytes(range(256)) * 3  # 192 stereo sample frames
+
+        async def read_all() -> tuple[WavFormat, list[bytes]]:
+            wav_format, pcm_chunks = await read_wav_stream(
+                _in_chunks(_wav_bytes(pcm, num_channels=2), chunk_size=7)
+            )
+            return wav_format, [chunk async for chunk in pcm_chunks]
+
+        wav_format, chunks = asyncio.run(read_all())
+        assert wav_format.num_channels == 2
+        assert all(len(chunk) % wav_format.block_align == 0 for chunk in chunks)
+        assert b"".join(chunks) == pcm
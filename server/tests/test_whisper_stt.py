@@ -0,0 +1,37 @@
+"""Tests for the Whisper STT service sharing its model between connections."""
+
+import sys
+import types
+
+import pytest
+
+from services.whisper_stt import SharedWhisperSTTService
+
+
+@pytest.fixture
+def model_loads(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, str, str]]:
+    """Stand in for faster_whisper, recording each model load."""
+    loads: list[tuple[str, str, str]] = []
+
+    class FakeWhisperModel:
+        def __init__(self, model_name: str, device: str, compute_type: str) -> None:
+            loads.append((model_name, device, compute_type))
+
+    module = types.ModuleType("faster_whisper")
+    module.__dict__["WhisperModel"] = FakeWhisperModel
+    monkeypatch.setitem(sys.modules, "faster_whisper", module)
+    monkeypatch.setattr("services.whisper_stt._models", {})
+    return loads
+
+
+class TestSharedWhisperSTTService:
+    """Tests for SharedWhisperSTTService."""
+
+    def test_connections_share_one_model(self, model_loads: list[tuple[str, str, str]]) -> None:
+        first = SharedWhisperSTTService(model="tiny", device="cpu", compute_type="int8")
+        second = SharedWhisperSTTService(model="tiny", device="cpu", compute_type="int8")
+        other = SharedWhisperSTTService(model="base", device="cpu", compute_type="int8")
+
+        assert first._model is second._model
+        assert other._model is not first._model
+        assert model_loads == [("tiny", "cpu", "int8"), ("base", "cpu", "int8")]
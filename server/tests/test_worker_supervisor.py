@@ -0,0 +1,164 @@
+"""Tests for the worker supervisor and fork server, with stand-in workers."""
+
+import gc
+import http.server
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from utils.fork_server import ForkServer
+from utils.worker_supervisor import WorkerSupervisor, subprocess_launcher
+
+# Serves /health on the --port it is given, like a server worker
+STAND_IN_WORKER = """
+import http.server, json, os, sys
+
+port = int(sys.argv[sys.argv.index("--port") + 1])
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        data = json.dumps({"pid": os.getpid(), "worker_url": os.environ["WORKER_URL"]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+http.server.HTTPServer(("127.0.0.1", port), Handler).serve_forever()
+"""
+
+
+def _free_port_range(count: int) -> int:
+    """Find a first port such that it and the following ports look free."""
+    for _ in range(20):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            first_port = probe.getsockname()[1]
+        if first_port + count < 65536:
+            return first_port
+    pytest.skip("No free port range")
+
+
+# Set by the fork server's preload, so forked workers should see it
+_preloaded_models: list[str] = []
+
+
+def _preload() -> None:
+    _preloaded_models.append("model")
+
+
+def _run_forked_worker(port: int) -> None:
+    """Serve /health on a port, reporting what the worker inherited."""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            data = json.dumps(
+                {
+                    "pid": os.getpid(),
+                    "worker_url": os.environ["WORKER_URL"],
+                    "preloaded_models": _preloaded_models,
+                    "frozen_objects": gc.get_freeze_count(),
+                    "gc_enabled": gc.isenabled(),
+                }
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            _ = format, args
+
+    http.server.HTTPServer(("127.0.0.1", port), Handler).serve_forever()
+
+
+def _get_health(url: str, timeout_secs: float = 10.0) -> str:
+    deadline = time.monotonic() + timeout_secs
+    while True:
+        try:
+            with urllib.request.urlopen(f"{url}/health", timeout=1) as response:
+                return response.read().decode()
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses POSIX signals")
+class TestWorkerSupervisor:
+    """Tests for WorkerSupervisor."""
+
+    def test_starts_restarts_and_stops_workers(self, tmp_path: Path) -> None:
+        script = tmp_path / "worker.py"
+        script.write_text(STAND_IN_WORKER)
+        first_port = _free_port_range(2)
+        supervisor = WorkerSupervisor(
+            subprocess_launcher([sys.executable, str(script)]), 2, first_port
+        )
+        supervisor.start()
+        try:
+            healths = [_get_health(url) for url in supervisor.worker_urls]
+            assert f'"worker_url": "{supervisor.worker_urls[1]}"' in healths[1]
+
+            pid = int(healths[0].split('"pid": ')[1].split(",")[0])
+            os.kill(pid, signal.SIGKILL)
+            time.sleep(0.5)
+            assert f'"pid": {pid},' not in _get_health(supervisor.worker_urls[0])
+        finally:
+            supervisor.stop()
+
+        with pytest.raises(OSError):
+            urllib.request.urlopen(f"{supervisor.worker_urls[1]}/health", timeout=1)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+class TestForkServer:
+    """Tests for ForkServer."""
+
+    def test_workers_inherit_preloaded_frozen_state(self) -> None:
+        fork_server = ForkServer(_run_forked_worker, preload=_preload)
+        fork_server.start()
+        first_port = _free_port_range(2)
+        supervisor = WorkerSupervisor(fork_server.launch, 2, first_port)
+        supervisor.start()
+        try:
+            healths = [json.loads(_get_health(url)) for url in supervisor.worker_urls]
+            assert healths[1]["worker_url"] == supervisor.worker_urls[1]
+            assert all(health["preloaded_models"] == ["model"] for health in healths)
+            assert all(health["frozen_objects"] > 0 for health in healths)
+            assert all(health["gc_enabled"] for health in healths)
+            # The preload ran in the fork server, not in this process
+            assert _preloaded_models == []
+
+            os.kill(healths[0]["pid"], signal.SIGKILL)
+            time.sleep(0.5)
+            assert json.loads(_get_health(supervisor.worker_urls[0]))["pid"] != healths[0]["pid"]
+        finally:
+            supervisor.stop()
+            fork_server.close()
+
+    def test_reports_worker_exits(self) -> None:
+        fork_server = ForkServer(_run_forked_worker)
+        fork_server.start()
+        try:
+            worker = fork_server.launch(_free_port_range(1))
+            assert worker.poll() is None
+            with pytest.raises(subprocess.TimeoutExpired):
+                worker.wait(timeout=0.1)
+
+            worker.terminate()
+            assert worker.wait(timeout=10) == -signal.SIGTERM
+            assert worker.poll() == -signal.SIGTERM
+        finally:
+            fork_server.close()
@@ -0,0 +1,319 @@
+"""Admission control for new pipelines.
+
+Every pipeline of a worker shares its event loop, so past some load each new
+connection slows down every client's dictation. Before a WebRTC offer starts
+a pipeline, the worker checks its load and, when over capacity, answers 503
+with Retry-After so the client backs off instead of being accepted into a
+degraded session.
+
+A new client is turned away when any of these is over its limit:
+- Active pipelines (ADMISSION_MAX_PIPELINES, less the reserved pipelines)
+- Event-loop lag: how late the loop runs a timer, which grows when CPU-bound
+  work such as VAD inference, audio handling or TLS starves it
+- CPU used by this process, as a percentage of one core
+
+An admitted offer holds a pipeline slot from its admission until its
+pipeline task is registered (or the offer fails), so a burst of offers
+negotiating at once cannot all pass the pipeline limit before any of their
+pipelines is running.
+
+A client replacing its running pipeline is always admitted, as its load does
+not grow. A reconnecting client, one whose pipeline on this worker ended
+recently, is only turned away at ADMISSION_MAX_PIPELINES: its session takes
+back load the worker already carried, and ADMISSION_RESERVED_PIPELINES can
+keep pipelines free for it. Each decision is counted by outcome and
+reason, and the counters are exposed by /metrics.
+
+While draining for shutdown (see utils.readiness), every offer is turned
+away, so clients reconnect to another worker.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Final
+
+from loguru import logger
+
+# Event-loop lag and CPU are sampled this often
+LOAD_SAMPLE_INTERVAL_SECS: Final[float] = 0.5
+# A client whose pipeline ended this recently counts as reconnecting
+RECONNECT_WINDOW_SECS: Final[float] = 120.0
+# Most recently disconnected clients remembered as reconnecting
+MAX_RECENT_DISCONNECTS: Final[int] = 10000
+METRIC_PREFIX: Final[str] = "tambourine"
+
+
+class AdmissionReason(StrEnum):
+    """Why an offer was admitted or shed."""
+
+    WITHIN_CAPACITY = "within_capacity"
+    RECONNECT = "reconnect"  # Admitted into capacity kept for reconnecting clients
+    MAX_PIPELINES = "max_pipelines"
+    LOOP_LAG = "loop_lag"
+    CPU = "cpu"
+    DRAINING = "draining"
+
+
+@dataclass(frozen=True)
+class AdmissionDecision:
+    """Whether to start a pipeline for an offer, and why."""
+
+    admitted: bool
+    reason: AdmissionReason
+
+
+@dataclass(frozen=True)
+class AdmissionLoad:
+    """Point-in-time load signals of this worker."""
+
+    loop_lag_secs: float
+    cpu_percent: float
+
+
+class LoadMonitor:
+    """Samples event-loop lag and process CPU in a background task."""
+
+    def __init__(
+        self,
+        interval_secs: float = LOAD_SAMPLE_INTERVAL_SECS,
+        clock: Callable[[], float] = time.monotonic,
+        cpu_clock: Callable[[], float] = time.process_time,
+    ) -> None:
+        """Initialize the monitor.
+
+        Args:
+            interval_secs: Seconds between samples
+            clock: Monotonic wall clock
+            cpu_clock: CPU time of this process
+        """
+        self._interval_secs = interval_secs
+        self._clock = clock
+        self._cpu_clock = cpu_clock
+        self._loop_lag_secs = 0.0
+        self._cpu_percent = 0.0
+        self._task: asyncio.Task[None] | None = None
+
+    def load(self) -> AdmissionLoad:
+        """Get the latest load signals."""
+        return AdmissionLoad(loop_lag_secs=self._loop_lag_secs, cpu_percent=self._cpu_percent)
+
+    def start(self) -> None:
+        """Start sampling on the running event loop."""
+        self._task = asyncio.create_task(self._sample_forever())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def record_sample(self, loop_lag_secs: float, cpu_percent: float) -> None:
+        """Record one sample.
+
+        A lag spike counts at once and then halves with each calmer sample, so
+        one slow callback sheds load for about a second rather than one sample.
+        """
+        self._loop_lag_secs = max(loop_lag_secs, self._loop_lag_secs / 2)
+        self._cpu_percent = cpu_percent
+
+    async def _sample_forever(self) -> None:
+        previous_at = self._clock()
+        previous_cpu_secs = self._cpu_clock()
+        while True:
+            await asyncio.sleep(self._interval_secs)
+            now = self._clock()
+            cpu_secs = self._cpu_clock()
+            elapsed_secs = now - previous_at
+            self.record_sample(
+                loop_lag_secs=max(elapsed_secs - self._interval_secs, 0.0),
+                cpu_percent=(cpu_secs - previous_cpu_secs) / elapsed_secs * 100,
+            )
+            previous_at, previous_cpu_secs = now, cpu_secs
+
+
+class AdmissionController:
+    """Decides whether this worker takes on another pipeline."""
+
+    def __init__(
+        self,
+        load_monitor: LoadMonitor,
+        *,
+        max_pipelines: int | None = None,
+        reserved_pipelines: int = 0,
+        max_loop_lag_secs: float | None = None,
+        max_cpu_percent: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the controller.
+
+        Args:
+            load_monitor: Source of event-loop lag and CPU samples
+            max_pipelines: Most concurrent pipelines, or None for no limit
+            reserved_pipelines: Pipelines of max_pipelines only reconnecting clients may use
+            max_loop_lag_secs: Loop lag over which new clients are shed, or None
+            max_cpu_percent: Process CPU (percent of one core) over which new
+                clients are shed, or None
+            clock: Monotonic clock for the reconnect window
+
+        Raises:
+            ValueError: If the reserved pipelines leave none for new clients
+        """
+        if max_pipelines is not None and reserved_pipelines >= max_pipelines:
+            raise ValueError("Reserved pipelines must be fewer than the maximum pipelines")
+        self._load_monitor = load_monitor
+        self._max_pipelines = max_pipelines
+        self._reserved_pipelines = reserved_pipelines
+        self._max_loop_lag_secs = max_loop_lag_secs
+        self._max_cpu_percent = max_cpu_percent
+        self._clock = clock
+        self._recent_disconnects: OrderedDict[str, float] = OrderedDict()
+        self._decisions: Counter[tuple[bool, AdmissionReason]] = Counter()
+        self._draining = False
+        # Admitted offers whose pipeline task is not registered yet
+        self._pending_admissions = 0
+
+    @property
+    def draining(self) -> bool:
+        """Whether every offer is turned away ahead of shutdown."""
+        return self._draining
+
+    def drain(self) -> None:
+        """Turn every offer away from now on, ahead of shutdown."""
+        if not self._draining:
+            self._draining = True
+            logger.info("Draining: turning new WebRTC offers away")
+
+    def check(
+        self, client_uuid: str, active_pipelines: int, *, has_pipeline: bool = False
+    ) -> AdmissionDecision:
+        """Decide whether to start a pipeline for a client's offer, counting the decision.
+
+        An admitted offer holds a pipeline slot until release() is called for it.
+
+        Args:
+            client_uuid: The client's UUID
+            active_pipelines: Pipelines this worker is running
+            has_pipeline: Whether the client has a pipeline here that the new one replaces
+        """
+        active_pipelines += self._pending_admissions
+        if self._draining:
+            decision = AdmissionDecision(admitted=False, reason=AdmissionReason.DRAINING)
+        elif has_pipeline:
+            decision = AdmissionDecision(admitted=True, reason=AdmissionReason.RECONNECT)
+        else:
+            decision = self._decide(
+                active_pipelines, is_reconnect=self._recently_disconnected(client_uuid)
+            )
+        self._decisions[decision.admitted, decision.reason] += 1
+        if decision.admitted:
+            self._pending_admissions += 1
+        else:
+            load = self._load_monitor.load()
+            logger.warning(
+                f"Shedding offer from {client_uuid} ({decision.reason.value}): "
+                f"{active_pipelines} pipelines, loop lag {load.loop_lag_secs * 1000:.0f} ms, "
+                f"CPU {load.cpu_percent:.0f}%"
+            )
+        return decision
+
+    def release(self) -> None:
+        """Release an admitted offer's slot, once its pipeline task is registered or it failed."""
+        self._pending_admissions = max(self._pending_admissions - 1, 0)
+
+    def note_disconnected(self, client_uuid: str) -> None:
+        """Remember that a client's pipeline ended, so its next offer is a reconnect."""
+        self._recent_disconnects[client_uuid] = self._clock()
+        self._recent_disconnects.move_to_end(client_uuid)
+        while len(self._recent_disconnects) > MAX_RECENT_DISCONNECTS:
+            self._recent_disconnects.popitem(last=False)
+
+    def decision_counts(self) -> dict[tuple[bool, AdmissionReason], int]:
+        """Get the number of decisions by outcome (admitted or not) and reason."""
+        return dict(self._decisions)
+
+    def load(self) -> AdmissionLoad:
+        """Get the latest load signals."""
+        return self._load_monitor.load()
+
+    def capacity(self, active_pipelines: int) -> float:
+        """Score the load this worker can still take, from 1 (idle) to 0 (at a limit).
+
+        Each configured limit for new clients is used in proportion to its
+        value, and the score is what is left of the most used one.
+        """
+        load = self._load_monitor.load()
+        limits = [
+            (
+                active_pipelines + self._pending_admissions,
+                None
+                if self._max_pipelines is None
+                else self._max_pipelines - self._reserved_pipelines,
+            ),
+            (load.loop_lag_secs, self._max_loop_lag_secs),
+            (load.cpu_percent, self._max_cpu_percent),
+        ]
+        usages = [value / limit for value, limit in limits if limit]
+        return max(0.0, 1.0 - max(usages, default=0.0))
+
+    def _recently_disconnected(self, client_uuid: str) -> bool:
+        disconnected_at = self._recent_disconnects.get(client_uuid)
+        return (
+            disconnected_at is not None and self._clock() - disconnected_at <= RECONNECT_WINDOW_SECS
+        )
+
+    def _decide(self, active_pipelines: int, *, is_reconnect: bool) -> AdmissionDecision:
+        if self._max_pipelines is not None and active_pipelines >= self._max_pipelines:
+            return AdmissionDecision(admitted=False, reason=AdmissionReason.MAX_PIPELINES)
+        if is_reconnect:
+            return AdmissionDecision(admitted=True, reason=AdmissionReason.RECONNECT)
+
+        load = self._load_monitor.load()
+        if (
+            self._max_pipelines is not None
+            and active_pipelines >= self._max_pipelines - self._reserved_pipelines
+        ):
+            reason: AdmissionReason | None = AdmissionReason.MAX_PIPELINES
+        elif self._max_loop_lag_secs is not None and load.loop_lag_secs > self._max_loop_lag_secs:
+            reason = AdmissionReason.LOOP_LAG
+        elif self._max_cpu_percent is not None and load.cpu_percent > self._max_cpu_percent:
+            reason = AdmissionReason.CPU
+        else:
+            reason = None
+
+        if reason is not None:
+            return AdmissionDecision(admitted=False, reason=reason)
+        return AdmissionDecision(admitted=True, reason=AdmissionReason.WITHIN_CAPACITY)
+
+
+def format_metrics(controller: AdmissionController, active_pipelines: int) -> str:
+    """Format admission decisions and load in the Prometheus text exposition format."""
+    load = controller.load()
+    lines = [
+        f"# HELP {METRIC_PREFIX}_admission_decisions_total WebRTC offers admitted or shed",
+        f"# TYPE {METRIC_PREFIX}_admission_decisions_total counter",
+    ]
+    for (admitted, reason), count in sorted(controller.decision_counts().items()):
+        outcome = "admitted" if admitted else "shed"
+        lines.append(
+            f'{METRIC_PREFIX}_admission_decisions_total{{outcome="{outcome}",'
+            f'reason="{reason.value}"}} {count}'
+        )
+    lines += [
+        f"# HELP {METRIC_PREFIX}_active_pipelines Pipelines this worker is running",
+        f"# TYPE {METRIC_PREFIX}_active_pipelines gauge",
+        f"{METRIC_PREFIX}_active_pipelines {active_pipelines}",
+        f"# HELP {METRIC_PREFIX}_event_loop_lag_seconds Recent event-loop lag",
+        f"# TYPE {METRIC_PREFIX}_event_loop_lag_seconds gauge",
+        f"{METRIC_PREFIX}_event_loop_lag_seconds {load.loop_lag_secs:.6f}",
+        f"# HELP {METRIC_PREFIX}_cpu_percent Process CPU over the last sample, per core",
+        f"# TYPE {METRIC_PREFIX}_cpu_percent gauge",
+        f"{METRIC_PREFIX}_cpu_percent {load.cpu_percent:.1f}",
+    ]
+    return "\n".join(lines) + "\n"
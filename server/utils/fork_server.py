@@ -0,0 +1,252 @@
+"""Fork server starting pipeline workers from one preloaded process.
+
+A worker started as a fresh interpreter imports pipecat, aiortc, PyAV, numpy,
+ONNX Runtime and its configured provider SDKs on its own, so with --workers N
+those modules take N copies of memory. With --fork-server, the supervisor
+instead forks a fork server process once, before it starts any thread. The
+fork server has everything main.py imports, runs a preload step (importing
+the configured providers, fetching model files) and calls gc.freeze(); each
+worker is then forked from it, sharing its pages copy-on-write until a worker
+writes to them.
+
+gc.freeze() moves every object the fork server holds into a permanent
+generation the garbage collector never scans, so collections in the workers
+do not write to (and so copy) the pages of those objects. Following the gc
+module's advice, the fork server also disables collection while preloading,
+so it leaves no freed holes in pages the workers share, and workers enable it
+again as they start.
+
+Loaded ONNX Runtime sessions and CTranslate2 (faster-whisper) models start
+thread pools, which do not survive a fork, so models are loaded by each
+worker rather than by the fork server; see services.whisper_stt for sharing
+the Whisper model between a worker's connections.
+
+The supervisor talks to the fork server over a socket pair, one line per
+message: it sends a worker's port, and the fork server answers
+"started <pid>", and "exited <pid> <exit code>" when it reaps a worker.
+"""
+
+import contextlib
+import gc
+import os
+import select
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable
+from typing import Final, NoReturn
+
+from loguru import logger
+
+from utils.worker_supervisor import worker_environment
+
+# How often the fork server checks for exited workers
+REAP_INTERVAL_SECS: Final[float] = 0.5
+
+
+class ForkServer:
+    """Forks worker processes from a preloaded, single-threaded process."""
+
+    def __init__(
+        self, run_worker: Callable[[int], None], preload: Callable[[], None] | None = None
+    ) -> None:
+        """Initialize the fork server.
+
+        Args:
+            run_worker: Runs a worker serving on a local port, in the forked worker
+            preload: Loads what workers share, in the fork server before it freezes
+        """
+        self._run_worker = run_worker
+        self._preload = preload
+        self.pid: int | None = None
+        self._socket: socket.socket | None = None
+        self._buffer = b""
+        self._exit_codes: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Fork the fork server and wait for it to preload.
+
+        Call this before starting any thread: only the forking thread exists
+        in the fork server and the workers.
+
+        Raises:
+            ConnectionError: If the fork server exits while preloading
+        """
+        parent_socket, child_socket = socket.socketpair()
+        pid = os.fork()
+        if pid == 0:
+            parent_socket.close()
+            self._serve(child_socket)
+        child_socket.close()
+        self.pid = pid
+        self._socket = parent_socket
+        with self._lock:
+            self._read_message(timeout=None)
+        logger.info(f"Fork server {pid} preloaded")
+
+    def launch(self, port: int) -> "ForkedWorker":
+        """Fork a worker serving on a local port."""
+        with self._lock:
+            self._connected_socket().sendall(f"{port}\n".encode())
+            while True:
+                match self._read_message(timeout=None):
+                    case ["started", pid]:
+                        return ForkedWorker(self, int(pid))
+                    case _:
+                        pass
+
+    def exit_code(self, pid: int, timeout: float | None) -> int | None:
+        """Wait for a worker to exit.
+
+        Args:
+            pid: The worker's process ID
+            timeout: Seconds to wait, or None to wait until it exits
+
+        Returns:
+            The worker's exit code (negative for a signal), or None if it is still running
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while pid not in self._exit_codes:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                if self._read_message(remaining) is None:
+                    return None
+            return self._exit_codes[pid]
+
+    def close(self) -> None:
+        """Stop the fork server (stop its workers first)."""
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def _connected_socket(self) -> socket.socket:
+        if self._socket is None:
+            raise RuntimeError("The fork server is not running")
+        return self._socket
+
+    def _read_message(self, timeout: float | None) -> list[str] | None:
+        """Read one message, recording exits; None if none arrives in time."""
+        connected_socket = self._connected_socket()
+        while b"\n" not in self._buffer:
+            if not select.select([connected_socket], [], [], timeout)[0]:
+                return None
+            data = connected_socket.recv(4096)
+            if not data:
+                raise ConnectionError("The fork server exited")
+            self._buffer += data
+        line, _, self._buffer = self._buffer.partition(b"\n")
+        message = line.decode().split()
+        match message:
+            case ["exited", pid, exit_code]:
+                self._exit_codes[int(pid)] = int(exit_code)
+            case _:
+                pass
+        return message
+
+    def _serve(self, supervisor_socket: socket.socket) -> NoReturn:
+        """Preload, then fork workers until the supervisor closes its socket."""
+        # Ctrl+C reaches the whole process group; the fork server stops with
+        # the supervisor instead
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        exit_code = 0
+        try:
+            gc.disable()
+            if self._preload is not None:
+                self._preload()
+            gc.freeze()
+            supervisor_socket.sendall(b"ready\n")
+
+            buffer = b""
+            while True:
+                readable = select.select([supervisor_socket], [], [], REAP_INTERVAL_SECS)[0]
+                for pid, worker_exit_code in _reap_workers():
+                    supervisor_socket.sendall(f"exited {pid} {worker_exit_code}\n".encode())
+                if not readable:
+                    continue
+                data = supervisor_socket.recv(4096)
+                if not data:
+                    break
+                buffer += data
+                while b"\n" in buffer:
+                    line, _, buffer = buffer.partition(b"\n")
+                    pid = self._fork_worker(supervisor_socket, int(line))
+                    supervisor_socket.sendall(f"started {pid}\n".encode())
+        except Exception:
+            logger.exception("Fork server failed")
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            os._exit(exit_code)
+
+    def _fork_worker(self, supervisor_socket: socket.socket, port: int) -> int:
+        pid = os.fork()
+        if pid != 0:
+            return pid
+
+        supervisor_socket.close()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        os.environ.update(worker_environment(port))
+        gc.enable()
+        exit_code = 0
+        try:
+            self._run_worker(port)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except BaseException:
+            logger.exception(f"Worker on port {port} failed")
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            os._exit(exit_code)
+
+
+class ForkedWorker:
+    """A worker process forked by a ForkServer."""
+
+    def __init__(self, fork_server: ForkServer, pid: int) -> None:
+        self._fork_server = fork_server
+        self.pid = pid
+
+    def poll(self) -> int | None:
+        """Get the worker's exit code, or None if it is running."""
+        return self._fork_server.exit_code(self.pid, timeout=0)
+
+    def wait(self, timeout: float | None = None) -> int:
+        """Wait for the worker to exit and get its exit code.
+
+        Raises:
+            subprocess.TimeoutExpired: If it is still running after the timeout
+        """
+        exit_code = self._fork_server.exit_code(self.pid, timeout)
+        if exit_code is None:
+            raise subprocess.TimeoutExpired(f"worker {self.pid}", timeout or 0)
+        return exit_code
+
+    def terminate(self) -> None:
+        """Ask the worker to stop."""
+        self._signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        """Kill the worker."""
+        self._signal(signal.SIGKILL)
+
+    def _signal(self, signal_number: int) -> None:
+        with contextlib.suppress(ProcessLookupError):
+            os.kill(self.pid, signal_number)
+
+
+def _reap_workers() -> list[tuple[int, int]]:
+    """Reap exited workers, getting their process IDs and exit codes."""
+    exited: list[tuple[int, int]] = []
+    while True:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return exited
+        if pid == 0:
+            return exited
+        exited.append((pid, os.waitstatus_to_exitcode(status)))
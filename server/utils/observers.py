@@ -1,8 +1,10 @@
-"""Custom logging observer for pipeline events.
+"""Custom observers for pipeline events.
 
 Filters frames by source to avoid duplicate logs as frames propagate through the pipeline.
 """
 
+from typing import Any
+
 from pipecat.frames.frames import (
     InputAudioRawFrame,
     LLMFullResponseEndFrame,
@@ -17,12 +19,19 @@ from pipecat.frames.frames import (
     UserStoppedSpeakingFrame,
 )
 from pipecat.observers.base_observer import BaseObserver, FramePushed
-from pipecat.processors.frameworks.rtvi import RTVIServerMessageFrame
+from pipecat.processors.frame_processor import FrameProcessor
+from pipecat.processors.frameworks.rtvi import (
+    RTVIObserver,
+    RTVIObserverParams,
+    RTVIProcessor,
+    RTVIServerMessageFrame,
+)
 from pipecat.services.llm_service import LLMService
 from pipecat.services.stt_service import STTService
 from pipecat.transports.base_input import BaseInputTransport
 from pipecat.transports.base_output import BaseOutputTransport
 
+from processors.formatting_router import FormattingRouter
 from utils.logger import logger
 
 
@@ -111,3 +120,126 @@ class PipelineLogObserver(BaseObserver):
                 frame, UserSpeakingFrame | MetricsFrame | TextFrame | LLMTextFrame
             ):
                 logger.debug(f"Frame: {type(frame).__name__}")
+
+
+class FormattingRouteLatencyObserver(BaseObserver):
+    """Observer that completes formatting route timings when results reach the client.
+
+    A recording's result has been delivered when the output transport sends
+    its formatted or raw transcription message, which carries its recording ID.
+    """
+
+    def __init__(self, formatting_router: FormattingRouter) -> None:
+        """Initialize the observer.
+
+        Args:
+            formatting_router: The connection's formatting router
+        """
+        super().__init__()
+        self._formatting_router = formatting_router
+
+    async def on_push_frame(self, data: FramePushed) -> None:
+        """Complete a recording's route timing when its result is sent.
+
+        Args:
+            data: The frame push event data containing source, frame, and other info.
+        """
+        match (data.frame, data.source):
+            case (
+                RTVIServerMessageFrame(
+                    data={"type": "raw-transcription" | "formatted-transcription"} as message
+                ),
+                BaseOutputTransport(),
+            ):
+                self._formatting_router.complete(message.get("recording_id"))
+
+
+class InFlightLLMObserver(BaseObserver):
+    """Observer that counts the LLM responses a pipeline is generating.
+
+    A response is in flight from the LLM service's LLMFullResponseStartFrame
+    to its LLMFullResponseEndFrame; /ready sums the count over pipelines.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the observer."""
+        super().__init__()
+        self.in_flight = 0
+
+    async def on_push_frame(self, data: FramePushed) -> None:
+        """Count responses starting and ending at the LLM service.
+
+        Args:
+            data: The frame push event data containing source, frame, and other info.
+        """
+        match (data.frame, data.source):
+            case (LLMFullResponseStartFrame(), LLMService()):
+                self.in_flight += 1
+            case (LLMFullResponseEndFrame(), LLMService()):
+                self.in_flight = max(0, self.in_flight - 1)
+
+
+class RecordingOutputRTVIObserver(RTVIObserver):
+    """RTVI observer that reports LLM responses only as they leave the LLM stage.
+
+    The default RTVIObserver sends BotLlmStarted/Text/Stopped the first time any
+    processor pushes a response frame, i.e. straight from the LLM service, before
+    the output guard can hold back a runaway response. This observer reports
+    response frames only when the output processor (RecordingOutputSequencer)
+    pushes them, so the client sees exactly the responses the LLM stage
+    delivers, in recording order. Frames pushed earlier are not marked as seen,
+    so the same frame is reported once it reaches the output processor.
+    """
+
+    def __init__(
+        self,
+        rtvi: RTVIProcessor,
+        output_processor: FrameProcessor,
+        *,
+        params: RTVIObserverParams | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the observer.
+
+        Args:
+            rtvi: The RTVI processor to send messages through
+            output_processor: The processor whose LLM response frames reach the client
+            params: Settings to enable/disable specific messages
+            **kwargs: Additional arguments passed to RTVIObserver
+        """
+        super().__init__(rtvi, params=params, **kwargs)
+        self._output_processor = output_processor
+
+    async def on_push_frame(self, data: FramePushed) -> None:
+        """Skip LLM response frames until the output processor pushes them.
+
+        Args:
+            data: The frame push event data containing source, frame, and other info.
+        """
+        match data.frame:
+            case LLMFullResponseStartFrame() | LLMTextFrame() | LLMFullResponseEndFrame() if (
+                data.source is not self._output_processor
+            ):
+                return
+            case _:
+                await super().on_push_frame(data)
+
+
+class RecordingOutputRTVIProcessor(RTVIProcessor):
+    """RTVI processor whose task observer is a RecordingOutputRTVIObserver."""
+
+    def __init__(self, output_processor: FrameProcessor, **kwargs: Any) -> None:
+        """Initialize the processor.
+
+        Args:
+            output_processor: The processor whose LLM response frames reach the client
+            **kwargs: Additional arguments passed to RTVIProcessor
+        """
+        super().__init__(**kwargs)
+        self._output_processor = output_processor
+
+    def create_rtvi_observer(
+        self, *, params: RTVIObserverParams | None = None, **kwargs: Any
+    ) -> RTVIObserver:
+        """Create the observer PipelineTask adds for this processor."""
+        return RecordingOutputRTVIObserver(self, self._output_processor, params=params, **kwargs)
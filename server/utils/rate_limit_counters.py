@@ -0,0 +1,479 @@
+"""Sliding-window rate-limit counters shared by server workers.
+
+Each rate limit keeps two fixed-window counters per key: the current window
+and the previous one. A request is allowed while the previous count, weighted
+by how much of the previous window still overlaps the sliding window, plus
+the current count stays within the limit. This is the limits library's
+"sliding window counter" strategy: no burst of twice the limit at window
+boundaries, at the cost of two integers per key.
+
+Counters live in one of:
+- memory: A dictionary in this process, for a single worker (the default)
+- shared-memory: A memory-mapped file (on /dev/shm where available) holding
+  a fixed-size hash table, shared by all workers on the host. A check and
+  increment is a few struct reads and writes under a file lock, with no
+  system call beyond the lock and no disk writes.
+- state: The state store (see utils.state_store), for workers on several
+  hosts sharing a Redis-protocol server. The store can wait on the database
+  or the network, so checks are answered from a local copy of the counters
+  and a background thread exchanges the hits with the store a few times a
+  second. The limiter calls the counters on the event loop, so they never
+  wait on the store there.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import Callable, Generator, Iterator
+from contextlib import contextmanager
+from math import floor
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+from loguru import logger
+
+if sys.platform != "win32":
+    import fcntl
+
+if TYPE_CHECKING:
+    from config.settings import Settings
+    from utils.state_store import StateStore
+
+SHARED_MEMORY_FILE_NAME: Final[str] = "tambourine_rate_limits"
+# 8 MiB: room for the limits of tens of thousands of client IPs per window
+SHARED_MEMORY_SLOT_COUNT: Final[int] = 1 << 18
+# Slots probed for a key before the oldest probed slot is reused
+SHARED_MEMORY_MAX_PROBES: Final[int] = 16
+SHARED_MEMORY_MAGIC: Final[bytes] = b"TBRLIM01"
+# How often state store counters exchange hits with the store
+STATE_SYNC_INTERVAL_SECS: Final[float] = 0.2
+# Expired in-process counters are dropped this often
+COUNTER_SWEEP_INTERVAL_SECS: Final[float] = 60.0
+
+# Header: magic, slot count
+_HEADER: Final[struct.Struct] = struct.Struct("<8sI4x")
+# Slot: key hash (0 if empty), window index, window length (secs), current count, previous count
+_SLOT: Final[struct.Struct] = struct.Struct("<QqIII4x")
+
+# Sliding window state: previous count, previous TTL, current count, current TTL
+SlidingWindow = tuple[int, float, int, float]
+
+
+def sliding_window_ttls(now: float, window_secs: int) -> tuple[float, float]:
+    """Get the TTLs of the previous and current windows, as the limits library defines them.
+
+    The previous window's TTL is how much of it still overlaps the sliding
+    window; the current window's counter is kept for two windows.
+    """
+    elapsed = now % window_secs
+    return window_secs - elapsed, 2 * window_secs - elapsed
+
+
+def is_within_limit(
+    previous_count: int, previous_ttl: float, current_count: int, limit: int, window_secs: int
+) -> bool:
+    """Check if a weighted sliding window count is within a limit."""
+    return floor(previous_count * previous_ttl / window_secs + current_count) <= limit
+
+
+class WindowCounters(ABC):
+    """Sliding-window rate-limit counters, keyed by the limits library's limit keys.
+
+    Checks run on the event loop, so they must not wait on I/O.
+    """
+
+    @abstractmethod
+    def acquire(self, key: str, limit: int, window_secs: int, amount: int = 1) -> bool:
+        """Count a hit if it keeps the sliding window within the limit.
+
+        Args:
+            key: The rate limit key (limit and client identifiers)
+            limit: Hits allowed per sliding window
+            window_secs: Length of the window
+            amount: Cost of the hit
+
+        Returns:
+            True if the hit was counted, False if it exceeds the limit
+        """
+
+    @abstractmethod
+    def get(self, key: str, window_secs: int) -> SlidingWindow:
+        """Get the previous and current window counts and TTLs of a key."""
+
+    @abstractmethod
+    def clear(self, key: str, window_secs: int) -> None:
+        """Reset a key's counters."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release resources held by the counters."""
+
+
+class MemoryWindowCounters(WindowCounters):
+    """Counters in this process, for a single worker."""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        """Initialize empty counters.
+
+        Args:
+            clock: Returns the current time in epoch seconds
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Key -> (window index of the current count, current count, previous count)
+        self._windows: dict[str, tuple[int, int, int]] = {}
+        self._next_sweep_at = clock() + COUNTER_SWEEP_INTERVAL_SECS
+
+    def acquire(self, key: str, limit: int, window_secs: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        now = self._clock()
+        window = int(now // window_secs)
+        previous_ttl, _ = sliding_window_ttls(now, window_secs)
+        with self._lock:
+            if now >= self._next_sweep_at:
+                self._sweep(window)
+                self._next_sweep_at = now + COUNTER_SWEEP_INTERVAL_SECS
+            previous_count, current_count = self._counts(key, window)
+            current_count += amount
+            if not is_within_limit(previous_count, previous_ttl, current_count, limit, window_secs):
+                return False
+            self._windows[key] = (window, current_count, previous_count)
+        return True
+
+    def get(self, key: str, window_secs: int) -> SlidingWindow:
+        now = self._clock()
+        with self._lock:
+            previous_count, current_count = self._counts(key, int(now // window_secs))
+        previous_ttl, current_ttl = sliding_window_ttls(now, window_secs)
+        return previous_count, previous_ttl if previous_count else 0.0, current_count, current_ttl
+
+    def clear(self, key: str, window_secs: int) -> None:
+        with self._lock:
+            self._windows.pop(key, None)
+
+    def close(self) -> None:
+        pass
+
+    def _counts(self, key: str, window: int) -> tuple[int, int]:
+        """Get a key's previous and current counts, as of a window."""
+        key_window, current_count, previous_count = self._windows.get(key, (window, 0, 0))
+        match window - key_window:
+            case 0:
+                return previous_count, current_count
+            case 1:
+                return current_count, 0
+            case _:
+                return 0, 0
+
+    def _sweep(self, window: int) -> None:
+        """Drop keys whose counts have expired."""
+        self._windows = {
+            key: counts for key, counts in self._windows.items() if window - counts[0] <= 1
+        }
+
+
+class StateStoreWindowCounters(WindowCounters):
+    """Counters kept in the state store, as one expiring counter per key and window.
+
+    Hits are checked against a local copy of each window's count: the total
+    last read from the store plus the hits counted here since. A background
+    thread adds those hits to the store and reads back the totals of the keys
+    checked since its last pass, so hits on other workers are seen within
+    about sync_interval_secs (until then, all workers together may overshoot
+    a limit by the hits they count in that time).
+    """
+
+    def __init__(
+        self, state_store: StateStore, sync_interval_secs: float = STATE_SYNC_INTERVAL_SECS
+    ) -> None:
+        """Initialize the counters (they start syncing with the store on first use).
+
+        Args:
+            state_store: The state store holding the counters
+            sync_interval_secs: Seconds between exchanges with the store
+        """
+        self._state_store = state_store
+        self._sync_interval_secs = sync_interval_secs
+        self._lock = threading.Lock()
+        # Window key -> (total last read from the store, time the window stops counting)
+        self._synced: dict[str, tuple[int, float]] = {}
+        # Window key -> (hits not yet added to the store, counter expiry)
+        self._unsynced: defaultdict[str, tuple[int, int]] = defaultdict(lambda: (0, 0))
+        # Window keys checked since the last sync (-> time the window stops
+        # counting), and keys cleared since then
+        self._checked: dict[str, float] = {}
+        self._cleared: set[str] = set()
+        self._stopped = threading.Event()
+        # Started on the first hit, so importing or forking never leaves a thread behind
+        self._sync_thread: threading.Thread | None = None
+
+    def acquire(self, key: str, limit: int, window_secs: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        window = int(now // window_secs)
+        previous_key, current_key = f"{key}/{window - 1}", f"{key}/{window}"
+        previous_ttl, _ = sliding_window_ttls(now, window_secs)
+        with self._lock:
+            if self._sync_thread is None:
+                self._sync_thread = threading.Thread(
+                    target=self._sync_periodically, name="rate-limit-sync", daemon=True
+                )
+                self._sync_thread.start()
+            self._checked[previous_key] = (window + 1) * window_secs
+            self._checked[current_key] = (window + 2) * window_secs
+            previous_count = self._local_count(previous_key)
+            current_count = self._local_count(current_key) + amount
+            if not is_within_limit(previous_count, previous_ttl, current_count, limit, window_secs):
+                return False
+            unsynced_count, _ = self._unsynced[current_key]
+            self._unsynced[current_key] = (unsynced_count + amount, 2 * window_secs)
+        return True
+
+    def get(self, key: str, window_secs: int) -> SlidingWindow:
+        now = time.time()
+        window = int(now // window_secs)
+        with self._lock:
+            previous_count = self._local_count(f"{key}/{window - 1}")
+            current_count = self._local_count(f"{key}/{window}")
+        previous_ttl, current_ttl = sliding_window_ttls(now, window_secs)
+        return previous_count, previous_ttl if previous_count else 0.0, current_count, current_ttl
+
+    def clear(self, key: str, window_secs: int) -> None:
+        window = int(time.time() // window_secs)
+        with self._lock:
+            for window_key in (f"{key}/{window - 1}", f"{key}/{window}"):
+                self._synced.pop(window_key, None)
+                self._unsynced.pop(window_key, None)
+                self._cleared.add(window_key)
+
+    def sync(self) -> None:
+        """Add the hits counted here to the store and read back the checked keys' totals."""
+        with self._lock:
+            unsynced, self._unsynced = self._unsynced, defaultdict(lambda: (0, 0))
+            checked, self._checked = self._checked, {}
+            cleared, self._cleared = self._cleared, set()
+        try:
+            for window_key in cleared:
+                self._state_store.clear_counter(window_key)
+            totals = {
+                window_key: self._state_store.increment_counter(window_key, expiry_secs, count)
+                for window_key, (count, expiry_secs) in unsynced.items()
+            }
+            for window_key in checked.keys() - totals.keys():
+                totals[window_key] = self._state_store.get_counter(window_key)
+        except Exception as e:
+            # Keep the hits for the next pass rather than losing them
+            logger.warning(f"Rate-limit counter sync failed: {e}")
+            with self._lock:
+                for window_key, (count, expiry_secs) in unsynced.items():
+                    unsynced_count, _ = self._unsynced[window_key]
+                    self._unsynced[window_key] = (unsynced_count + count, expiry_secs)
+                self._checked = checked | self._checked
+                self._cleared |= cleared
+            return
+        now = time.time()
+        with self._lock:
+            # Keys cleared during this pass start over
+            self._synced.update(
+                (window_key, (total, checked[window_key]))
+                for window_key, total in totals.items()
+                if window_key not in self._cleared
+            )
+            self._synced = {
+                window_key: synced for window_key, synced in self._synced.items() if synced[1] > now
+            }
+
+    def close(self) -> None:
+        # The state store is closed by its owner, after the last hits are synced
+        self._stopped.set()
+        if self._sync_thread is not None:
+            self._sync_thread.join()
+        self.sync()
+
+    def _local_count(self, window_key: str) -> int:
+        return self._synced.get(window_key, (0, 0.0))[0] + self._unsynced.get(window_key, (0, 0))[0]
+
+    def _sync_periodically(self) -> None:
+        while not self._stopped.wait(self._sync_interval_secs):
+            self.sync()
+
+
+class SharedMemoryWindowCounters(WindowCounters):
+    """Counters in a memory-mapped hash table shared by the workers on one host.
+
+    Each key has one fixed-size slot holding its current and previous window
+    counts, found by open addressing from a hash of the key. Slots whose
+    counts have expired are reused, so the table never needs cleaning. If
+    every probed slot is live (the table is nearly full), the one whose
+    window ended first is reused.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        slot_count: int = SHARED_MEMORY_SLOT_COUNT,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Open (or create) the shared counter table.
+
+        Args:
+            path: File backing the table; workers sharing counters use the same path
+            slot_count: Slots of a new table (an existing table keeps its size)
+            clock: Returns the current time in epoch seconds
+        """
+        self._clock = clock
+        self._thread_lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        with self._file_lock():
+            header = os.pread(self._fd, _HEADER.size, 0)
+            if len(header) == _HEADER.size and header.startswith(SHARED_MEMORY_MAGIC):
+                _, slot_count = _HEADER.unpack(header)
+            else:
+                os.ftruncate(self._fd, _HEADER.size + slot_count * _SLOT.size)
+                os.pwrite(self._fd, _HEADER.pack(SHARED_MEMORY_MAGIC, slot_count), 0)
+        self._slot_count = slot_count
+        self._map = mmap.mmap(self._fd, _HEADER.size + slot_count * _SLOT.size)
+        logger.info(f"Rate-limit counters: shared memory at {path} ({slot_count} slots)")
+
+    def acquire(self, key: str, limit: int, window_secs: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        now = self._clock()
+        window = int(now // window_secs)
+        previous_ttl, _ = sliding_window_ttls(now, window_secs)
+        key_hash = _hash_key(key)
+        with self._lock():
+            offset = self._find_slot(key_hash)
+            if offset is None:
+                offset = self._claim_slot(key_hash, now, window_secs)
+            previous_count, current_count = self._read_counts(offset, window)
+            current_count += amount
+            if not is_within_limit(previous_count, previous_ttl, current_count, limit, window_secs):
+                return False
+            _SLOT.pack_into(
+                self._map, offset, key_hash, window, window_secs, current_count, previous_count
+            )
+        return True
+
+    def get(self, key: str, window_secs: int) -> SlidingWindow:
+        now = self._clock()
+        window = int(now // window_secs)
+        previous_ttl, current_ttl = sliding_window_ttls(now, window_secs)
+        with self._lock():
+            offset = self._find_slot(_hash_key(key))
+            previous_count, current_count = (
+                self._read_counts(offset, window) if offset is not None else (0, 0)
+            )
+        return previous_count, previous_ttl if previous_count else 0.0, current_count, current_ttl
+
+    def clear(self, key: str, window_secs: int) -> None:
+        key_hash = _hash_key(key)
+        now = self._clock()
+        window = int(now // window_secs)
+        with self._lock():
+            offset = self._find_slot(key_hash)
+            if offset is not None:
+                _SLOT.pack_into(self._map, offset, key_hash, window, window_secs, 0, 0)
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+    def _probe_offsets(self, key_hash: int) -> Iterator[int]:
+        """Get the offsets of the slots a key may occupy, in probing order."""
+        for probe in range(SHARED_MEMORY_MAX_PROBES):
+            yield _HEADER.size + ((key_hash + probe) % self._slot_count) * _SLOT.size
+
+    def _find_slot(self, key_hash: int) -> int | None:
+        """Get the offset of a key's slot, or None if it has none."""
+        for offset in self._probe_offsets(key_hash):
+            slot_hash = _SLOT.unpack_from(self._map, offset)[0]
+            if slot_hash == key_hash:
+                return offset
+            if slot_hash == 0:
+                # Slots are never emptied, so the key is not further along
+                return None
+        return None
+
+    def _claim_slot(self, key_hash: int, now: float, window_secs: int) -> int:
+        """Claim a free or expired slot (or the oldest live one) for a key without one."""
+        oldest_offset, oldest_end = 0, float("inf")
+        for offset in self._probe_offsets(key_hash):
+            slot_hash, slot_window, slot_window_secs, _, _ = _SLOT.unpack_from(self._map, offset)
+            slot_end = (slot_window + 1) * slot_window_secs
+            # A slot's counts expire once its current window is no longer the previous one
+            if slot_hash == 0 or now >= slot_end + slot_window_secs:
+                break
+            if slot_end < oldest_end:
+                oldest_offset, oldest_end = offset, slot_end
+        else:
+            logger.warning("Shared rate-limit table is full; reusing a live slot")
+            offset = oldest_offset
+        _SLOT.pack_into(self._map, offset, key_hash, int(now // window_secs), window_secs, 0, 0)
+        return offset
+
+    def _read_counts(self, offset: int, window: int) -> tuple[int, int]:
+        """Get a slot's previous and current counts, as of a window."""
+        _, slot_window, _, current_count, previous_count = _SLOT.unpack_from(self._map, offset)
+        match window - slot_window:
+            case 0:
+                return previous_count, current_count
+            case 1:
+                return current_count, 0
+            case _:
+                return 0, 0
+
+    @contextmanager
+    def _lock(self) -> Generator[None]:
+        with self._thread_lock, self._file_lock():
+            yield
+
+    @contextmanager
+    def _file_lock(self) -> Generator[None]:
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+def _hash_key(key: str) -> int:
+    """Hash a key identically in every worker (0 marks an empty slot)."""
+    key_hash = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+    return key_hash or 1
+
+
+def default_shared_memory_path() -> str:
+    """Get the default file of the shared-memory counters (on tmpfs where available)."""
+    directory = Path("/dev/shm")
+    if not directory.is_dir():
+        directory = Path(tempfile.gettempdir())
+    return str(directory / SHARED_MEMORY_FILE_NAME)
+
+
+def create_window_counters(settings: Settings, state_store: StateStore) -> WindowCounters:
+    """Create the rate-limit counters selected by settings.
+
+    Shared memory needs POSIX file locks, so on Windows the counters are kept
+    in the state store instead.
+    """
+    match settings.rate_limit_backend:
+        case "memory":
+            return MemoryWindowCounters()
+        case "shared-memory" if sys.platform != "win32":
+            return SharedMemoryWindowCounters(
+                settings.rate_limit_shared_memory_path or default_shared_memory_path()
+            )
+        case _:
+            return StateStoreWindowCounters(state_store)
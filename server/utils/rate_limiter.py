@@ -2,17 +2,26 @@
 
 This module provides IP-based rate limiting to prevent API abuse.
 Each endpoint has configurable limits appropriate for its expected usage pattern.
+
+Limits use sliding windows, with counters shared by all workers (see
+utils.rate_limit_counters) rather than kept per process. slowapi checks them
+synchronously on the event loop, so the counters answer without waiting on
+I/O.
 """
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import sqlite3
+from typing import ClassVar
 
+from limits.storage import SlidingWindowCounterSupport, Storage
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from starlette.requests import Request
 
-if TYPE_CHECKING:
-    from starlette.requests import Request
+from utils.rate_limit_counters import MemoryWindowCounters, WindowCounters
+from utils.state_store import RedisProtocolError
+from utils.worker_routing import forwarded_client_ip
 
 
 def get_ip_only(request: Request) -> str:
@@ -24,16 +33,66 @@ def get_ip_only(request: Request) -> str:
     Returns:
         The client's IP address, or "unknown" if not available
     """
-    return get_remote_address(request) or "unknown"
+    return forwarded_client_ip(request) or get_remote_address(request) or "unknown"
+
+
+class SharedRateLimitStorage(Storage, SlidingWindowCounterSupport):
+    """Rate-limit storage (for the limits library) backed by shared window counters.
+
+    Only the sliding window counter strategy is supported. The limiter
+    creates its storage at import time, before settings are loaded, so the
+    counters are set afterwards with use_window_counters().
+    """
+
+    STORAGE_SCHEME = ["shared"]  # noqa: RUF012 - declared as a plain attribute by limits
+    counters: ClassVar[WindowCounters] = MemoryWindowCounters()
+
+    @property
+    def base_exceptions(self) -> tuple[type[Exception], ...]:
+        return (OSError, sqlite3.Error, RedisProtocolError)
+
+    def acquire_sliding_window_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        return self.counters.acquire(key, limit, expiry, amount)
+
+    def get_sliding_window(self, key: str, expiry: int) -> tuple[int, float, int, float]:
+        return self.counters.get(key, expiry)
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        self.counters.clear(key, expiry)
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        raise NotImplementedError("Shared rate-limit storage only supports sliding windows")
 
+    def get(self, key: str) -> int:
+        raise NotImplementedError("Shared rate-limit storage only supports sliding windows")
 
-# Create the limiter with in-memory storage
-# Using in-memory is fine for single-server deployments
-# For multi-server, would need Redis backend
+    def get_expiry(self, key: str) -> float:
+        raise NotImplementedError("Shared rate-limit storage only supports sliding windows")
+
+    def check(self) -> bool:
+        return True
+
+    def reset(self) -> int | None:
+        # Not supported across backends; counters expire on their own
+        return None
+
+    def clear(self, key: str) -> None:
+        raise NotImplementedError("Shared rate-limit storage only supports sliding windows")
+
+
+def use_window_counters(counters: WindowCounters) -> None:
+    """Keep rate-limit counters in shared window counters."""
+    SharedRateLimitStorage.counters = counters
+
+
+# Create the limiter with shared storage (in-process until use_window_counters() is called)
 limiter = Limiter(
     key_func=get_ip_only,
     default_limits=["100/minute"],  # Default fallback
-    storage_uri="memory://",
+    storage_uri="shared://",
+    strategy="sliding-window-counter",
 )
 
 
@@ -59,6 +118,15 @@ RATE_LIMIT_CONFIG = "200/minute"
 # Runtime config endpoints (prompts, stt-timeout): Allow frequent updates
 RATE_LIMIT_RUNTIME_CONFIG = "200/minute"
 
+# Reformat endpoint: Each request is an LLM call, so allow fewer than config updates
+RATE_LIMIT_REFORMAT = "60/minute"
+
+# Batch transcription: Each request is a whole STT and LLM job
+RATE_LIMIT_TRANSCRIBE = "30/minute"
+
+# Batch formatting: Each request may hold many transcripts
+RATE_LIMIT_FORMAT = "60/minute"
+
 # Providers endpoint: Allow frequent reads
 RATE_LIMIT_PROVIDERS = "200/minute"
 
@@ -0,0 +1,152 @@
+"""Readiness of a worker for new clients, for load balancers.
+
+/health only says the process is alive. /ready says whether to send it new
+clients, and how much more load it can take:
+- Not ready (503) while warming up: the VAD model, and the local Whisper and
+  Ollama models when enabled, load in the background after startup, so the
+  first clients sent here do not wait for them. A component that fails to
+  load does not hold readiness back; it loads on first use instead
+- Not ready (503) while draining: on SIGTERM the worker turns new offers away
+  for DRAIN_SECS before shutting down, so load balancers send clients
+  elsewhere first
+- Otherwise ready (200)
+
+Either way it reports the worker's load (active pipelines, LLM responses in
+flight, event-loop lag and CPU) and its capacity score, from 1 (idle) to 0
+(at an admission limit, see utils.admission_control), to weight it by.
+"""
+
+import signal
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import StrEnum
+from types import FrameType
+
+import uvicorn
+from loguru import logger
+
+
+class ReadinessState(StrEnum):
+    """Whether a worker takes new clients."""
+
+    WARMING_UP = "warming_up"
+    READY = "ready"
+    DRAINING = "draining"
+
+
+class WarmUpState(StrEnum):
+    """Warm-up progress of one component."""
+
+    WARMING = "warming"
+    WARM = "warm"
+    FAILED = "failed"  # Loads on first use instead; does not hold readiness back
+
+
+class WarmUp:
+    """Tracks the components loaded in the background after startup."""
+
+    def __init__(self, components: list[str]) -> None:
+        """Initialize with every component warming.
+
+        Args:
+            components: Names of the components to warm up (e.g., "vad")
+        """
+        self._states = dict.fromkeys(components, WarmUpState.WARMING)
+
+    @property
+    def is_warm(self) -> bool:
+        """Whether no component is still warming."""
+        return WarmUpState.WARMING not in self._states.values()
+
+    def mark_warm(self, component: str) -> None:
+        """Record that a component has loaded."""
+        self._states[component] = WarmUpState.WARM
+        logger.info(f"Warmed up {component}")
+
+    def mark_failed(self, component: str, error: Exception) -> None:
+        """Record that a component failed to load, so it loads on first use."""
+        self._states[component] = WarmUpState.FAILED
+        logger.warning(f"Could not warm up {component}: {error}")
+
+    def states(self) -> dict[str, WarmUpState]:
+        """Get each component's warm-up state."""
+        return dict(self._states)
+
+
+@dataclass(frozen=True)
+class ReadinessReport:
+    """A worker's readiness and load, as reported by /ready."""
+
+    state: ReadinessState
+    warm_up: dict[str, WarmUpState]
+    active_pipelines: int
+    in_flight_llm_calls: int
+    loop_lag_secs: float
+    cpu_percent: float
+    cpu_secs: float
+    capacity: float
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the worker takes new clients."""
+        return self.state == ReadinessState.READY
+
+    def to_dict(self) -> dict[str, object]:
+        """Convert to the /ready response body."""
+        return {
+            "status": self.state.value,
+            "warm_up": {component: state.value for component, state in self.warm_up.items()},
+            "active_pipelines": self.active_pipelines,
+            "in_flight_llm_calls": self.in_flight_llm_calls,
+            "loop_lag_ms": round(self.loop_lag_secs * 1000, 1),
+            "cpu_percent": round(self.cpu_percent, 1),
+            "cpu_secs": self.cpu_secs,
+            "capacity": round(self.capacity, 3),
+        }
+
+
+def readiness_state(warm_up: WarmUp, *, draining: bool) -> ReadinessState:
+    """Get whether a worker takes new clients."""
+    if draining:
+        return ReadinessState.DRAINING
+    if not warm_up.is_warm:
+        return ReadinessState.WARMING_UP
+    return ReadinessState.READY
+
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn server that drains for a while on SIGTERM before shutting down.
+
+    A second SIGTERM, or SIGINT, shuts down at once.
+    """
+
+    def __init__(
+        self, config: uvicorn.Config, *, drain_secs: float, on_drain: Callable[[], None]
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            config: uvicorn configuration
+            drain_secs: Seconds between the first SIGTERM and shutting down (0 for none)
+            on_drain: Called on the first SIGTERM to start turning new clients away
+        """
+        super().__init__(config)
+        self._drain_secs = drain_secs
+        self._on_drain = on_drain
+        self._drain_timer: threading.Timer | None = None
+
+    def handle_exit(self, sig: int, frame: FrameType | None) -> None:
+        """Start draining on the first SIGTERM, or shut down."""
+        if sig != signal.SIGTERM or self._drain_secs <= 0 or self._drain_timer is not None:
+            if self._drain_timer is not None:
+                self._drain_timer.cancel()
+            super().handle_exit(sig, frame)
+            return
+        logger.info(f"Draining for {self._drain_secs:g}s before shutting down")
+        self._on_drain()
+        self._drain_timer = threading.Timer(
+            self._drain_secs, super().handle_exit, args=(sig, frame)
+        )
+        self._drain_timer.daemon = True
+        self._drain_timer.start()
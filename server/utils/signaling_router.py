@@ -0,0 +1,437 @@
+"""Consistent-hash routing of client requests across server nodes.
+
+A client's pipeline lives in one server process, so its WebRTC offer, ICE
+candidate patches and config calls must all reach the same node. In the
+router role (python main.py --role router --backend URL ...), the server
+holds no pipelines and proxies each request to a backend node:
+- Requests for a client UUID (X-Client-UUID header, clientUUID of WebRTC
+  offers, client verification) go to the node the UUID hashes to
+- ICE candidate patches go to the node that answered the peer connection's
+  offer
+- Other requests (e.g., registration) go to the least loaded node
+
+Nodes are placed on a hash ring with virtual nodes, so a node joining or
+leaving only remaps the clients hashing to its own ring positions. The
+router polls each node's /ready (see utils.readiness) for its active pipeline
+count and gives busier nodes fewer virtual nodes, steering new clients to idle
+ones. A node that is warming up or draining answers but is not ready: it
+leaves the ring and gets no new clients, but keeps serving those pinned to it.
+
+Nodes see every request coming from the router, so the router sends the
+client's IP in X-Forwarded-For with the token configured on it and the nodes
+(PROXY_TOKEN); without it, nodes rate-limit all clients by the router's IP.
+
+Clients registered (or connected) through the router stay pinned to their
+node while it is healthy, so reweighting never moves an active client, and
+nodes need not share a state backend: a client reaching a node that does not
+know it (e.g., after a router restart) re-registers there.
+
+The router's own /ready is ready while any node is, so load balancers can
+health-check it, and on drain() (on SIGTERM, for the supervisor front end) it
+turns new WebRTC offers away and reports draining.
+
+The supervisor mode (python main.py --workers N, see utils.worker_supervisor)
+uses the same router in front of worker processes on one host, but places
+each new WebRTC offer on the least loaded worker instead of hashing.
+
+Try it locally with two servers and a router (all with the same PROXY_TOKEN):
+    python main.py --port 8766
+    python main.py --port 8767
+    python main.py --role router --backend http://127.0.0.1:8766 --backend http://127.0.0.1:8767
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import contextlib
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Final
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from loguru import logger
+from starlette.responses import JSONResponse, Response
+
+from utils.readiness import ReadinessState
+from utils.worker_routing import PROXIED_HEADER, proxy_request, read_signaling_keys
+
+# Virtual nodes of an idle node; a node with LOAD_HALVING_PIPELINES active
+# pipelines gets half as many
+VIRTUAL_NODES_PER_NODE: Final[int] = 100
+MIN_VIRTUAL_NODES: Final[int] = 10
+LOAD_HALVING_PIPELINES: Final[int] = 20
+HEALTH_TIMEOUT_SECS: Final[float] = 2.0
+PROXY_TIMEOUT_SECS: Final[float] = 300.0
+# Most client UUIDs and peer connections pinned to their node
+PINNED_CACHE_SIZE: Final[int] = 100_000
+# Retry-After of new offers turned away while draining
+DRAINING_RETRY_AFTER_SECS: Final[int] = 5
+
+
+def ring_hash(key: str) -> int:
+    """Hash a key to a ring position (identically in every router)."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+def virtual_node_count(active_pipelines: int) -> int:
+    """Get the virtual nodes of a node with some active pipelines."""
+    return max(
+        MIN_VIRTUAL_NODES,
+        round(VIRTUAL_NODES_PER_NODE / (1 + active_pipelines / LOAD_HALVING_PIPELINES)),
+    )
+
+
+class HashRing:
+    """Consistent hash ring of nodes, weighted by their virtual node counts.
+
+    A node's virtual nodes sit at fixed positions (the hashes of the node and
+    index), so lowering its count only frees its highest-index positions.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty ring."""
+        self._virtual_node_counts: dict[str, int] = {}
+        self._positions: list[int] = []
+        self._owners: list[str] = []
+
+    @property
+    def nodes(self) -> list[str]:
+        """Get the nodes on the ring."""
+        return list(self._virtual_node_counts)
+
+    def set_node(self, node: str, virtual_nodes: int) -> None:
+        """Add a node to the ring, or change its virtual node count."""
+        if self._virtual_node_counts.get(node) != virtual_nodes:
+            self._virtual_node_counts[node] = virtual_nodes
+            self._rebuild()
+
+    def remove_node(self, node: str) -> None:
+        """Remove a node from the ring (if on it)."""
+        if self._virtual_node_counts.pop(node, None) is not None:
+            self._rebuild()
+
+    def get_node(self, key: str) -> str | None:
+        """Get the node a key maps to, or None if the ring is empty."""
+        if not self._positions:
+            return None
+        index = bisect.bisect(self._positions, ring_hash(key)) % len(self._positions)
+        return self._owners[index]
+
+    def _rebuild(self) -> None:
+        points = sorted(
+            (ring_hash(f"{node}#{index}"), node)
+            for node, count in self._virtual_node_counts.items()
+            for index in range(count)
+        )
+        self._positions = [position for position, _ in points]
+        self._owners = [node for _, node in points]
+
+
+@dataclass
+class BackendNode:
+    """A backend server node and its last reported health and load."""
+
+    url: str
+    healthy: bool = False
+    # Whether the node takes new clients (not warming up or draining)
+    ready: bool = False
+    active_pipelines: int = 0
+    # Share of one core the node's process used since the previous poll
+    cpu_percent: float = 0.0
+    # Process CPU time and wall time of the previous poll
+    cpu_secs: float | None = None
+    polled_at: float = 0.0
+
+
+class SignalingRouter:
+    """Routes client requests to backend nodes and proxies them there."""
+
+    def __init__(
+        self,
+        backend_urls: list[str],
+        health_interval_secs: float,
+        *,
+        place_offers_by_load: bool = False,
+        proxy_token: str | None = None,
+    ) -> None:
+        """Initialize the router.
+
+        Args:
+            backend_urls: Base URLs of the backend nodes
+            health_interval_secs: How often to poll the nodes' health and load
+            place_offers_by_load: Send new WebRTC offers to the least loaded node
+                rather than the client's node (for workers sharing a state store)
+            proxy_token: Token the nodes trust the client IP of proxied requests with
+        """
+        self._nodes = {url.rstrip("/"): BackendNode(url.rstrip("/")) for url in backend_urls}
+        self._health_interval_secs = health_interval_secs
+        self._place_offers_by_load = place_offers_by_load
+        self._proxy_headers = {PROXIED_HEADER: proxy_token} if proxy_token else {}
+        self._ring = HashRing()
+        self._pinned_clients: OrderedDict[str, str] = OrderedDict()
+        self._pinned_peer_connections: OrderedDict[str, str] = OrderedDict()
+        self._client = httpx.AsyncClient(timeout=PROXY_TIMEOUT_SECS)
+        self._health_task: asyncio.Task[None] | None = None
+        self._draining = False
+
+    @property
+    def nodes(self) -> list[BackendNode]:
+        """Get the backend nodes."""
+        return list(self._nodes.values())
+
+    @property
+    def draining(self) -> bool:
+        """Whether new WebRTC offers are turned away ahead of shutdown."""
+        return self._draining
+
+    def drain(self) -> None:
+        """Turn new WebRTC offers away from now on, ahead of shutdown."""
+        if not self._draining:
+            self._draining = True
+            logger.info("Draining: turning new WebRTC offers away")
+
+    def readiness_state(self) -> ReadinessState:
+        """Get whether the router takes new clients: not draining, with a ready node."""
+        if self._draining:
+            return ReadinessState.DRAINING
+        if not any(node.ready for node in self._nodes.values()):
+            return ReadinessState.WARMING_UP
+        return ReadinessState.READY
+
+    async def start(self) -> None:
+        """Poll the nodes once, then keep polling them in the background."""
+        await self.refresh_nodes()
+        self._health_task = asyncio.create_task(self._poll_nodes())
+
+    async def stop(self) -> None:
+        """Stop polling and close the HTTP client."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._health_task
+        await self._client.aclose()
+
+    async def refresh_nodes(self) -> None:
+        """Poll every node's health and load, and reweight the ring."""
+        await asyncio.gather(*(self._refresh_node(node) for node in self._nodes.values()))
+
+    def route_client(self, client_uuid: str) -> str | None:
+        """Get the node for a client: its pinned node if healthy, else its ring node."""
+        pinned_url = self._pinned_clients.get(client_uuid)
+        if pinned_url is not None and self._nodes[pinned_url].healthy:
+            return pinned_url
+        return self._ring.get_node(client_uuid)
+
+    def route_peer_connection(self, pc_id: str) -> str | None:
+        """Get the node hosting a peer connection, or None if unknown."""
+        return self._pinned_peer_connections.get(pc_id)
+
+    def least_loaded_node(self) -> str | None:
+        """Get the ready node with the fewest active pipelines."""
+        ready_nodes = [node for node in self._nodes.values() if node.ready]
+        if not ready_nodes:
+            return None
+        return min(ready_nodes, key=lambda node: node.active_pipelines).url
+
+    async def handle(self, request: Request) -> Response:
+        """Route a request to a node and relay the node's response."""
+        client_uuid, pc_id = await read_signaling_keys(request)
+        path = request.url.path
+        if client_uuid is None and path.startswith("/api/client/verify/"):
+            client_uuid = path.removeprefix("/api/client/verify/")
+
+        is_new_offer = path == "/api/offer" and request.method == "POST"
+        if is_new_offer and self._draining:
+            return JSONResponse(
+                status_code=503,
+                content={"error": "Server is shutting down", "code": "DRAINING"},
+                headers={"Retry-After": str(DRAINING_RETRY_AFTER_SECS)},
+            )
+        if is_new_offer and self._place_offers_by_load:
+            node_url = self.least_loaded_node()
+        elif client_uuid:
+            node_url = self.route_client(client_uuid)
+        elif pc_id:
+            node_url = self.route_peer_connection(pc_id)
+            if node_url is None:
+                return JSONResponse(
+                    status_code=404, content={"detail": "Peer connection not found"}
+                )
+        else:
+            node_url = self.least_loaded_node()
+        if node_url is None:
+            return JSONResponse(
+                status_code=503,
+                content={"error": "No backend node available", "code": "NO_BACKEND_AVAILABLE"},
+            )
+
+        response = await proxy_request(
+            self._client, request, node_url, extra_headers=self._proxy_headers
+        )
+        if response is None:
+            self._set_unhealthy(self._nodes[node_url])
+            return JSONResponse(
+                status_code=502,
+                content={"error": "Backend node unreachable", "code": "BACKEND_UNREACHABLE"},
+            )
+        if response.status_code == 200:
+            self._pin_from_response(request, response, node_url, client_uuid)
+            if is_new_offer:
+                # Counted until the next poll, so bursts of offers spread out
+                self._nodes[node_url].active_pipelines += 1
+        return response
+
+    def _pin_from_response(
+        self, request: Request, response: Response, node_url: str, client_uuid: str | None
+    ) -> None:
+        """Pin new clients and peer connections to the node that answered for them."""
+        path, method = request.url.path, request.method
+        if (path, method) not in {("/api/client/register", "POST"), ("/api/offer", "POST")}:
+            return
+        try:
+            body = json.loads(bytes(response.body))
+        except ValueError:
+            return
+        if not isinstance(body, dict):
+            return
+        if path == "/api/client/register" and isinstance(body.get("uuid"), str):
+            _pin(self._pinned_clients, body["uuid"], node_url)
+        elif path == "/api/offer":
+            if client_uuid:
+                _pin(self._pinned_clients, client_uuid, node_url)
+            if isinstance(body.get("pc_id"), str):
+                _pin(self._pinned_peer_connections, body["pc_id"], node_url)
+
+    async def _poll_nodes(self) -> None:
+        while True:
+            await asyncio.sleep(self._health_interval_secs)
+            await self.refresh_nodes()
+
+    async def _refresh_node(self, node: BackendNode) -> None:
+        try:
+            response = await self._client.get(f"{node.url}/ready", timeout=HEALTH_TIMEOUT_SECS)
+            # Not ready (warming up or draining) is still healthy
+            if response.status_code != 503:
+                response.raise_for_status()
+            health = response.json()
+        except (httpx.HTTPError, ValueError) as error:
+            if node.healthy:
+                logger.warning(f"Backend node {node.url} left the ring: {error}")
+            self._set_unhealthy(node)
+            return
+
+        is_ready = response.status_code == 200
+        if is_ready and not node.ready:
+            logger.info(f"Backend node {node.url} joined the ring")
+        elif not is_ready and node.ready:
+            logger.info(f"Backend node {node.url} left the ring: {health.get('status')}")
+        node.healthy, node.ready = True, is_ready
+        node.active_pipelines = int(health.get("active_pipelines", 0))
+        now, cpu_secs = time.monotonic(), health.get("cpu_secs")
+        if isinstance(cpu_secs, int | float):
+            if node.cpu_secs is not None and now > node.polled_at:
+                node.cpu_percent = max(0.0, (cpu_secs - node.cpu_secs) / (now - node.polled_at))
+                node.cpu_percent *= 100
+            node.cpu_secs, node.polled_at = float(cpu_secs), now
+        if is_ready:
+            self._ring.set_node(node.url, virtual_node_count(node.active_pipelines))
+        else:
+            self._ring.remove_node(node.url)
+
+    def _set_unhealthy(self, node: BackendNode) -> None:
+        node.healthy = node.ready = False
+        self._ring.remove_node(node.url)
+
+
+def _pin(pins: OrderedDict[str, str], key: str, node_url: str) -> None:
+    pins[key] = node_url
+    pins.move_to_end(key)
+    if len(pins) > PINNED_CACHE_SIZE:
+        pins.popitem(last=False)
+
+
+def create_router_app(
+    backend_urls: list[str],
+    health_interval_secs: float,
+    *,
+    place_offers_by_load: bool = False,
+    proxy_token: str | None = None,
+) -> FastAPI:
+    """Create the app of the router role, proxying every request to a backend node.
+
+    Args:
+        backend_urls: Base URLs of the backend nodes
+        health_interval_secs: How often to poll the nodes' health and load
+        place_offers_by_load: Send new WebRTC offers to the least loaded node
+        proxy_token: Token the nodes trust the client IP of proxied requests with
+    """
+    router = SignalingRouter(
+        backend_urls,
+        health_interval_secs,
+        place_offers_by_load=place_offers_by_load,
+        proxy_token=proxy_token,
+    )
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
+        await router.start()
+        yield
+        await router.stop()
+
+    app = FastAPI(title="Tambourine Router", lifespan=lifespan)
+    app.state.router = router
+    app.add_middleware(
+        CORSMiddleware,  # type: ignore[invalid-argument-type]
+        allow_origins=["*"],
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    @app.get("/health")
+    async def health_check() -> JSONResponse:
+        """Health check of the router (healthy while any node is), with each node's load."""
+        is_healthy = any(node.healthy for node in router.nodes)
+        return JSONResponse(
+            status_code=200 if is_healthy else 503,
+            content={
+                "status": "ok" if is_healthy else "unavailable",
+                "nodes": [
+                    {
+                        "url": node.url,
+                        "healthy": node.healthy,
+                        "ready": node.ready,
+                        "active_pipelines": node.active_pipelines,
+                        "cpu_percent": round(node.cpu_percent, 1),
+                    }
+                    for node in router.nodes
+                ],
+            },
+        )
+
+    @app.get("/ready")
+    async def readiness_check() -> JSONResponse:
+        """Readiness for load balancers: 200 while any node is ready and not draining."""
+        state = router.readiness_state()
+        return JSONResponse(
+            status_code=200 if state == ReadinessState.READY else 503,
+            content={
+                "status": state.value,
+                "ready_nodes": sum(node.ready for node in router.nodes),
+                "active_pipelines": sum(node.active_pipelines for node in router.nodes),
+            },
+        )
+
+    @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"])
+    async def route_to_node(request: Request) -> Response:
+        """Proxy a request to the backend node routed to."""
+        return await router.handle(request)
+
+    return app
@@ -0,0 +1,112 @@
+"""Startup profiling: per-module import times and time to ready.
+
+A cold start (a container scaling out, a worker restarting after a crash)
+pays for starting Python, importing the server's modules and initializing its
+services before the first client can connect. python main.py
+--profile-startup measures each and exits without serving. Imports are timed
+in a fresh interpreter with python -X importtime, as the profiling process
+has imported them already; services are initialized in the profiling process.
+"""
+
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# python -X importtime writes one line per module to stderr:
+# "import time: <self us> | <cumulative us> | <indentation><module>"
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| *(\S+)$")
+
+MICROSECONDS_PER_SECOND = 1_000_000
+
+
+@dataclass(frozen=True)
+class ModuleImportTime:
+    """How long importing one module took.
+
+    Attributes:
+        module: Module name
+        self_secs: Time spent in the module itself, excluding the modules it imported
+        cumulative_secs: Time including the modules it imported first
+    """
+
+    module: str
+    self_secs: float
+    cumulative_secs: float
+
+
+@dataclass
+class StartupProfile:
+    """Where a cold start's time goes, phase by phase.
+
+    Attributes:
+        module_import_times: Import time of every module, in import order
+        phase_secs: Wall-clock seconds of each startup phase, in order
+    """
+
+    module_import_times: list[ModuleImportTime] = field(default_factory=list)
+    phase_secs: dict[str, float] = field(default_factory=dict)
+
+    def format_report(self, top: int = 20) -> str:
+        """Format the slowest modules and packages to import and the time to ready."""
+        package_secs: defaultdict[str, float] = defaultdict(float)
+        for import_time in self.module_import_times:
+            package_secs[import_time.module.partition(".")[0]] += import_time.self_secs
+
+        lines = [f"Slowest packages to import (of {len(package_secs)}):"]
+        lines += [
+            f"  {secs * 1000:>8.1f} ms  {package}"
+            for package, secs in sorted(package_secs.items(), key=lambda item: -item[1])[:top]
+        ]
+        lines.append(f"Slowest modules to import (of {len(self.module_import_times)}, self time):")
+        lines += [
+            f"  {import_time.self_secs * 1000:>8.1f} ms  {import_time.module}"
+            for import_time in sorted(self.module_import_times, key=lambda item: -item.self_secs)[
+                :top
+            ]
+        ]
+        lines.append("Time to ready:")
+        lines += [f"  {secs * 1000:>8.1f} ms  {phase}" for phase, secs in self.phase_secs.items()]
+        lines.append(f"  {sum(self.phase_secs.values()) * 1000:>8.1f} ms  total")
+        return "\n".join(lines)
+
+
+def time_imports(code: str, cwd: Path) -> tuple[float, list[ModuleImportTime]]:
+    """Run Python code in a fresh interpreter, timing each module it imports.
+
+    Args:
+        code: Statements to run (e.g., "import main")
+        cwd: Directory to run them in
+
+    Returns:
+        Wall-clock seconds for the interpreter to start and run the code, and the
+        import time of every module it imported
+
+    Raises:
+        RuntimeError: If the code fails
+    """
+    started_at = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    elapsed_secs = time.perf_counter() - started_at
+    if result.returncode != 0:
+        raise RuntimeError(f"Timing imports failed:\n{result.stderr[-2000:]}")
+
+    module_import_times = [
+        ModuleImportTime(
+            module=match.group(3),
+            self_secs=int(match.group(1)) / MICROSECONDS_PER_SECOND,
+            cumulative_secs=int(match.group(2)) / MICROSECONDS_PER_SECOND,
+        )
+        for line in result.stderr.splitlines()
+        if (match := IMPORT_TIME_LINE.match(line))
+    ]
+    return elapsed_secs, module_import_times
@@ -0,0 +1,587 @@
+"""Pluggable state backends shared by server workers.
+
+Client registrations and preferences, connection ownership and rate-limit
+counters are kept in a StateStore, so several server processes (workers)
+can serve the same clients:
+- memory: In-process state (single worker, lost on restart; the default)
+- sqlite: A SQLite database in WAL mode, shared by workers on one host (the
+  default with WORKER_URL or --workers)
+- redis: A Redis-protocol server (Redis, Valkey, KeyDB, ...), shared by
+  workers on any host
+
+Connection ownership maps a client UUID (or WebRTC peer connection ID) to the
+URL of the worker hosting its pipeline, so requests reaching another worker
+can be forwarded there. The store is synchronous, but the SQLite and Redis
+backends can wait on a busy database or the network, so the lookups made on
+every request (connection owners, rate-limit counters) are run in a worker
+thread by their callers.
+"""
+
+from __future__ import annotations
+
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from io import BufferedReader
+from typing import TYPE_CHECKING, Final
+from urllib.parse import urlparse
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from config.settings import Settings
+
+REDIS_KEY_PREFIX: Final[str] = "tambourine:"
+REDIS_SOCKET_TIMEOUT_SECS: Final[float] = 5.0
+SQLITE_BUSY_TIMEOUT_MS: Final[int] = 5000
+# Expired rate-limit counters are deleted this often (Redis expires them itself)
+COUNTER_SWEEP_INTERVAL_SECS: Final[float] = 60.0
+
+
+class StateStore(ABC):
+    """Shared state of client registrations, connection owners and rate-limit counters."""
+
+    # Client registrations
+
+    @abstractmethod
+    def add_registered_uuid(self, client_uuid: str, seen_at: float) -> None:
+        """Register a client UUID, last seen at seen_at (epoch seconds)."""
+
+    @abstractmethod
+    def get_registered_uuid_last_seen(self, client_uuid: str) -> float | None:
+        """Get when a client UUID was last seen, or None if it is not registered."""
+
+    @abstractmethod
+    def touch_registered_uuid(self, client_uuid: str, seen_at: float) -> bool:
+        """Update when a registered client UUID was last seen.
+
+        Returns:
+            False if the UUID is not (or no longer) registered
+        """
+
+    @abstractmethod
+    def evict_registered_uuids(self, seen_before: float) -> int:
+        """Unregister client UUIDs last seen before a time.
+
+        Returns:
+            The number of UUIDs unregistered
+        """
+
+    @abstractmethod
+    def registered_uuid_count(self) -> int:
+        """Get the number of registered client UUIDs."""
+
+    # Client preferences
+
+    @abstractmethod
+    def set_formatting_cache_opt_out(self, client_uuid: str, opted_out: bool) -> None:
+        """Record whether a client has opted out of the formatting result cache."""
+
+    @abstractmethod
+    def is_formatting_cache_opted_out(self, client_uuid: str) -> bool:
+        """Check whether a client has opted out of the formatting result cache."""
+
+    # Connection ownership
+
+    @abstractmethod
+    def set_owner(self, key: str, owner: str) -> None:
+        """Record the worker owning a connection (replacing any previous owner)."""
+
+    @abstractmethod
+    def get_owner(self, key: str) -> str | None:
+        """Get the worker owning a connection, or None if none does."""
+
+    @abstractmethod
+    def release_owner(self, key: str, owner: str) -> None:
+        """Forget a connection's owner, unless another worker has taken it over."""
+
+    # Rate-limit counters (fixed windows)
+
+    @abstractmethod
+    def increment_counter(self, key: str, expiry_secs: int, amount: int = 1) -> int:
+        """Increment a counter, starting a new window of expiry_secs if it expired.
+
+        Returns:
+            The counter's value after the increment
+        """
+
+    @abstractmethod
+    def get_counter(self, key: str) -> int:
+        """Get a counter's value in its current window (0 if expired)."""
+
+    @abstractmethod
+    def get_counter_expiry(self, key: str) -> float:
+        """Get the time (epoch seconds) a counter's window ends (now if expired)."""
+
+    @abstractmethod
+    def clear_counter(self, key: str) -> None:
+        """Reset a counter."""
+
+    # Shared values
+
+    @abstractmethod
+    def ensure_shared_value(self, key: str, value: str) -> str:
+        """Store a value unless one is already stored under the key.
+
+        Returns:
+            The stored value (the given one, or the one stored first)
+        """
+
+    def close(self) -> None:  # noqa: B027 - optional hook, nothing to close by default
+        """Release the backend's connections."""
+
+
+# =============================================================================
+# In-memory backend
+# =============================================================================
+
+
+class MemoryStateStore(StateStore):
+    """In-process state, for a single worker."""
+
+    def __init__(self) -> None:
+        """Initialize empty state."""
+        self._registered_uuids: dict[str, float] = {}
+        self._formatting_cache_opt_outs: set[str] = set()
+        self._owners: dict[str, str] = {}
+        self._shared_values: dict[str, str] = {}
+        self._counters: dict[str, tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self._next_sweep_at = time.time() + COUNTER_SWEEP_INTERVAL_SECS
+
+    def add_registered_uuid(self, client_uuid: str, seen_at: float) -> None:
+        self._registered_uuids[client_uuid] = seen_at
+
+    def get_registered_uuid_last_seen(self, client_uuid: str) -> float | None:
+        return self._registered_uuids.get(client_uuid)
+
+    def touch_registered_uuid(self, client_uuid: str, seen_at: float) -> bool:
+        if client_uuid not in self._registered_uuids:
+            return False
+        self._registered_uuids[client_uuid] = seen_at
+        return True
+
+    def evict_registered_uuids(self, seen_before: float) -> int:
+        with self._lock:
+            count = len(self._registered_uuids)
+            self._registered_uuids = {
+                client_uuid: seen_at
+                for client_uuid, seen_at in self._registered_uuids.items()
+                if seen_at >= seen_before
+            }
+            return count - len(self._registered_uuids)
+
+    def registered_uuid_count(self) -> int:
+        return len(self._registered_uuids)
+
+    def set_formatting_cache_opt_out(self, client_uuid: str, opted_out: bool) -> None:
+        if opted_out:
+            self._formatting_cache_opt_outs.add(client_uuid)
+        else:
+            self._formatting_cache_opt_outs.discard(client_uuid)
+
+    def is_formatting_cache_opted_out(self, client_uuid: str) -> bool:
+        return client_uuid in self._formatting_cache_opt_outs
+
+    def set_owner(self, key: str, owner: str) -> None:
+        self._owners[key] = owner
+
+    def get_owner(self, key: str) -> str | None:
+        return self._owners.get(key)
+
+    def release_owner(self, key: str, owner: str) -> None:
+        if self._owners.get(key) == owner:
+            del self._owners[key]
+
+    def increment_counter(self, key: str, expiry_secs: int, amount: int = 1) -> int:
+        now = time.time()
+        with self._lock:
+            if now >= self._next_sweep_at:
+                self._counters = {k: v for k, v in self._counters.items() if v[1] > now}
+                self._next_sweep_at = now + COUNTER_SWEEP_INTERVAL_SECS
+            count, expires_at = self._counters.get(key, (0, now))
+            if expires_at <= now:
+                count, expires_at = 0, now + expiry_secs
+            self._counters[key] = (count + amount, expires_at)
+            return count + amount
+
+    def get_counter(self, key: str) -> int:
+        count, expires_at = self._counters.get(key, (0, 0.0))
+        return count if expires_at > time.time() else 0
+
+    def get_counter_expiry(self, key: str) -> float:
+        return max(self._counters.get(key, (0, 0.0))[1], time.time())
+
+    def clear_counter(self, key: str) -> None:
+        self._counters.pop(key, None)
+
+    def ensure_shared_value(self, key: str, value: str) -> str:
+        return self._shared_values.setdefault(key, value)
+
+
+# =============================================================================
+# SQLite backend
+# =============================================================================
+
+
+class SqliteStateStore(StateStore):
+    """State in a SQLite database (WAL mode), shared by workers on one host."""
+
+    def __init__(self, path: str) -> None:
+        """Open (and create if needed) the database.
+
+        Args:
+            path: Path of the database file
+        """
+        self._connection = sqlite3.connect(
+            path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000, check_same_thread=False, autocommit=True
+        )
+        self._lock = threading.Lock()
+        self._next_sweep_at = time.time() + COUNTER_SWEEP_INTERVAL_SECS
+        with self._lock:
+            # WAL lets workers read while another writes; NORMAL sync is durable across crashes
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS registered_uuids (
+                    client_uuid TEXT PRIMARY KEY,
+                    last_seen REAL NOT NULL
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS registered_uuids_last_seen
+                    ON registered_uuids (last_seen);
+                CREATE TABLE IF NOT EXISTS formatting_cache_opt_outs (
+                    client_uuid TEXT PRIMARY KEY
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS owners (
+                    key TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS counters (
+                    key TEXT PRIMARY KEY,
+                    count INTEGER NOT NULL,
+                    expires_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS shared_values (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                """
+            )
+        logger.info(f"State store: SQLite database at {path}")
+
+    def _execute(self, sql: str, parameters: tuple[object, ...] = ()) -> list[tuple]:
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def add_registered_uuid(self, client_uuid: str, seen_at: float) -> None:
+        self._execute(
+            "INSERT OR REPLACE INTO registered_uuids VALUES (?, ?)", (client_uuid, seen_at)
+        )
+
+    def get_registered_uuid_last_seen(self, client_uuid: str) -> float | None:
+        rows = self._execute(
+            "SELECT last_seen FROM registered_uuids WHERE client_uuid = ?", (client_uuid,)
+        )
+        return rows[0][0] if rows else None
+
+    def touch_registered_uuid(self, client_uuid: str, seen_at: float) -> bool:
+        rows = self._execute(
+            "UPDATE registered_uuids SET last_seen = max(last_seen, ?) WHERE client_uuid = ? "
+            "RETURNING 1",
+            (seen_at, client_uuid),
+        )
+        return bool(rows)
+
+    def evict_registered_uuids(self, seen_before: float) -> int:
+        return len(
+            self._execute(
+                "DELETE FROM registered_uuids WHERE last_seen < ? RETURNING 1", (seen_before,)
+            )
+        )
+
+    def registered_uuid_count(self) -> int:
+        return self._execute("SELECT COUNT(*) FROM registered_uuids")[0][0]
+
+    def set_formatting_cache_opt_out(self, client_uuid: str, opted_out: bool) -> None:
+        if opted_out:
+            self._execute(
+                "INSERT OR IGNORE INTO formatting_cache_opt_outs VALUES (?)", (client_uuid,)
+            )
+        else:
+            self._execute(
+                "DELETE FROM formatting_cache_opt_outs WHERE client_uuid = ?", (client_uuid,)
+            )
+
+    def is_formatting_cache_opted_out(self, client_uuid: str) -> bool:
+        rows = self._execute(
+            "SELECT 1 FROM formatting_cache_opt_outs WHERE client_uuid = ?", (client_uuid,)
+        )
+        return bool(rows)
+
+    def set_owner(self, key: str, owner: str) -> None:
+        self._execute("INSERT OR REPLACE INTO owners VALUES (?, ?)", (key, owner))
+
+    def get_owner(self, key: str) -> str | None:
+        rows = self._execute("SELECT owner FROM owners WHERE key = ?", (key,))
+        return rows[0][0] if rows else None
+
+    def release_owner(self, key: str, owner: str) -> None:
+        self._execute("DELETE FROM owners WHERE key = ? AND owner = ?", (key, owner))
+
+    def increment_counter(self, key: str, expiry_secs: int, amount: int = 1) -> int:
+        now = time.time()
+        if now >= self._next_sweep_at:
+            self._next_sweep_at = now + COUNTER_SWEEP_INTERVAL_SECS
+            self._execute("DELETE FROM counters WHERE expires_at <= ?", (now,))
+        rows = self._execute(
+            """
+            INSERT INTO counters VALUES (?1, ?2, ?3) ON CONFLICT (key) DO UPDATE SET
+                count = CASE WHEN expires_at <= ?4 THEN ?2 ELSE count + ?2 END,
+                expires_at = CASE WHEN expires_at <= ?4 THEN ?3 ELSE expires_at END
+            RETURNING count
+            """,
+            (key, amount, now + expiry_secs, now),
+        )
+        return rows[0][0]
+
+    def get_counter(self, key: str) -> int:
+        rows = self._execute(
+            "SELECT count FROM counters WHERE key = ? AND expires_at > ?", (key, time.time())
+        )
+        return rows[0][0] if rows else 0
+
+    def get_counter_expiry(self, key: str) -> float:
+        rows = self._execute("SELECT expires_at FROM counters WHERE key = ?", (key,))
+        return max(rows[0][0], time.time()) if rows else time.time()
+
+    def clear_counter(self, key: str) -> None:
+        self._execute("DELETE FROM counters WHERE key = ?", (key,))
+
+    def ensure_shared_value(self, key: str, value: str) -> str:
+        self._execute("INSERT OR IGNORE INTO shared_values VALUES (?, ?)", (key, value))
+        return self._execute("SELECT value FROM shared_values WHERE key = ?", (key,))[0][0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+# =============================================================================
+# Redis-protocol backend
+# =============================================================================
+
+
+class RedisProtocolError(Exception):
+    """Error reply from a Redis-protocol server."""
+
+
+class _RespConnection:
+    """Minimal blocking client of the Redis serialization protocol (RESP2).
+
+    Only plain commands are needed, so this avoids a Redis client dependency.
+    """
+
+    def __init__(self, url: str) -> None:
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported Redis URL (expected redis://): {url}")
+        self._address = (parsed.hostname or "localhost", parsed.port or 6379)
+        self._password = parsed.password
+        self._database = int(parsed.path.lstrip("/") or 0)
+        self._socket: socket.socket | None = None
+        self._reader: BufferedReader | None = None
+        self._lock = threading.Lock()
+
+    def command(self, *args: str | float) -> object:
+        """Send a command and return its reply (reconnecting once if the connection dropped)."""
+        with self._lock:
+            try:
+                return self._send(args)
+            except (ConnectionError, TimeoutError):
+                self._disconnect()
+                return self._send(args)
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+
+    def _send(self, args: tuple[str | float, ...]) -> object:
+        if self._socket is None:
+            self._connect()
+        assert self._socket is not None
+        self._socket.sendall(self._encode(args))
+        return self._read_reply()
+
+    def _connect(self) -> None:
+        self._socket = socket.create_connection(self._address, timeout=REDIS_SOCKET_TIMEOUT_SECS)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._socket.makefile("rb")
+        if self._password:
+            self._socket.sendall(self._encode(("AUTH", self._password)))
+            self._read_reply()
+        if self._database:
+            self._socket.sendall(self._encode(("SELECT", self._database)))
+            self._read_reply()
+
+    def _disconnect(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+        if self._socket is not None:
+            self._socket.close()
+        self._socket = None
+        self._reader = None
+
+    @staticmethod
+    def _encode(args: tuple[str | float, ...]) -> bytes:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    def _read_line(self) -> bytes:
+        assert self._reader is not None
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Redis connection closed")
+        return line[:-2]
+
+    def _read_exact(self, size: int) -> bytes:
+        assert self._reader is not None
+        data = self._reader.read(size)
+        if len(data) < size:
+            raise ConnectionError("Redis connection closed")
+        return data
+
+    def _read_reply(self) -> object:
+        line = self._read_line()
+        prefix, payload = line[:1], line[1:]
+        match prefix:
+            case b"+":
+                return payload.decode()
+            case b"-":
+                raise RedisProtocolError(payload.decode())
+            case b":":
+                return int(payload)
+            case b"$":
+                length = int(payload)
+                if length < 0:
+                    return None
+                return self._read_exact(length + 2)[:-2].decode()
+            case b"*":
+                length = int(payload)
+                return None if length < 0 else [self._read_reply() for _ in range(length)]
+            case _:
+                raise RedisProtocolError(f"Unexpected reply: {line!r}")
+
+
+def _as_int(reply: object) -> int:
+    """Read an integer reply (or integer string bulk reply, 0 for a missing key)."""
+    match reply:
+        case int():
+            return reply
+        case str():
+            return int(reply)
+        case _:
+            return 0
+
+
+class RedisStateStore(StateStore):
+    """State in a Redis-protocol server, shared by workers on any host."""
+
+    def __init__(self, url: str) -> None:
+        """Connect lazily to the server.
+
+        Args:
+            url: Server URL (redis://[:password@]host[:port][/db])
+        """
+        self._redis = _RespConnection(url)
+        logger.info(f"State store: Redis-protocol server at {urlparse(url).hostname}")
+
+    # Registrations are a sorted set scored by last-seen time
+
+    def add_registered_uuid(self, client_uuid: str, seen_at: float) -> None:
+        self._redis.command("ZADD", f"{REDIS_KEY_PREFIX}uuids", seen_at, client_uuid)
+
+    def get_registered_uuid_last_seen(self, client_uuid: str) -> float | None:
+        seen_at = self._redis.command("ZSCORE", f"{REDIS_KEY_PREFIX}uuids", client_uuid)
+        return float(seen_at) if isinstance(seen_at, str) else None
+
+    def touch_registered_uuid(self, client_uuid: str, seen_at: float) -> bool:
+        # XX only updates existing members, GT never moves last-seen backwards
+        self._redis.command("ZADD", f"{REDIS_KEY_PREFIX}uuids", "XX", "GT", seen_at, client_uuid)
+        return self.get_registered_uuid_last_seen(client_uuid) is not None
+
+    def evict_registered_uuids(self, seen_before: float) -> int:
+        return _as_int(
+            self._redis.command(
+                "ZREMRANGEBYSCORE", f"{REDIS_KEY_PREFIX}uuids", "-inf", f"({seen_before}"
+            )
+        )
+
+    def registered_uuid_count(self) -> int:
+        return _as_int(self._redis.command("ZCARD", f"{REDIS_KEY_PREFIX}uuids"))
+
+    def set_formatting_cache_opt_out(self, client_uuid: str, opted_out: bool) -> None:
+        redis_key = f"{REDIS_KEY_PREFIX}cache-opt-out:{client_uuid}"
+        if opted_out:
+            self._redis.command("SET", redis_key, "1")
+        else:
+            self._redis.command("DEL", redis_key)
+
+    def is_formatting_cache_opted_out(self, client_uuid: str) -> bool:
+        opt_out = self._redis.command("GET", f"{REDIS_KEY_PREFIX}cache-opt-out:{client_uuid}")
+        return isinstance(opt_out, str)
+
+    def set_owner(self, key: str, owner: str) -> None:
+        self._redis.command("SET", f"{REDIS_KEY_PREFIX}owner:{key}", owner)
+
+    def get_owner(self, key: str) -> str | None:
+        owner = self._redis.command("GET", f"{REDIS_KEY_PREFIX}owner:{key}")
+        return owner if isinstance(owner, str) else None
+
+    def release_owner(self, key: str, owner: str) -> None:
+        # Not atomic, but a takeover between the GET and DEL only drops a routing hint
+        # (the new owner records it again on its next connection)
+        if self.get_owner(key) == owner:
+            self._redis.command("DEL", f"{REDIS_KEY_PREFIX}owner:{key}")
+
+    def increment_counter(self, key: str, expiry_secs: int, amount: int = 1) -> int:
+        redis_key = f"{REDIS_KEY_PREFIX}rate:{key}"
+        count = _as_int(self._redis.command("INCRBY", redis_key, amount))
+        if count == amount:
+            self._redis.command("EXPIRE", redis_key, expiry_secs)
+        return count
+
+    def get_counter(self, key: str) -> int:
+        return _as_int(self._redis.command("GET", f"{REDIS_KEY_PREFIX}rate:{key}"))
+
+    def get_counter_expiry(self, key: str) -> float:
+        ttl_ms = self._redis.command("PTTL", f"{REDIS_KEY_PREFIX}rate:{key}")
+        return time.time() + max(ttl_ms, 0) / 1000 if isinstance(ttl_ms, int) else time.time()
+
+    def clear_counter(self, key: str) -> None:
+        self._redis.command("DEL", f"{REDIS_KEY_PREFIX}rate:{key}")
+
+    def ensure_shared_value(self, key: str, value: str) -> str:
+        redis_key = f"{REDIS_KEY_PREFIX}shared:{key}"
+        self._redis.command("SET", redis_key, value, "NX")
+        stored = self._redis.command("GET", redis_key)
+        return stored if isinstance(stored, str) else value
+
+    def close(self) -> None:
+        self._redis.close()
+
+
+def create_state_store(settings: Settings) -> StateStore:
+    """Create the state store selected by settings."""
+    match settings.state_backend:
+        case "memory":
+            return MemoryStateStore()
+        case "sqlite":
+            return SqliteStateStore(settings.state_sqlite_path)
+        case "redis":
+            return RedisStateStore(settings.state_redis_url)
@@ -0,0 +1,138 @@
+"""Streaming decoding of 16-bit PCM WAV files.
+
+Uploaded WAV files are decoded as they arrive, so a file is never held in
+memory as a whole: the header is parsed from the first chunks, then the PCM
+data is passed on in chunks of whole sample frames.
+"""
+
+import struct
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Final
+
+import numpy as np
+
+# A WAV header (with any metadata chunks) larger than this is rejected
+MAX_WAV_HEADER_BYTES: Final[int] = 64 * 1024
+
+WAVE_FORMAT_PCM: Final[int] = 0x0001
+WAVE_FORMAT_EXTENSIBLE: Final[int] = 0xFFFE
+
+
+@dataclass(frozen=True)
+class WavFormat:
+    """Format of a 16-bit PCM WAV stream.
+
+    Attributes:
+        sample_rate: Samples per second per channel
+        num_channels: Interleaved channels
+    """
+
+    sample_rate: int
+    num_channels: int
+
+    @property
+    def block_align(self) -> int:
+        """Bytes per sample frame (all channels)."""
+        return self.num_channels * 2
+
+    def duration_secs(self, pcm_bytes: int) -> float:
+        """Duration of the given number of PCM bytes."""
+        return pcm_bytes / (self.block_align * self.sample_rate)
+
+
+def parse_wav_header(header: bytes) -> tuple[WavFormat, int] | None:
+    """Parse the start of a WAV stream up to its data chunk.
+
+    Args:
+        header: The first bytes of the stream
+
+    Returns:
+        The format and the offset of the first PCM byte, or None if more bytes
+        are needed to reach the data chunk
+
+    Raises:
+        ValueError: If the stream is not a 16-bit PCM WAV file
+    """
+    if len(header) < 12:
+        return None
+    if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        raise ValueError("Audio must be a WAV file")
+
+    wav_format: WavFormat | None = None
+    offset = 12
+    while len(header) >= offset + 8:
+        chunk_id = header[offset : offset + 4]
+        (chunk_size,) = struct.unpack_from("<I", header, offset + 4)
+        body_offset = offset + 8
+        if chunk_id == b"data":
+            if wav_format is None:
+                raise ValueError("WAV file has no fmt chunk before its data")
+            return wav_format, body_offset
+        if len(header) < body_offset + chunk_size:
+            return None
+        if chunk_id == b"fmt ":
+            audio_format, num_channels, sample_rate = struct.unpack_from(
+                "<HHI", header, body_offset
+            )
+            (bits_per_sample,) = struct.unpack_from("<H", header, body_offset + 14)
+            if audio_format not in (WAVE_FORMAT_PCM, WAVE_FORMAT_EXTENSIBLE) or (
+                bits_per_sample != 16
+            ):
+                raise ValueError("WAV audio must be 16-bit PCM")
+            if num_channels < 1 or sample_rate < 1:
+                raise ValueError("WAV file has an invalid fmt chunk")
+            wav_format = WavFormat(sample_rate=sample_rate, num_channels=num_channels)
+        # Chunks are padded to an even size
+        offset = body_offset + chunk_size + (chunk_size % 2)
+    return None
+
+
+async def read_wav_stream(
+    chunks: AsyncIterator[bytes],
+) -> tuple[WavFormat, AsyncIterator[bytes]]:
+    """Read a WAV stream's header and return its PCM data as whole sample frames.
+
+    Args:
+        chunks: The raw stream, in chunks of any size
+
+    Returns:
+        The format, and the PCM data in chunks holding whole sample frames
+
+    Raises:
+        ValueError: If the stream is not a 16-bit PCM WAV file
+    """
+    header = b""
+    parsed: tuple[WavFormat, int] | None = None
+    async for chunk in chunks:
+        header += chunk
+        parsed = parse_wav_header(header)
+        if parsed is not None:
+            break
+        if len(header) > MAX_WAV_HEADER_BYTES:
+            raise ValueError("WAV header is too large")
+    if parsed is None:
+        raise ValueError("Audio ended before the WAV data chunk")
+    wav_format, data_offset = parsed
+
+    async def pcm_chunks() -> AsyncIterator[bytes]:
+        pending = header[data_offset:]
+        async for chunk in chunks:
+            pending += chunk
+            whole_bytes = len(pending) - len(pending) % wav_format.block_align
+            if whole_bytes:
+                yield pending[:whole_bytes]
+                pending = pending[whole_bytes:]
+        whole_bytes = len(pending) - len(pending) % wav_format.block_align
+        if whole_bytes:
+            yield pending[:whole_bytes]
+
+    return wav_format, pcm_chunks()
+
+
+def downmix_to_mono(pcm: bytes, num_channels: int) -> bytes:
+    """Average interleaved 16-bit channels into one."""
+    if num_channels == 1:
+        return pcm
+    samples = np.frombuffer(pcm, dtype=np.int16).reshape(-1, num_channels)
+    return samples.mean(axis=1).astype(np.int16).tobytes()
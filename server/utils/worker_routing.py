@@ -0,0 +1,243 @@
+"""Forwarding of client requests to the worker hosting the client's pipeline.
+
+With several workers behind a load balancer, a client's signaling and config
+requests may reach a worker other than the one running its pipeline. Each
+worker records itself as the owner of its connections in the shared state
+store, and any other worker forwards the client's requests to the owner:
+- Config and batch endpoints, by the X-Client-UUID header
+- WebRTC offers (POST /api/offer), by the clientUUID in the request data
+- ICE candidate patches (PATCH /api/offer), by the peer connection ID
+
+Forwarded requests are marked with a token shared by all workers (through
+the state store), so they are never forwarded again and the owner can trust
+their X-Forwarded-For header for per-IP rate limits. If the owner cannot be
+reached (e.g., it crashed), the request is handled locally.
+
+Requests proxied by a router or supervisor front end (see
+utils.signaling_router) are marked with a proxy token instead, so nodes trust
+their X-Forwarded-For header too while still forwarding them to the owning
+worker. The token is the one configured on the router and its nodes
+(PROXY_TOKEN), or else one shared through the state store (by a supervisor
+and its workers).
+"""
+
+from __future__ import annotations
+
+import json
+import secrets
+from typing import TYPE_CHECKING, ClassVar, Final
+
+import httpx
+from loguru import logger
+from starlette.responses import Response
+
+if TYPE_CHECKING:
+    from starlette.requests import Request
+
+    from processors.client_manager import ClientConnectionManager
+    from utils.state_store import StateStore
+
+FORWARDED_HEADER: Final[str] = "X-Tambourine-Forwarded"
+PROXIED_HEADER: Final[str] = "X-Tambourine-Proxied"
+PROXY_TOKEN_KEY: Final[str] = "proxy-token"
+# Batch transcription requests stream whole recordings
+FORWARD_TIMEOUT_SECS: Final[float] = 300.0
+# Headers describing a single hop, which must not be forwarded
+HOP_BY_HOP_HEADERS: Final[frozenset[str]] = frozenset(
+    {
+        "connection",
+        "host",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailers",
+        "transfer-encoding",
+        "upgrade",
+    }
+)
+
+
+async def find_remote_owner(
+    request: Request, client_manager: ClientConnectionManager
+) -> str | None:
+    """Get the URL of the worker that should handle a request, if not this one.
+
+    Args:
+        request: The incoming request
+        client_manager: This worker's client connection manager
+
+    Returns:
+        The owning worker's URL, or None to handle the request here
+    """
+    if is_forwarded(request):
+        return None
+    client_uuid, pc_id = await read_signaling_keys(request)
+    if client_uuid:
+        return await client_manager.get_remote_owner(client_uuid=client_uuid)
+    if pc_id:
+        return await client_manager.get_remote_owner(pc_id=pc_id)
+    return None
+
+
+async def read_signaling_keys(request: Request) -> tuple[str | None, str | None]:
+    """Get the client UUID or peer connection ID a request is for.
+
+    Args:
+        request: The incoming request (its body is read for WebRTC offers)
+
+    Returns:
+        The client UUID and peer connection ID, either or both None if absent
+    """
+    client_uuid = request.headers.get("X-Client-UUID")
+    if client_uuid:
+        return client_uuid, None
+    if request.url.path != "/api/offer":
+        return None, None
+
+    try:
+        body = json.loads(await request.body())
+    except ValueError:
+        return None, None
+    if not isinstance(body, dict):
+        return None, None
+    match request.method:
+        case "POST":
+            request_data = body.get("requestData") or body.get("request_data") or {}
+            client_uuid = request_data.get("clientUUID") if isinstance(request_data, dict) else None
+            return client_uuid or None, None
+        case "PATCH":
+            return None, body.get("pc_id") or None
+        case _:
+            return None, None
+
+
+def is_forwarded(request: Request) -> bool:
+    """Check if a request was forwarded by another worker (with the shared token)."""
+    token = WorkerForwarder.token
+    return token is not None and request.headers.get(FORWARDED_HEADER) == token
+
+
+def is_proxied(request: Request) -> bool:
+    """Check if a request was proxied by a router or front end (with the proxy token)."""
+    token = TrustedProxy.token
+    return token is not None and request.headers.get(PROXIED_HEADER) == token
+
+
+def forwarded_client_ip(request: Request) -> str | None:
+    """Get the original client IP of a request forwarded by another worker or a router."""
+    if not (is_forwarded(request) or is_proxied(request)):
+        return None
+    return request.headers.get("X-Forwarded-For")
+
+
+class TrustedProxy:
+    """The token of proxies whose X-Forwarded-For header this server trusts."""
+
+    # Token sent by the router or front end in front of this server (None trusts none)
+    token: ClassVar[str | None] = None
+
+
+def resolve_proxy_token(configured_token: str | None, state_store: StateStore) -> str:
+    """Get the proxy token: the configured one, or else one shared through the state store.
+
+    Args:
+        configured_token: The PROXY_TOKEN setting, if set
+        state_store: The state store shared by a supervisor and its workers
+    """
+    return configured_token or state_store.ensure_shared_value(
+        PROXY_TOKEN_KEY, secrets.token_urlsafe(32)
+    )
+
+
+class WorkerForwarder:
+    """Forwards requests to other workers over HTTP."""
+
+    # Token marking forwarded requests, shared by all workers (None until a forwarder exists)
+    token: ClassVar[str | None] = None
+
+    def __init__(self, state_store: StateStore) -> None:
+        """Initialize the forwarder with a pooled HTTP client.
+
+        Args:
+            state_store: The state store shared with the other workers
+        """
+        WorkerForwarder.token = state_store.ensure_shared_value(
+            "forwarding-token", secrets.token_urlsafe(32)
+        )
+        self._client = httpx.AsyncClient(timeout=FORWARD_TIMEOUT_SECS)
+
+    async def forward(self, request: Request, owner_url: str) -> Response | None:
+        """Forward a request to the owning worker.
+
+        Args:
+            request: The incoming request
+            owner_url: Base URL of the owning worker
+
+        Returns:
+            The owner's response, or None if it could not be reached
+        """
+        assert self.token is not None
+        return await proxy_request(
+            self._client, request, owner_url, extra_headers={FORWARDED_HEADER: self.token}
+        )
+
+    async def close(self) -> None:
+        """Close the HTTP client."""
+        await self._client.aclose()
+
+
+async def proxy_request(
+    client: httpx.AsyncClient,
+    request: Request,
+    base_url: str,
+    extra_headers: dict[str, str] | None = None,
+) -> Response | None:
+    """Send a request on to another server and relay its response.
+
+    Args:
+        client: HTTP client to send the request with
+        request: The incoming request
+        base_url: Base URL of the server to send it to
+        extra_headers: Headers to add to the request
+
+    Returns:
+        The server's response, or None if it could not be reached
+    """
+    headers = {
+        name: value
+        for name, value in request.headers.items()
+        if name.lower() not in HOP_BY_HOP_HEADERS
+    }
+    headers |= extra_headers or {}
+    # Keeps per-IP rate limits keyed by the real client, also across several hops
+    client_ip = forwarded_client_ip(request) or (
+        request.client.host if request.client is not None else None
+    )
+    if client_ip is not None:
+        headers["X-Forwarded-For"] = client_ip
+    try:
+        response = await client.request(
+            request.method,
+            f"{base_url.rstrip('/')}{request.url.path}",
+            params=request.url.query,
+            headers=headers,
+            # Streams the body (or replays it, if it was read to route the request),
+            # with the original Content-Length
+            content=request.stream(),
+        )
+    except httpx.HTTPError as error:
+        logger.warning(f"Could not forward {request.url.path} to {base_url}: {error}")
+        return None
+
+    logger.debug(f"Forwarded {request.method} {request.url.path} to {base_url}")
+    return Response(
+        content=response.content,
+        status_code=response.status_code,
+        headers={
+            name: value
+            for name, value in response.headers.items()
+            # Bodies are relayed decoded, so their length may differ
+            if name.lower() not in HOP_BY_HOP_HEADERS | {"content-encoding", "content-length"}
+        },
+    )
@@ -0,0 +1,148 @@
+"""Supervisor of pipeline worker processes behind one signaling front end.
+
+Every pipeline of a server process shares its event loop and GIL, so VAD
+inference, WebRTC encryption and audio handling for many clients compete for
+one core. In supervisor mode (python main.py --workers N), the main process
+runs no pipelines: it starts N worker processes, each a full server on its
+own local port, and serves the signaling front end (see
+utils.signaling_router) on the public port.
+
+Each new WebRTC offer is sent to the worker with the fewest active
+pipelines, which then hosts the whole session: WebRTC media flows between the
+client and that worker directly, as the worker's ICE candidates are in its
+answer. A live peer connection cannot move between processes, so sessions
+are placed rather than handed off. Workers share registrations, connection
+owners (see utils.worker_routing) and rate limits through the state store and
+shared-memory counters, so any worker can answer any client's config calls.
+
+Workers that exit are restarted. Their load is reported per worker by the
+front end's /health, and the front end's /ready is ready while any worker is.
+On SIGTERM the front end drains for DRAIN_SECS (see utils.readiness), then
+stops the workers, which shut down without draining again. The front end
+sends the workers each client's IP with a token they share through the state
+store, so per-IP rate limits apply to clients rather than to the front end. Workers are started as fresh interpreters (see
+subprocess_launcher) or, with --fork-server, forked from a preloaded process
+they share memory with (see utils.fork_server).
+"""
+
+import os
+import subprocess
+import threading
+from collections.abc import Callable
+from typing import Final, Protocol
+
+from loguru import logger
+
+# Workers are polled this often for their load
+WORKER_HEALTH_INTERVAL_SECS: Final[float] = 1.0
+# Delay before restarting a worker that exited
+WORKER_RESTART_DELAY_SECS: Final[float] = 2.0
+WORKER_STOP_TIMEOUT_SECS: Final[float] = 10.0
+
+
+class WorkerProcess(Protocol):
+    """A running worker process, as subprocess.Popen exposes it."""
+
+    pid: int
+
+    def poll(self) -> int | None: ...
+
+    def wait(self, timeout: float | None = None) -> int: ...
+
+    def terminate(self) -> None: ...
+
+    def kill(self) -> None: ...
+
+
+class WorkerSupervisor:
+    """Starts, restarts and stops the worker server processes."""
+
+    def __init__(
+        self,
+        launch_worker: Callable[[int], WorkerProcess],
+        worker_count: int,
+        first_port: int,
+    ) -> None:
+        """Initialize the supervisor.
+
+        Args:
+            launch_worker: Starts a worker process serving on a local port
+            worker_count: Number of worker processes
+            first_port: Local port of the first worker (the others follow it)
+        """
+        self._launch_worker = launch_worker
+        self._ports = [first_port + index for index in range(worker_count)]
+        self._processes: dict[int, WorkerProcess] = {}
+        self._stopping = threading.Event()
+        self._monitor_thread: threading.Thread | None = None
+
+    @property
+    def worker_urls(self) -> list[str]:
+        """Get the base URLs of the workers."""
+        return [worker_url(port) for port in self._ports]
+
+    def start(self) -> None:
+        """Start the workers and restart any that exit."""
+        for port in self._ports:
+            self._spawn(port)
+        self._monitor_thread = threading.Thread(
+            target=self._monitor, name="worker-supervisor", daemon=True
+        )
+        self._monitor_thread.start()
+
+    def stop(self) -> None:
+        """Stop the workers, killing any that do not exit in time."""
+        self._stopping.set()
+        if self._monitor_thread is not None:
+            self._monitor_thread.join()
+        for process in self._processes.values():
+            process.terminate()
+        for port, process in self._processes.items():
+            try:
+                process.wait(timeout=WORKER_STOP_TIMEOUT_SECS)
+            except subprocess.TimeoutExpired:
+                logger.warning(f"Worker on port {port} did not stop; killing it")
+                process.kill()
+                process.wait()
+        logger.info("All workers stopped")
+
+    def _spawn(self, port: int) -> None:
+        self._processes[port] = self._launch_worker(port)
+        logger.info(f"Started worker {self._processes[port].pid} on port {port}")
+
+    def _monitor(self) -> None:
+        while not self._stopping.wait(WORKER_RESTART_DELAY_SECS):
+            for port, process in list(self._processes.items()):
+                exit_code = process.poll()
+                if exit_code is not None and not self._stopping.is_set():
+                    logger.warning(
+                        f"Worker {process.pid} on port {port} exited ({exit_code}); restarting it"
+                    )
+                    self._spawn(port)
+
+
+def subprocess_launcher(command: list[str]) -> Callable[[int], WorkerProcess]:
+    """Get a worker launcher running a command per worker.
+
+    Args:
+        command: Command running one server process (--host and --port are appended)
+    """
+
+    def launch_worker(port: int) -> WorkerProcess:
+        return subprocess.Popen(
+            [*command, "--host", "127.0.0.1", "--port", str(port)],
+            env=os.environ | worker_environment(port),
+        )
+
+    return launch_worker
+
+
+def worker_url(port: int) -> str:
+    """Get the base URL of the worker on a local port."""
+    return f"http://127.0.0.1:{port}"
+
+
+def worker_environment(port: int) -> dict[str, str]:
+    """Get the environment variables of the worker on a local port."""
+    # The front end drains for all workers before stopping them, so they stop at once
+    return {"WORKER_URL": worker_url(port), "DRAIN_SECS": "0"}